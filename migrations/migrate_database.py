@@ -1,30 +1,698 @@
 #!/usr/bin/env python3
 """
-Database migration script to add AI analysis fields to existing SVCS database
+Database migrations for SVCS databases
+
+Two entry points live here:
+1. migrate_database() - legacy one-off migration adding AI analysis fields
+   to the old global history database
+2. run_migrations() - versioned migration runner for the repository-local
+   .svcs/semantic.db, applied automatically whenever the database is opened
+
+Usage:
+    python migrations/migrate_database.py [path/to/.svcs/semantic.db]
 """
 
 import sqlite3
 import os
+import sys
+import time
+import uuid
+
+
+# --- Versioned migrations for .svcs/semantic.db ---
+
+def _table_columns(conn, table):
+    """Return the column names of a table (empty if the table is missing)."""
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _create_index(conn, name, table, columns):
+    """Create an index if every column it covers exists on the table."""
+    if not set(columns) <= _table_columns(conn, table):
+        return False
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+    return True
+
+
+def _migration_001_query_indexes(conn):
+    """Composite indexes matched to the real query shapes."""
+    # get_branch_events: WHERE branch = ? ORDER BY created_at DESC
+    _create_index(conn, "idx_semantic_events_branch_created", "semantic_events", ["branch", "created_at"])
+    # process_merge: EXCEPT over (event_type, node_id, location) per branch,
+    # then the latest event per key
+    _create_index(conn, "idx_semantic_events_branch_key", "semantic_events",
+                  ["branch", "event_type", "node_id", "location", "created_at"])
+    # note import and joins with commits
+    _create_index(conn, "idx_semantic_events_commit", "semantic_events", ["commit_hash"])
+    # get_node_evolution / get_filtered_evolution
+    _create_index(conn, "idx_semantic_events_node", "semantic_events", ["node_id", "created_at"])
+    # event type filters
+    _create_index(conn, "idx_semantic_events_type", "semantic_events", ["event_type", "created_at"])
+    # recency scans across all branches
+    _create_index(conn, "idx_semantic_events_created", "semantic_events", ["created_at"])
+    # api.py orders and filters by commit timestamp, optionally per branch
+    _create_index(conn, "idx_commits_timestamp", "commits", ["timestamp"])
+    _create_index(conn, "idx_commits_branch_timestamp", "commits", ["branch", "timestamp"])
+
+
+def _migration_002_analysis_progress(conn):
+    """Checkpoint table for resumable history backfills."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_progress (
+            commit_hash TEXT PRIMARY KEY,
+            event_count INTEGER NOT NULL DEFAULT 0,
+            analyzed_at INTEGER NOT NULL
+        )
+    """)
+
+
+def _migration_003_analysis_queue(conn):
+    """Durable queue of commits waiting for background analysis."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_queue (
+            commit_hash TEXT PRIMARY KEY,
+            branch TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            worker_id TEXT,
+            event_count INTEGER,
+            enqueued_at INTEGER NOT NULL,
+            started_at INTEGER,
+            finished_at INTEGER
+        )
+    """)
+    _create_index(conn, "idx_analysis_queue_status", "analysis_queue", ["status", "enqueued_at"])
+
+
+# Branch-aware event table as of migration 4 (matches svcs_repo_local.py)
+_SEMANTIC_EVENTS_V4 = """
+    CREATE TABLE semantic_events (
+        event_id TEXT PRIMARY KEY,
+        commit_hash TEXT NOT NULL,
+        branch TEXT,
+        event_type TEXT NOT NULL,
+        node_id TEXT,
+        location TEXT,
+        details TEXT,
+        layer TEXT,
+        layer_description TEXT,
+        confidence REAL,
+        reasoning TEXT,
+        impact TEXT,
+        created_at INTEGER NOT NULL,
+        git_notes_synced BOOLEAN DEFAULT FALSE,
+        FOREIGN KEY (commit_hash) REFERENCES commits(commit_hash)
+    )
+"""
+
+_EVENT_IDENTITY = ("commit_hash", "event_type", "node_id", "location", "details", "layer")
+
+
+def _migration_004_single_event_schema(conn):
+    """One event schema and one row per event.
+
+    svcs/storage.py used to create its own semantic_events table (INTEGER
+    key, no branch) and the hook path wrote every event twice: once through
+    it (no branch, no event_id) and once through RepositoryLocalDatabase.
+    """
+    columns = {row[1]: row[2].upper() for row in conn.execute("PRAGMA table_info(semantic_events)")}
+    if not columns:
+        return
+
+    # Legacy storage.py table: rebuild with the branch-aware layout
+    if "branch" not in columns or columns.get("event_id") == "INTEGER":
+        conn.execute("ALTER TABLE semantic_events RENAME TO semantic_events_legacy")
+        conn.execute(_SEMANTIC_EVENTS_V4)
+        copied = [name for name in ("commit_hash", "branch", "event_type", "node_id", "location", "details",
+                                    "layer", "layer_description", "confidence", "reasoning", "impact",
+                                    "created_at") if name in columns]
+        conn.execute(f"""
+            INSERT INTO semantic_events ({', '.join(copied)})
+            SELECT {', '.join(copied)} FROM semantic_events_legacy ORDER BY rowid
+        """)
+        conn.execute("DROP TABLE semantic_events_legacy")
+
+    commit_columns = _table_columns(conn, "commits")
+    for name, definition in (("branch", "TEXT"), ("message", "TEXT"), ("created_at", "INTEGER"),
+                             ("git_notes_synced", "BOOLEAN DEFAULT FALSE")):
+        if commit_columns and name not in commit_columns:
+            conn.execute(f"ALTER TABLE commits ADD COLUMN {name} {definition}")
+
+    # Recreate indexes dropped with the old table or skipped for missing columns
+    _migration_001_query_indexes(conn)
+
+    # Drop branch-less copies of events that were also stored with a branch
+    same_event = " AND ".join(f"t.{name} IS semantic_events.{name}" for name in _EVENT_IDENTITY)
+    conn.execute(f"""
+        DELETE FROM semantic_events
+        WHERE branch IS NULL AND EXISTS (
+            SELECT 1 FROM semantic_events t
+            WHERE t.branch IS NOT NULL AND {same_event}
+        )
+    """)
+
+    # Remaining branch-less events take their commit's branch
+    if commit_columns:
+        conn.execute("""
+            UPDATE semantic_events
+            SET branch = (SELECT c.branch FROM commits c WHERE c.commit_hash = semantic_events.commit_hash)
+            WHERE branch IS NULL
+        """)
+
+    # Identical events stored more than once on the same branch
+    conn.execute(f"""
+        DELETE FROM semantic_events
+        WHERE rowid NOT IN (
+            SELECT MIN(rowid) FROM semantic_events
+            GROUP BY branch, {', '.join(_EVENT_IDENTITY)}
+        )
+    """)
+
+    missing_ids = [row[0] for row in conn.execute("SELECT rowid FROM semantic_events WHERE event_id IS NULL")]
+    conn.executemany("UPDATE semantic_events SET event_id = ? WHERE rowid = ?",
+                     [(str(uuid.uuid4()), rowid) for rowid in missing_ids])
+
+
+def _migration_005_keyset_indexes(conn):
+    """Indexes ending in event_id, so (created_at, event_id) cursors are one range scan."""
+    if _create_index(conn, "idx_semantic_events_branch_keyset", "semantic_events",
+                     ["branch", "created_at", "event_id"]):
+        conn.execute("DROP INDEX IF EXISTS idx_semantic_events_branch_created")
+    if _create_index(conn, "idx_semantic_events_keyset", "semantic_events", ["created_at", "event_id"]):
+        conn.execute("DROP INDEX IF EXISTS idx_semantic_events_created")
+    # api.py pages the commit-joined log by (commits.timestamp, event_id)
+    if _create_index(conn, "idx_semantic_events_commit_keyset", "semantic_events", ["commit_hash", "event_id"]):
+        conn.execute("DROP INDEX IF EXISTS idx_semantic_events_commit")
+
+
+# Full-text index over event text, kept in sync by triggers. It is an
+# external-content table keyed by semantic_events.rowid, so it stores only
+# the index, not a second copy of the text.
+EVENT_FTS_TABLE = "semantic_events_fts"
+EVENT_FTS_COLUMNS = ("details", "reasoning", "location")
+_EVENT_FTS_TRIGGERS = {
+    "semantic_events_fts_insert": """
+        CREATE TRIGGER IF NOT EXISTS semantic_events_fts_insert AFTER INSERT ON semantic_events BEGIN
+            INSERT INTO semantic_events_fts (rowid, details, reasoning, location)
+            VALUES (new.rowid, new.details, new.reasoning, new.location);
+        END
+    """,
+    "semantic_events_fts_delete": """
+        CREATE TRIGGER IF NOT EXISTS semantic_events_fts_delete AFTER DELETE ON semantic_events BEGIN
+            INSERT INTO semantic_events_fts (semantic_events_fts, rowid, details, reasoning, location)
+            VALUES ('delete', old.rowid, old.details, old.reasoning, old.location);
+        END
+    """,
+    "semantic_events_fts_update": """
+        CREATE TRIGGER IF NOT EXISTS semantic_events_fts_update
+        AFTER UPDATE OF details, reasoning, location ON semantic_events BEGIN
+            INSERT INTO semantic_events_fts (semantic_events_fts, rowid, details, reasoning, location)
+            VALUES ('delete', old.rowid, old.details, old.reasoning, old.location);
+            INSERT INTO semantic_events_fts (rowid, details, reasoning, location)
+            VALUES (new.rowid, new.details, new.reasoning, new.location);
+        END
+    """,
+}
+
+_fts5_supported = None
+
+
+def fts5_supported(conn):
+    """Whether this SQLite build has the FTS5 extension (probed once per process)."""
+    global _fts5_supported
+    if _fts5_supported is None:
+        try:
+            conn.execute("CREATE VIRTUAL TABLE temp._svcs_fts5_probe USING fts5(x)")
+            conn.execute("DROP TABLE temp._svcs_fts5_probe")
+            _fts5_supported = True
+        except sqlite3.OperationalError:
+            _fts5_supported = False
+    return _fts5_supported
+
+
+def _fts_triggers_present(conn):
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    return set(_EVENT_FTS_TRIGGERS) <= names
+
+
+def _event_fts_needs_sync(conn):
+    if "event_id" not in _table_columns(conn, "semantic_events"):
+        return False
+    if not fts5_supported(conn):
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        return bool(names & set(_EVENT_FTS_TRIGGERS))
+    has_table = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (EVENT_FTS_TABLE,)).fetchone()
+    return not (has_table and _fts_triggers_present(conn))
+
+
+def ensure_event_fts(conn):
+    """Create, re-sync or detach the event full-text index for this SQLite build.
+
+    With FTS5, a missing table or missing triggers (e.g. after the database was
+    written by a build without FTS5) are recreated and the index is rebuilt.
+    Without FTS5, the triggers are dropped so inserts keep working; searches
+    then fall back to LIKE. Cheap when nothing changed; runs in the caller's
+    transaction if there is one. Returns True when the index is usable.
+    """
+    if not _event_fts_needs_sync(conn):
+        return fts5_supported(conn) and bool(
+            conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (EVENT_FTS_TABLE,)).fetchone())
+
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-check under the write lock; another process may have synced it
+        if _event_fts_needs_sync(conn):
+            if fts5_supported(conn):
+                conn.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {EVENT_FTS_TABLE} USING fts5(
+                        {', '.join(EVENT_FTS_COLUMNS)}, content='semantic_events', content_rowid='rowid'
+                    )
+                """)
+                for trigger_sql in _EVENT_FTS_TRIGGERS.values():
+                    conn.execute(trigger_sql)
+                conn.execute(f"INSERT INTO {EVENT_FTS_TABLE} ({EVENT_FTS_TABLE}) VALUES ('rebuild')")
+            else:
+                for name in _EVENT_FTS_TRIGGERS:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        if own_transaction:
+            conn.commit()
+    except Exception:
+        if own_transaction:
+            conn.rollback()
+        raise
+    return fts5_supported(conn)
+
+
+def _migration_006_event_fts(conn):
+    """FTS5 index over details, reasoning and location (skipped without FTS5)."""
+    ensure_event_fts(conn)
+
+
+# Rollup of event counts per (branch, event_type, layer, author, day), so
+# dashboards and status commands read O(groups) rows instead of scanning
+# semantic_events. Author and day come from the event's commit (day is the
+# UTC date of the commit, or of the event while its commit is unknown); NULLs
+# are stored as ''. Triggers on semantic_events and commits update it in the
+# writer's transaction. INSERT OR REPLACE on commits does not fire delete
+# triggers and can leave it stale; rebuild_event_stats() recomputes it.
+EVENT_STATS_TABLE = "event_stats"
+EVENT_STATS_KEYS = ("branch", "event_type", "layer", "author", "day")
+
+
+def _event_stats_key(event, author, timestamp):
+    """SQL expressions for the rollup key of an event row and its commit values."""
+    return (f"COALESCE({event}.branch, '') AS branch, COALESCE({event}.event_type, '') AS event_type, "
+            f"COALESCE({event}.layer, '') AS layer, COALESCE({author}, '') AS author, "
+            f"COALESCE(date(COALESCE({timestamp}, {event}.created_at), 'unixepoch'), '') AS day")
+
+
+def _event_stats_upsert(select_sql):
+    """Add the (key..., count, confidence_sum, confidence_count) rows of a SELECT to the rollup."""
+    return f"""
+        INSERT INTO {EVENT_STATS_TABLE} ({', '.join(EVENT_STATS_KEYS)}, event_count, confidence_sum, confidence_count)
+        {select_sql}
+        ON CONFLICT ({', '.join(EVENT_STATS_KEYS)}) DO UPDATE SET
+            event_count = event_count + excluded.event_count,
+            confidence_sum = confidence_sum + excluded.confidence_sum,
+            confidence_count = confidence_count + excluded.confidence_count;
+    """
+
+
+def _event_row_delta(row, sign):
+    # Single event: the commit is looked up as it is now
+    return _event_stats_upsert(f"""
+        SELECT {_event_stats_key(row, 'c.author', 'c.timestamp')},
+               {sign}1, {sign}COALESCE({row}.confidence, 0), {sign}({row}.confidence IS NOT NULL)
+        FROM (SELECT 1) LEFT JOIN commits c ON c.commit_hash = {row}.commit_hash
+        WHERE 1
+    """)
+
+
+def _commit_events_delta(commit_hash, author, timestamp, sign):
+    # All events of one commit, keyed with the given commit values
+    return _event_stats_upsert(f"""
+        SELECT {_event_stats_key('se', author, timestamp)},
+               {sign}COUNT(*), {sign}TOTAL(se.confidence), {sign}COUNT(se.confidence)
+        FROM semantic_events se
+        WHERE se.commit_hash = {commit_hash}
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+
+
+_DROP_EMPTY_EVENT_STATS = f"DELETE FROM {EVENT_STATS_TABLE} WHERE event_count <= 0;"
+
+# Full recomputation; also what readers fall back to without the rollup table
+EVENT_STATS_SELECT = f"""
+    SELECT {_event_stats_key('se', 'c.author', 'c.timestamp')},
+           COUNT(*) AS event_count, TOTAL(se.confidence) AS confidence_sum,
+           COUNT(se.confidence) AS confidence_count
+    FROM semantic_events se
+    LEFT JOIN commits c ON c.commit_hash = se.commit_hash
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+_EVENT_STATS_TRIGGERS = {
+    "event_stats_event_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS event_stats_event_insert AFTER INSERT ON semantic_events BEGIN
+            {_event_row_delta('new', '+')}
+        END
+    """,
+    "event_stats_event_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS event_stats_event_delete AFTER DELETE ON semantic_events BEGIN
+            {_event_row_delta('old', '-')}
+            {_DROP_EMPTY_EVENT_STATS}
+        END
+    """,
+    "event_stats_event_update": f"""
+        CREATE TRIGGER IF NOT EXISTS event_stats_event_update
+        AFTER UPDATE OF commit_hash, branch, event_type, layer, confidence, created_at ON semantic_events BEGIN
+            {_event_row_delta('old', '-')}
+            {_event_row_delta('new', '+')}
+            {_DROP_EMPTY_EVENT_STATS}
+        END
+    """,
+    # Events stored before their commit row was counted without author
+    "event_stats_commit_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS event_stats_commit_insert AFTER INSERT ON commits
+        WHEN new.author IS NOT NULL OR new.timestamp IS NOT NULL BEGIN
+            {_commit_events_delta('new.commit_hash', 'NULL', 'NULL', '-')}
+            {_commit_events_delta('new.commit_hash', 'new.author', 'new.timestamp', '+')}
+            {_DROP_EMPTY_EVENT_STATS}
+        END
+    """,
+    "event_stats_commit_update": f"""
+        CREATE TRIGGER IF NOT EXISTS event_stats_commit_update AFTER UPDATE OF author, timestamp ON commits
+        WHEN new.author IS NOT old.author OR new.timestamp IS NOT old.timestamp BEGIN
+            {_commit_events_delta('old.commit_hash', 'old.author', 'old.timestamp', '-')}
+            {_commit_events_delta('new.commit_hash', 'new.author', 'new.timestamp', '+')}
+            {_DROP_EMPTY_EVENT_STATS}
+        END
+    """,
+    "event_stats_commit_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS event_stats_commit_delete AFTER DELETE ON commits
+        WHEN old.author IS NOT NULL OR old.timestamp IS NOT NULL BEGIN
+            {_commit_events_delta('old.commit_hash', 'old.author', 'old.timestamp', '-')}
+            {_commit_events_delta('old.commit_hash', 'NULL', 'NULL', '+')}
+            {_DROP_EMPTY_EVENT_STATS}
+        END
+    """,
+}
+
+
+def rebuild_event_stats(conn):
+    """Recompute the event_stats rollup from semantic_events and commits.
+
+    Creates the table and its triggers if missing. Runs in the caller's
+    transaction if there is one. Returns the number of rollup rows.
+    """
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {EVENT_STATS_TABLE} (
+                branch TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                layer TEXT NOT NULL,
+                author TEXT NOT NULL,
+                day TEXT NOT NULL,
+                event_count INTEGER NOT NULL DEFAULT 0,
+                confidence_sum REAL NOT NULL DEFAULT 0,
+                confidence_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY ({', '.join(EVENT_STATS_KEYS)})
+            ) WITHOUT ROWID
+        """)
+        # Lets the triggers find groups whose last event went away without a scan
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_event_stats_empty
+            ON {EVENT_STATS_TABLE} (event_count) WHERE event_count <= 0
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_event_stats_day ON {EVENT_STATS_TABLE} (day)")
+        for trigger_sql in _EVENT_STATS_TRIGGERS.values():
+            conn.execute(trigger_sql)
+        conn.execute(f"DELETE FROM {EVENT_STATS_TABLE}")
+        conn.execute(f"""
+            INSERT INTO {EVENT_STATS_TABLE}
+                ({', '.join(EVENT_STATS_KEYS)}, event_count, confidence_sum, confidence_count)
+            {EVENT_STATS_SELECT}
+        """)
+        count = conn.execute(f"SELECT COUNT(*) FROM {EVENT_STATS_TABLE}").fetchone()[0]
+        if own_transaction:
+            conn.commit()
+    except Exception:
+        if own_transaction:
+            conn.rollback()
+        raise
+    return count
+
+
+def _migration_007_event_stats(conn):
+    """event_stats rollup table, its maintenance triggers and initial contents."""
+    if {"event_id", "commit_hash"} <= _table_columns(conn, "semantic_events") and _table_columns(conn, "commits"):
+        rebuild_event_stats(conn)
+
+
+def _migration_008_branch_reachability(conn):
+    """Commit-to-branch reachability index; merged event copies collapse into pins.
+
+    process_merge used to copy a source branch's events into the target
+    branch. Branch views now come from branch_commits (filled from git by
+    svcs_repo_reachability), so each copied event is kept once and the
+    branches it was copied to get a pinned row for its commit instead.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS branch_commits (
+            branch TEXT NOT NULL,
+            commit_hash TEXT NOT NULL,
+            pinned INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (branch, commit_hash)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_branch_commits_commit ON branch_commits (commit_hash, branch)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS branch_heads (
+            branch TEXT PRIMARY KEY,
+            head TEXT NOT NULL,
+            refreshed_at INTEGER NOT NULL
+        )
+    """)
+    if not {"branch", "commit_hash"} <= _table_columns(conn, "semantic_events"):
+        return
+
+    identity = ", ".join(_EVENT_IDENTITY)
+    conn.execute(f"""
+        CREATE TEMP TABLE event_copies AS
+        SELECT se.rowid AS copy_rowid, se.branch, se.commit_hash
+        FROM semantic_events se
+        JOIN (
+            SELECT MIN(rowid) AS kept, {identity} FROM semantic_events
+            GROUP BY {identity} HAVING COUNT(*) > 1
+        ) k ON {" AND ".join(f"se.{name} IS k.{name}" for name in _EVENT_IDENTITY)}
+        WHERE se.rowid != k.kept
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO branch_commits (branch, commit_hash, pinned)
+        SELECT DISTINCT branch, commit_hash, 1 FROM temp.event_copies
+        WHERE branch IS NOT NULL AND commit_hash IS NOT NULL
+    """)
+    conn.execute("DELETE FROM semantic_events WHERE rowid IN (SELECT copy_rowid FROM temp.event_copies)")
+    conn.execute("DROP TABLE temp.event_copies")
+
+
+def _migration_009_notes_sync(conn):
+    """Last fetched and imported commit of each semantic notes ref.
+
+    svcs_repo_notes.sync_notes skips the fetch when the remote ref is
+    unchanged and imports only the notes that differ from imported_head.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS notes_sync (
+            notes_ref TEXT PRIMARY KEY,
+            remote_head TEXT,
+            checked_at INTEGER,
+            imported_head TEXT,
+            imported_at INTEGER
+        )
+    """)
+
+
+# Event count per commit. A branch's event count is the sum over its
+# branch_commits rows, O(commits on the branch) instead of O(events).
+# Maintained by triggers on semantic_events; rebuild_commit_event_counts()
+# recomputes it.
+COMMIT_EVENT_COUNTS_TABLE = "commit_event_counts"
+
+_COMMIT_EVENT_COUNT_TRIGGERS = {
+    "commit_event_counts_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS commit_event_counts_insert AFTER INSERT ON semantic_events
+        WHEN new.commit_hash IS NOT NULL BEGIN
+            INSERT INTO {COMMIT_EVENT_COUNTS_TABLE} (commit_hash, event_count) VALUES (new.commit_hash, 1)
+            ON CONFLICT (commit_hash) DO UPDATE SET event_count = event_count + 1;
+        END
+    """,
+    "commit_event_counts_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS commit_event_counts_delete AFTER DELETE ON semantic_events
+        WHEN old.commit_hash IS NOT NULL BEGIN
+            UPDATE {COMMIT_EVENT_COUNTS_TABLE} SET event_count = event_count - 1
+            WHERE commit_hash = old.commit_hash;
+            DELETE FROM {COMMIT_EVENT_COUNTS_TABLE} WHERE commit_hash = old.commit_hash AND event_count <= 0;
+        END
+    """,
+    "commit_event_counts_update": f"""
+        CREATE TRIGGER IF NOT EXISTS commit_event_counts_update AFTER UPDATE OF commit_hash ON semantic_events
+        WHEN old.commit_hash IS NOT new.commit_hash BEGIN
+            UPDATE {COMMIT_EVENT_COUNTS_TABLE} SET event_count = event_count - 1
+            WHERE commit_hash = old.commit_hash;
+            DELETE FROM {COMMIT_EVENT_COUNTS_TABLE} WHERE commit_hash = old.commit_hash AND event_count <= 0;
+            INSERT INTO {COMMIT_EVENT_COUNTS_TABLE} (commit_hash, event_count)
+            SELECT new.commit_hash, 1 WHERE new.commit_hash IS NOT NULL
+            ON CONFLICT (commit_hash) DO UPDATE SET event_count = event_count + 1;
+        END
+    """,
+}
+
+
+def rebuild_commit_event_counts(conn):
+    """Recompute commit_event_counts from semantic_events.
+
+    Creates the table and its triggers if missing. Runs in the caller's
+    transaction if there is one. Returns the number of commits counted.
+    """
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {COMMIT_EVENT_COUNTS_TABLE} (
+                commit_hash TEXT PRIMARY KEY,
+                event_count INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        for trigger_sql in _COMMIT_EVENT_COUNT_TRIGGERS.values():
+            conn.execute(trigger_sql)
+        conn.execute(f"DELETE FROM {COMMIT_EVENT_COUNTS_TABLE}")
+        conn.execute(f"""
+            INSERT INTO {COMMIT_EVENT_COUNTS_TABLE} (commit_hash, event_count)
+            SELECT commit_hash, COUNT(*) FROM semantic_events WHERE commit_hash IS NOT NULL GROUP BY commit_hash
+        """)
+        count = conn.execute(f"SELECT COUNT(*) FROM {COMMIT_EVENT_COUNTS_TABLE}").fetchone()[0]
+        if own_transaction:
+            conn.commit()
+    except Exception:
+        if own_transaction:
+            conn.rollback()
+        raise
+    return count
+
+
+def _migration_010_branch_view_indexes(conn):
+    """Index and per-commit event counts for reachability-based branch views.
+
+    Branch pages walk the keyset index and probe branch_commits by its
+    (branch, commit_hash) primary key; commit-driven plans read
+    (commit_hash, created_at, event_id) in keyset order. count_branch_events
+    sums commit_event_counts over the branch's commits.
+    """
+    _create_index(conn, "idx_semantic_events_commit_created", "semantic_events",
+                  ["commit_hash", "created_at", "event_id"])
+    if "commit_hash" in _table_columns(conn, "semantic_events"):
+        rebuild_commit_event_counts(conn)
+
+
+# (version, description, function) - append new migrations, never reorder
+MIGRATIONS = [
+    (1, "Composite indexes on semantic_events and commits", _migration_001_query_indexes),
+    (2, "Backfill checkpoint table", _migration_002_analysis_progress),
+    (3, "Background analysis job queue", _migration_003_analysis_queue),
+    (4, "Single event schema, remove double-written events", _migration_004_single_event_schema),
+    (5, "Keyset pagination indexes", _migration_005_keyset_indexes),
+    (6, "Full-text index over event details, reasoning and location", _migration_006_event_fts),
+    (7, "Event statistics rollup", _migration_007_event_stats),
+    (8, "Branch reachability index, collapse merged event copies", _migration_008_branch_reachability),
+    (9, "Semantic notes sync state", _migration_009_notes_sync),
+    (10, "Branch view index and per-commit event counts", _migration_010_branch_view_indexes),
+]
+
+
+def get_schema_version(conn):
+    """Return the highest applied migration version (0 for a fresh database)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at INTEGER NOT NULL
+        )
+    """)
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn, migrations=None):
+    """Apply all pending migrations on an open connection.
+
+    Each migration runs in its own transaction together with the row that
+    records it, so an interrupted run resumes at the first unapplied version.
+    Returns the list of versions applied by this call.
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    current = get_schema_version(conn)
+    conn.commit()
+
+    applied = []
+    for version, description, migrate in sorted(migrations, key=lambda m: m[0]):
+        if version <= current:
+            continue
+        try:
+            # Explicit BEGIN so schema changes share the transaction (sqlite3
+            # otherwise autocommits DDL statements); IMMEDIATE serializes
+            # concurrent openers, the loser sees the version already recorded
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM schema_migrations WHERE version = ?", (version,)).fetchone():
+                conn.rollback()
+                continue
+            migrate(conn)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, int(time.time()))
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
+
+
+def run_migrations(db_path):
+    """Open a database file and bring its schema up to date."""
+    with sqlite3.connect(db_path) as conn:
+        return apply_migrations(conn)
+
+
+# --- Legacy migration for the global history database ---
 
 def migrate_database():
     """Add AI analysis fields to the semantic_events table"""
     db_path = "../.svcs/history.db"
-    
+
     if not os.path.exists(db_path):
         print("❌ No database found, skipping migration")
         return
-    
+
     print("🔄 Migrating SVCS database to include AI analysis fields...")
-    
+
     with sqlite3.connect(db_path) as conn:
         cursor = conn.cursor()
-        
+
         # Check if the new columns already exist
         cursor.execute("PRAGMA table_info(semantic_events)")
         columns = [column[1] for column in cursor.fetchall()]
-        
+
         new_columns = ['layer', 'layer_description', 'confidence', 'reasoning', 'impact']
-        
+
         for column in new_columns:
             if column not in columns:
                 print(f"  ➕ Adding column: {column}")
@@ -34,18 +702,29 @@ def migrate_database():
                     cursor.execute(f"ALTER TABLE semantic_events ADD COLUMN {column} TEXT")
             else:
                 print(f"  ✅ Column already exists: {column}")
-        
+
         conn.commit()
-        
+
         # Verify the migration
         cursor.execute("PRAGMA table_info(semantic_events)")
         final_columns = [column[1] for column in cursor.fetchall()]
-        
+
         print("📊 Final database schema:")
         for i, col in enumerate(final_columns, 1):
             print(f"  {i}. {col}")
-        
+
         print("✅ Database migration completed successfully!")
 
 if __name__ == "__main__":
-    migrate_database()
+    if len(sys.argv) > 1:
+        target = sys.argv[1]
+        if not os.path.exists(target):
+            print(f"❌ No database found at {target}")
+            sys.exit(1)
+        applied = run_migrations(target)
+        if applied:
+            print(f"✅ Applied migrations: {', '.join(str(v) for v in applied)}")
+        else:
+            print("✅ Database schema is up to date")
+    else:
+        migrate_database()
@@ -1,12 +1,49 @@
 # SVCS Comprehensive Modular Analyzer
 # Integrates all 5 layers of semantic analysis
 
+import multiprocessing
 import os
-from typing import List, Dict, Any, Optional
-from ..parsers import PythonParser, PHPParser, JavaScriptParser, BaseParser
+import time
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from ..parsers import PythonParser, PHPParser, JavaScriptParser, BaseParser, ParseTimeout
 from ..layers import (StructuralAnalyzer, SyntacticAnalyzer, SemanticAnalyzer, 
                      BehavioralAnalyzer, AIPatternAnalyzer, TrueAIAnalyzer)
 from ..storage import initialize_database, store_commit_events, get_recent_events, get_event_statistics
+from ..git_objects import get_object_reader
+from ..parse_cache import ParseCache, get_parse_cache, get_spill_dir
+from ..file_classifier import FileClassifier
+
+# Analyzable files in one commit from which analysis fans out to a process pool
+PARALLEL_FILE_THRESHOLD = int(os.environ.get("SVCS_PARALLEL_FILES", "200"))
+
+# Worker processes for that pool; 0 means one per CPU. Long-running callers
+# that analyze from threads (queue worker, hook daemon) use 1 unless it is set.
+ANALYSIS_JOBS = int(os.environ.get("SVCS_ANALYSIS_JOBS", "0"))
+
+# Files whose blobs are read per cat-file batch
+PREFETCH_CHUNK_FILES = 128
+
+# Per-file budgets; past either one a file gets structural (layer 1) analysis only. 0 disables.
+MAX_FILE_BYTES = int(os.environ.get("SVCS_MAX_FILE_BYTES", str(1024 * 1024)))
+MAX_FILE_SECONDS = float(os.environ.get("SVCS_MAX_FILE_SECONDS", "10"))
+
+# Per-worker analyzer, set up by _init_file_worker in each pool process
+_worker_analyzer = None
+
+
+def _init_file_worker(spill_dir: Optional[str], settings: Dict[str, Any]):
+    """Build one analyzer (with its own parsers and parse cache) per worker process."""
+    global _worker_analyzer
+    _worker_analyzer = ComprehensiveAnalyzer(parse_cache=ParseCache(spill_dir=spill_dir), jobs=1, **settings)
+
+
+def _analyze_file_task(task: tuple) -> List[Dict[str, Any]]:
+    return _worker_analyzer._analyze_change(*task)
+
+
+class _BudgetExceeded(Exception):
+    """Raised before an analysis layer once a file has used up its time budget."""
+
 
 class ComprehensiveAnalyzer:
     """
@@ -21,7 +58,27 @@ class ComprehensiveAnalyzer:
     5b. True AI - LLM analysis
     """
     
-    def __init__(self):
+    def __init__(self, parse_cache: Optional[ParseCache] = None, jobs: Optional[int] = None,
+                 parallel_threshold: Optional[int] = None, max_file_bytes: Optional[int] = None,
+                 max_file_seconds: Optional[float] = None, classifier: Optional[FileClassifier] = None):
+        # Parser output keyed by blob SHA, shared across commits and analyzers
+        self.parse_cache = parse_cache or get_parse_cache()
+        
+        # Process pool for commits touching many files (jobs=1 keeps analysis in-process)
+        self.jobs = max(1, jobs or ANALYSIS_JOBS or os.cpu_count() or 1)
+        self.parallel_threshold = PARALLEL_FILE_THRESHOLD if parallel_threshold is None else parallel_threshold
+        
+        # Per-file budgets that bound a commit's analysis time
+        self.max_file_bytes = MAX_FILE_BYTES if max_file_bytes is None else max_file_bytes
+        self.max_file_seconds = MAX_FILE_SECONDS if max_file_seconds is None else max_file_seconds
+        
+        # Generated/minified/vendored file detection; None reads .svcs/config.json per commit
+        self.classifier = classifier
+        
+        # Per-file outcomes of analyze_commit, accumulated over this analyzer's lifetime
+        self.stats = {"files_analyzed": 0, "files_degraded": 0, "files_skipped": 0,
+                      "generated_files": 0, "minified_files": 0, "vendored_files": 0}
+        
         # Initialize parsers
         self.parsers = {
             'python': PythonParser(),
@@ -43,14 +100,23 @@ class ComprehensiveAnalyzer:
         ]
     
     def analyze_file_changes(self, filepath: str, before_content: str, 
-                           after_content: str) -> List[Dict[str, Any]]:
+                           after_content: str, before_blob: Optional[str] = None,
+                           after_blob: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Comprehensive analysis of file changes using all 5 layers.
         
+        A file larger than max_file_bytes is not parsed. A file still being
+        analyzed after max_file_seconds stops inside the parser or before the
+        next layer, and layer 5b's LLM requests get only the time left. Either
+        way it keeps only its layer 1 events plus an analysis_degraded event
+        with the reason.
+        
         Args:
             filepath: Path to the file being analyzed
             before_content: Content before changes
             after_content: Content after changes
+            before_blob: Git blob SHA of before_content, enables the parse cache
+            after_blob: Git blob SHA of after_content, enables the parse cache
             
         Returns:
             List of semantic events from all layers
@@ -66,30 +132,55 @@ class ComprehensiveAnalyzer:
         if not parser:
             return all_events
         
-        # Parse both versions
-        nodes_before, deps_before = parser.parse_code(before_content)
-        nodes_after, deps_after = parser.parse_code(after_content)
+        # Oversized files (generated bundles, huge templates) are not parsed at all
+        size = max(len(before_content), len(after_content))
+        if self.max_file_bytes and size * 4 > self.max_file_bytes:
+            # UTF-8 takes one to four bytes per character
+            size = max(len(before_content.encode("utf-8", "replace")), len(after_content.encode("utf-8", "replace")))
+        if self.max_file_bytes and size > self.max_file_bytes:
+            return self._structural_only(filepath, before_content, after_content,
+                                         f"{size} bytes exceeds the {self.max_file_bytes} byte budget")
+        deadline = time.monotonic() + self.max_file_seconds if self.max_file_seconds else None
+        
+        # Parse both versions, reusing earlier parses of the same blobs; the
+        # parser checks the deadline as it goes
+        parser.deadline = deadline
+        try:
+            (nodes_before, deps_before), (nodes_after, deps_after) = self._parse_versions(
+                parser, before_content, after_content, before_blob, after_blob
+            )
+            parser.check_deadline()
+        except ParseTimeout:
+            return self._structural_only(filepath, before_content, after_content,
+                                         f"parsing ran past the {self.max_file_seconds:g}s time budget")
+        finally:
+            parser.deadline = None
         
-        # Run all layers of analysis
+        # Run all layers of analysis, checking the budget before each one after layer 1
+        structural = []
         try:
             # Layer 1: Structural Analysis
-            events = self.layer1.analyze(
+            structural = self.layer1.analyze(
                 filepath, before_content, after_content, 
                 nodes_before, nodes_after, deps_before, deps_after
             )
-            all_events.extend(events)
+            all_events.extend(structural)
+            self._check_budget(deadline, "layer 1")
             
             # Layer 2: Syntactic Analysis
             events = self.layer2.analyze(filepath, nodes_before, nodes_after)
             all_events.extend(events)
+            self._check_budget(deadline, "layer 2")
             
             # Layer 3: Semantic Analysis
             events = self.layer3.analyze(filepath, nodes_before, nodes_after)
             all_events.extend(events)
+            self._check_budget(deadline, "layer 3")
             
             # Layer 4: Behavioral Analysis
             events = self.layer4.analyze(filepath, nodes_before, nodes_after)
             all_events.extend(events)
+            self._check_budget(deadline, "layer 4")
             
             # Layer 5a: AI Pattern Analysis
             events = self.layer5a.analyze(
@@ -97,66 +188,162 @@ class ComprehensiveAnalyzer:
                 nodes_before, nodes_after
             )
             all_events.extend(events)
+            self._check_budget(deadline, "layer 5a")
             
-            # Layer 5b: True AI Analysis
+            # Layer 5b: True AI Analysis, its requests limited to the time left
             events = self.layer5b.analyze(
                 filepath, before_content, after_content,
-                nodes_before, nodes_after
+                nodes_before, nodes_after,
+                timeout=deadline - time.monotonic() if deadline is not None else None
             )
             all_events.extend(events)
+            self._check_budget(deadline, "layer 5b")
             
+        except _BudgetExceeded as e:
+            return structural + [self._degraded_event(filepath, str(e))]
         except Exception as e:
             print(f"Warning: Analysis layer failed for {filepath}: {e}")
         
         return all_events
     
-    def analyze_commit(self, commit_hash: str, repo_path: str = ".") -> List[Dict[str, Any]]:
+    def _check_budget(self, deadline: Optional[float], step: str):
+        if deadline is not None and time.monotonic() > deadline:
+            raise _BudgetExceeded(f"{step} ran past the {self.max_file_seconds:g}s time budget")
+    
+    def _structural_only(self, filepath: str, before_content: str, after_content: str,
+                         reason: str) -> List[Dict[str, Any]]:
+        """Layer 1 events of an unparsed file plus the analysis_degraded marker."""
+        structural = self.layer1.analyze(filepath, before_content, after_content, {}, {}, set(), set())
+        return structural + [self._degraded_event(filepath, reason)]
+    
+    def _degraded_event(self, filepath: str, reason: str) -> Dict[str, Any]:
+        return {
+            "event_type": "analysis_degraded",
+            "node_id": f"file:{filepath}",
+            "location": filepath,
+            "details": f"Structural analysis only: {reason}",
+            "layer": "1",
+            "layer_description": self.layer1.layer_description
+        }
+    
+    def analyze_commit(self, commit_hash: str, repo_path: str = ".",
+                       raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Analyze a complete commit using all layers.
         
+        Blobs are prefetched in cat-file batches. Once the commit touches
+        parallel_threshold analyzable files, files are analyzed in a pool of
+        `jobs` worker processes; events come back in the same file order
+        either way.
+        
+        Generated, minified and vendored files are skipped or analyzed
+        structurally only, as the file classifier decides; the outcome of
+        every file is counted in self.stats.
+        
         Args:
             commit_hash: Git commit hash to analyze
             repo_path: Path to the repository
+            raise_errors: Raise when the commit's changes cannot be listed
+                instead of returning no events
             
         Returns:
             List of all semantic events detected
         """
         import subprocess
-        import os
         
         all_events = []
+        reader = get_object_reader(repo_path)
+        if self.parse_cache.spill_dir is None:
+            self.parse_cache.set_spill_dir(get_spill_dir(repo_path))
         
         try:
-            # Get changed files in the commit
-            # Use --root flag to handle initial commits properly
-            result = subprocess.run(
-                ['git', 'diff-tree', '--no-commit-id', '--name-only', '-r', '--root', commit_hash],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            changed_files = [f.strip() for f in result.stdout.split('\n') if f.strip()]
-            
-            for file_path in changed_files:
-                if self._should_analyze_file(file_path):
-                    try:
-                        before_content, after_content = self._get_file_contents_for_commit(
-                            file_path, commit_hash, repo_path
-                        )
-                        
-                        events = self.analyze_file_changes(file_path, before_content, after_content)
-                        all_events.extend(events)
-                        
-                    except Exception as e:
-                        print(f"Warning: Failed to analyze {file_path}: {e}")
-        
+            # Changed files with their blob IDs; --root handles initial commits
+            changes = reader.changed_files(commit_hash)
         except subprocess.CalledProcessError as e:
+            if raise_errors:
+                raise
             print(f"Error getting commit files: {e}")
+            return all_events
+        
+        # Skip files no parser handles before reading any blobs
+        changes = [change for change in changes
+                   if self._should_analyze_file(change.path) and self._get_parser_for_file(change.path)]
+        
+        # Path globs and .gitattributes can rule files out before their blobs are read
+        classifier = self.classifier or FileClassifier.from_repo(repo_path)
+        classes = classifier.classify_paths([change.path for change in changes], reader, commit_hash)
+        for file_class in classes.values():
+            self._count_class(classifier, file_class)
+        changes = [change for change in changes
+                   if change.path not in classes or classifier.action(classes[change.path]) != "skip"]
+        tasks = self._classify_tasks(classifier, classes, self._prefetch_changes(reader, changes))
+        
+        if self.jobs > 1 and len(changes) >= max(self.parallel_threshold, 2):
+            workers = min(self.jobs, len(changes))
+            chunksize = max(1, len(changes) // (workers * 8))
+            settings = {"max_file_bytes": self.max_file_bytes, "max_file_seconds": self.max_file_seconds}
+            # Spawned, not forked: callers may hold threads, SQLite connections and cat-file pipes
+            with multiprocessing.get_context("spawn").Pool(
+                    workers, initializer=_init_file_worker,
+                    initargs=(self.parse_cache.spill_dir, settings)) as pool:
+                for events in pool.imap(_analyze_file_task, tasks, chunksize=chunksize):
+                    self._count_outcome(events)
+                    all_events.extend(events)
+        else:
+            for task in tasks:
+                events = self._analyze_change(*task)
+                self._count_outcome(events)
+                all_events.extend(events)
         
         return all_events
     
+    def _classify_tasks(self, classifier: FileClassifier, classes: Dict[str, Any],
+                        tasks: Iterator[Tuple]) -> Iterator[Tuple]:
+        """Add the structural-only reason (or None) to each task, dropping files to skip."""
+        for path, before_content, after_content, old_blob, new_blob in tasks:
+            file_class = classes.get(path)
+            if file_class is None:
+                file_class = classifier.classify_content(path, after_content or before_content)
+                if file_class is not None:
+                    self._count_class(classifier, file_class)
+            action = classifier.action(file_class) if file_class else "analyze"
+            if action == "skip":
+                continue
+            reason = f"{file_class.category} file, {file_class.reason}" if action == "structural" else None
+            yield path, before_content, after_content, old_blob, new_blob, reason
+    
+    def _count_class(self, classifier: FileClassifier, file_class):
+        self.stats[f"{file_class.category}_files"] = self.stats.get(f"{file_class.category}_files", 0) + 1
+        if classifier.action(file_class) == "skip":
+            self.stats["files_skipped"] += 1
+    
+    def _count_outcome(self, events: List[Dict[str, Any]]):
+        if any(event.get("event_type") == "analysis_degraded" for event in events):
+            self.stats["files_degraded"] += 1
+        else:
+            self.stats["files_analyzed"] += 1
+    
+    def _prefetch_changes(self, reader, changes) -> Iterator[Tuple]:
+        """Yield (path, before, after, old_blob, new_blob), reading blobs a batch of files at a time."""
+        for start in range(0, len(changes), PREFETCH_CHUNK_FILES):
+            chunk = changes[start:start + PREFETCH_CHUNK_FILES]
+            texts = reader.read_texts(blob for change in chunk for blob in (change.old_blob, change.new_blob))
+            for change in chunk:
+                yield (change.path, texts.get(change.old_blob, ""), texts.get(change.new_blob, ""),
+                       change.old_blob, change.new_blob)
+    
+    def _analyze_change(self, path: str, before_content: str, after_content: str,
+                        old_blob: Optional[str], new_blob: Optional[str],
+                        structural_reason: Optional[str] = None) -> List[Dict[str, Any]]:
+        try:
+            if structural_reason is not None:
+                return self._structural_only(path, before_content, after_content, structural_reason)
+            return self.analyze_file_changes(path, before_content, after_content,
+                                             before_blob=old_blob, after_blob=new_blob)
+        except Exception as e:
+            print(f"Warning: Failed to analyze {path}: {e}")
+            return []
+    
     def get_layer_summary(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Get a summary of events by layer."""
         summary = {
@@ -174,6 +361,26 @@ class ComprehensiveAnalyzer:
         
         return summary
     
+    def _parse_versions(self, parser: BaseParser, before_content: str, after_content: str,
+                        before_blob: Optional[str], after_blob: Optional[str]) -> tuple:
+        """Parse both sides of a file change.
+        
+        A committed after blob is parsed in full and cached, since it is the
+        before blob of the next commit that touches the file; the before side
+        is then usually a cache hit, which costs less than a scoped parse of
+        both sides. Parsers with scoped parsing deep-parse only the nodes the
+        diff touches when the after side has no blob to cache (working-tree
+        content) and the before side is not cached. That partial output
+        depends on the other side, so it is never cached.
+        """
+        if parser.scoped_parsing and not after_blob:
+            before = self.parse_cache.lookup(parser, before_blob)
+            if before is None:
+                return parser.parse_changes(before_content, after_content)
+            return before, parser.parse_code(after_content)
+        return (self.parse_cache.get_or_parse(parser, before_blob, before_content),
+                self.parse_cache.get_or_parse(parser, after_blob, after_content))
+    
     def _get_parser_for_file(self, filepath: str) -> Optional[BaseParser]:
         """Get the appropriate parser for a file."""
         if filepath.endswith(('.py', '.pyw', '.pyi')):
@@ -211,48 +418,10 @@ class ComprehensiveAnalyzer:
     def _get_file_contents_for_commit(self, file_path: str, commit_hash: str, 
                                     repo_path: str) -> tuple:
         """Get before and after contents of a file for a commit."""
-        import subprocess
-        
-        # Get the parent commit
-        try:
-            result = subprocess.run(
-                ['git', 'rev-parse', f'{commit_hash}^'],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            parent_hash = result.stdout.strip()
-        except subprocess.CalledProcessError:
-            parent_hash = None
-        
-        # Get before content (from parent commit)
-        before_content = ""
-        if parent_hash:
-            try:
-                result = subprocess.run(
-                    ['git', 'show', f'{parent_hash}:{file_path}'],
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    before_content = result.stdout
-            except subprocess.CalledProcessError:
-                pass
-        
-        # Get after content (from current commit)
-        after_content = ""
-        try:
-            result = subprocess.run(
-                ['git', 'show', f'{commit_hash}:{file_path}'],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            after_content = result.stdout
-        except subprocess.CalledProcessError:
-            pass
-        
-        return before_content, after_content
+        reader = get_object_reader(repo_path)
+        for change in reader.changed_files(commit_hash):
+            if change.path == file_path:
+                return reader.read_text(change.old_blob), reader.read_text(change.new_blob)
+        # Unchanged in this commit: both sides are the committed version
+        content = reader.read_text(f"{commit_hash}:{file_path}")
+        return content, content
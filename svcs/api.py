@@ -11,31 +11,87 @@ import subprocess
 from pathlib import Path
 from datetime import datetime, timedelta
 
+try:
+    from svcs_repo_connections import get_connection
+    from svcs_repo_reachability import revision_condition, revision_exists
+    from svcs_repo_search import (PATTERN_TERMS, _like_pattern, decode_cursor, encode_cursor,
+                                  has_event_fts, text_search_sql)
+    from svcs_repo_stats import get_event_stats
+except ImportError:
+    # Development mode fallback
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from svcs_repo_connections import get_connection
+    from svcs_repo_reachability import revision_condition, revision_exists
+    from svcs_repo_search import (PATTERN_TERMS, _like_pattern, decode_cursor, encode_cursor,
+                                  has_event_fts, text_search_sql)
+    from svcs_repo_stats import get_event_stats
+
 # --- Configuration ---
 SVCS_DIR = ".svcs"
 # Use the new repository-local database path
 DB_PATH = os.path.join(SVCS_DIR, "semantic.db")
 
 def _get_db_connection():
-    """Establishes a connection to the SQLite database."""
+    """Returns this thread's pooled connection to the SQLite database.
+
+    Rows are sqlite3.Row until conn.close() returns the connection to the pool.
+    """
     db_path = os.path.join(SVCS_DIR, "semantic.db")
     
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"SVCS database not found at '{db_path}'. Run 'svcs init' to initialize the repository.")
     
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     conn.row_factory = sqlite3.Row
     return conn
 
 def _execute_query(query, params=()):
     """A helper function to execute a query and return results."""
     conn = _get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    results = cursor.fetchall()
-    conn.close()
+    try:
+        results = conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in results]
+
+def _get_event_stats(**kwargs):
+    """Event statistics from the event_stats rollup (see svcs_repo_stats.get_event_stats)."""
+    conn = _get_db_connection()
+    try:
+        return get_event_stats(conn, **kwargs)
+    finally:
+        conn.close()
+
+def _execute_branch_query(query, branch, conditions=(), params=(), suffix="", suffix_params=()):
+    """Run `query` with its WHERE conditions, narrowed to the events on a git branch.
+
+    The branch (or any git revision) is resolved to its reachable commits in
+    SQL, see svcs_repo_reachability.revision_condition.
+    """
+    conn = _get_db_connection()
+    try:
+        conditions, params = list(conditions), list(params)
+        if branch:
+            condition, branch_params = revision_condition(conn, str(Path(SVCS_DIR).resolve().parent),
+                                                          branch, alias="e")
+            conditions.insert(0, condition)
+            params[:0] = branch_params
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        results = conn.execute(query + suffix, params + list(suffix_params)).fetchall()
+    finally:
+        conn.close()
     return [dict(row) for row in results]
 
+def resolves_revision(revision):
+    """Whether git can resolve the branch (or other revision) the branch filters take."""
+    return revision_exists(str(Path(SVCS_DIR).resolve().parent), revision)
+
+def get_branch_event_counts(branches):
+    """Number of semantic events on each branch, counted in SQL without loading events."""
+    return {branch: _execute_branch_query("SELECT COUNT(*) AS count FROM semantic_events e", branch)[0]["count"]
+            for branch in branches}
+
 def get_valid_commit_hashes():
     """Returns a set of all commit hashes currently in the Git history."""
     try:
@@ -47,10 +103,48 @@ def get_valid_commit_hashes():
 
 # --- Core API Functions ---
 
-def get_full_log():
+def _text_search(terms, columns):
+    """
+    SQL fragments matching events whose columns contain any of the terms.
+    
+    Uses the FTS5 index of .svcs/semantic.db (bm25 rank in "rank") and falls
+    back to LIKE when this SQLite build or database has no full-text index.
+    """
+    conn = _get_db_connection()
+    try:
+        use_fts = has_event_fts(conn)
+    finally:
+        conn.close()
+    return text_search_sql(terms, columns, alias="e", use_fts=use_fts)
+
+def _keyset_condition(cursor, descending=True):
+    """WHERE condition and parameters continuing after a (c.timestamp, e.event_id) cursor."""
+    timestamp, event_id = decode_cursor(cursor)
+    op = '<' if descending else '>'
+    # The separate bound on c.timestamp lets SQLite range-scan idx_commits_timestamp
+    return (f"c.timestamp {op}= ? AND (c.timestamp {op} ? OR e.event_id {op} ?)",
+            [timestamp, timestamp, event_id])
+
+def get_next_cursor(events, limit):
+    """
+    Cursor for the page after `events`, or None when it was the last page.
+    
+    Pass it as `cursor=` to get_full_log or search_events_advanced (timestamp
+    order) to continue where the previous page ended.
+    """
+    if not limit or not events or len(events) < limit:
+        return None
+    last = events[-1]
+    return encode_cursor(last['timestamp'], last['event_id'])
+
+def get_full_log(limit=None, cursor=None, branch=None):
     """
     Fetches the entire log of all semantic events, including commit metadata.
     Use this for broad questions about the project history as a whole.
+    
+    With a limit, returns one page, newest first; pass get_next_cursor(page, limit)
+    as the cursor to fetch the next one. With a branch (or other git revision),
+    only the events of commits it reaches are returned.
     """
     query = """
         SELECT
@@ -59,9 +153,17 @@ def get_full_log():
             c.author, c.branch, c.timestamp
         FROM semantic_events e
         JOIN commits c ON e.commit_hash = c.commit_hash
-        ORDER BY c.timestamp DESC
     """
-    return _execute_query(query)
+    conditions, params = [], []
+    if cursor:
+        condition, params = _keyset_condition(cursor)
+        conditions.append(condition)
+    suffix = " ORDER BY c.timestamp DESC, e.event_id DESC"
+    suffix_params = []
+    if limit:
+        suffix += " LIMIT ?"
+        suffix_params.append(limit)
+    return _execute_branch_query(query, branch, conditions, params, suffix, suffix_params)
 
 def search_events(author=None, event_type=None, node_id=None, location=None):
     """Generic search for events, now including commit metadata. Primarily for the CLI."""
@@ -77,7 +179,6 @@ def search_events(author=None, event_type=None, node_id=None, location=None):
             c.author, c.branch, c.timestamp
         FROM semantic_events e
         JOIN commits c ON e.commit_hash = c.commit_hash
-        WHERE
     """
     
     if author:
@@ -90,10 +191,14 @@ def search_events(author=None, event_type=None, node_id=None, location=None):
         query_parts.append("e.node_id = ?")
         params.append(node_id)
     if location:
-        query_parts.append("e.location LIKE ?")
-        params.append(f"%{location}%")
-    
-    final_query = base_query + " AND ".join(query_parts) + " ORDER BY c.timestamp DESC"
+        # Plain LIKE: the FTS5 index only matches whole-word prefixes
+        query_parts.append("e.location LIKE ? ESCAPE '\\'")
+        params.append(_like_pattern(location))
+    
+    final_query = base_query
+    if query_parts:
+        final_query += " WHERE " + " AND ".join(query_parts)
+    final_query += " ORDER BY c.timestamp DESC"
     return _execute_query(final_query, params)
 
 def get_node_evolution(node_id: str):
@@ -118,17 +223,19 @@ def find_dependency_changes(dependency_name: str):
     Locates events related to dependency changes for a specific library or module.
     Useful for tracking when external dependencies were added, updated, or removed.
     """
-    query = """
+    match = _text_search([dependency_name], ("details", "reasoning"))
+    query = f"""
         SELECT
             e.event_id, e.commit_hash, e.event_type, e.node_id, e.location, e.details,
             e.layer, e.layer_description, e.confidence, e.reasoning, e.impact,
             c.author, c.branch, c.timestamp
         FROM semantic_events e
         JOIN commits c ON e.commit_hash = c.commit_hash
-        WHERE e.details LIKE ? OR e.reasoning LIKE ?
+        {match["join"]}
+        {"WHERE " + match["where"] if match["where"] else ""}
         ORDER BY c.timestamp DESC
     """
-    return _execute_query(query, (f"%{dependency_name}%", f"%{dependency_name}%"))
+    return _execute_query(query, match["join_params"] + match["where_params"])
 
 def get_commit_details(commit_hash: str):
     """
@@ -194,7 +301,8 @@ def search_events_advanced(
     min_confidence=None,
     limit=20,
     order_by="timestamp",
-    order_desc=True
+    order_desc=True,
+    cursor=None
 ):
     """
     Advanced search with comprehensive filtering options.
@@ -209,6 +317,7 @@ def search_events_advanced(
         limit: Maximum number of results
         order_by: Field to order by
         order_desc: Whether to order in descending order
+        cursor: Continue after a previous page (see get_next_cursor); timestamp order only
     
     Returns:
         List of matching semantic events
@@ -241,8 +350,8 @@ def search_events_advanced(
         params.append(f"%{author}%")
     
     if location_pattern:
-        conditions.append("e.location LIKE ?")
-        params.append(f"%{location_pattern}%")
+        conditions.append("e.location LIKE ? ESCAPE '\\'")
+        params.append(_like_pattern(location_pattern))
     
     if since_date:
         parsed_date = _parse_relative_date(since_date)
@@ -254,14 +363,21 @@ def search_events_advanced(
         conditions.append("e.confidence >= ?")
         params.append(min_confidence)
     
+    if cursor:
+        if order_by != "timestamp":
+            raise ValueError("Cursors require order_by='timestamp'")
+        condition, cursor_params = _keyset_condition(cursor, order_desc)
+        conditions.append(condition)
+        params.extend(cursor_params)
+    
     # Add WHERE clause if there are conditions
     if conditions:
         base_query += " WHERE " + " AND ".join(conditions)
     
-    # Add ORDER BY
+    # Add ORDER BY; event_id breaks ties so pages are stable
     order_direction = "DESC" if order_desc else "ASC"
     if order_by == "timestamp":
-        base_query += f" ORDER BY c.timestamp {order_direction}"
+        base_query += f" ORDER BY c.timestamp {order_direction}, e.event_id {order_direction}"
     else:
         base_query += f" ORDER BY e.{order_by} {order_direction}, c.timestamp {order_direction}"
     
@@ -308,39 +424,24 @@ def get_project_statistics():
         List of statistics about semantic events
     """
     
-    queries = {
-        "total_events": "SELECT COUNT(*) as count FROM semantic_events",
-        "events_by_type": """
-            SELECT event_type, COUNT(*) as count 
-            FROM semantic_events 
-            GROUP BY event_type 
-            ORDER BY count DESC
-        """,
-        "events_by_layer": """
-            SELECT layer, COUNT(*) as count 
-            FROM semantic_events 
-            GROUP BY layer 
-            ORDER BY count DESC
-        """,
-        "events_by_author": """
-            SELECT c.author, COUNT(*) as count 
-            FROM semantic_events e
-            JOIN commits c ON e.commit_hash = c.commit_hash
-            GROUP BY c.author 
-            ORDER BY count DESC
-        """,
-        "avg_confidence": "SELECT AVG(confidence) as avg_confidence FROM semantic_events"
-    }
-    
-    results = []
-    for stat_name, query in queries.items():
-        try:
-            result = _execute_query(query)
-            results.append({"statistic": stat_name, "data": result})
-        except Exception as e:
-            results.append({"statistic": stat_name, "error": str(e)})
-    
-    return results
+    try:
+        stats = _get_event_stats(groupings=["event_types", "layers", "authors"])
+    except Exception as e:
+        return [{"statistic": name, "error": str(e)} for name in
+                ("total_events", "events_by_type", "events_by_layer", "events_by_author", "avg_confidence")]
+    
+    return [
+        {"statistic": "total_events", "data": [{"count": stats["total_events"]}]},
+        {"statistic": "events_by_type",
+         "data": [{"event_type": value, "count": count} for value, count in stats["event_types"].items()]},
+        {"statistic": "events_by_layer",
+         "data": [{"layer": value, "count": count} for value, count in stats["layers"].items()]},
+        {"statistic": "events_by_author",
+         "data": [{"author": value, "count": count} for value, count in stats["authors"].items()
+                  if value is not None]},
+        {"statistic": "avg_confidence",
+         "data": [{"avg_confidence": stats["avg_confidence"] if stats["total_events"] else None}]},
+    ]
 
 def search_semantic_patterns(
     pattern_type,
@@ -361,31 +462,12 @@ def search_semantic_patterns(
         List of matching semantic patterns
     """
     
-    # Map pattern types to search terms
-    pattern_mappings = {
-        "performance": ["performance", "optimization", "speed", "efficiency"],
-        "architecture": ["architecture", "design", "pattern", "structure"],
-        "error_handling": ["error", "exception", "handling", "try", "catch"],
-        "refactoring": ["refactor", "cleanup", "reorganize", "restructure"],
-        "security": ["security", "authentication", "authorization", "validation"],
-        "testing": ["test", "testing", "unit", "integration", "mock"],
-        "documentation": ["documentation", "comment", "docstring", "readme"]
-    }
-    
-    search_terms = pattern_mappings.get(pattern_type, [pattern_type])
-    
-    # Build query to search in details and reasoning
-    conditions = []
-    params = []
-    
-    # Search for pattern in details or reasoning
-    pattern_conditions = []
-    for term in search_terms:
-        pattern_conditions.append("(e.details LIKE ? OR e.reasoning LIKE ?)")
-        params.extend([f"%{term}%", f"%{term}%"])
+    search_terms = PATTERN_TERMS.get(pattern_type, [pattern_type])
     
-    if pattern_conditions:
-        conditions.append("(" + " OR ".join(pattern_conditions) + ")")
+    # Search for pattern in details or reasoning (FTS5 index when available)
+    match = _text_search(search_terms, ("details", "reasoning"))
+    conditions = [match["where"]] if match["where"] else []
+    params = list(match["where_params"])
     
     # Add confidence filter
     if min_confidence is not None:
@@ -406,18 +488,22 @@ def search_semantic_patterns(
             c.author, c.branch, c.timestamp
         FROM semantic_events e
         JOIN commits c ON e.commit_hash = c.commit_hash
-    """
+    """ + match["join"]
     
     if conditions:
         query += " WHERE " + " AND ".join(conditions)
     
-    query += " ORDER BY e.confidence DESC, c.timestamp DESC"
+    # Best bm25 match first; without the index, most confident first
+    if match["rank"]:
+        query += f" ORDER BY {match['rank']}, e.confidence DESC, c.timestamp DESC"
+    else:
+        query += " ORDER BY e.confidence DESC, c.timestamp DESC"
     
     if limit:
         query += " LIMIT ?"
         params.append(limit)
     
-    return _execute_query(query, params)
+    return _execute_query(query, match["join_params"] + params)
 
 def get_filtered_evolution(
     node_id,
@@ -686,44 +772,25 @@ def generate_analytics(
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        # Get events in date range
-        events = search_events_advanced(
-            since_date=start_date.strftime("%Y-%m-%d"),
-            limit=1000
-        )
-        
-        # Calculate analytics
-        total_events = len(events)
-        
-        # Group by event type
-        event_types = {}
-        for event in events:
-            event_type = event.get('event_type', 'unknown')
-            event_types[event_type] = event_types.get(event_type, 0) + 1
-        
-        # Group by author
-        authors = {}
-        for event in events:
-            author = event.get('author', 'unknown')
-            authors[author] = authors.get(author, 0) + 1
-        
-        # Group by layer
-        layers = {}
-        for event in events:
-            layer = event.get('layer', 'unknown')
-            layers[layer] = layers.get(layer, 0) + 1
+        # Totals for the date range from the event_stats rollup
+        stats = _get_event_stats(since=start_date.strftime("%Y-%m-%d"),
+                                 groupings=["event_types", "authors", "layers"])
+        event_types = stats["event_types"]
+        authors = {author: count for author, count in stats["authors"].items() if author is not None}
         
         analytics = {
-            "total_events": total_events,
+            "total_events": stats["total_events"],
             "date_range": {
                 "start": start_date.strftime("%Y-%m-%d"),
                 "end": end_date.strftime("%Y-%m-%d"),
                 "days": days
             },
             "event_types": event_types,
+            "top_event_type": next(iter(event_types), None),
             "authors": authors,
-            "layers": layers,
-            "avg_confidence": sum(event.get('confidence', 0) for event in events) / max(total_events, 1)
+            "author_count": len(authors),
+            "layers": stats["layers"],
+            "avg_confidence": stats["avg_confidence"]
         }
         
         # Save to file if requested
@@ -823,11 +890,9 @@ def get_branch_events(branch: str, limit: int = 100):
             datetime(c.timestamp, 'unixepoch') as readable_date
         FROM semantic_events e
         JOIN commits c ON e.commit_hash = c.commit_hash
-        WHERE c.branch = ?
-        ORDER BY c.timestamp DESC
-        LIMIT ?
     """
-    return _execute_query(query, (branch, limit))
+    return _execute_branch_query(query, branch, suffix=" ORDER BY c.timestamp DESC LIMIT ?",
+                                 suffix_params=[limit])
 
 def get_repository_status():
     """
@@ -886,6 +951,8 @@ __all__ = [
     '_execute_query',
     'get_valid_commit_hashes',
     'get_full_log',
+    'get_branch_event_counts',
+    'get_next_cursor',
     'search_events',
     'get_node_evolution',
     'find_dependency_changes',
@@ -159,31 +159,39 @@ def setup_centralized_git_hooks(repo_path: Path):
             # Use the proper modular CLI script
             svcs_cmd = f"{sys.executable} {cli_script}"
         
+        # Thin hook client: hands the hook to the resident daemon when it runs,
+        # otherwise processes it in-process like `svcs process-hook`
+        daemon_script = current_dir.parent / 'svcs_repo_daemon.py'
+        if daemon_script.exists():
+            hook_cmd = f"{sys.executable} {daemon_script} hook"
+        else:
+            hook_cmd = f"{svcs_cmd} process-hook"
+        
         # Enhanced hook templates with semantic note synchronization
         hooks_config = {
             'post-commit': f"""#!/bin/bash
 # SVCS Post-Commit Hook - Trigger semantic analysis
 echo "🔍 SVCS: Analyzing commit for semantic events..."
 if [ -d ".svcs" ]; then
-    {svcs_cmd} process-hook post-commit "$@" || echo "⚠️  SVCS: Post-commit analysis failed"
+    {hook_cmd} post-commit "$@" || echo "⚠️  SVCS: Post-commit analysis failed"
 fi
 """,
             'post-merge': f"""#!/bin/bash
 # SVCS Post-Merge Hook - Sync semantic notes and analyze merge
 if [ -d ".svcs" ]; then
-    {svcs_cmd} process-hook post-merge "$@" || echo "⚠️  SVCS: Post-merge processing failed"
+    {hook_cmd} post-merge "$@" || echo "⚠️  SVCS: Post-merge processing failed"
 fi
 """,
             'post-checkout': f"""#!/bin/bash
 # SVCS Post-Checkout Hook - Fetch semantic notes after clone/checkout
 if [ -d ".svcs" ]; then
-    {svcs_cmd} process-hook post-checkout "$@" || echo "⚠️  SVCS: Post-checkout processing failed"
+    {hook_cmd} post-checkout "$@" || echo "⚠️  SVCS: Post-checkout processing failed"
 fi
 """,
             'post-receive': f"""#!/bin/bash
 # SVCS Post-Receive Hook - For bare repositories
 if [ -d ".svcs" ]; then
-    {svcs_cmd} process-hook post-receive "$@" || echo "⚠️ SVCS: Post-receive processing failed"
+    {hook_cmd} post-receive "$@" || echo "⚠️ SVCS: Post-receive processing failed"
 fi
 """,
             'update': f"""#!/bin/bash
@@ -191,7 +199,7 @@ fi
 if [ -d ".svcs" ]; then
     # Only process if this is a notes update, not a branch update
     if [[ "$1" == refs/notes/* ]]; then
-        {svcs_cmd} process-hook update "$1" "$2" "$3" || echo "⚠️ SVCS: Update processing failed"
+        {hook_cmd} update "$1" "$2" "$3" || echo "⚠️ SVCS: Update processing failed"
     fi
 fi
 """
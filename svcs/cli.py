@@ -8,6 +8,9 @@ Complete command set:
   svcs init-project - Interactive tour to setup a new SVCS project
   svcs status       - Show SVCS status  
   svcs events       - List recent semantic events
+  svcs analyze      - Backfill analysis of existing history
+  svcs worker       - Background analysis worker
+  svcs queue        - Analysis queue status and retries
   svcs search       - Advanced semantic search
   svcs evolution    - Track function/class evolution
   svcs analytics    - Generate analytics reports
@@ -21,6 +24,7 @@ Complete command set:
   svcs compare      - Compare branches
   svcs cleanup      - Repository maintenance
   svcs mcp          - MCP server management
+  svcs daemon       - Resident hook daemon management
 """
 
 import sys
@@ -89,6 +93,7 @@ Complete command set:
   svcs init-project [name] [--path .] [--non-interactive] # Interactive tour / setup for new project
   svcs status                         # Show repository status
   svcs events                         # List recent semantic events
+  svcs analyze --all                  # Backfill analysis of existing history
   svcs search "query"                 # Advanced semantic search
   svcs evolution "func:name"          # Track function evolution
   svcs analytics                      # Generate analytics reports  
@@ -100,9 +105,12 @@ Complete command set:
   svcs discuss --query "summary"      # Start with initial query
   svcs query "natural language"       # One-shot natural language queries
   svcs notes sync                     # Git notes team collaboration
+  svcs notes hydrate                  # Import all shared semantic notes
+  svcs notes convert                  # Rewrite notes in SVCS_NOTES_FORMAT
   svcs compare main feature           # Compare branches
   svcs cleanup                        # Repository maintenance
   svcs mcp start                     # Start MCP server
+  svcs daemon start                  # Keep analyzers warm for git hooks
 
 Examples:
   svcs init                           # Initialize current repository
@@ -166,6 +174,43 @@ Date Formats (--since):
                               help='Filter by event type')
     events_parser.set_defaults(func=cmd_events)
     
+    # Analyze command (history backfill)
+    analyze_parser = subparsers.add_parser('analyze', help='Backfill semantic analysis of existing history')
+    analyze_target = analyze_parser.add_mutually_exclusive_group(required=True)
+    analyze_target.add_argument('--range', type=str,
+                               help='Git revision range to analyze (e.g., "main~500..main")')
+    analyze_target.add_argument('--all', action='store_true',
+                               help='Analyze every commit reachable from any ref')
+    analyze_parser.add_argument('--jobs', '-j', type=int,
+                               help='Worker processes (default: CPU count)')
+    analyze_parser.add_argument('--batch-size', type=int, default=50,
+                               help='Commits written per database transaction')
+    analyze_parser.add_argument('--notes', action='store_true',
+                               help='Also publish the results as semantic git notes (one fast-import pass per batch)')
+    analyze_parser.set_defaults(func=cmd_analyze)
+    
+    # Worker command (drains the post-commit analysis queue)
+    worker_parser = subparsers.add_parser('worker', help='Run the background analysis worker')
+    worker_parser.add_argument('--concurrency', '-c', type=int, default=1,
+                              help='Commits analyzed in parallel (default: 1)')
+    worker_parser.add_argument('--drain', action='store_true',
+                              help='Exit once the queue is empty instead of waiting for new commits')
+    worker_parser.add_argument('--poll-interval', type=float, default=2.0,
+                              help='Seconds between queue checks when idle')
+    worker_parser.set_defaults(func=cmd_worker)
+    
+    # Queue command
+    queue_parser = subparsers.add_parser('queue', help='Inspect the background analysis queue')
+    queue_subparsers = queue_parser.add_subparsers(dest='queue_command', required=True)
+    queue_status_parser = queue_subparsers.add_parser('status', help='Show queued, running and failed jobs')
+    queue_status_parser.add_argument('--status', choices=['pending', 'running', 'done', 'failed'],
+                                    help='Only list jobs with this status')
+    queue_status_parser.add_argument('--limit', '-l', type=int, default=10,
+                                    help='Number of jobs to list')
+    queue_retry_parser = queue_subparsers.add_parser('retry', help='Requeue failed jobs')
+    queue_retry_parser.add_argument('commit', nargs='?', help='Commit hash or prefix (default: all failed jobs)')
+    queue_parser.set_defaults(func=cmd_queue)
+    
     # Search command
     search_parser = subparsers.add_parser('search', help='Advanced semantic search')
     search_parser.add_argument('--pattern-type', type=str,
@@ -182,6 +227,8 @@ Date Formats (--since):
                               help='Filter by file/location pattern')
     search_parser.add_argument('--limit', '-l', type=int, default=20,
                               help='Maximum number of results')
+    search_parser.add_argument('--cursor', type=str,
+                              help='Continue after a previous page (cursor printed at its end)')
     search_parser.set_defaults(func=cmd_search)
     
     # Evolution command
@@ -260,7 +307,7 @@ Date Formats (--since):
     
     # Notes command
     notes_parser = subparsers.add_parser('notes', help='Git notes management')
-    notes_parser.add_argument('notes_action', choices=['sync', 'fetch', 'show', 'status'],
+    notes_parser.add_argument('notes_action', choices=['sync', 'fetch', 'show', 'status', 'hydrate', 'convert'],
                              help='Notes action')
     notes_parser.add_argument('--commit', type=str,
                              help='Commit hash for show action')
@@ -280,6 +327,8 @@ Date Formats (--since):
                                help='Clean events for unreachable commits')
     cleanup_parser.add_argument('--show-stats', action='store_true',
                                help='Show database statistics')
+    cleanup_parser.add_argument('--rebuild-stats', action='store_true',
+                               help='Recompute the event statistics rollup')
     cleanup_parser.set_defaults(func=cmd_cleanup)
     
     # Configuration command
@@ -393,6 +442,18 @@ Date Formats (--since):
                                 help='Follow log output')
     mcp_logs_parser.set_defaults(func=cmd_mcp_logs)
 
+    # Daemon command (resident hook daemon)
+    daemon_parser = subparsers.add_parser('daemon', help='Resident hook daemon management')
+    daemon_subparsers = daemon_parser.add_subparsers(dest='daemon_command', required=True)
+    daemon_start_parser = daemon_subparsers.add_parser('start', help='Start the hook daemon in the background')
+    daemon_start_parser.add_argument('--foreground', action='store_true',
+                                    help='Run in the foreground instead of detaching')
+    daemon_start_parser.add_argument('--idle-timeout', type=float, default=1800,
+                                    help='Exit after this many idle seconds (default: 1800)')
+    daemon_subparsers.add_parser('stop', help='Stop the hook daemon')
+    daemon_subparsers.add_parser('status', help='Show hook daemon status')
+    daemon_parser.set_defaults(func=cmd_daemon)
+
     # Init-project command
     init_project_parser = subparsers.add_parser('init-project', help='Initialize a new SVCS project with an interactive tour or non-interactively.')
     init_project_parser.add_argument('project_name', nargs='?', default=None, help='Name of the new project (optional, will be prompted if not provided in interactive mode, or uses a default in non-interactive mode if not set)')
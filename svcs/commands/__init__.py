@@ -10,6 +10,9 @@ Each module contains related command functions to improve maintainability.
 from .init import cmd_init
 from .status import cmd_status, cmd_cleanup
 from .events import cmd_events, cmd_process_hook
+from .analyze import cmd_analyze
+from .daemon import cmd_daemon
+from .queue import cmd_worker, cmd_queue
 from .search import cmd_search, cmd_evolution, cmd_compare
 from .analytics import cmd_analytics, cmd_quality
 from .web import cmd_web, cmd_dashboard
@@ -30,6 +33,10 @@ __all__ = [
     # Events and semantic data
     'cmd_events',
     'cmd_process_hook',
+    'cmd_analyze',
+    'cmd_daemon',
+    'cmd_worker',
+    'cmd_queue',
     
     # Search and analysis
     'cmd_search',
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+SVCS History Analysis Commands
+
+Commands for backfilling semantic analysis over existing history.
+"""
+
+import sys
+from pathlib import Path
+from .base import ensure_svcs_initialized, print_svcs_error, print_svcs_info, print_svcs_success
+
+
+def cmd_analyze(args):
+    """Backfill semantic analysis for a revision range or the whole history."""
+    repo_path = Path(args.path or Path.cwd()).resolve()
+
+    if not ensure_svcs_initialized(repo_path):
+        print_svcs_error("SVCS not initialized. Run 'svcs init' first.")
+        return
+
+    try:
+        from svcs_repo_backfill import RepositoryHistoryBackfill
+
+        backfill = RepositoryHistoryBackfill(repo_path, jobs=args.jobs, batch_size=args.batch_size,
+                                             notes=args.notes)
+        target = "all refs" if args.all else args.range
+        print(f"🔍 Backfilling semantic analysis for {target} with {backfill.jobs} worker(s)...")
+
+        stats = backfill.run(rev_range=args.range, all_refs=args.all)
+
+        if stats["total_commits"] == 0:
+            print_svcs_info("No commits in range")
+            return
+        if stats["skipped_commits"]:
+            print_svcs_info(f"Skipped {stats['skipped_commits']} already analyzed commits")
+        if stats["interrupted"]:
+            print_svcs_info("Interrupted - progress saved, re-run the same command to resume")
+
+        print_svcs_success(
+            f"Analyzed {stats['analyzed_commits']} commits, stored {stats['stored_events']} events "
+            f"in {stats['elapsed_seconds']:.1f}s ({stats['commits_per_second']:.1f} commits/s)"
+        )
+        if stats["files_skipped"] or stats["files_degraded"]:
+            print_svcs_info(
+                f"Skipped {stats['files_skipped']} files and analyzed {stats['files_degraded']} structurally only "
+                f"({stats['generated_files']} generated, {stats['minified_files']} minified, "
+                f"{stats['vendored_files']} vendored)"
+            )
+        if stats["notes_written"]:
+            print_svcs_success(f"Wrote {stats['notes_written']} semantic git notes")
+        if stats["failed_commits"]:
+            print_svcs_error(f"{stats['failed_commits']} commits failed and will be retried on the next run")
+
+    except Exception as e:
+        print_svcs_error(f"Analysis error: {e}")
+        if '--debug' in sys.argv:
+            import traceback
+            traceback.print_exc()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+SVCS Hook Daemon Commands
+
+Start, stop and inspect the resident daemon that keeps analyzers warm for git hooks.
+"""
+
+from .base import print_svcs_error, print_svcs_info, print_svcs_success
+
+
+def cmd_daemon(args):
+    """Manage the resident hook daemon."""
+    try:
+        import svcs_repo_daemon as daemon
+    except ImportError as e:
+        print_svcs_error(f"Hook daemon not available: {e}")
+        return
+
+    action = args.daemon_command
+    if action == 'start':
+        if args.foreground:
+            print(f"🚀 Starting SVCS hook daemon on {daemon.get_socket_path()} (Ctrl+C to stop)")
+            try:
+                daemon.HookDaemon(idle_timeout=args.idle_timeout).serve()
+            except RuntimeError as e:
+                print_svcs_error(str(e))
+            except KeyboardInterrupt:
+                print_svcs_info("Hook daemon stopped")
+            return
+
+        status = daemon.start_daemon(idle_timeout=args.idle_timeout)
+        if status:
+            print_svcs_success(f"Hook daemon running (PID: {status['pid']}, socket: {status['socket']})")
+            print(f"📄 View logs: tail -f {daemon.get_default_log_file()}")
+        else:
+            print_svcs_error(f"Hook daemon did not start, check {daemon.get_default_log_file()}")
+
+    elif action == 'stop':
+        if daemon.stop_daemon():
+            print_svcs_success("Hook daemon stopped")
+        else:
+            print_svcs_info("Hook daemon is not running")
+
+    else:
+        status = daemon.ping()
+        if not status:
+            print_svcs_info("Hook daemon is not running (hooks run in-process)")
+            return
+        print(f"✅ Hook daemon running (PID: {status['pid']})")
+        print(f"   📡 Socket: {status['socket']}")
+        print(f"   ⏱️  Uptime: {status['uptime'] / 60:.1f} min")
+        print(f"   🔁 Hooks handled: {status['requests']}")
+        for repo in status['repositories']:
+            print(f"   📁 {repo}")
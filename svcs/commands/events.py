@@ -60,8 +60,54 @@ def cmd_events(args):
             traceback.print_exc()
 
 
+# Per-repository RepositoryLocalSVCS / analyzer instances. None means hooks
+# build fresh instances; the resident hook daemon enables the cache so
+# analyzers (and their layers) stay warm between commits.
+_warm_instances = None
+
+
+def enable_warm_instances():
+    """Reuse SVCS and analyzer instances across hook invocations in this process."""
+    global _warm_instances
+    if _warm_instances is None:
+        _warm_instances = {}
+
+
+def _get_hook_svcs(repo_path):
+    return _get_warm_instance('svcs', repo_path, RepositoryLocalSVCS)
+
+
+def _get_hook_analyzer(repo_path):
+    from svcs.semantic_analyzer import SVCSModularAnalyzer
+    if _warm_instances is None:
+        return SVCSModularAnalyzer(str(repo_path))
+    # The hook daemon stays resident; only fan out files when SVCS_ANALYSIS_JOBS asks for it
+    from svcs.analyzers.comprehensive_analyzer import ANALYSIS_JOBS
+    return _get_warm_instance('analyzer', repo_path,
+                              lambda path: SVCSModularAnalyzer(path, jobs=ANALYSIS_JOBS or 1))
+
+
+def _get_warm_instance(kind, repo_path, factory):
+    if _warm_instances is None:
+        return factory(str(repo_path))
+    key = (kind, str(Path(repo_path).resolve()))
+    if key not in _warm_instances:
+        _warm_instances[key] = factory(str(repo_path))
+    return _warm_instances[key]
+
+
 def cmd_process_hook(args):
-    """Process git hook for semantic analysis."""
+    """Process git hook for semantic analysis, through the hook daemon when it is running."""
+    try:
+        from svcs_repo_daemon import run_hook_client
+    except ImportError:
+        process_hook_in_process(args)
+        return
+    run_hook_client(args.hook_name, args.hook_args, repo_path=args.path or '.')
+
+
+def process_hook_in_process(args):
+    """Process git hook for semantic analysis in this process."""
     hook_name = args.hook_name
     repo_path = Path(args.path or '.')
     
@@ -75,12 +121,9 @@ def cmd_process_hook(args):
             commit_hash = result.stdout.strip()
             
             # Initialize SVCS and analyzer
-            from svcs_repo_local import RepositoryLocalSVCS
-            from svcs.semantic_analyzer import SVCSModularAnalyzer
-            
             print("🔍 SVCS: Analyzing semantic changes...")
-            svcs = RepositoryLocalSVCS(str(repo_path))
-            analyzer = SVCSModularAnalyzer(str(repo_path))
+            svcs = _get_hook_svcs(repo_path)
+            analyzer = _get_hook_analyzer(repo_path)
             
             # Analyze the commit using modern analyzer
             semantic_events = analyzer.analyze_commit_changes(commit_hash)
@@ -99,24 +142,19 @@ def cmd_process_hook(args):
         # Post-merge: handle merge analysis and transfer semantic events
         try:
             # Initialize SVCS
-            from svcs_repo_local import RepositoryLocalSVCS
-            svcs = RepositoryLocalSVCS(str(repo_path))
+            svcs = _get_hook_svcs(repo_path)
             
             # Check if auto-sync is enabled (default: True)
             auto_sync = svcs.get_config('auto_sync_notes', True)
             
-            if auto_sync:
-                # Automatically fetch semantic notes from remote (in case they weren't fetched during git pull)
-                fetch_result = svcs.git_notes.fetch_notes_from_remote()
-                if fetch_result:
-                    pass  # Successfully fetched, no need to announce
-            else:
+            if not auto_sync:
                 print("ℹ️ SVCS: Auto-sync disabled, use 'svcs notes fetch' manually if needed")
             
-            # Import semantic events from git notes (for commits merged from remote)
-            imported_count = svcs.import_semantic_events_from_notes()
-            if imported_count > 0:
-                print(f"✅ SVCS: Imported {imported_count} semantic events")
+            # Fetch semantic notes if the remote ref moved (git pull does not fetch them)
+            # and import the notes changed since the last sync
+            summary = svcs.sync_notes_from_remote(remote="origin" if auto_sync else None)
+            if summary["events"] > 0:
+                print(f"✅ SVCS: Imported {summary['events']} semantic events")
             
             # Finally, automatically process merge and transfer semantic events between branches
             result = svcs.process_merge()
@@ -129,17 +167,15 @@ def cmd_process_hook(args):
         # Post-checkout: handle branch switching and fetch notes
         try:
             # Initialize SVCS
-            from svcs_repo_local import RepositoryLocalSVCS
-            svcs = RepositoryLocalSVCS(str(repo_path))
+            svcs = _get_hook_svcs(repo_path)
             
-            # Fetch semantic notes when switching branches (they might have new commits)
-            fetch_result = svcs.git_notes.fetch_notes_from_remote()
-            
-            # Import any new semantic events from notes
-            imported_count = svcs.import_semantic_events_from_notes()
-            if imported_count > 0:
-                print(f"✅ SVCS: Imported {imported_count} semantic events")
-            elif fetch_result:
+            # Branch switches reuse a recent remote check and import only changed notes,
+            # so a checkout with unchanged notes costs no remote round trip
+            from svcs_repo_notes import NOTES_CHECK_INTERVAL
+            summary = svcs.sync_notes_from_remote(min_interval=NOTES_CHECK_INTERVAL)
+            if summary["events"] > 0:
+                print(f"✅ SVCS: Imported {summary['events']} semantic events")
+            elif summary["fetch"] == "fetched":
                 print("✅ SVCS: Semantic notes synced")
                 
         except Exception as e:
@@ -151,8 +187,7 @@ def cmd_process_hook(args):
             print("🔍 SVCS: Processing pre-push...")
             
             # Initialize SVCS
-            from svcs_repo_local import RepositoryLocalSVCS
-            svcs = RepositoryLocalSVCS(str(repo_path))
+            svcs = _get_hook_svcs(repo_path)
             
             # Check if auto-sync is enabled (default: True)
             auto_sync = svcs.get_config('auto_sync_notes', True)
@@ -160,7 +195,8 @@ def cmd_process_hook(args):
             if auto_sync:
                 # Automatically sync semantic notes to remote before push
                 print("📤 SVCS: Auto-syncing semantic notes to remote...")
-                sync_result = svcs.git_notes.sync_notes_to_remote()
+                remote = args.hook_args[0] if args.hook_args else 'origin'
+                sync_result = svcs.git_notes.sync_notes_to_remote(remote)
                 if sync_result:
                     print("✅ SVCS: Semantic notes synced to remote")
                 else:
@@ -175,13 +211,9 @@ def cmd_process_hook(args):
     elif hook_name.endswith('post-receive'):
         # Post-receive: analyze pushed commits in bare repository
         try:
-            import sys
-            from svcs_repo_local import RepositoryLocalSVCS
-            from svcs.semantic_analyzer import SVCSModularAnalyzer
-            
             print("📥 SVCS: Processing pushed commits...")
-            svcs = RepositoryLocalSVCS(str(repo_path))
-            analyzer = SVCSModularAnalyzer(str(repo_path))
+            svcs = _get_hook_svcs(repo_path)
+            analyzer = _get_hook_analyzer(repo_path)
             
             total_analyzed = 0
             
@@ -250,8 +282,7 @@ def cmd_process_hook(args):
                 if ref_name == 'refs/notes/svcs-semantic':
                     print("📝 SVCS: Processing semantic notes update...")
                     
-                    from svcs_repo_local import RepositoryLocalSVCS
-                    svcs = RepositoryLocalSVCS(str(repo_path))
+                    svcs = _get_hook_svcs(repo_path)
                     
                     # Import updated semantic events from notes
                     imported_count = svcs.import_semantic_events_from_notes()
@@ -71,26 +71,21 @@ def process_post_merge_hook(repo_path: Path, hook_args):
     try:
         print_svcs_info("Synchronizing semantic notes after merge...")
         
-        # Fetch semantic notes from origin
-        result = subprocess.run(['git', 'fetch', 'origin', 'refs/notes/svcs-semantic:refs/notes/svcs-semantic'], 
-                              cwd=repo_path, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            print_svcs_success("Semantic notes synchronized from origin")
-            
-            # Import the fetched semantic notes into local database
-            try:
-                from svcs_repo_local import RepositoryLocalSVCS
-                svcs = RepositoryLocalSVCS(str(repo_path))
-                imported_count = svcs.import_semantic_events_from_notes()
-                if imported_count > 0:
-                    print_svcs_success(f"Imported {imported_count} semantic events from notes")
-                else:
-                    print_svcs_info("No new semantic events to import")
-            except Exception as e:
-                print_svcs_error(f"Failed to import semantic notes: {e}")
-        else:
-            print_svcs_info("No semantic notes found on origin")
+        # Fetch semantic notes from origin if they moved and import the changed ones
+        try:
+            from svcs_repo_local import RepositoryLocalSVCS
+            svcs = RepositoryLocalSVCS(str(repo_path))
+            summary = svcs.sync_notes_from_remote()
+            if summary["fetch"] is None:
+                print_svcs_info("No semantic notes found on origin")
+            else:
+                print_svcs_success("Semantic notes synchronized from origin")
+            if summary["events"] > 0:
+                print_svcs_success(f"Imported {summary['events']} semantic events from notes")
+            else:
+                print_svcs_info("No new semantic events to import")
+        except Exception as e:
+            print_svcs_error(f"Failed to import semantic notes: {e}")
             
         # Also trigger analysis of merge commit if it exists
         try:
@@ -131,26 +126,23 @@ def process_post_checkout_hook(repo_path: Path, hook_args):
                 # File checkout, no need to sync notes
                 return True
         
-        # Fetch semantic notes from origin
-        result = subprocess.run(['git', 'fetch', 'origin', 'refs/notes/svcs-semantic:refs/notes/svcs-semantic'], 
-                              cwd=repo_path, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            print_svcs_success("Semantic notes fetched from origin")
-            
-            # Import the fetched semantic notes into local database
-            try:
-                from svcs_repo_local import RepositoryLocalSVCS
-                svcs = RepositoryLocalSVCS(str(repo_path))
-                imported_count = svcs.import_semantic_events_from_notes()
-                if imported_count > 0:
-                    print_svcs_success(f"Imported {imported_count} semantic events from notes")
-                else:
-                    print_svcs_info("No new semantic events to import")
-            except Exception as e:
-                print_svcs_error(f"Failed to import semantic notes: {e}")
-        else:
-            print_svcs_info("No semantic notes found on origin")
+        # Fetch semantic notes from origin if they moved and import the changed ones;
+        # branch switches reuse a recent remote check
+        try:
+            from svcs_repo_local import RepositoryLocalSVCS
+            from svcs_repo_notes import NOTES_CHECK_INTERVAL
+            svcs = RepositoryLocalSVCS(str(repo_path))
+            summary = svcs.sync_notes_from_remote(min_interval=NOTES_CHECK_INTERVAL)
+            if summary["fetch"] is None:
+                print_svcs_info("No semantic notes found on origin")
+            elif summary["fetch"] == "fetched":
+                print_svcs_success("Semantic notes fetched from origin")
+            if summary["events"] > 0:
+                print_svcs_success(f"Imported {summary['events']} semantic events from notes")
+            else:
+                print_svcs_info("No new semantic events to import")
+        except Exception as e:
+            print_svcs_error(f"Failed to import semantic notes: {e}")
             
         return True
         
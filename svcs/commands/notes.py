@@ -40,6 +40,30 @@ def cmd_notes(args):
             else:
                 print("ℹ️  No new semantic notes to fetch")
             
+        elif args.notes_action == 'hydrate':
+            from svcs_repo_notes import hydrate_notes
+            print("💧 Importing semantic notes into the local database...")
+            summary = hydrate_notes(svcs.db)
+            if summary["events"]:
+                print(f"✅ Imported {summary['events']} semantic events from {summary['commits']} notes")
+            else:
+                print("ℹ️  No new semantic events to import")
+            print(f"📝 Notes: {summary['notes']} total, {summary['notes'] - summary['pending']} already in the database")
+            if summary["invalid"]:
+                print(f"⚠️  Skipped {summary['invalid']} unreadable notes")
+            
+        elif args.notes_action == 'convert':
+            from svcs_repo_notes import NOTE_FORMAT, convert_notes
+            print(f"🗜️  Converting semantic notes to format {NOTE_FORMAT}...")
+            summary = convert_notes(str(repo_path))
+            if summary["converted"]:
+                print(f"✅ Converted {summary['converted']} of {summary['notes']} notes")
+                print("ℹ️  Run 'svcs notes sync' to publish them")
+            else:
+                print(f"ℹ️  All {summary['notes']} notes already use format {NOTE_FORMAT}")
+            if summary["invalid"]:
+                print(f"⚠️  Left {summary['invalid']} unreadable notes unchanged")
+            
         elif args.notes_action == 'show':
             commit_hash = args.commit or 'HEAD'
             print(f"📝 Showing semantic note for commit: {commit_hash}")
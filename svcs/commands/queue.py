@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+SVCS Analysis Queue Commands
+
+Commands for the background analysis worker and its durable job queue.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from .base import ensure_svcs_initialized, print_svcs_error, print_svcs_info, print_svcs_success
+
+
+def cmd_worker(args):
+    """Drain the analysis queue filled by the post-commit hook."""
+    repo_path = Path(args.path or Path.cwd()).resolve()
+
+    if not ensure_svcs_initialized(repo_path):
+        print_svcs_error("SVCS not initialized. Run 'svcs init' first.")
+        return
+
+    try:
+        from svcs_repo_queue import QueueWorker
+
+        worker = QueueWorker(repo_path, concurrency=args.concurrency, poll_interval=args.poll_interval)
+        mode = "until the queue is empty" if args.drain else "(Ctrl+C to stop)"
+        print(f"👷 SVCS worker started with {worker.concurrency} thread(s) {mode}")
+
+        stats = worker.run(drain=args.drain)
+
+        if stats["recovered"]:
+            print_svcs_info(f"Requeued {stats['recovered']} jobs abandoned by a previous worker")
+        print_svcs_success(f"Analyzed {stats['processed']} commits, stored {stats['events']} events")
+        if stats["failed"]:
+            print_svcs_error(f"{stats['failed']} analysis attempts failed, see 'svcs queue status'")
+
+    except Exception as e:
+        print_svcs_error(f"Worker error: {e}")
+        if '--debug' in sys.argv:
+            import traceback
+            traceback.print_exc()
+
+
+def cmd_queue(args):
+    """Inspect or retry jobs in the analysis queue."""
+    repo_path = Path(args.path or Path.cwd()).resolve()
+
+    if not ensure_svcs_initialized(repo_path):
+        print_svcs_error("SVCS not initialized. Run 'svcs init' first.")
+        return
+
+    try:
+        from svcs_repo_queue import RepositoryAnalysisQueue, worker_running
+
+        queue = RepositoryAnalysisQueue(repo_path)
+
+        if args.queue_command == 'retry':
+            retried = queue.retry(args.commit)
+            if retried:
+                print_svcs_success(f"Requeued {retried} failed jobs")
+                print("💡 Run 'svcs worker --drain' to process them now")
+            else:
+                print_svcs_info("No failed jobs to retry")
+            return
+
+        status = queue.get_status()
+        counts = status["counts"]
+        print("📬 SVCS Analysis Queue")
+        print("=" * 40)
+        print(f"⏳ Pending:  {counts['pending']}")
+        print(f"🔄 Running:  {counts['running']}")
+        print(f"✅ Done:     {counts['done']}")
+        print(f"❌ Failed:   {counts['failed']}")
+        if status["oldest_pending_age"] is not None:
+            print(f"🕐 Oldest pending job queued {status['oldest_pending_age']}s ago")
+        print(f"👷 Worker: {'running' if worker_running(repo_path) else 'not running'}")
+
+        jobs = queue.list_jobs(status=args.status, limit=args.limit)
+        if jobs:
+            print()
+            for job in jobs:
+                queued = datetime.fromtimestamp(job['enqueued_at']).strftime('%Y-%m-%d %H:%M:%S')
+                line = f"   {job['commit_hash'][:8]} | {job['status']:<7} | {job['branch'] or '-'} | {queued}"
+                if job['event_count'] is not None:
+                    line += f" | {job['event_count']} events"
+                print(line)
+                if job['status'] == 'failed' and job['last_error']:
+                    print(f"      💬 {job['last_error']} (after {job['attempts']} attempts)")
+
+    except Exception as e:
+        print_svcs_error(f"Queue error: {e}")
+        if '--debug' in sys.argv:
+            import traceback
+            traceback.print_exc()
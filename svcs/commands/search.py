@@ -22,7 +22,7 @@ def cmd_search(args):
     try:
         # Import API functions from centralized location
         sys.path.insert(0, str(repo_path))
-        from svcs.api import search_events_advanced, search_semantic_patterns
+        from svcs.api import search_events_advanced, search_semantic_patterns, get_next_cursor
         
         # Determine search type
         if args.pattern_type:
@@ -42,7 +42,8 @@ def cmd_search(args):
                 'min_confidence': args.confidence,
                 'since_date': args.since,
                 'limit': args.limit,
-                'location_pattern': args.location
+                'location_pattern': args.location,
+                'cursor': getattr(args, 'cursor', None)
             }
             # Remove None values
             search_params = {k: v for k, v in search_params.items() if v is not None}
@@ -74,6 +75,11 @@ def cmd_search(args):
             if 'reasoning' in result:
                 print(f"   🧠 {result['reasoning']}")
             print()
+        
+        if not args.pattern_type:
+            next_cursor = get_next_cursor(results, args.limit)
+            if next_cursor:
+                print(f"➡️ More results: svcs search ... --cursor {next_cursor}")
             
     except ImportError:
         print_svcs_error("API functions not available. Ensure SVCS is properly set up.")
@@ -150,6 +156,9 @@ def cmd_compare(args):
     print(f"   {args.branch1}: {comparison['branch1_count']} total events")
     print(f"   {args.branch2}: {comparison['branch2_count']} total events")
     print(f"   Difference: {abs(comparison['branch1_count'] - comparison['branch2_count'])}")
+    if 'only_in_branch1' in comparison:
+        print(f"   Only in {args.branch1}: {comparison['only_in_branch1']}")
+        print(f"   Only in {args.branch2}: {comparison['only_in_branch2']}")
     
     if comparison['branch1_events']:
         print(f"\n🌿 Recent events in '{args.branch1}':")
@@ -49,6 +49,11 @@ def cmd_cleanup(args):
             result = svcs.cleanup_unreachable_commits()
             print(result)
             
+        elif args.rebuild_stats:
+            print("🔄 Rebuilding event statistics...")
+            groups = svcs.db.rebuild_event_stats()
+            print(f"✅ Event statistics rebuilt: {groups} groups")
+            
         elif args.show_stats:
             print("📊 Repository database statistics:")
             stats = svcs.get_database_stats()
@@ -311,15 +311,30 @@ def cmd_config(args):
                     print("ℹ️  Git hooks will now automatically sync semantic notes during push/pull/merge operations")
                 else:
                     print("ℹ️  Manual 'svcs notes sync/fetch' commands will be required")
+            elif args.setting == 'async-analysis' and args.value:
+                async_analysis = args.value.lower() in ['true', '1', 'yes', 'on']
+                svcs.set_config('async_analysis', async_analysis)
+                status = "enabled" if async_analysis else "disabled"
+                print(f"✅ Background commit analysis {status}")
+                
+                if async_analysis:
+                    print("ℹ️  The post-commit hook queues commits for 'svcs worker'")
+                else:
+                    print("ℹ️  The post-commit hook analyzes each commit before returning")
                     
         elif args.config_action == 'get':
             if args.setting == 'auto-sync':
                 auto_sync = svcs.get_config('auto_sync_notes', True)  # Default to True
                 status = "enabled" if auto_sync else "disabled"
                 print(f"Auto-sync semantic notes: {status}")
+            elif args.setting == 'async-analysis':
+                async_analysis = svcs.get_config('async_analysis', True)  # Default to True
+                status = "enabled" if async_analysis else "disabled"
+                print(f"Background commit analysis: {status}")
             else:
                 print("Available settings:")
-                print("  auto-sync  - Automatically sync semantic notes during git operations")
+                print("  auto-sync       - Automatically sync semantic notes during git operations")
+                print("  async-analysis  - Queue post-commit analysis for a background worker")
                 
         elif args.config_action == 'list':
             config = svcs.get_all_config()
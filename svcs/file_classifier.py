@@ -0,0 +1,246 @@
+# SVCS File Classification
+# Detects generated, minified and vendored files before the full analysis pipeline
+
+"""
+A FileClassifier tells the analyzer which changed files are not hand-written
+source. Evidence is checked in this order:
+
+1. linguist-generated / linguist-vendored attributes from the analyzed
+   commit's .gitattributes files (and .git/info/attributes); as in linguist,
+   an unset attribute (`vendor/** -linguist-vendored`) overrides the
+   built-in globs of its category
+2. Path globs: the "file_classification" section of .svcs/config.json, then
+   the built-in defaults unless "use_defaults" is false there
+3. Content: generated-code header markers and minified line lengths
+
+Each category maps to an action: "skip" (no events), "structural" (layer 1
+file-level events plus an analysis_degraded marker) or "analyze".
+
+Example .svcs/config.json section:
+
+    "file_classification": {
+        "generated": ["src/api/client/**"],
+        "vendored": ["libs/external/**"],
+        "actions": {"generated": "skip"},
+        "use_defaults": true
+    }
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+GENERATED = "generated"
+MINIFIED = "minified"
+VENDORED = "vendored"
+
+ACTIONS = ("skip", "structural", "analyze")
+
+DEFAULT_ACTIONS = {GENERATED: "structural", MINIFIED: "structural", VENDORED: "skip"}
+
+# gitattributes-style globs; patterns without a slash match the file name at any depth
+DEFAULT_PATTERNS = {
+    GENERATED: ["*_pb2.py", "*_pb2.pyi", "*_pb2_grpc.py", "*_pb.js", "*_grpc_pb.js", "*.pb.ts",
+                "*.bundle.js", "*.generated.*"],
+    MINIFIED: ["*.min.js", "*-min.js", "*.min.mjs"],
+    VENDORED: ["**/third_party/**", "**/third-party/**", "**/vendor/**", "**/vendors/**",
+               "**/bower_components/**", "**/site-packages/**"],
+}
+
+# Linguist attributes and the category they mark
+ATTRIBUTES = {"linguist-generated": GENERATED, "linguist-vendored": VENDORED}
+
+# Markers looked for in the first lines of a file
+HEADER_LINES = 5
+GENERATED_MARKERS = ("@generated", "autogenerated", "auto-generated", "automatically generated",
+                     "code generated by", "generated by the protocol buffer compiler")
+
+# Files at least this long whose average line is longer than MINIFIED_LINE_LENGTH
+MINIFIED_MIN_SIZE = 1000
+MINIFIED_LINE_LENGTH = 200
+
+
+class FileClass(NamedTuple):
+    """Why a file is not treated as hand-written source."""
+    category: str
+    reason: str
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Translate a gitattributes glob (`*`, `?`, `[...]`, `**`) into a regex for the whole path."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+class PathPattern:
+    """One gitattributes-style pattern, relative to the directory that defines it."""
+
+    def __init__(self, pattern: str, base: str = ""):
+        self.pattern = pattern
+        self.base = base.strip("/")
+        anchored = "/" in pattern.rstrip("/")
+        pattern = pattern.lstrip("/") if anchored else pattern
+        self.match_name = not anchored
+        self._regex = re.compile(glob_to_regex(pattern) + r"\Z", re.DOTALL)
+
+    def matches(self, path: str) -> bool:
+        if self.base:
+            if not path.startswith(self.base + "/"):
+                return False
+            path = path[len(self.base) + 1:]
+        if self.match_name:
+            path = path.rsplit("/", 1)[-1]
+        return self._regex.match(path) is not None
+
+
+def parse_attributes(content: str, base: str = "") -> List[Tuple[PathPattern, Dict[str, Optional[bool]]]]:
+    """Parse the linguist attributes of a .gitattributes file into (pattern, {attribute: state})."""
+    rules = []
+    for line in content.splitlines():
+        fields = line.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        states = {}
+        for field in fields[1:]:
+            name, _, value = field.partition("=")
+            if name.startswith(("-", "!")):
+                state, name = (False if name[0] == "-" else None), name[1:]
+            else:
+                state = value.lower() not in ("false", "0") if value else True
+            if name in ATTRIBUTES:
+                states[name] = state
+        if states:
+            rules.append((PathPattern(fields[0], base), states))
+    return rules
+
+
+class FileClassifier:
+    """
+    Classifies changed files as generated, minified or vendored.
+
+    Subclass and override classify_content (or pass extra patterns) to plug
+    in other rules; ComprehensiveAnalyzer takes an instance as `classifier`.
+    """
+
+    def __init__(self, patterns: Optional[Dict[str, Iterable[str]]] = None,
+                 actions: Optional[Dict[str, str]] = None, use_defaults: bool = True):
+        # Configured globs, then the built-in ones .gitattributes can override
+        self.patterns = {}
+        self.default_patterns = {}
+        for category in (GENERATED, MINIFIED, VENDORED):
+            globs = [glob + "**" if glob.endswith("/") else glob for glob in (patterns or {}).get(category, ())]
+            self.patterns[category] = [PathPattern(glob) for glob in globs]
+            defaults = DEFAULT_PATTERNS[category] if use_defaults else ()
+            self.default_patterns[category] = [PathPattern(glob) for glob in defaults]
+        self.actions = dict(DEFAULT_ACTIONS)
+        for category, action in (actions or {}).items():
+            if category in self.actions and action in ACTIONS:
+                self.actions[category] = action
+
+    @classmethod
+    def from_repo(cls, repo_path: str) -> "FileClassifier":
+        """Build a classifier from the repository's .svcs/config.json, if it has one."""
+        try:
+            config = json.loads((Path(repo_path) / ".svcs" / "config.json").read_text())
+            settings = config.get("file_classification") or {}
+        except (OSError, ValueError, AttributeError):
+            settings = {}
+        return cls(patterns={category: settings.get(category, ()) for category in DEFAULT_PATTERNS},
+                   actions=settings.get("actions"), use_defaults=settings.get("use_defaults", True) is not False)
+
+    def action(self, file_class: FileClass) -> str:
+        return self.actions.get(file_class.category, "analyze")
+
+    def classify_paths(self, paths: List[str], reader=None,
+                       commit_hash: Optional[str] = None) -> Dict[str, FileClass]:
+        """Classify by path globs and, given a reader and commit, by .gitattributes."""
+        classes = {}
+        attributes = self._load_attributes(paths, reader, commit_hash) if reader and commit_hash else []
+        for path in paths:
+            file_class = self.classify_path(path, attributes)
+            if file_class:
+                classes[path] = file_class
+        return classes
+
+    def classify_path(self, path: str, attributes=()) -> Optional[FileClass]:
+        """Classify by .gitattributes states, then configured and built-in globs."""
+        states = {}
+        for pattern, rule_states in attributes:
+            if pattern.matches(path):
+                states.update(rule_states)
+        for name, category in ATTRIBUTES.items():
+            if states.get(name):
+                return FileClass(category, f"{name} in .gitattributes")
+        unset = {category for name, category in ATTRIBUTES.items() if states.get(name) is False}
+        for globs in (self.patterns, self.default_patterns):
+            for category, patterns in globs.items():
+                if globs is self.default_patterns and category in unset:
+                    continue
+                for pattern in patterns:
+                    if pattern.matches(path):
+                        return FileClass(category, f"path matches {pattern.pattern}")
+        return None
+
+    def classify_content(self, path: str, content: str) -> Optional[FileClass]:
+        """Classify by header markers and line lengths."""
+        if not content:
+            return None
+        header = "\n".join(content[:4096].split("\n", HEADER_LINES)[:HEADER_LINES]).lower()
+        for marker in GENERATED_MARKERS:
+            if marker in header:
+                return FileClass(GENERATED, f"header contains '{marker}'")
+        if len(content) >= MINIFIED_MIN_SIZE:
+            average = len(content) // (content.count("\n") + 1)
+            if average > MINIFIED_LINE_LENGTH:
+                return FileClass(MINIFIED, f"average line length {average}")
+        return None
+
+    def _load_attributes(self, paths: List[str], reader, commit_hash: str) -> list:
+        """Linguist rules from the commit's .gitattributes files, shallowest first, then info/attributes."""
+        directories = {""}
+        for path in paths:
+            parts = path.split("/")[:-1]
+            directories.update("/".join(parts[:depth]) for depth in range(1, len(parts) + 1))
+        # cat-file --batch specs cannot contain whitespace
+        directories = sorted((d for d in directories if not any(c.isspace() for c in d)),
+                             key=lambda d: (d.count("/") + bool(d), d))
+        specs = [f"{commit_hash}:{d + '/' if d else ''}.gitattributes" for d in directories]
+
+        rules = []
+        for directory, (_, result) in zip(directories, reader.read_objects(specs)):
+            if result is not None and result[0] == "blob":
+                rules += parse_attributes(result[1].decode("utf-8", "replace"), directory)
+        for git_dir in (Path(reader.repo_path) / ".git", Path(reader.repo_path)):
+            info = git_dir / "info" / "attributes"
+            if info.is_file():
+                rules += parse_attributes(info.read_text(errors="replace"))
+                break
+        return rules
@@ -0,0 +1,226 @@
+# SVCS Git Object Access
+# Long-lived `git cat-file --batch` reader shared by all analyzers
+
+import atexit
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+NULL_SHA = "0" * 40
+
+# Tree entries that are not file blobs (submodules, symlinks)
+_NON_BLOB_MODES = {"160000", "120000"}
+
+
+class FileChange(NamedTuple):
+    """One entry of `git diff-tree -r --raw` output."""
+    path: str
+    status: str
+    old_blob: Optional[str]
+    new_blob: Optional[str]
+
+
+class GitObjectReader:
+    """
+    Reads git objects through a single persistent `git cat-file --batch` process.
+
+    Requests are serialized with a lock, so one reader can be shared across
+    threads. The process is started lazily and restarted if it dies.
+    """
+
+    def __init__(self, repo_path: str):
+        self.repo_path = str(Path(repo_path).resolve())
+        self._process = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def _ensure_process(self):
+        if self._pid != os.getpid():
+            # Forked child: the pipes belong to the parent's process
+            self._process = None
+            self._pid = os.getpid()
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.repo_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        return self._process
+
+    def read_object(self, spec: str) -> Optional[Tuple[str, bytes]]:
+        """Return (object_type, raw_bytes) for a SHA or `<rev>:<path>`, or None if missing."""
+        if not spec or spec == NULL_SHA:
+            return None
+
+        with self._lock:
+            process = self._ensure_process()
+            try:
+                process.stdin.write(spec.encode("utf-8") + b"\n")
+                process.stdin.flush()
+                header = process.stdout.readline().decode("utf-8", "replace").split()
+                if len(header) != 3:
+                    # "<spec> missing" / "<spec> ambiguous"
+                    return None
+                _, object_type, size = header
+                data = process.stdout.read(int(size))
+                process.stdout.read(1)  # trailing newline
+                return object_type, data
+            except (BrokenPipeError, OSError, ValueError):
+                self._terminate()
+                return None
+
+    def read_objects(self, specs: Iterable[str],
+                     chunk_size: int = 256) -> Iterator[Tuple[str, Optional[Tuple[str, bytes]]]]:
+        """Yield (spec, (object_type, raw_bytes) or None) for many objects in order.
+
+        Writes a chunk of requests before reading the replies, so bulk reads
+        cost one pipe round trip per chunk instead of one per object. Specs
+        must not contain whitespace (object IDs, not `<rev>:<path>`).
+        """
+        specs = list(specs)
+        for start in range(0, len(specs), chunk_size):
+            chunk = specs[start:start + chunk_size]
+            with self._lock:
+                process = self._ensure_process()
+                try:
+                    process.stdin.write(b"".join(spec.encode("utf-8") + b"\n" for spec in chunk))
+                    process.stdin.flush()
+                    results = []
+                    for spec in chunk:
+                        header = process.stdout.readline().decode("utf-8", "replace").split()
+                        if len(header) != 3:
+                            results.append((spec, None))
+                            continue
+                        _, object_type, size = header
+                        data = process.stdout.read(int(size))
+                        process.stdout.read(1)  # trailing newline
+                        results.append((spec, (object_type, data)))
+                except (BrokenPipeError, OSError, ValueError):
+                    self._terminate()
+                    results = [(spec, None) for spec in chunk]
+            yield from results
+
+    def read_blob(self, spec: str) -> Optional[bytes]:
+        """Return blob contents, or None if the object is missing or not a blob."""
+        result = self.read_object(spec)
+        if result is None or result[0] != "blob":
+            return None
+        return result[1]
+
+    def read_text(self, spec: str) -> str:
+        """Return blob contents decoded as UTF-8 with universal newlines ("" if missing).
+
+        Matches what the analyzers used to get from `git show` in text mode.
+        """
+        return _decode_text(self.read_blob(spec))
+
+    def read_texts(self, specs: Iterable[Optional[str]], chunk_size: int = 256) -> Dict[str, str]:
+        """Decode many blobs like read_text, batching the reads; returns {blob_id: text}."""
+        wanted = dict.fromkeys(spec for spec in specs if spec and spec != NULL_SHA)
+        texts = {}
+        for spec, result in self.read_objects(wanted, chunk_size):
+            texts[spec] = _decode_text(result[1] if result is not None and result[0] == "blob" else None)
+        return texts
+
+    def changed_files(self, commit_hash: str) -> List[FileChange]:
+        """List files changed by a commit with their before/after blob IDs."""
+        result = subprocess.run(
+            ["git", "diff-tree", "-r", "--raw", "--root", "--no-commit-id", "-z", commit_hash],
+            cwd=self.repo_path,
+            capture_output=True,
+            check=True
+        )
+        return parse_raw_diff(result.stdout.decode("utf-8", errors="replace"))
+
+    def iter_commit_file_contents(self, commit_hash: str,
+                                  paths: Optional[List[str]] = None) -> Iterator[Tuple[str, str, str]]:
+        """Yield (path, before_content, after_content) for files changed in a commit."""
+        wanted = set(paths) if paths is not None else None
+        for change in self.changed_files(commit_hash):
+            if wanted is not None and change.path not in wanted:
+                continue
+            yield change.path, self.read_text(change.old_blob), self.read_text(change.new_blob)
+
+    def _terminate(self):
+        process, self._process = self._process, None
+        if process is None or self._pid != os.getpid():
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    def close(self):
+        """Stop the cat-file process."""
+        with self._lock:
+            self._terminate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _decode_text(data: Optional[bytes]) -> str:
+    if data is None:
+        return ""
+    return data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def parse_raw_diff(output: str) -> List[FileChange]:
+    """Parse `git diff-tree -r --raw -z` output into FileChange entries."""
+    changes = []
+    fields = output.split("\0")
+    i = 0
+    while i < len(fields):
+        meta = fields[i]
+        if not meta.startswith(":"):
+            i += 1
+            continue
+        old_mode, new_mode, old_blob, new_blob, status = meta[1:].split(" ")[:5]
+        status = status[:1]
+        # Copies and renames carry two paths; the new one is last
+        path_count = 2 if status in ("R", "C") else 1
+        path = fields[i + path_count]
+        i += 1 + path_count
+        changes.append(FileChange(
+            path=path,
+            status=status,
+            old_blob=None if old_blob == NULL_SHA or old_mode in _NON_BLOB_MODES else old_blob,
+            new_blob=None if new_blob == NULL_SHA or new_mode in _NON_BLOB_MODES else new_blob
+        ))
+    return changes
+
+
+_readers: Dict[str, GitObjectReader] = {}
+_readers_lock = threading.Lock()
+
+
+def get_object_reader(repo_path: str = ".") -> GitObjectReader:
+    """Return the shared reader for a repository, creating it on first use."""
+    key = str(Path(repo_path).resolve())
+    with _readers_lock:
+        reader = _readers.get(key)
+        if reader is None:
+            reader = GitObjectReader(key)
+            _readers[key] = reader
+        return reader
+
+
+@atexit.register
+def close_all_readers():
+    """Stop every shared cat-file process (registered with atexit)."""
+    with _readers_lock:
+        readers = list(_readers.values())
+        _readers.clear()
+    for reader in readers:
+        reader.close()
@@ -21,8 +21,9 @@ class SyntacticAnalyzer:
             before = nodes_before[node_id]
             after = nodes_after[node_id]
             
-            # Skip if no actual change
-            if before.get("source") == after.get("source"):
+            # Skip if no actual change (Python nodes carry a hash of their source)
+            if (before.get("source_hash") == after.get("source_hash") and
+                    before.get("source") == after.get("source")):
                 continue
             
             base_event = {
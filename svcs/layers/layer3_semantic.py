@@ -21,8 +21,13 @@ class SemanticAnalyzer:
             before = nodes_before[node_id]
             after = nodes_after[node_id]
             
+            # Equal source hashes mean equal details
+            if before.get("source_hash") is not None and before.get("source_hash") == after.get("source_hash"):
+                continue
+            
             # Check if there are any semantic changes worth analyzing
             has_semantic_changes = (
+                before.get("source_hash") != after.get("source_hash") or
                 before.get("source") != after.get("source") or
                 before.get("calls", set()) != after.get("calls", set()) or
                 before.get("returns", 0) != after.get("returns", 0) or
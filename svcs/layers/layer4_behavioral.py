@@ -25,8 +25,13 @@ class BehavioralAnalyzer:
             before = nodes_before[node_id]
             after = nodes_after[node_id]
             
+            # Equal source hashes mean equal details
+            if before.get("source_hash") is not None and before.get("source_hash") == after.get("source_hash"):
+                continue
+            
             # Skip if no actual change in source AND no behavioral differences
-            source_same = before.get("source") == after.get("source")
+            source_same = (before.get("source_hash") == after.get("source_hash") and
+                           before.get("source") == after.get("source"))
             behavioral_same = self._nodes_behaviorally_identical(before, after)
             
             if source_same and behavioral_same:
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 import json
 import os
 import re
+import time
 from pathlib import Path
 
 # Load environment variables from .env file
@@ -69,8 +70,12 @@ class TrueAIAnalyzer:
         self._model = self._initialize_model()
     
     def analyze(self, filepath: str, before_content: str, after_content: str,
-                nodes_before: dict, nodes_after: dict) -> List[Dict[str, Any]]:
-        """Analyze semantic changes using LLM-powered analysis."""
+                nodes_before: dict, nodes_after: dict, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Analyze semantic changes using LLM-powered analysis.
+        
+        ``timeout`` caps the seconds spent on LLM requests for this file, on
+        top of the per-request AI_TIMEOUT.
+        """
         events = []
         
         # Skip identical content
@@ -93,7 +98,7 @@ class TrueAIAnalyzer:
 
         try:
             # Analyze abstract changes using LLM
-            llm_changes = self.analyze_abstract_changes(before_content, after_content, filepath)
+            llm_changes = self.analyze_abstract_changes(before_content, after_content, filepath, timeout)
             
             # Convert to events
             for change in llm_changes:
@@ -117,7 +122,7 @@ class TrueAIAnalyzer:
         return events
     
     def analyze_abstract_changes(self, before_content: str, after_content: str, 
-                                filepath: str) -> List[LLMChange]:
+                                filepath: str, timeout: Optional[float] = None) -> List[LLMChange]:
         """Analyze abstract semantic changes using LLM."""
         if not self._model:
             return []
@@ -129,7 +134,7 @@ class TrueAIAnalyzer:
         
         try:
             # Get LLM response
-            response = self._query_llm(prompt, filepath)
+            response = self._query_llm(prompt, filepath, timeout)
             
             # Parse LLM response into structured changes
             parsed_changes = self._parse_llm_response(response, filepath)
@@ -269,8 +274,16 @@ If no significant semantic changes are detected, return: []
 """
         return prompt
     
-    def _query_llm(self, prompt: str, filepath: str = "") -> str:
-        """Query LLM with fallback to multiple models."""
+    def _request_timeout(self, deadline: Optional[float]) -> Optional[float]:
+        """Seconds the next request may take: AI_TIMEOUT, capped by the time left (None once it is up)."""
+        if deadline is None:
+            return self.config['ai_timeout']
+        remaining = deadline - time.monotonic()
+        return min(self.config['ai_timeout'], remaining) if remaining > 0 else None
+    
+    def _query_llm(self, prompt: str, filepath: str = "", timeout: Optional[float] = None) -> str:
+        """Query LLM with fallback to multiple models, within ``timeout`` seconds overall."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
         
         # Only show analysis message if debug mode or we have working AI
         file_display = f" for {filepath}" if filepath else ""
@@ -280,12 +293,13 @@ If no significant semantic changes are detected, return: []
             print(f"🐛 Debug: Available providers: {self._get_available_providers()}")
         
         # Try Google Gemini Flash (primary LLM service)
-        if os.getenv('GOOGLE_API_KEY'):
+        if os.getenv('GOOGLE_API_KEY') and self._request_timeout(deadline):
             try:
                 import google.generativeai as genai
                 genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
                 model = genai.GenerativeModel(self.config['google_model'])
-                response = model.generate_content(prompt)
+                response = model.generate_content(prompt,
+                                                  request_options={"timeout": self._request_timeout(deadline)})
                 if self.config['debug']:
                     print(f"✅ Gemini analysis successful{file_display}")
                 return response.text
@@ -293,7 +307,7 @@ If no significant semantic changes are detected, return: []
                 pass  # Silent fallback
         
         # Try OpenAI (fallback)
-        if os.getenv('OPENAI_API_KEY'):
+        if os.getenv('OPENAI_API_KEY') and self._request_timeout(deadline):
             try:
                 if self.config['debug']:
                     print(f"🔄 Trying OpenAI {self.config['openai_model']}{file_display}...")
@@ -307,7 +321,7 @@ If no significant semantic changes are detected, return: []
                     ],
                     max_tokens=1000,
                     temperature=0.1,
-                    timeout=self.config['ai_timeout']
+                    timeout=self._request_timeout(deadline)
                 )
                 if self.config['debug']:
                     print(f"✅ OpenAI analysis successful{file_display}")
@@ -316,7 +330,7 @@ If no significant semantic changes are detected, return: []
                 pass  # Silent fallback
         
         # Try Anthropic Claude (fallback)
-        if os.getenv('ANTHROPIC_API_KEY'):
+        if os.getenv('ANTHROPIC_API_KEY') and self._request_timeout(deadline):
             try:
                 if self.config['debug']:
                     print(f"🔄 Trying Anthropic {self.config['anthropic_model']}{file_display}...")
@@ -325,7 +339,7 @@ If no significant semantic changes are detected, return: []
                 response = client.messages.create(
                     model=self.config['anthropic_model'],
                     max_tokens=1000,
-                    timeout=self.config['ai_timeout'],
+                    timeout=self._request_timeout(deadline),
                     messages=[
                         {"role": "user", "content": prompt}
                     ]
@@ -337,16 +351,17 @@ If no significant semantic changes are detected, return: []
                 pass  # Silent fallback
         
         # Try Ollama local models (fallback - no API key needed)
+        if not self._request_timeout(deadline):
+            return "[]"
         try:
             if self.config['debug']:
                 print(f"🔄 Trying Ollama {self.config['ollama_model']}{file_display}...")
             import ollama
             
-            # Configure Ollama client if custom URL is provided
-            if self.config['ollama_base_url'] != 'http://localhost:11434':
-                ollama_client = ollama.Client(host=self.config['ollama_base_url'])
-            else:
-                ollama_client = ollama
+            # A client of our own, so requests get a timeout; the default URL leaves OLLAMA_HOST in charge
+            host = self.config['ollama_base_url']
+            ollama_client = ollama.Client(host=None if host == 'http://localhost:11434' else host,
+                                          timeout=self._request_timeout(deadline))
             
             # First try the generate method
             try:
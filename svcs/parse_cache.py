@@ -0,0 +1,198 @@
+# SVCS Parse Cache
+# Blob-keyed cache of parser output shared across commits
+
+"""
+Caches `(nodes, dependencies)` returned by the language parsers.
+
+Entries are keyed by git blob SHA and parser cache version, so the "after"
+blob of commit N is parsed once and reused as the "before" blob of commit N+1.
+Results live in a bounded in-memory LRU; when a spill directory is set
+(normally `.svcs/parse_cache/`), entries are also pickled to disk so later
+processes and re-analysis runs can reuse them.
+
+Cached values are shared between callers and must be treated as read-only.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_DISK_ENTRIES = 50000
+SPILL_DIR_NAME = "parse_cache"
+
+# How often (in disk writes) to check the spill directory size
+_PRUNE_INTERVAL = 256
+
+
+class ParseCache:
+    """Bounded LRU of parser output keyed by (parser version, blob SHA)."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, spill_dir: Optional[str] = None,
+                 max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self.max_disk_entries = max(1, max_disk_entries)
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], set]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def set_spill_dir(self, spill_dir: Optional[str]):
+        """Enable (or with None, disable) the on-disk spill."""
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+
+    def get_or_parse(self, parser, blob_id: Optional[str], source_code: str) -> tuple:
+        """Return parser output for a blob, parsing only on a cache miss."""
+        if not blob_id:
+            # Content that is not a git blob (working tree, missing side) is not cached
+            return parser.parse_code(source_code)
+
+        key = f"{parser.get_cache_version()}:{blob_id}"
+        result = self.get(key)
+        if result is None:
+            result = parser.parse_code(source_code)
+            self.put(key, result)
+        return result
+
+    def lookup(self, parser, blob_id: Optional[str]) -> Optional[tuple]:
+        """Cached parser output for a blob, or None (never parses)."""
+        if not blob_id:
+            return None
+        return self.get(f"{parser.get_cache_version()}:{blob_id}")
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Look a key up in memory, then in the spill directory."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        result = self._load_from_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, result)
+        return result
+
+    def put(self, key: str, result: tuple):
+        """Store parser output in memory and, if enabled, on disk."""
+        with self._lock:
+            self._remember(key, result)
+        self._save_to_disk(key, result)
+
+    def clear(self, include_disk: bool = False):
+        """Drop all in-memory entries, and optionally the spill directory."""
+        with self._lock:
+            self._entries.clear()
+        if include_disk and self.spill_dir and self.spill_dir.exists():
+            for path in self.spill_dir.glob("*/*.pkl"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses
+            }
+
+    def _remember(self, key: str, result: tuple):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.spill_dir / digest[:2] / f"{digest[2:]}.pkl"
+
+    def _load_from_disk(self, key: str) -> Optional[tuple]:
+        if not self.spill_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_key, result = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Discarding unreadable parse cache entry {path}: {e}")
+            return None
+        return result if stored_key == key else None
+
+    def _save_to_disk(self, key: str, result: tuple):
+        if not self.spill_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename, so concurrent readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((key, result), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.debug(f"Could not spill parse cache entry to {path}: {e}")
+            return
+
+        self._disk_writes += 1
+        if self._disk_writes % _PRUNE_INTERVAL == 0:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Remove the least recently written entries above max_disk_entries."""
+        try:
+            files = [(p.stat().st_mtime, p) for p in self.spill_dir.glob("*/*.pkl")]
+        except OSError:
+            return
+        excess = len(files) - self.max_disk_entries
+        if excess <= 0:
+            return
+        files.sort()
+        for _, path in files[:excess]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+_default_cache: Optional[ParseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """Return the process-wide parse cache shared by all analyzers."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ParseCache()
+        return _default_cache
+
+
+def get_spill_dir(repo_path: str) -> Optional[str]:
+    """Spill directory for a repository, or None when SVCS is not initialized there."""
+    if os.getenv("SVCS_PARSE_CACHE_DISK", "1").lower() in ("0", "false", "no", "off"):
+        return None
+    svcs_dir = Path(repo_path) / ".svcs"
+    if not svcs_dir.is_dir():
+        return None
+    return str(svcs_dir / SPILL_DIR_NAME)
@@ -4,10 +4,11 @@
 from .python_parser import PythonParser
 from .php_parser import PHPParser
 from .javascript_parser import JavaScriptParser
-from .base_parser import BaseParser
+from .base_parser import BaseParser, ParseTimeout
 
 __all__ = [
     "BaseParser",
+    "ParseTimeout",
     "PythonParser", 
     "PHPParser",
     "JavaScriptParser"
@@ -1,12 +1,31 @@
 # SVCS Base Parser
 # Abstract base class for all language parsers
 
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Set, List, Any, Optional
 
+
+class ParseTimeout(BaseException):
+    """Raised inside a parser once its deadline has passed.
+    
+    A BaseException, like asyncio.CancelledError, so the parsers' broad
+    ``except Exception`` fallbacks do not turn it into a slower re-parse.
+    """
+
+
 class BaseParser(ABC):
     """Abstract base parser for all languages."""
     
+    # Bump when parse_code output changes, so cached parses are not reused
+    parser_version = "1"
+    
+    # True when parse_changes limits detail extraction to the changed nodes
+    scoped_parsing = False
+    
+    # time.monotonic() value after which check_deadline raises ParseTimeout; None disables
+    deadline: Optional[float] = None
+    
     def __init__(self):
         self.supported_extensions = set()
         self.language_name = ""
@@ -24,6 +43,23 @@ class BaseParser(ABC):
         """
         pass
     
+    def parse_changes(self, before_code: str, after_code: str) -> tuple:
+        """
+        Parse both versions of a changed file.
+        
+        Parsers may return cheaper records for nodes the change did not
+        touch, as long as a node's before and after records stay equal.
+        
+        Returns:
+            Tuple of ((nodes_before, deps_before), (nodes_after, deps_after))
+        """
+        return self.parse_code(before_code), self.parse_code(after_code)
+    
+    def check_deadline(self):
+        """Called between parsing steps; raises ParseTimeout past the deadline."""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise ParseTimeout(self.__class__.__name__)
+    
     @abstractmethod
     def get_node_details(self, node) -> Dict[str, Any]:
         """Extract detailed information from a parsed node."""
@@ -36,3 +72,11 @@ class BaseParser(ABC):
     def get_language_name(self) -> str:
         """Get the name of the language this parser handles."""
         return self.language_name
+    
+    def get_backend_name(self) -> str:
+        """Name of the parsing backend in use (e.g. a library or regex fallback)."""
+        return "default"
+    
+    def get_cache_version(self) -> str:
+        """Identify this parser's output format for the blob-keyed parse cache."""
+        return f"{self.__class__.__name__}/{self.parser_version}/{self.get_backend_name()}"
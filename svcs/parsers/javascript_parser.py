@@ -23,6 +23,10 @@ class JavaScriptParser(BaseParser):
         self.supported_extensions = {'.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs'}
         self.language_name = "JavaScript"
     
+    def get_backend_name(self) -> str:
+        """Esprima when installed, otherwise the regex fallback."""
+        return "esprima" if esprima_available else "regex"
+    
     def parse_code(self, source_code: str) -> tuple:
         """Parse JavaScript/TypeScript code."""
         if esprima_available:
@@ -46,8 +50,11 @@ class JavaScriptParser(BaseParser):
             except:
                 ast = esprima.parseModule(source_code, {'loc': True, 'tolerant': True})
             
+            self.check_deadline()
+            
             # Extract functions and classes
             self._extract_nodes_esprima(ast, nodes)
+            self.check_deadline()
             
             # Extract dependencies (import/require statements)
             self._extract_dependencies_esprima(ast, dependencies)
@@ -55,6 +62,7 @@ class JavaScriptParser(BaseParser):
             # Extract assignment targets from esprima AST
             assignment_targets = set()
             self._extract_assignment_targets_esprima(ast, assignment_targets)
+            self.check_deadline()
             
             # Extract behavioral patterns for Layer 4 analysis (enhanced with esprima data)
             self._extract_behavioral_patterns_esprima(source_code, nodes, assignment_targets)
@@ -72,18 +80,22 @@ class JavaScriptParser(BaseParser):
         
         # Clean the code - remove comments and normalize whitespace
         cleaned_code = self._preprocess_js(source_code)
+        self.check_deadline()
         
         # Extract ES6 classes with methods and inheritance
         self._extract_es6_classes(cleaned_code, nodes)
+        self.check_deadline()
         
         # Extract all function types (regular, arrow, async, generator)
         self._extract_functions(cleaned_code, nodes)
+        self.check_deadline()
         
         # Extract imports and requires
         self._extract_dependencies(cleaned_code, dependencies)
         
         # Detect functional programming patterns
         self._detect_functional_programming(cleaned_code, nodes)
+        self.check_deadline()
         
         # Extract detailed behavioral patterns for Layer 4 analysis
         self._extract_behavioral_patterns(cleaned_code, nodes)
@@ -256,6 +268,7 @@ class JavaScriptParser(BaseParser):
         # Extract functions
         for pattern_type, pattern in func_patterns.items():
             for match in re.finditer(pattern, code):
+                self.check_deadline()
                 func_name = match.group(1)
                 params = match.group(2).strip()
                 
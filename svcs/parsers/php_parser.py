@@ -32,6 +32,14 @@ class PHPParser(BaseParser):
         self.supported_extensions = {'.php', '.phtml', '.php3', '.php4', '.php5', '.phps'}
         self.language_name = "PHP"
     
+    def get_backend_name(self) -> str:
+        """tree-sitter, phply or the regex fallback, in order of preference."""
+        if tree_sitter_available:
+            return "tree-sitter"
+        elif phply_available:
+            return "phply"
+        return "regex"
+    
     def parse_code(self, source_code: str) -> tuple:
         """Parse PHP code using available parsers."""
         if tree_sitter_available:
@@ -50,9 +58,11 @@ class PHPParser(BaseParser):
             parser = tree_sitter.Parser()
             parser.language = php_language
             tree = parser.parse(source_code.encode('utf-8'))
+            self.check_deadline()
             
             # Extract functions and classes
             self._extract_nodes_tree_sitter(tree.root_node, nodes, source_code)
+            self.check_deadline()
             
             # Extract dependencies (use/require statements)
             self._extract_dependencies_tree_sitter(tree.root_node, dependencies, source_code)
@@ -75,9 +85,11 @@ class PHPParser(BaseParser):
             lexer = phplex.lexer
             parser = phpparse.make_parser()
             ast_tree = parser.parse(source_code, lexer=lexer)
+            self.check_deadline()
             
             # Extract functions and classes from AST
             self._extract_nodes_phply(ast_tree, nodes)
+            self.check_deadline()
             
             # Extract dependencies
             self._extract_dependencies_phply(ast_tree, dependencies)
@@ -2,7 +2,11 @@
 # Comprehensive Python AST-based parser with deep semantic analysis
 
 import ast
-from typing import Dict, Set, List, Any
+import difflib
+import hashlib
+import re
+import sys
+from typing import Dict, Set, List, Any, Optional
 from .base_parser import BaseParser
 
 class FunctionDetailVisitor(ast.NodeVisitor):
@@ -223,148 +227,414 @@ class FunctionDetailVisitor(ast.NodeVisitor):
         self.generic_visit(node)
 
 
+# Line breaks as counted by the Python tokenizer (str.splitlines also splits on \x0b, \x0c, ...)
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+_DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+# Statement-level nodes that can hold definitions in their bodies
+_BLOCK_TYPES = tuple(getattr(ast, name) for name in ("stmt", "excepthandler", "match_case") if hasattr(ast, name))
+
+# Counters FunctionDetailVisitor keeps per function
+_METRIC_FIELDS = tuple(vars(FunctionDetailVisitor()))
+
+# Functional-programming constructs layer 4 totals per file: lambdas, then comprehension kinds
+_FP_KINDS = {ast.Lambda: 0, ast.ListComp: 1, ast.DictComp: 2, ast.SetComp: 3, ast.GeneratorExp: 4}
+
+_LEAF_DIGESTS = {}
+
+# AST nodes visited between deadline checks
+_CHECK_INTERVAL = 1024
+
+
+def _node_digest(node, children: List[bytes]) -> bytes:
+    """Hash of a node's type, scalar fields and child hashes; positions and formatting are ignored."""
+    shape = [type(node).__name__]
+    for name in node._fields:
+        value = getattr(node, name, None)
+        if isinstance(value, list):
+            shape.append(f"{name}[{len(value)}")
+            shape.extend("." if isinstance(item, ast.AST) else repr(item) for item in value)
+        else:
+            shape.append(name + ("." if isinstance(value, ast.AST) else repr(value)))
+    data = "\0".join(shape).encode("utf-8", "surrogatepass") + b"".join(children)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _text_digest(text: str) -> bytes:
+    """Hash of an untouched definition's source lines."""
+    return hashlib.blake2b(b"text\0" + text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _function_details(node, source_hash: str, metrics: Dict[str, Any]) -> Dict[str, Any]:
+    details = {"source_hash": source_hash}
+    
+    # Extract function signature (argument names)
+    args = [arg.arg for arg in node.args.args]
+    defaults = len(node.args.defaults)
+    vararg = node.args.vararg.arg if node.args.vararg else None
+    kwarg = node.args.kwonlyargs
+    
+    signature_parts = []
+    if args:
+        signature_parts.extend(args)
+    if vararg:
+        signature_parts.append(f"*{vararg}")
+    if kwarg:
+        signature_parts.extend([kw.arg for kw in kwarg])
+    if node.args.kwarg:
+        signature_parts.append(f"**{node.args.kwarg.arg}")
+        
+    details["signature"] = f"({', '.join(signature_parts)})"
+    details["has_defaults"] = defaults > 0
+    details["is_async"] = isinstance(node, ast.AsyncFunctionDef)
+    
+    # Extract decorators
+    decorators = []
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Name):
+            decorators.append(decorator.id)
+        elif isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Name):
+            decorators.append(decorator.func.id)
+    details["decorators"] = set(decorators)
+    
+    # Store all the semantic information the visitor collected
+    for name, value in metrics.items():
+        if name == "control_flow_statements":
+            details["control_flow"] = value
+        elif name != "decorators":
+            details[name] = value
+    return details
+
+
+def _class_details(node, source_hash: str) -> Dict[str, Any]:
+    details = {"source_hash": source_hash}
+    
+    bases = []
+    for base in node.bases:
+        if isinstance(base, ast.Name):
+            bases.append(base.id)
+    details["base_classes"] = set(bases)
+    
+    # Extract decorators for classes too
+    decorators = []
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Name):
+            decorators.append(decorator.id)
+    details["decorators"] = set(decorators)
+    
+    # Count methods and attributes
+    methods = []
+    attributes = []
+    for item in node.body:
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            methods.append(item.name)
+        elif isinstance(item, ast.Assign):
+            for target in item.targets:
+                if isinstance(target, ast.Name):
+                    attributes.append(target.id)
+    details["methods"] = set(methods)
+    details["attributes"] = set(attributes)
+    return details
+
+
+class ModuleDetailVisitor(FunctionDetailVisitor):
+    """
+    Single pass over a module that collects imports, function and class
+    definitions and per-function details together.
+    
+    Function counters accumulate into the innermost enclosing function and
+    are folded into the outer one when it ends, so every function still
+    reports its whole body (nested functions included) without being
+    visited again. Each definition gets a hash built bottom-up from its
+    children's hashes, in place of keeping its unparsed source.
+    
+    Definitions listed in ``untouched`` (id(node) -> hash of their source
+    text) are only walked for imports, nested definitions and the lambda and
+    comprehension counts layer 4 needs. ``check`` (the parser's
+    check_deadline) is called every _CHECK_INTERVAL nodes.
+    """
+    
+    def __init__(self, untouched: Optional[Dict[int, bytes]] = None, check=None):
+        super().__init__()
+        self.untouched = untouched or {}
+        self.check = check
+        self._visited = 0
+        self.dependencies = set()
+        # [depth, preorder index, node_id, details], to order definitions like ast.walk
+        self.definitions = []
+        self._children = [[]]
+        self._depth = 0
+        self._functions = 0
+        self._fp_counts = [0] * 5
+    
+    def nodes(self) -> Dict[str, Dict[str, Any]]:
+        """node_id -> details; like the ast.walk scan it replaces, the last definition of a name wins."""
+        nodes = {}
+        for _, _, node_id, details in sorted(self.definitions, key=lambda entry: entry[:2]):
+            nodes[node_id] = details
+        return nodes
+    
+    def visit(self, node):
+        if self.check is not None:
+            self._visited += 1
+            if not self._visited % _CHECK_INTERVAL:
+                self.check()
+        if not node._fields:
+            # Operators and expression contexts
+            digest = _LEAF_DIGESTS.get(type(node))
+            if digest is None:
+                digest = _LEAF_DIGESTS[type(node)] = _node_digest(node, [])
+            self._children[-1].append(digest)
+            return
+        
+        self._depth += 1
+        if isinstance(node, _DEFINITION_TYPES):
+            if id(node) in self.untouched:
+                self._visit_untouched(node, self._depth)
+                self._children[-1].append(self.untouched[id(node)])
+            else:
+                self._visit_definition(node)
+        else:
+            self._add_import(node)
+            self._children.append([])
+            if self._functions:
+                super().visit(node)
+            else:
+                self.generic_visit(node)
+            digest = _node_digest(node, self._children.pop())
+            self._children[-1].append(digest)
+        self._depth -= 1
+    
+    def _add_import(self, node):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                self.dependencies.add(alias.name)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            self.dependencies.add(node.module)
+    
+    def _open_definition(self, node, depth: int) -> list:
+        node_type = "class" if isinstance(node, ast.ClassDef) else "func"
+        entry = [depth, len(self.definitions), f"{node_type}:{node.name}", None]
+        self.definitions.append(entry)
+        return entry
+    
+    def _visit_definition(self, node):
+        entry = self._open_definition(node, self._depth)
+        self._children.append([])
+        if isinstance(node, ast.ClassDef):
+            if self._functions:
+                self.class_definitions += 1
+            self.generic_visit(node)
+            digest = _node_digest(node, self._children.pop())
+            entry[3] = _class_details(node, digest.hex())
+        else:
+            outer = {name: getattr(self, name) for name in _METRIC_FIELDS}
+            FunctionDetailVisitor.__init__(self)
+            self.async_features["async_def"] = isinstance(node, ast.AsyncFunctionDef)
+            self._functions += 1
+            self.generic_visit(node)
+            self._functions -= 1
+            metrics = {name: getattr(self, name) for name in _METRIC_FIELDS}
+            for name, value in outer.items():
+                setattr(self, name, value)
+            if self._functions:
+                self._merge_metrics(metrics)
+            digest = _node_digest(node, self._children.pop())
+            entry[3] = _function_details(node, digest.hex(), metrics)
+        self._children[-1].append(digest)
+    
+    def _merge_metrics(self, metrics: Dict[str, Any]):
+        """Fold a nested function's counters into the enclosing function's."""
+        for name, value in metrics.items():
+            current = getattr(self, name)
+            if isinstance(value, set):
+                current |= value
+            elif isinstance(value, dict):
+                for key, count in value.items():
+                    if not isinstance(count, bool):  # async_def belongs to the function itself
+                        current[key] += count
+            else:
+                setattr(self, name, current + value)
+    
+    def _visit_untouched(self, node, depth: int):
+        if self.check is not None:
+            self.check()
+        entry = self._open_definition(node, depth)
+        start = list(self._fp_counts)
+        for child in ast.iter_child_nodes(node):
+            self._walk_untouched(child, depth + 1)
+        details = {"source_hash": self.untouched[id(node)].hex()}
+        if not isinstance(node, ast.ClassDef):
+            lambdas, list_comps, dict_comps, set_comps, generators = (
+                end - begin for end, begin in zip(self._fp_counts, start))
+            details["lambda_functions"] = lambdas
+            details["comprehensions"] = {"list": list_comps, "dict": dict_comps, "set": set_comps,
+                                         "generator": generators}
+        entry[3] = details
+    
+    def _walk_untouched(self, node, depth: int):
+        if isinstance(node, _DEFINITION_TYPES):
+            self._visit_untouched(node, depth)
+            return
+        kind = _FP_KINDS.get(type(node))
+        if kind is not None:
+            self._fp_counts[kind] += 1
+        else:
+            self._add_import(node)
+        for child in ast.iter_child_nodes(node):
+            self._walk_untouched(child, depth + 1)
+
+
 class PythonParser(BaseParser):
     """Python-specific parser using AST analysis."""
     
+    # 2: nodes carry a source_hash instead of their unparsed source
+    parser_version = "2"
+    
+    scoped_parsing = True
+    
     def __init__(self):
         super().__init__()
         self.supported_extensions = {'.py', '.pyw', '.pyi'}
         self.language_name = "Python"
     
+    def get_backend_name(self) -> str:
+        """ast output depends on the interpreter version."""
+        return f"ast-py{sys.version_info[0]}.{sys.version_info[1]}"
+    
     def parse_code(self, source_code: str) -> tuple:
         """
         Parses Python source code and extracts module-level dependencies
         and a dictionary of semantic nodes.
         """
-        nodes = {}
-        module_dependencies = set()
+        return self._visit_tree(self._parse_tree(source_code))
+    
+    def parse_changes(self, before_code: str, after_code: str) -> tuple:
+        """
+        Parse both versions, extracting full details only where the diff touches.
+        
+        A function or class whose lines (decorators included) lie in one
+        unchanged run of lines, and map exactly onto the same node in the other
+        version, gets an identity record on both sides: a hash of its source
+        text plus the counts layer 4 sums over the whole file. Names defined
+        more than once keep full details, so the last definition still wins,
+        and so do the definitions around them and any nested in a changed
+        function (whose details cover its whole body).
+        """
+        before_tree = self._parse_tree(before_code)
+        after_tree = self._parse_tree(after_code)
+        self.check_deadline()
+        if before_tree is None or after_tree is None:
+            return self._visit_tree(before_tree), self._visit_tree(after_tree)
+        
+        before_defs = list(self._definitions(before_tree))
+        after_defs = list(self._definitions(after_tree))
+        before_lines = _LINE_BREAK.split(before_code)
+        after_lines = _LINE_BREAK.split(after_code)
+        unchanged = self._unchanged_sources(before_defs, after_defs, before_lines, after_lines)
+        self.check_deadline()
+        
+        # Untouched definitions are walked without details, so nothing inside
+        # them may need details, and neither may an enclosing function
+        skipped = set(unchanged)
+        changed = True
+        while changed:
+            changed = False
+            for definitions in (before_defs, after_defs):
+                for node_id, _, enclosing in definitions:
+                    if node_id in skipped:
+                        if any(is_function and parent not in skipped for parent, is_function in enclosing):
+                            skipped.discard(node_id)
+                            changed = True
+                    else:
+                        for parent, _ in enclosing:
+                            if parent in skipped:
+                                skipped.discard(parent)
+                                changed = True
+        
+        digests = {node_id: _text_digest(unchanged[node_id]) for node_id in skipped}
+        return tuple(
+            self._visit_tree(tree, {id(node): digests[node_id] for node_id, node, _ in definitions
+                                    if node_id in digests})
+            for tree, definitions in ((before_tree, before_defs), (after_tree, after_defs))
+        )
+    
+    def _visit_tree(self, tree: Optional[ast.AST], untouched: Optional[Dict[int, bytes]] = None) -> tuple:
+        if tree is None:
+            return {}, set()
+        visitor = ModuleDetailVisitor(untouched, self.check_deadline if self.deadline is not None else None)
+        visitor.visit(tree)
+        return visitor.nodes(), visitor.dependencies
+    
+    def _parse_tree(self, source_code: str) -> Optional[ast.AST]:
         if not source_code:
-            return nodes, module_dependencies
-            
+            return None
         try:
-            tree = ast.parse(source_code)
-            
-            # Find all module-level imports
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        module_dependencies.add(alias.name)
-                elif isinstance(node, ast.ImportFrom) and node.module:
-                    module_dependencies.add(node.module)
-            
-            # Find all function and class definitions
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        node_type = "func"
-                    else:
-                        node_type = "class"
-                    node_id = f"{node_type}:{node.name}"
-                    nodes[node_id] = self.get_node_details(node)
-                    
+            return ast.parse(source_code)
         except SyntaxError:
             print("Warning: Could not parse Python file due to a syntax error.")
-            
-        return nodes, module_dependencies
+            return None
+    
+    def _definitions(self, node: ast.AST, enclosing: tuple = ()):
+        """
+        Yield (node_id, node, enclosing) for every function and class definition.
+        
+        Only statement bodies are walked, since definitions cannot appear inside
+        expressions. ``enclosing`` lists (node_id, is_function) of the outer
+        definitions.
+        """
+        for _, value in ast.iter_fields(node):
+            if not isinstance(value, list):
+                continue
+            for child in value:
+                if isinstance(child, _DEFINITION_TYPES):
+                    is_function = not isinstance(child, ast.ClassDef)
+                    node_id = f"{'func' if is_function else 'class'}:{child.name}"
+                    yield node_id, child, enclosing
+                    yield from self._definitions(child, enclosing + ((node_id, is_function),))
+                elif isinstance(child, _BLOCK_TYPES):
+                    yield from self._definitions(child, enclosing)
+    
+    @staticmethod
+    def _span(node) -> tuple:
+        """First and last line of a definition, decorators included."""
+        start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+        return start, node.end_lineno
+    
+    def _unchanged_sources(self, before_defs, after_defs, before_lines, after_lines) -> Dict[str, str]:
+        """node_id -> source text of the definitions the diff leaves untouched."""
+        def unique_spans(definitions):
+            spans, seen = {}, set()
+            for node_id, node, _ in definitions:
+                if node_id in seen:
+                    spans.pop(node_id, None)
+                else:
+                    seen.add(node_id)
+                    spans[node_id] = self._span(node)
+            return spans
+        
+        before_spans = unique_spans(before_defs)
+        after_spans = unique_spans(after_defs)
+        # Runs of identical lines as (before start, after start, length), 1-based
+        matcher = difflib.SequenceMatcher(None, before_lines, after_lines)
+        equal_runs = [(i + 1, j + 1, size) for i, j, size in matcher.get_matching_blocks() if size]
+        
+        unchanged = {}
+        for node_id, (start, end) in before_spans.items():
+            after_span = after_spans.get(node_id)
+            if after_span is None:
+                continue
+            for before_start, after_start, size in equal_runs:
+                if before_start <= start and end < before_start + size:
+                    offset = after_start - before_start
+                    if after_span == (start + offset, end + offset):
+                        unchanged[node_id] = "\n".join(before_lines[start - 1:end])
+                    break
+        return unchanged
     
     def get_node_details(self, node) -> Dict[str, Any]:
         """Extracts detailed information from a single AST function or class node."""
-        details = {"source": ast.unparse(node)}
-        
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            # Extract function signature (argument names)
-            args = [arg.arg for arg in node.args.args]
-            defaults = len(node.args.defaults)
-            vararg = node.args.vararg.arg if node.args.vararg else None
-            kwarg = node.args.kwonlyargs
-            kwarg_defaults = node.args.kw_defaults
-            
-            signature_parts = []
-            if args:
-                signature_parts.extend(args)
-            if vararg:
-                signature_parts.append(f"*{vararg}")
-            if kwarg:
-                signature_parts.extend([kw.arg for kw in kwarg])
-            if node.args.kwarg:
-                signature_parts.append(f"**{node.args.kwarg.arg}")
-                
-            details["signature"] = f"({', '.join(signature_parts)})"
-            details["has_defaults"] = defaults > 0
-            details["is_async"] = isinstance(node, ast.AsyncFunctionDef)
-            
-            # Extract decorators
-            decorators = []
-            for decorator in node.decorator_list:
-                if isinstance(decorator, ast.Name):
-                    decorators.append(decorator.id)
-                elif isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Name):
-                    decorators.append(decorator.func.id)
-            details["decorators"] = set(decorators)
-
-            # Use the visitor to get deep details
-            visitor = FunctionDetailVisitor()
-            if isinstance(node, ast.AsyncFunctionDef):
-                visitor.async_features["async_def"] = True
-            visitor.visit(node)
-            
-            # Debug: Check what boolean literals were found
-            # print(f"DEBUG: Function {node.name} boolean literals: {visitor.boolean_literals}")
-            
-            # Store all the extracted semantic information
-            details["calls"] = visitor.calls
-            details["exception_handlers"] = visitor.exception_handlers
-            details["control_flow"] = visitor.control_flow_statements
-            details["return_statements"] = visitor.return_statements
-            details["yield_statements"] = visitor.yield_statements
-            details["async_features"] = visitor.async_features
-            details["comprehensions"] = visitor.comprehensions
-            details["lambda_functions"] = visitor.lambda_functions
-            details["class_definitions"] = visitor.class_definitions
-            details["global_statements"] = visitor.global_statements
-            details["nonlocal_statements"] = visitor.nonlocal_statements
-            details["assert_statements"] = visitor.assert_statements
-            details["string_literals"] = visitor.string_literals
-            details["numeric_literals"] = visitor.numeric_literals
-            details["boolean_literals"] = visitor.boolean_literals
-            details["none_literals"] = visitor.none_literals
-            details["attribute_access"] = visitor.attribute_access
-            details["subscript_access"] = visitor.subscript_access
-            details["binary_operators"] = visitor.binary_operators
-            details["unary_operators"] = visitor.unary_operators
-            details["comparison_operators"] = visitor.comparison_operators
-            details["logical_operators"] = visitor.logical_operators
-            details["assignment_targets"] = visitor.assignment_targets
-            details["augmented_assignments"] = visitor.augmented_assignments
-            details["starred_expressions"] = visitor.starred_expressions
-            details["slice_expressions"] = visitor.slice_expressions
-            
-        elif isinstance(node, ast.ClassDef):
-            # Extract class-specific information
-            bases = []
-            for base in node.bases:
-                if isinstance(base, ast.Name):
-                    bases.append(base.id)
-            details["base_classes"] = set(bases)
-            
-            # Extract decorators for classes too
-            decorators = []
-            for decorator in node.decorator_list:
-                if isinstance(decorator, ast.Name):
-                    decorators.append(decorator.id)
-            details["decorators"] = set(decorators)
-            
-            # Count methods and attributes
-            methods = []
-            attributes = []
-            for item in node.body:
-                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    methods.append(item.name)
-                elif isinstance(item, ast.Assign):
-                    for target in item.targets:
-                        if isinstance(target, ast.Name):
-                            attributes.append(target.id)
-            details["methods"] = set(methods)
-            details["attributes"] = set(attributes)
-            
-        return details
+        visitor = ModuleDetailVisitor()
+        visitor.visit(node)
+        return visitor.definitions[0][3]
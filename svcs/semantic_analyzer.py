@@ -19,15 +19,20 @@ from pathlib import Path
 
 # Import modular components
 from .analyzers.comprehensive_analyzer import ComprehensiveAnalyzer
-from .storage import initialize_database, store_commit_events, get_recent_events, get_event_statistics
+from .storage import initialize_database, store_commit_analysis, get_recent_events, get_event_statistics
+from .git_objects import get_object_reader
 
 class SVCSModularAnalyzer:
     """
     Modular semantic analyzer with complete 5-layer analysis system.
     """
     
-    def __init__(self, repo_path: str = None):
-        """Initialize the analyzer for a specific repository."""
+    def __init__(self, repo_path: str = None, jobs: int = None):
+        """Initialize the analyzer for a specific repository.
+
+        jobs caps the comprehensive analyzer's file worker processes (see
+        ComprehensiveAnalyzer); None uses SVCS_ANALYSIS_JOBS or the CPU count.
+        """
         # Use current working directory if no repo_path provided
         self.repo_path = repo_path or os.getcwd()
         
@@ -56,9 +61,10 @@ class SVCSModularAnalyzer:
         initialize_database(self.db_path)
         
         # Initialize comprehensive analyzer with all 5 layers
-        self.comprehensive_analyzer = ComprehensiveAnalyzer()
+        self.comprehensive_analyzer = ComprehensiveAnalyzer(jobs=jobs)
     
-    def analyze_file_changes(self, filepath: str, before_content: str, after_content: str) -> List[Dict[str, Any]]:
+    def analyze_file_changes(self, filepath: str, before_content: str, after_content: str,
+                             before_blob: str = None, after_blob: str = None) -> List[Dict[str, Any]]:
         """
         Analyze changes between two versions of a file using all 5 layers.
         
@@ -66,18 +72,25 @@ class SVCSModularAnalyzer:
             filepath: Path to the file being analyzed
             before_content: Content of the file before changes
             after_content: Content of the file after changes
+            before_blob: Optional git blob SHA of before_content (enables the parse cache)
+            after_blob: Optional git blob SHA of after_content (enables the parse cache)
             
         Returns:
             List of semantic events detected across all layers
         """
-        return self.comprehensive_analyzer.analyze_file_changes(filepath, before_content, after_content)
+        return self.comprehensive_analyzer.analyze_file_changes(
+            filepath, before_content, after_content,
+            before_blob=before_blob, after_blob=after_blob
+        )
     
-    def analyze_commit(self, commit_hash: str = None) -> List[Dict[str, Any]]:
+    def analyze_commit(self, commit_hash: str = None, store: bool = True) -> List[Dict[str, Any]]:
         """
         Analyze a specific commit for semantic changes using all 5 layers.
         
         Args:
             commit_hash: Git commit hash to analyze (defaults to HEAD)
+            store: Persist the events in .svcs/semantic.db (on the current branch)
+                and as the commit's semantic git note
             
         Returns:
             List of semantic events detected in the commit
@@ -96,15 +109,20 @@ class SVCSModularAnalyzer:
         # Use comprehensive analyzer for commit analysis
         all_events = self.comprehensive_analyzer.analyze_commit(commit_hash, self.repo_path)
         
-        # Store events in database
-        if all_events:
-            store_commit_events(self.db_path, commit_hash, commit_metadata, all_events)
+        # Store events in database and as a git note, like every other writer
+        if all_events and store:
+            store_commit_analysis(self.repo_path, commit_hash, all_events)
         
         return all_events
     
     def analyze_commit_changes(self, commit_hash: str = None) -> List[Dict[str, Any]]:
-        """Analyze semantic changes in a commit (alias for analyze_commit)."""
-        return self.analyze_commit(commit_hash)
+        """
+        Analyze semantic changes in a commit without storing them.
+        
+        Hooks and workers persist the result once, together with the git note,
+        through RepositoryLocalSVCS.analyze_and_store_commit.
+        """
+        return self.analyze_commit(commit_hash, store=False)
     
     def get_recent_events(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent semantic events from the database."""
@@ -273,62 +291,13 @@ exit 0
     def _get_changed_files(self, commit_hash: str) -> List[str]:
         """Get list of files changed in a commit."""
         try:
-            result = subprocess.run(
-                ['git', 'diff-tree', '--no-commit-id', '--name-only', '-r', commit_hash],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return [f.strip() for f in result.stdout.split('\\n') if f.strip()]
+            return [change.path for change in get_object_reader(self.repo_path).changed_files(commit_hash)]
         except subprocess.CalledProcessError:
             return []
     
     def _get_file_contents_for_commit(self, file_path: str, commit_hash: str) -> tuple:
         """Get before and after contents of a file for a commit."""
-        # Get the previous commit
-        try:
-            result = subprocess.run(
-                ['git', 'rev-parse', f'{commit_hash}^'],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            parent_hash = result.stdout.strip()
-        except subprocess.CalledProcessError:
-            parent_hash = None
-        
-        # Get before content (from parent commit)
-        before_content = ""
-        if parent_hash:
-            try:
-                result = subprocess.run(
-                    ['git', 'show', f'{parent_hash}:{file_path}'],
-                    cwd=self.repo_path,
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    before_content = result.stdout
-            except subprocess.CalledProcessError:
-                pass
-        
-        # Get after content (from current commit)
-        after_content = ""
-        try:
-            result = subprocess.run(
-                ['git', 'show', f'{commit_hash}:{file_path}'],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            after_content = result.stdout
-        except subprocess.CalledProcessError:
-            pass
-        
-        return before_content, after_content
+        return self.comprehensive_analyzer._get_file_contents_for_commit(file_path, commit_hash, self.repo_path)
     
     def _should_analyze_file(self, file_path: str) -> bool:
         """Check if a file should be analyzed for semantic changes."""
@@ -1,83 +1,52 @@
-# SVCS Modular Storage - Extracted from .svcs/storage.py
+# SVCS Modular Storage
 # Database operations for storing semantic events
+#
+# Thin functional API over RepositoryLocalDatabase, so every writer shares
+# one schema (.svcs/semantic.db with branch-aware, UUID-keyed events).
 
-import sqlite3
+import sys
+from pathlib import Path
+
+try:
+    from svcs_repo_connections import get_connection
+    from svcs_repo_local import RepositoryLocalDatabase, RepositoryLocalSVCS
+    from svcs_repo_stats import get_event_stats
+except ImportError:
+    # Development mode fallback
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from svcs_repo_connections import get_connection
+    from svcs_repo_local import RepositoryLocalDatabase, RepositoryLocalSVCS
+    from svcs_repo_stats import get_event_stats
+
+def _get_database(db_path):
+    """Open the repository-local database that lives at db_path."""
+    db_path = Path(db_path)
+    repo_path = db_path.parent.parent if db_path.parent.name == ".svcs" else db_path.parent
+    return RepositoryLocalDatabase(str(repo_path), db_path=str(db_path))
 
 def initialize_database(db_path):
     """Creates the database and tables if they don't already exist."""
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        # Create commits table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS commits (
-                commit_hash TEXT PRIMARY KEY,
-                author TEXT NOT NULL,
-                timestamp INTEGER NOT NULL
-            )
-        """)
-        # Create semantic_events table with AI analysis fields
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS semantic_events (
-                event_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                commit_hash TEXT NOT NULL,
-                event_type TEXT NOT NULL,
-                node_id TEXT,
-                location TEXT,
-                details TEXT,
-                layer TEXT,
-                layer_description TEXT,
-                confidence REAL,
-                reasoning TEXT,
-                impact TEXT,
-                created_at INTEGER NOT NULL,
-                FOREIGN KEY (commit_hash) REFERENCES commits (commit_hash)
-            )
-        """)
-        conn.commit()
+    _get_database(db_path)
 
-def store_commit_events(db_path, commit_hash, commit_metadata, events):
-    """Stores the analysis results for a single commit in the database."""
-    import time
-    
-    current_time = int(time.time())
-    
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        
-        # Insert the commit record, ignoring if it already exists
-        cursor.execute("""
-            INSERT OR IGNORE INTO commits (commit_hash, author, timestamp)
-            VALUES (?, ?, ?)
-        """, (commit_hash, commit_metadata["author"], commit_metadata["timestamp"]))
-        
-        # Insert all semantic events for this commit with AI analysis fields
-        events_to_store = [
-            (
-                commit_hash,
-                event.get("event_type"),
-                event.get("node_id"),
-                event.get("location"),
-                event.get("details"),
-                event.get("layer"),
-                event.get("layer_description"),
-                event.get("confidence"),
-                event.get("reasoning"),
-                event.get("impact"),
-                current_time,  # created_at
-            )
-            for event in events
-        ]
-        
-        cursor.executemany("""
-            INSERT INTO semantic_events (commit_hash, event_type, node_id, location, details, layer, layer_description, confidence, reasoning, impact, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, events_to_store)
-        
-        conn.commit()
+def store_commit_events(db_path, commit_hash, commit_metadata, events, branch=None):
+    """Stores the analysis results for a single commit in the database.
+
+    branch defaults to the repository's current branch.
+    """
+    _get_database(db_path).store_semantic_events(
+        events, commit_hash=commit_hash, branch=branch, commit_metadata=commit_metadata
+    )
+
+def store_commit_analysis(repo_path, commit_hash, events, branch=None):
+    """Stores a commit's events and writes its semantic git note, like the hooks do.
+
+    Returns (stored event count, whether the note was written).
+    """
+    return RepositoryLocalSVCS(str(repo_path)).analyze_and_store_commit(commit_hash, events, branch=branch)
 
 def get_recent_events(db_path, limit=20):
     """Retrieve recent semantic events from the database."""
-    with sqlite3.connect(db_path) as conn:
+    with get_connection(db_path) as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT e.event_type, e.node_id, e.location, e.details, 
@@ -103,29 +72,15 @@ def get_recent_events(db_path, limit=20):
         return events
 
 def get_event_statistics(db_path):
-    """Get statistics about stored semantic events."""
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        
-        # Total events
-        cursor.execute("SELECT COUNT(*) FROM semantic_events")
-        total_events = cursor.fetchone()[0]
-        
-        # Events by type
-        cursor.execute("""
-            SELECT event_type, COUNT(*) 
-            FROM semantic_events 
-            GROUP BY event_type 
-            ORDER BY COUNT(*) DESC
-        """)
-        events_by_type = cursor.fetchall()
+    """Get statistics about stored semantic events (from the event_stats rollup)."""
+    with get_connection(db_path) as conn:
+        stats = get_event_stats(conn, groupings=["event_types"])
         
         # Total commits analyzed
-        cursor.execute("SELECT COUNT(*) FROM commits")
-        total_commits = cursor.fetchone()[0]
+        total_commits = conn.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
         
         return {
-            'total_events': total_events,
+            'total_events': stats['total_events'],
             'total_commits': total_commits,
-            'events_by_type': dict(events_by_type)
+            'events_by_type': stats['event_types']
         }
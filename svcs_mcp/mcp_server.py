@@ -39,7 +39,7 @@ except ImportError as e:
 # Import SVCS API functions
 try:
     from svcs.api import (
-        search_events_advanced, get_recent_activity, search_semantic_patterns,
+        search_events_advanced, get_recent_activity, search_semantic_patterns, get_next_cursor,
         get_filtered_evolution, debug_query_tools, get_commit_summary,
         get_commit_changed_files, get_repository_status
     )
@@ -113,7 +113,8 @@ async def handle_list_tools() -> List[Tool]:
                     "event_types": {"type": "array", "items": {"type": "string"}, "description": "Event type filters (optional)"},
                     "location_pattern": {"type": "string", "description": "Location pattern filter (optional)"},
                     "since_date": {"type": "string", "description": "Date filter (YYYY-MM-DD or 'N days ago') (optional)"},
-                    "limit": {"type": "number", "description": "Max results (default 10)"}
+                    "limit": {"type": "number", "description": "Max results (default 10)"},
+                    "cursor": {"type": "string", "description": "Next page cursor from a previous result (optional)"}
                 },
                 "required": ["project_path"]
             }
@@ -324,6 +325,8 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.T
                 kwargs["min_confidence"] = arguments.get("min_confidence")
             if arguments.get("limit"):
                 kwargs["limit"] = arguments.get("limit")
+            if arguments.get("cursor"):
+                kwargs["cursor"] = arguments.get("cursor")
             
             try:
                 original_cwd = change_to_project_dir(project_path)
@@ -331,6 +334,9 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.T
                 try:
                     events = search_events_advanced(**kwargs)
                     result = format_events_result(events, "Advanced Search Results")
+                    next_cursor = get_next_cursor(events, kwargs.get("limit", 20))
+                    if next_cursor:
+                        result += f"➡️ More results: call again with cursor `{next_cursor}`\n"
                     return [types.TextContent(type="text", text=result)]
                 finally:
                     os.chdir(original_cwd)
@@ -16,6 +16,13 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    from svcs_repo_connections import get_connection
+except ImportError:
+    # Development mode fallback
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from svcs_repo_connections import get_connection
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -46,8 +53,8 @@ class GlobalSVCSDatabase:
         (SVCS_HOME / "cache").mkdir(exist_ok=True)
     
     def get_connection(self):
-        """Get database connection."""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's pooled database connection (WAL mode)."""
+        return get_connection(self.db_path)
     
     def init_schema(self):
         """Initialize the global database schema."""
@@ -379,15 +379,25 @@ class RepositoryLocalMCPServer:
     
     async def analyze_current_commit(self, project_path: str) -> Dict[str, Any]:
         """Analyze the current/latest commit for semantic changes."""
+        svcs = self.repo_manager.get_repository(project_path)
         analyzer = self.repo_manager.get_analyzer(project_path)
-        if not analyzer:
+        if not svcs or not analyzer:
             return {"error": f"Repository not found: {project_path}"}
         
         try:
-            events = analyzer.analyze_commit_changes()
+            result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=project_path,
+                                    capture_output=True, text=True, check=True)
+            commit_hash = result.stdout.strip()
+            events = analyzer.analyze_commit_changes(commit_hash)
+            # Same writer as the hooks: events and the semantic git note together
+            stored_count, notes_written = (svcs.analyze_and_store_commit(commit_hash, events)
+                                           if events else (0, False))
             return {
                 "success": True,
+                "commit_hash": commit_hash,
                 "events_detected": len(events),
+                "events_stored": stored_count,
+                "notes_written": notes_written,
                 "events": events
             }
         except Exception as e:
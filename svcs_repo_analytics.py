@@ -30,7 +30,7 @@ import argparse
 # Import from repository-local .svcs/api.py
 sys.path.insert(0, 'svcs')
 try:
-    from api import get_full_log, get_valid_commit_hashes
+    from api import get_branch_event_counts, get_full_log, get_valid_commit_hashes, resolves_revision
 except ImportError:
     print("❌ Error: Could not import from .svcs/api.py")
     print("   Make sure you're running this from a repository with SVCS initialized")
@@ -71,31 +71,15 @@ def get_git_info():
         }
 
 def get_events_for_branch(branch=None):
-    """Get semantic events filtered by git branch."""
-    events = get_full_log()
-    
-    if not branch:
-        return events
-        
-    # Filter events by git commits on the specified branch
-    try:
-        # Get commits on the specified branch
-        branch_commits = subprocess.run(
-            ['git', 'rev-list', branch],
-            capture_output=True, text=True, check=True
-        ).stdout.strip().split('\n')
-        branch_commits = set(commit for commit in branch_commits if commit)
-        
-        # Filter events to only those on this branch
-        filtered_events = [
-            event for event in events 
-            if event.get('commit_hash', '').startswith(tuple(branch_commits)) if branch_commits
-        ]
-        return filtered_events
-        
-    except subprocess.CalledProcessError:
+    """Get semantic events filtered by git branch.
+
+    The filter runs in SQL against the commits the branch reaches (see
+    svcs_repo_reachability), so no event outside the branch is loaded.
+    """
+    if branch and not resolves_revision(branch):
         print(f"⚠️  Warning: Could not get commits for branch '{branch}', showing all events")
-        return events
+        return get_full_log()
+    return get_full_log(branch=branch)
 
 def generate_repository_analytics_report(branch=None):
     """Generate comprehensive analytics about semantic code evolution for this repository."""
@@ -156,9 +140,10 @@ def generate_repository_analytics_report(branch=None):
     # Git Branch Analysis (if multiple branches available)
     if len(git_info['all_branches']) > 1 and not branch:
         print(f"\n🌿 BRANCH ANALYSIS")
-        for branch_name in git_info['all_branches'][:5]:  # Top 5 branches
-            branch_events = get_events_for_branch(branch_name)
-            print(f"   {branch_name:<15} {len(branch_events):>3} events")
+        # Counted in SQL; the events loaded above serve every other section
+        branch_counts = get_branch_event_counts(git_info['all_branches'][:5])  # Top 5 branches
+        for branch_name, count in branch_counts.items():
+            print(f"   {branch_name:<15} {count:>3} events")
     
     # Temporal Analysis
     analyze_temporal_patterns(events)
@@ -272,7 +257,7 @@ def generate_git_enhanced_json_report(events, output_file='svcs_analytics.json')
 def show_git_enhanced_timeline(branch=None):
     """Show a git-aware timeline of major semantic changes."""
     
-    events = get_events_for_branch(branch) if branch else get_full_log()
+    events = get_events_for_branch(branch)
     
     if not events:
         return
@@ -365,7 +350,7 @@ def main():
             generate_repository_analytics_report(args.branch)
             
         if args.export_json:
-            events = get_events_for_branch(args.branch) if args.branch else get_full_log()
+            events = get_events_for_branch(args.branch)
             generate_git_enhanced_json_report(events)
             
         if not args.compare_branches and not args.timeline:
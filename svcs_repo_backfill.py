@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Repository History Backfill for SVCS
+
+Analyzes existing repository history with the comprehensive analyzer:
+1. Commits are fanned out to a process pool (one analyzer per worker)
+2. Results stream back to a single writer in the parent process
+3. Progress is checkpointed in .svcs/semantic.db, so an interrupted run
+   resumes where it stopped
+4. Throughput is reported in commits/sec
+5. With notes=True the results are also published as semantic git notes,
+   one `git fast-import` pass per checkpointed batch
+6. Each commit's events are stamped with a local branch that reaches it
+   (the current branch when it does), from the reachability index; commits
+   no local branch reaches are stored without a branch
+
+Usage:
+    svcs analyze --all
+    svcs analyze --range main~500..main --jobs 8 --notes
+"""
+
+import logging
+import multiprocessing
+import os
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from svcs_repo_local import RepositoryLocalDatabase
+from svcs_repo_notes import write_notes
+from svcs_repo_reachability import commit_branches
+
+logger = logging.getLogger(__name__)
+
+# Per-worker state, set up by _init_worker in each pool process
+_worker_analyzer = None
+_worker_repo_path = None
+
+
+def _init_worker(repo_path: str):
+    """Build one analyzer per worker process (pool workers cannot start pools of their own)."""
+    global _worker_analyzer, _worker_repo_path
+    from svcs.analyzers.comprehensive_analyzer import ComprehensiveAnalyzer
+    _worker_analyzer = ComprehensiveAnalyzer(jobs=1)
+    _worker_repo_path = repo_path
+
+
+def _analyze_commit(commit_hash: str) -> Tuple[str, List[Dict[str, Any]], Optional[str], Dict[str, int]]:
+    """Analyze one commit in a worker; returns (commit_hash, events, error, file_stats)."""
+    before = dict(_worker_analyzer.stats)
+    try:
+        events = _worker_analyzer.analyze_commit(commit_hash, _worker_repo_path, raise_errors=True)
+        error = None
+    except Exception as e:
+        events, error = [], str(e)
+    # Per-file outcomes of this commit only (generated, vendored, degraded, ...)
+    file_stats = {key: value - before.get(key, 0) for key, value in _worker_analyzer.stats.items()}
+    return commit_hash, events, error, file_stats
+
+
+class RepositoryHistoryBackfill:
+    """Parallel, resumable semantic analysis of existing commits."""
+
+    def __init__(self, repo_path: str, jobs: int = None, batch_size: int = 50, notes: bool = False):
+        self.repo_path = Path(repo_path).resolve()
+        self.db = RepositoryLocalDatabase(str(self.repo_path))
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.notes = notes
+
+    def list_commits(self, rev_range: str = None, all_refs: bool = False) -> List[Tuple[str, Dict[str, Any]]]:
+        """List commits oldest first with their metadata, in one git call."""
+        cmd = ["git", "log", "--reverse", "--format=%H%x00%an%x00%at%x00%s"]
+        if all_refs:
+            cmd.append("--all")
+        elif rev_range:
+            cmd.extend(rev_range.split())
+        else:
+            cmd.append("HEAD")
+        cmd.append("--")
+
+        result = subprocess.run(cmd, cwd=self.repo_path, capture_output=True, text=True, check=True)
+        commits = []
+        for line in result.stdout.splitlines():
+            parts = line.split("\x00")
+            if len(parts) < 4:
+                continue
+            commit_hash, author, timestamp, message = parts[:4]
+            commits.append((commit_hash, {"author": author, "timestamp": int(timestamp), "message": message}))
+        return commits
+
+    def completed_commits(self) -> set:
+        """Commits already checkpointed or analyzed by the hooks."""
+        with self.db.get_connection() as conn:
+            done = {row[0] for row in conn.execute("SELECT commit_hash FROM analysis_progress")}
+            done.update(row[0] for row in conn.execute("SELECT DISTINCT commit_hash FROM semantic_events"))
+        return done
+
+    def run(self, rev_range: str = None, all_refs: bool = False,
+            progress: Callable[[str], None] = print, report_every: float = 5.0) -> Dict[str, Any]:
+        """Analyze every pending commit in the range and return run statistics."""
+        commits = self.list_commits(rev_range, all_refs)
+        done = self.completed_commits()
+        pending = [(commit_hash, meta) for commit_hash, meta in commits if commit_hash not in done]
+        metadata = dict(pending)
+
+        stats = {
+            "total_commits": len(commits),
+            "skipped_commits": len(commits) - len(pending),
+            "analyzed_commits": 0,
+            "stored_events": 0,
+            "failed_commits": 0,
+            "notes_written": 0,
+            "files_analyzed": 0,
+            "files_degraded": 0,
+            "files_skipped": 0,
+            "generated_files": 0,
+            "minified_files": 0,
+            "vendored_files": 0,
+            "elapsed_seconds": 0.0,
+            "commits_per_second": 0.0,
+            "interrupted": False
+        }
+        if not pending:
+            return stats
+
+        self.db.refresh_branch_index(force=True)
+        with self.db.get_connection() as conn:
+            branches = commit_branches(conn, list(metadata), prefer=self.db.get_current_branch())
+        buffer = []
+        start = time.monotonic()
+        last_report = start
+
+        def flush():
+            if not buffer:
+                return
+            now = int(datetime.now().timestamp())
+            with self.db.get_connection() as conn:
+                for commit_hash, events in buffer:
+                    for event in events:
+                        event["commit_hash"] = commit_hash
+                    self.db.store_semantic_events(
+                        events, commit_hash=commit_hash, branch=branches.get(commit_hash, ""),
+                        commit_metadata=metadata[commit_hash], conn=conn
+                    )
+                    conn.execute("""
+                        INSERT OR REPLACE INTO analysis_progress (commit_hash, event_count, analyzed_at)
+                        VALUES (?, ?, ?)
+                    """, (commit_hash, len(events), now))
+                if self.notes:
+                    # Written before the checkpoint commits, so a crash never skips a batch's notes
+                    stats["notes_written"] += write_notes(
+                        str(self.repo_path), [(commit_hash, events) for commit_hash, events in buffer if events])
+            buffer.clear()
+
+        def consume(results):
+            nonlocal last_report
+            for commit_hash, events, error, file_stats in results:
+                for key, value in file_stats.items():
+                    stats[key] = stats.get(key, 0) + value
+                if error:
+                    # Not checkpointed, so the next run retries it
+                    stats["failed_commits"] += 1
+                    logger.warning(f"Backfill failed for {commit_hash[:8]}: {error}")
+                    continue
+                buffer.append((commit_hash, events))
+                stats["analyzed_commits"] += 1
+                stats["stored_events"] += len(events)
+                if len(buffer) >= self.batch_size:
+                    flush()
+                if progress and time.monotonic() - last_report >= report_every:
+                    last_report = time.monotonic()
+                    rate = stats["analyzed_commits"] / max(last_report - start, 1e-9)
+                    progress(f"📈 {stats['analyzed_commits']}/{len(pending)} commits "
+                             f"({rate:.1f} commits/s, {stats['stored_events']} events)")
+
+        hashes = [commit_hash for commit_hash, _ in pending]
+        try:
+            if self.jobs == 1:
+                _init_worker(str(self.repo_path))
+                consume(_analyze_commit(commit_hash) for commit_hash in hashes)
+            else:
+                with multiprocessing.Pool(self.jobs, initializer=_init_worker,
+                                          initargs=(str(self.repo_path),)) as pool:
+                    consume(pool.imap_unordered(_analyze_commit, hashes, chunksize=4))
+        except KeyboardInterrupt:
+            stats["interrupted"] = True
+        finally:
+            flush()
+
+        stats["elapsed_seconds"] = time.monotonic() - start
+        stats["commits_per_second"] = stats["analyzed_commits"] / max(stats["elapsed_seconds"], 1e-9)
+        return stats
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Shared SQLite Connections for SVCS
+
+Every SVCS database (the repository-local semantic.db, the web registry and
+the global MCP database) used to open a fresh sqlite3.connect() per call, in
+the default rollback-journal mode. Readers then block while a hook or the
+background worker commits, and every call pays the open + schema parse cost.
+
+This module hands out configured, pooled connections instead:
+
+1. WAL journal mode, so readers never block the writer or each other
+2. synchronous=NORMAL, a busy timeout and tuned cache/mmap/temp pragmas
+3. One connection per (thread, database file), reused across calls
+4. Nested `with get_connection(...)` blocks share a transaction that commits
+   (or rolls back) when the outermost block exits
+5. close() returns the connection to the pool instead of closing it
+
+Connections are never shared between threads or across fork(). A database
+file that is deleted or replaced is reopened on the next checkout.
+
+Environment:
+    SVCS_DB_BUSY_TIMEOUT   milliseconds to wait for a lock (default 5000)
+    SVCS_DB_JOURNAL_MODE   journal mode (default WAL; use DELETE on network filesystems)
+
+Usage:
+    from svcs_repo_connections import get_connection
+
+    with get_connection(db_path) as conn:
+        conn.execute("INSERT ...")
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_JOURNAL_MODE = "WAL"
+# Open connections kept per thread; the least recently used one is closed first
+DEFAULT_MAX_PER_THREAD = 8
+
+# Applied to every new connection (cache_size is in KiB when negative)
+TUNING_PRAGMAS = (
+    ("synchronous", "NORMAL"),
+    ("cache_size", "-16000"),
+    ("mmap_size", str(256 * 1024 * 1024)),
+    ("temp_store", "MEMORY"),
+)
+
+
+def _busy_timeout_ms() -> int:
+    try:
+        return max(0, int(os.environ.get("SVCS_DB_BUSY_TIMEOUT", DEFAULT_BUSY_TIMEOUT_MS)))
+    except ValueError:
+        return DEFAULT_BUSY_TIMEOUT_MS
+
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply the journal mode, busy timeout and tuning pragmas to a connection.
+
+    Pragmas the database refuses (e.g. WAL on a read-only file) are skipped.
+    """
+    busy_timeout = _busy_timeout_ms()
+    journal_mode = os.environ.get("SVCS_DB_JOURNAL_MODE", DEFAULT_JOURNAL_MODE).strip().upper()
+    pragmas = [("busy_timeout", str(busy_timeout))]
+    if journal_mode.isalpha():
+        pragmas.append(("journal_mode", journal_mode))
+    pragmas.extend(TUNING_PRAGMAS)
+    for name, value in pragmas:
+        try:
+            conn.execute(f"PRAGMA {name} = {value}").fetchall()
+        except sqlite3.Error as e:
+            logger.debug(f"Could not set PRAGMA {name}={value}: {e}")
+    return conn
+
+
+def connect(db_path: Union[str, Path], **kwargs) -> sqlite3.Connection:
+    """Open a new, unpooled connection with the SVCS pragmas applied.
+
+    For callers that manage a connection's lifetime themselves (worker
+    processes, one-off scripts). The timeout defaults to the busy timeout.
+    """
+    kwargs.setdefault("timeout", _busy_timeout_ms() / 1000.0)
+    return configure_connection(sqlite3.connect(str(db_path), **kwargs))
+
+
+def _file_identity(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+class PooledConnection:
+    """A pooled sqlite3 connection owned by one thread.
+
+    Behaves like sqlite3.Connection, except that:
+
+    - `with` blocks nest: only the outermost one commits or rolls back
+    - close() rolls back uncommitted work and returns the connection to the pool
+    - row_factory is reset to tuples when the connection is returned
+    """
+
+    def __init__(self, conn: sqlite3.Connection, db_path: str):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_db_path", db_path)
+        object.__setattr__(self, "_identity", _file_identity(db_path))
+        object.__setattr__(self, "_depth", 0)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self) -> "PooledConnection":
+        object.__setattr__(self, "_depth", self._depth + 1)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        object.__setattr__(self, "_depth", max(0, self._depth - 1))
+        if self._depth == 0:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+            self._conn.row_factory = None
+        return False
+
+    def close(self):
+        """Return the connection to the pool (inside a `with` block, a no-op)."""
+        if self._depth:
+            return
+        if self._conn.in_transaction:
+            self._conn.rollback()
+        self._conn.row_factory = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The underlying sqlite3.Connection."""
+        return self._conn
+
+    @property
+    def in_use(self) -> bool:
+        return self._depth > 0
+
+    def _is_stale(self) -> bool:
+        """Whether the database file was deleted or replaced since it was opened."""
+        return self._identity is None or _file_identity(self._db_path) != self._identity
+
+    def _discard(self):
+        try:
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+
+
+class ConnectionPool:
+    """Per-thread pool of configured connections, keyed by database file."""
+
+    def __init__(self, max_per_thread: int = DEFAULT_MAX_PER_THREAD):
+        self.max_per_thread = max(1, max_per_thread)
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Connections inherited over fork() are kept referenced but never used:
+        # closing them in the child could release the parent's locks
+        self._inherited = []
+
+    def _connections(self) -> "OrderedDict[str, PooledConnection]":
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._inherited.append(self._local)
+                    self._local = threading.local()
+                    self._pid = os.getpid()
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = OrderedDict()
+        return connections
+
+    def get(self, db_path: Union[str, Path]) -> PooledConnection:
+        """The calling thread's connection to db_path, opened on first use."""
+        if str(db_path) == ":memory:":
+            # Every in-memory connection is its own database; never share them
+            return PooledConnection(connect(":memory:"), ":memory:")
+
+        key = os.path.abspath(str(db_path))
+        connections = self._connections()
+        pooled = connections.get(key)
+        if pooled is not None and not pooled.in_use and pooled._is_stale():
+            del connections[key]
+            pooled._discard()
+            pooled = None
+        if pooled is None:
+            pooled = PooledConnection(connect(key), key)
+            connections[key] = pooled
+            self._evict(connections)
+        else:
+            connections.move_to_end(key)
+        return pooled
+
+    def _evict(self, connections: "OrderedDict[str, PooledConnection]"):
+        for key in list(connections):
+            if len(connections) <= self.max_per_thread:
+                break
+            if not connections[key].in_use:
+                connections.pop(key)._discard()
+
+    def close_all(self):
+        """Close the calling thread's idle connections (e.g. before deleting a database)."""
+        connections = self._connections()
+        for key in list(connections):
+            if not connections[key].in_use:
+                connections.pop(key)._discard()
+
+
+_default_pool = ConnectionPool()
+
+
+def get_connection(db_path: Union[str, Path]) -> PooledConnection:
+    """Pooled connection to db_path for the calling thread."""
+    return _default_pool.get(db_path)
+
+
+def close_connections():
+    """Close the calling thread's idle pooled connections."""
+    _default_pool.close_all()
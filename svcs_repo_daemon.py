@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Resident Hook Daemon for SVCS
+
+Git hooks otherwise start a fresh interpreter for every commit, import the
+analyzer stack and build all analysis layers (including the LLM availability
+probe) before any analysis starts. The daemon keeps that state warm:
+
+1. One long-lived process per user listens on a Unix socket
+2. Hooks are thin clients that send (repo, hook, args) and print the reply
+3. Analyzers and repository objects are cached per repository in the daemon
+4. If the daemon is not running, hooks fall back to in-process execution
+
+With asynchronous analysis enabled (the default), post-commit never reaches
+the daemon: the client only queues the commit for a background worker.
+
+This module only imports the standard library at module level, so the hook
+client costs little more than interpreter startup.
+
+Usage:
+    svcs daemon start | stop | status
+    python svcs_repo_daemon.py hook post-commit [args...]   # used by git hooks
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 1
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+CONNECT_TIMEOUT = 0.5
+
+# Exit code of `hook --daemon-only` when no daemon answered
+EXIT_DAEMON_UNAVAILABLE = 75
+
+
+def get_socket_path() -> Path:
+    """Per-user socket path (SVCS_DAEMON_SOCKET overrides)."""
+    override = os.environ.get("SVCS_DAEMON_SOCKET")
+    if override:
+        return Path(override)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return Path(runtime_dir) / "svcs" / "daemon.sock"
+    return Path(tempfile.gettempdir()) / f"svcs-{os.getuid()}" / "daemon.sock"
+
+
+def get_default_log_file() -> Path:
+    """Daemon log file used when started in the background."""
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Logs" / "svcs-daemon.log"
+    return Path.home() / ".local" / "share" / "svcs" / "daemon.log"
+
+
+def _send_message(sock: socket.socket, message: Dict[str, Any]):
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _recv_message(sock_file) -> Optional[Dict[str, Any]]:
+    line = sock_file.readline()
+    if not line:
+        return None
+    return json.loads(line.decode("utf-8"))
+
+
+def send_request(message: Dict[str, Any], socket_path: Path = None) -> Optional[Dict[str, Any]]:
+    """Send one request to the daemon; returns None if it is not reachable."""
+    socket_path = socket_path or get_socket_path()
+    if not socket_path.exists():
+        return None
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(socket_path))
+        # Analysis can legitimately take a while once the daemon has the request
+        sock.settimeout(None)
+    except OSError:
+        return None
+    try:
+        with sock, sock.makefile("rb") as sock_file:
+            _send_message(sock, dict(message, protocol=PROTOCOL_VERSION))
+            return _recv_message(sock_file)
+    except (OSError, ValueError):
+        return None
+
+
+def ping(socket_path: Path = None) -> Optional[Dict[str, Any]]:
+    """Daemon status, or None if it is not running."""
+    reply = send_request({"op": "ping"}, socket_path)
+    return reply if reply and reply.get("ok") else None
+
+
+class _HookRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = _recv_message(self.rfile)
+        except ValueError as e:
+            request = None
+            logger.warning(f"Malformed daemon request: {e}")
+        if request is None:
+            return
+
+        reply = self.server.daemon.handle_request(request)
+        try:
+            _send_message(self.request, reply)
+        except OSError as e:
+            logger.warning(f"Client went away before the reply was sent: {e}")
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    # Requests are handled one at a time: hooks redirect the process-wide
+    # stdout/stderr, working directory and GIT_* environment while they run.
+    def handle_timeout(self):
+        self.daemon.idle_timeout_reached = True
+
+
+class HookDaemon:
+    """Long-lived server that runs SVCS hooks with warm analyzers."""
+
+    def __init__(self, socket_path: Path = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.socket_path = Path(socket_path or get_socket_path())
+        self.idle_timeout = idle_timeout
+        self.started_at = time.time()
+        self.requests_handled = 0
+        self.repositories = set()
+        self.idle_timeout_reached = False
+        self._running = False
+        self._server = None
+
+    def bind(self):
+        """Create the socket (in a private directory) and warm up shared state."""
+        socket_dir = self.socket_path.parent
+        socket_dir.mkdir(parents=True, exist_ok=True)
+        os.chmod(socket_dir, 0o700)
+
+        if self.socket_path.exists():
+            if ping(self.socket_path):
+                raise RuntimeError(f"SVCS daemon already running on {self.socket_path}")
+            self.socket_path.unlink()
+
+        self._server = _UnixServer(str(self.socket_path), _HookRequestHandler)
+        self._server.daemon = self
+        self._server.timeout = self.idle_timeout
+        os.chmod(self.socket_path, 0o600)
+
+        # Import the analyzer stack once and keep per-repository instances
+        from svcs.commands.events import enable_warm_instances
+        enable_warm_instances()
+
+    def serve(self):
+        """Handle requests until stopped or idle for idle_timeout seconds."""
+        if self._server is None:
+            self.bind()
+        self._running = True
+        logger.info(f"SVCS daemon listening on {self.socket_path} (pid {os.getpid()})")
+        try:
+            while self._running and not self.idle_timeout_reached:
+                self._server.handle_request()
+        finally:
+            self.close()
+
+    def stop(self):
+        self._running = False
+
+    def close(self):
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            with contextlib.suppress(FileNotFoundError):
+                self.socket_path.unlink()
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        if request.get("protocol") != PROTOCOL_VERSION:
+            return {"ok": False, "error": f"Unsupported protocol {request.get('protocol')}"}
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started_at,
+                "requests": self.requests_handled,
+                "repositories": sorted(self.repositories),
+                "socket": str(self.socket_path)
+            }
+        if op == "shutdown":
+            self.stop()
+            return {"ok": True}
+        if op == "hook":
+            return self._run_hook(request)
+        return {"ok": False, "error": f"Unknown operation: {op}"}
+
+    def _run_hook(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        repo_path = request.get("repo")
+        if not repo_path or not os.path.isdir(repo_path):
+            return {"ok": False, "error": f"Repository not found: {repo_path}"}
+
+        self.requests_handled += 1
+        self.repositories.add(repo_path)
+        output = io.StringIO()
+        saved_cwd = os.getcwd()
+        saved_stdin = sys.stdin
+        saved_env = {key: os.environ.get(key) for key in request.get("env", {})}
+        try:
+            os.chdir(repo_path)
+            os.environ.update(request.get("env", {}))
+            sys.stdin = io.StringIO(request.get("stdin", ""))
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                run_hook_in_process(request["hook"], repo_path, request.get("args", []))
+            return {"ok": True, "output": output.getvalue()}
+        except Exception as e:
+            logger.exception(f"Hook {request.get('hook')} failed in daemon")
+            return {"ok": False, "error": str(e), "output": output.getvalue()}
+        finally:
+            sys.stdin = saved_stdin
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            os.chdir(saved_cwd)
+
+
+def run_hook_in_process(hook_name: str, repo_path: str, hook_args: List[str]):
+    """Run a hook with the regular `svcs process-hook` implementation."""
+    import argparse
+    from svcs.commands.events import process_hook_in_process
+    process_hook_in_process(argparse.Namespace(hook_name=hook_name, path=repo_path, hook_args=hook_args))
+
+
+def run_hook_client(hook_name: str, hook_args: List[str], repo_path: str = None,
+                    daemon_only: bool = False) -> int:
+    """Entry point for git hooks: delegate to the daemon, else run in-process."""
+    # Git runs hooks from the top of the work tree (or the bare repository)
+    repo_path = str(Path(repo_path or os.getcwd()).resolve())
+
+    if hook_name.endswith("post-commit") and _enqueue_post_commit(repo_path):
+        return 0
+
+    reply = None
+    if os.environ.get("SVCS_NO_DAEMON", "").lower() not in ("1", "true", "yes"):
+        # post-receive reads pushed refs from stdin; other hooks do not need it
+        stdin_data = "" if sys.stdin is None or sys.stdin.isatty() or hook_name != "post-receive" else sys.stdin.read()
+        env = {key: value for key, value in os.environ.items() if key.startswith("GIT_")}
+        reply = send_request({"op": "hook", "repo": repo_path, "hook": hook_name,
+                              "args": list(hook_args), "stdin": stdin_data, "env": env})
+        if reply is not None and not reply.get("ok"):
+            print(f"⚠️ SVCS: Daemon could not run {hook_name}: {reply.get('error')}", file=sys.stderr)
+            reply = None
+        if stdin_data:
+            sys.stdin = io.StringIO(stdin_data)
+
+    if reply is not None:
+        sys.stdout.write(reply.get("output", ""))
+        return 0
+    if daemon_only:
+        return EXIT_DAEMON_UNAVAILABLE
+
+    run_hook_in_process(hook_name, repo_path, hook_args)
+    return 0
+
+
+def _enqueue_post_commit(repo_path: str) -> bool:
+    """Queue the new commit for a background worker (see svcs_repo_queue.py)."""
+    try:
+        from svcs_repo_queue import enqueue_post_commit
+        commit_hash = enqueue_post_commit(repo_path)
+    except Exception as e:
+        print(f"⚠️ SVCS: Could not queue commit, analyzing now: {e}", file=sys.stderr)
+        return False
+    if commit_hash:
+        print(f"📥 SVCS: Queued {commit_hash[:8]} for background analysis")
+    return bool(commit_hash)
+
+
+def start_daemon(idle_timeout: float = DEFAULT_IDLE_TIMEOUT, wait: float = 10.0) -> Optional[Dict[str, Any]]:
+    """Start the daemon in the background and wait until it answers."""
+    status = ping()
+    if status:
+        return status
+
+    log_file = get_default_log_file()
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_file, "a") as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "serve", "--idle-timeout", str(idle_timeout)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+            start_new_session=True, cwd=str(Path.home())
+        )
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        status = ping()
+        if status:
+            return status
+        time.sleep(0.1)
+    return None
+
+
+def stop_daemon() -> bool:
+    """Ask a running daemon to exit; returns False if none was running."""
+    reply = send_request({"op": "shutdown"})
+    return bool(reply and reply.get("ok"))
+
+
+def main(argv: List[str] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SVCS resident hook daemon")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the daemon in the foreground")
+    serve_parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+
+    hook_parser = subparsers.add_parser("hook", help="Run a git hook through the daemon")
+    hook_parser.add_argument("hook_name")
+    hook_parser.add_argument("--repo", help="Repository path (default: current directory)")
+    hook_parser.add_argument("--daemon-only", action="store_true",
+                             help=f"Exit with {EXIT_DAEMON_UNAVAILABLE} instead of running in-process")
+    hook_parser.add_argument("hook_args", nargs=argparse.REMAINDER)
+
+    args = parser.parse_args(argv)
+
+    # Make the SVCS package importable for the in-process fallback and the server
+    package_root = str(Path(__file__).resolve().parent)
+    if package_root not in sys.path:
+        sys.path.insert(0, package_root)
+
+    if args.command == "serve":
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+        try:
+            HookDaemon(idle_timeout=args.idle_timeout).serve()
+        except RuntimeError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    return run_hook_client(args.hook_name, args.hook_args, repo_path=args.repo, daemon_only=args.daemon_only)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -84,6 +84,9 @@ class RepositoryLocalHookManager:
         # Get the SVCS installation directory from environment
         svcs_install_dir = os.environ.get('SVCS_INSTALL_DIR', '')
         
+        # Thin client for the resident hook daemon (see svcs_repo_daemon.py)
+        daemon_script = Path(__file__).resolve().parent / 'svcs_repo_daemon.py'
+        
         base_content = f'''#!/bin/bash
 #
 # SVCS Repository-Local Hook: {hook_name}
@@ -108,6 +111,12 @@ fi
 export PYTHONPATH="$REPO_ROOT/.svcs:{svcs_install_dir}:$PYTHONPATH"
 export SVCS_INSTALL_DIR="{svcs_install_dir}"
 
+# Hand the hook to the resident SVCS daemon when it is running (warm analyzers);
+# otherwise fall through to in-process analysis below
+if [ -f "{daemon_script}" ] && {python_path} "{daemon_script}" hook --repo "$REPO_ROOT" --daemon-only {hook_name} "$@"; then
+    exit 0
+fi
+
 '''
         
         # Add hook-specific content
@@ -389,37 +398,15 @@ class SVCSRepositoryManager:
             if fetch_result.returncode == 0:
                 # Notes fetched successfully, now import them to database
                 from svcs_repo_local import RepositoryLocalSVCS
+                from svcs_repo_notes import hydrate_notes
                 svcs = RepositoryLocalSVCS(self.repo_path)
                 
-                # Get all commits with notes and import their semantic data
-                notes_commits_result = subprocess.run(
-                    ["git", "notes", "--ref=svcs-semantic", "list"],
-                    cwd=self.repo_path,
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                
-                if notes_commits_result.returncode == 0 and notes_commits_result.stdout.strip():
-                    commits_with_notes = []
-                    for line in notes_commits_result.stdout.strip().splitlines():
-                        if line.strip():
-                            commit_hash = line.split()[1] if len(line.split()) > 1 else line.strip()
-                            commits_with_notes.append(commit_hash)
-                    
-                    imported_count = 0
-                    for commit_hash in commits_with_notes:
-                        semantic_data = svcs.git_notes.get_semantic_data_from_note(commit_hash)
-                        if semantic_data and "semantic_events" in semantic_data:
-                            stored_count, _ = svcs.analyze_and_store_commit(
-                                commit_hash, semantic_data["semantic_events"]
-                            )
-                            imported_count += stored_count
-                    
-                    if imported_count > 0:
-                        return f"🔄 Fetched remote semantic notes and imported {imported_count} events"
-                    else:
-                        return "🔄 Fetched remote semantic notes (no events to import)"
+                # Import every fetched note in one batched pass
+                summary = hydrate_notes(svcs.db)
+                if summary["events"] > 0:
+                    return f"🔄 Fetched remote semantic notes and imported {summary['events']} events"
+                elif summary["notes"]:
+                    return "🔄 Fetched remote semantic notes (no events to import)"
                 else:
                     return "🔄 Fetched remote semantic notes (empty)"
             else:
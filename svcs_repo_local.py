@@ -14,22 +14,39 @@ import logging
 import os
 import sqlite3
 import subprocess
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from migrations.migrate_database import apply_migrations, ensure_event_fts
+from svcs_repo_connections import get_connection
+from svcs_repo_notes import NOTES_REF, decode_note, fetch_notes_ref, hydrate_notes, sync_notes, write_note
+from svcs_repo_reachability import branch_condition, pin_branch_commits, refresh_branch_index
+from svcs_repo_search import EventQuery, build_event_query
+from svcs_repo_stats import count_branch_events, get_event_stats, rebuild_commit_event_counts, rebuild_event_stats
+
 logger = logging.getLogger(__name__)
 
+# Seconds a branch reachability refresh stays fresh for read queries
+BRANCH_INDEX_TTL = 2.0
+
 
 class RepositoryLocalDatabase:
     """Repository-local semantic database stored in .svcs/semantic.db"""
     
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, db_path: str = None):
         self.repo_path = Path(repo_path).resolve()
         self.svcs_dir = self.repo_path / ".svcs"
-        self.db_path = self.svcs_dir / "semantic.db"
-        self.ensure_directory()
+        if db_path:
+            # Explicit database file (e.g. an analyzer's fallback location)
+            self.db_path = Path(db_path)
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            self.db_path = self.svcs_dir / "semantic.db"
+            self.ensure_directory()
+        self._branch_index_checked = None
         self.init_schema()
     
     def ensure_directory(self):
@@ -51,8 +68,8 @@ class RepositoryLocalDatabase:
                 f.write(f"# SVCS semantic analysis data (local only)\n{gitignore_entry}\n")
     
     def get_connection(self):
-        """Get database connection."""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's pooled database connection (WAL mode)."""
+        return get_connection(self.db_path)
     
     def init_schema(self):
         """Initialize the repository-local database schema."""
@@ -113,8 +130,11 @@ class RepositoryLocalDatabase:
                     semantic_events_count INTEGER DEFAULT 0
                 )
             """)
-            
-            conn.commit()
+
+            # Bring indexes and later schema changes up to date
+            apply_migrations(conn)
+            # Re-sync the full-text index if FTS5 support differs from the last writer's
+            ensure_event_fts(conn)
     
     def get_current_branch(self) -> str:
         """Get the current git branch."""
@@ -130,22 +150,57 @@ class RepositoryLocalDatabase:
         except subprocess.CalledProcessError:
             return "main"  # Fallback
     
+    def get_commit_metadata(self, commit_hash: str) -> Optional[Dict[str, Any]]:
+        """Read author, timestamp and subject of a commit from git."""
+        try:
+            result = subprocess.run([
+                'git', 'show', '--format=%an%n%at%n%s', '--no-patch', commit_hash
+            ], cwd=self.repo_path, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError:
+            return None
+
+        lines = result.stdout.strip().split('\n')
+        if len(lines) < 3:
+            return None
+        try:
+            return {"author": lines[0], "timestamp": int(lines[1]), "message": lines[2]}
+        except ValueError:
+            return None
+
     def store_semantic_event(self, event_data: Dict[str, Any]) -> str:
         """Store a semantic event in the repository-local database."""
-        event_id = str(uuid.uuid4())
-        current_branch = self.get_current_branch()
-        created_at = int(datetime.now().timestamp())
-        
-        with self.get_connection() as conn:
-            conn.execute("""
-                INSERT INTO semantic_events (
-                    event_id, commit_hash, branch, event_type, node_id, location,
-                    details, layer, layer_description, confidence, reasoning, impact, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        return self.store_semantic_events([event_data])[0]
+
+    def store_semantic_events(self, events: List[Dict[str, Any]], commit_hash: str = None,
+                              branch: str = None, commit_metadata: Dict[str, Any] = None,
+                              conn: sqlite3.Connection = None) -> List[str]:
+        """Store a batch of semantic events in a single transaction.
+
+        The branch is resolved once for the whole batch; an empty branch stores
+        the events without one. When ``commit_hash`` is
+        given it overrides the commit of every event, and ``commit_metadata``
+        (author, timestamp, message) writes the matching ``commits`` row in the
+        same transaction. Events keep their own ``created_at`` if they carry one.
+        Pass ``conn`` to join a transaction owned by the caller.
+
+        Returns the generated event IDs in input order.
+        """
+        if not events and not commit_metadata:
+            return []
+
+        if branch is None:
+            branch = self.get_current_branch()
+        now = int(datetime.now().timestamp())
+
+        event_ids = []
+        rows = []
+        for event_data in events:
+            event_id = str(uuid.uuid4())
+            event_ids.append(event_id)
+            rows.append((
                 event_id,
-                event_data.get("commit_hash"),
-                current_branch,
+                commit_hash or event_data.get("commit_hash"),
+                branch or None,
                 event_data.get("event_type"),
                 event_data.get("node_id"),
                 event_data.get("location"),
@@ -155,31 +210,99 @@ class RepositoryLocalDatabase:
                 event_data.get("confidence", 1.0),
                 event_data.get("reasoning"),
                 event_data.get("impact"),
-                created_at
+                event_data.get("created_at") or now
             ))
-            conn.commit()
-        
-        return event_id
-    
-    def get_branch_events(self, branch: str = None, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get semantic events for a specific branch."""
+
+        def write(conn):
+            if commit_hash and commit_metadata:
+                conn.execute("""
+                    INSERT OR IGNORE INTO commits (commit_hash, branch, author, timestamp, message, created_at, git_notes_synced)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (commit_hash, branch or None, commit_metadata.get("author"), commit_metadata.get("timestamp"),
+                      commit_metadata.get("message"), now, 0))
+            conn.executemany("""
+                INSERT INTO semantic_events (
+                    event_id, commit_hash, branch, event_type, node_id, location,
+                    details, layer, layer_description, confidence, reasoning, impact, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+        if conn is not None:
+            write(conn)
+        else:
+            with self.get_connection() as conn:
+                write(conn)
+        # Branch views only show indexed commits; recheck the heads on the next read
+        self._branch_index_checked = None
+
+        return event_ids
+
+    def get_branch_events(self, branch: str = None, limit: int = 100, cursor: str = None) -> List[Dict[str, Any]]:
+        """Get semantic events for a specific branch, newest first.
+
+        Pass the ``next_cursor`` of a previous page (see search_events) to
+        continue after it.
+        """
         if branch is None:
             branch = self.get_current_branch()
-        
+
+        self.refresh_branch_index()
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT se.event_id, se.commit_hash, se.branch, se.event_type, se.node_id, se.location,
-                       se.details, se.layer, se.confidence, se.reasoning, se.impact, se.created_at,
-                       c.author, c.timestamp as commit_timestamp, c.message as commit_message
-                FROM semantic_events se
-                LEFT JOIN commits c ON se.commit_hash = c.commit_hash
-                WHERE se.branch = ?
-                ORDER BY se.created_at DESC
-                LIMIT ?
-            """, (branch, limit))
-            
-            columns = [desc[0] for desc in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return EventQuery(branch).limit(limit).after(cursor).fetch(conn)
+
+    def search_events(self, query: EventQuery, with_total: bool = True) -> Dict[str, Any]:
+        """Run an EventQuery; returns the page of events, the cursor for the next
+        page and the total match count (None when with_total is False)."""
+        self.refresh_branch_index()
+        with self.get_connection() as conn:
+            page = query.fetch_page(conn)
+            page["total"] = query.count(conn) if with_total else None
+        return page
+
+    def refresh_branch_index(self, force: bool = False) -> Dict[str, int]:
+        """Update the commit-to-branch reachability index from git.
+
+        Read paths call this before branch queries; unless forced it checks
+        the branch heads at most once per BRANCH_INDEX_TTL seconds. Returns
+        {branch: commits listed} for the branches that moved.
+        """
+        now = time.monotonic()
+        if not force and self._branch_index_checked is not None \
+                and now - self._branch_index_checked < BRANCH_INDEX_TTL:
+            return {}
+        self._branch_index_checked = now
+        with self.get_connection() as conn:
+            return refresh_branch_index(conn, str(self.repo_path))
+
+    def count_branch_events(self, branch: str) -> int:
+        """Number of events visible on a branch."""
+        with self.get_connection() as conn:
+            return count_branch_events(conn, branch)
+
+    def merge_branch_events(self, source_branch: str, target_branch: str) -> int:
+        """Make the source branch's events visible on the target branch.
+
+        Merges that git records (merge commits, fast-forwards) need nothing
+        beyond an index refresh. Commits of source events the target still
+        does not reach (squash merges) are pinned to it; no event is copied.
+        Returns the number of commits pinned.
+        """
+        self.refresh_branch_index(force=True)
+        with self.get_connection() as conn:
+            return pin_branch_commits(conn, source_branch, target_branch)
+
+    def get_event_stats(self, branch: str = None, since=None, until=None) -> Dict[str, Any]:
+        """Event totals and per-type/layer/author/day/branch counts from the
+        event_stats rollup (see svcs_repo_stats.get_event_stats)."""
+        with self.get_connection() as conn:
+            return get_event_stats(conn, branch=branch, since=since, until=until)
+
+    def rebuild_event_stats(self) -> int:
+        """Recompute the event_stats and commit_event_counts rollups; returns
+        the number of event_stats groups."""
+        with self.get_connection() as conn:
+            rebuild_commit_event_counts(conn)
+            return rebuild_event_stats(conn)
 
 
 class GitNotesManager:
@@ -187,45 +310,18 @@ class GitNotesManager:
     
     def __init__(self, repo_path: str):
         self.repo_path = Path(repo_path).resolve()
-        self.notes_ref = "refs/notes/svcs-semantic"
+        self.notes_ref = NOTES_REF
     
     def store_semantic_data_as_note(self, commit_hash: str, semantic_events: List[Dict[str, Any]]) -> bool:
-        """Store semantic analysis data as a git note attached to a commit."""
+        """Store semantic analysis data as a git note attached to a commit.
+
+        The note is replaced, so it always holds this analysis only.
+        """
         try:
-            # Prepare semantic data for storage
-            note_data = {
-                "version": "1.0",
-                "timestamp": datetime.now().isoformat(),
-                "semantic_events": semantic_events,
-                "analyzer": "svcs",
-                "commit_hash": commit_hash
-            }
-            
-            # Convert to JSON
-            note_content = json.dumps(note_data, indent=2)
-            
-            # Store as git note
-            result = subprocess.run([
-                "git", "notes", "--ref", self.notes_ref, "add", 
-                "-m", note_content, commit_hash
-            ], cwd=self.repo_path, capture_output=True, text=True)
-            
-            if result.returncode == 0:
+            if write_note(str(self.repo_path), commit_hash, semantic_events, self.notes_ref):
                 logger.info(f"Stored semantic data as git note for commit {commit_hash[:8]}")
                 return True
-            else:
-                # Note might already exist, try to append
-                result = subprocess.run([
-                    "git", "notes", "--ref", self.notes_ref, "append",
-                    "-m", f"\n---\n{note_content}", commit_hash
-                ], cwd=self.repo_path, capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    logger.info(f"Appended semantic data to existing git note for commit {commit_hash[:8]}")
-                    return True
-                else:
-                    logger.error(f"Failed to store git note: {result.stderr}")
-                    return False
+            return False
         
         except Exception as e:
             logger.error(f"Error storing semantic data as git note: {e}")
@@ -236,25 +332,11 @@ class GitNotesManager:
         try:
             result = subprocess.run([
                 "git", "notes", "--ref", self.notes_ref, "show", commit_hash
-            ], cwd=self.repo_path, capture_output=True, text=True)
+            ], cwd=self.repo_path, capture_output=True)
             
             if result.returncode == 0:
-                # Parse the note content (might contain multiple JSON blocks)
-                note_content = result.stdout.strip()
-                
-                # Try to parse as single JSON first
-                try:
-                    return json.loads(note_content)
-                except json.JSONDecodeError:
-                    # Handle multiple JSON blocks separated by ---
-                    json_blocks = note_content.split('\n---\n')
-                    for block in json_blocks:
-                        try:
-                            data = json.loads(block.strip())
-                            if data.get("commit_hash") == commit_hash:
-                                return data
-                        except json.JSONDecodeError:
-                            continue
+                # Compact (format 2) or JSON notes, see svcs_repo_notes.decode_note
+                return decode_note(result.stdout, commit_hash)
             
             return None
         
@@ -290,7 +372,7 @@ class GitNotesManager:
             return False
     
     def fetch_notes_from_remote(self, remote: str = "origin") -> bool:
-        """Fetch semantic git notes from remote repository."""
+        """Fetch semantic git notes from remote repository (skipped when unchanged)."""
         try:
             # First check if remote exists
             check_remote = subprocess.run([
@@ -301,30 +383,12 @@ class GitNotesManager:
                 logger.warning(f"Remote '{remote}' not configured in repository")
                 return False
             
-            # Check if notes reference exists on remote
-            check_notes = subprocess.run([
-                "git", "ls-remote", remote, f"refs/notes/svcs-semantic"
-            ], cwd=self.repo_path, capture_output=True, text=True)
-            
-            if check_notes.returncode != 0 or not check_notes.stdout.strip():
-                logger.info(f"No semantic git notes found on remote '{remote}'")
-                return False
-            
-            # Fetch the notes - success includes both updates and "already up to date"
-            result = subprocess.run([
-                "git", "fetch", remote, f"{self.notes_ref}:{self.notes_ref}"
-            ], cwd=self.repo_path, capture_output=True, text=True)
-            
-            # Git fetch returns 0 for both successful updates and "already up to date"
-            if result.returncode == 0:
-                if result.stderr and "up to date" in result.stderr.lower():
-                    logger.info(f"Semantic git notes are already up to date with {remote}")
-                else:
-                    logger.info(f"Successfully fetched semantic git notes from {remote}")
-                return True
-            else:
-                logger.warning(f"Failed to fetch git notes from '{remote}': {result.stderr}")
-                return False
+            status = fetch_notes_ref(str(self.repo_path), remote, self.notes_ref)
+            if status == "unchanged":
+                logger.info(f"Semantic git notes are already up to date with {remote}")
+            elif status == "fetched":
+                logger.info(f"Successfully fetched semantic git notes from {remote}")
+            return status is not None
         
         except Exception as e:
             logger.error(f"Error fetching notes from remote: {e}")
@@ -369,84 +433,96 @@ class RepositoryLocalSVCS:
                 INSERT OR REPLACE INTO branches (branch_name, created_at)
                 VALUES (?, ?)
             """, (current_branch, created_at))
-            
-            conn.commit()
         
         return f"✅ SVCS initialized for repository at {self.repo_path} (branch: {current_branch})"
     
     def store_commit_metadata(self, commit_hash: str) -> bool:
         """Store commit metadata (author, timestamp, message) in the commits table."""
         try:
-            import subprocess
-            
-            # Get commit info from git
-            result = subprocess.run([
-                'git', 'show', '--format=%an%n%at%n%s', '--no-patch', commit_hash
-            ], cwd=self.repo_path, capture_output=True, text=True, check=True)
-            
-            lines = result.stdout.strip().split('\n')
-            if len(lines) >= 3:
-                author = lines[0]
-                timestamp = int(lines[1])
-                message = lines[2]
-                
-                current_branch = self.db.get_current_branch()
-                created_at = int(datetime.now().timestamp())
-                
-                with self.db.get_connection() as conn:
-                    # Check if commit already exists
-                    cursor = conn.execute("SELECT commit_hash FROM commits WHERE commit_hash = ?", (commit_hash,))
-                    if cursor.fetchone():
-                        return True  # Already exists
-                    
-                    # Insert new commit
-                    conn.execute("""
-                        INSERT INTO commits (commit_hash, branch, author, timestamp, message, created_at, git_notes_synced)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (commit_hash, current_branch, author, timestamp, message, created_at, 0))
-                    conn.commit()
-                    return True
-            return False
-            
+            commit_metadata = self.db.get_commit_metadata(commit_hash)
+            if not commit_metadata:
+                return False
+            self.db.store_semantic_events([], commit_hash=commit_hash, commit_metadata=commit_metadata)
+            return True
+
         except Exception as e:
             print(f"Warning: Could not store commit metadata: {e}")
             return False
 
-    def analyze_and_store_commit(self, commit_hash: str, semantic_events: List[Dict[str, Any]]) -> Tuple[int, bool]:
-        """Analyze a commit and store both locally and as git notes."""
-        # Store commit metadata first
-        self.store_commit_metadata(commit_hash)
+    def analyze_and_store_commit(self, commit_hash: str, semantic_events: List[Dict[str, Any]],
+                                 branch: str = None) -> Tuple[int, bool]:
+        """Analyze a commit and store both locally and as git notes.
         
-        # Store semantic events in local database
-        stored_count = 0
+        branch defaults to the current branch; background workers pass the
+        branch recorded when the commit was queued.
+        """
+        # Store commit metadata and all events in one transaction
         for event_data in semantic_events:
             event_data["commit_hash"] = commit_hash
-            self.db.store_semantic_event(event_data)
-            stored_count += 1
-        
+        self.db.store_semantic_events(
+            semantic_events,
+            commit_hash=commit_hash,
+            branch=branch,
+            commit_metadata=self.db.get_commit_metadata(commit_hash)
+        )
+        stored_count = len(semantic_events)
+
         # Store as git notes for team sharing
         notes_success = self.git_notes.store_semantic_data_as_note(commit_hash, semantic_events)
         
         return stored_count, notes_success
     
-    def get_branch_events(self, branch: str = None, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_branch_events(self, branch: str = None, limit: int = 100, cursor: str = None) -> List[Dict[str, Any]]:
         """Get semantic events for a specific branch."""
-        return self.db.get_branch_events(branch, limit)
+        return self.db.get_branch_events(branch, limit, cursor)
     
+    def search_events(self, branch: str = None, with_total: bool = None, **filters) -> Dict[str, Any]:
+        """Search events on a branch (default: current) with SQL-side filtering.
+
+        Accepts the keyword filters of svcs_repo_search.build_event_query and
+        returns {"events": [...], "next_cursor": ..., "total": <matches before
+        paging>}. Pass ``cursor=next_cursor`` for the following page. The total
+        is only counted for the first page unless with_total is set, so later
+        pages stay a single index range scan.
+        """
+        if branch is None:
+            branch = self.get_current_branch()
+        if with_total is None:
+            with_total = not filters.get("cursor")
+        return self.db.search_events(build_event_query(branch=branch, **filters), with_total=with_total)
+
     def get_current_branch(self) -> str:
         """Get current git branch."""
         return self.db.get_current_branch()
     
     def compare_branches(self, branch1: str, branch2: str, limit: int = 100) -> Dict[str, Any]:
-        """Compare semantic events between two branches."""
+        """Compare semantic events between two branches.
+
+        Counts come from SQL over the reachability index: each branch's total
+        and the events visible on only one of them. The event lists are the
+        most recent ``limit`` events of each branch.
+        """
         branch1_events = self.get_branch_events(branch1, limit)
         branch2_events = self.get_branch_events(branch2, limit)
-        
+
+        with self.db.get_connection() as conn:
+            condition1, params1 = branch_condition(conn, branch1)
+            condition2, params2 = branch_condition(conn, branch2)
+            counts = conn.execute(f"""
+                SELECT TOTAL({condition1} IS 1), TOTAL({condition2} IS 1),
+                       TOTAL({condition1} IS 1 AND {condition2} IS NOT 1),
+                       TOTAL({condition2} IS 1 AND {condition1} IS NOT 1)
+                FROM semantic_events se
+                WHERE {condition1} OR {condition2}
+            """, params1 + params2 + params1 + params2 + params2 + params1 + params1 + params2).fetchone()
+
         return {
             "branch1": branch1,
             "branch2": branch2,
-            "branch1_count": len(branch1_events),
-            "branch2_count": len(branch2_events),
+            "branch1_count": int(counts[0]),
+            "branch2_count": int(counts[1]),
+            "only_in_branch1": int(counts[2]),
+            "only_in_branch2": int(counts[3]),
             "branch1_events": branch1_events,
             "branch2_events": branch2_events
         }
@@ -454,6 +530,7 @@ class RepositoryLocalSVCS:
     def get_repository_status(self) -> Dict[str, Any]:
         """Get repository SVCS status."""
         current_branch = self.db.get_current_branch()
+        self.db.refresh_branch_index()
         
         with self.db.get_connection() as conn:
             # Get repository info
@@ -464,8 +541,7 @@ class RepositoryLocalSVCS:
                 return {"initialized": False}
             
             # Get branch events count
-            cursor = conn.execute("SELECT COUNT(*) FROM semantic_events WHERE branch = ?", (current_branch,))
-            events_count = cursor.fetchone()[0]
+            events_count = count_branch_events(conn, current_branch)
             
             # Get total commits analyzed
             cursor = conn.execute("SELECT COUNT(*) FROM commits")
@@ -480,10 +556,33 @@ class RepositoryLocalSVCS:
                 "created_at": repo_info[0]
             }
     
+    def get_database_stats(self) -> Dict[str, Any]:
+        """Database size and event/commit/branch totals (svcs cleanup --show-stats)."""
+        with self.db.get_connection() as conn:
+            stats = get_event_stats(conn, groupings=["branches"])
+            commits_tracked = conn.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
+        db_size = self.db.db_path.stat().st_size if self.db.db_path.exists() else 0
+        return {
+            "total_events": stats["total_events"],
+            "commits_tracked": commits_tracked,
+            "database_size": f"{round(db_size / (1024 * 1024), 2)} MB",
+            "database_size_bytes": db_size,
+            "branches_tracked": len([b for b in stats["branches"] if b is not None]),
+            "database_path": str(self.db.db_path)
+        }
+    
     def process_merge(self, source_branch: str = None, target_branch: str = None) -> str:
-        """Process semantic events after a git merge. Ensures all unique events from source branch are copied to target branch."""
+        """Process semantic events after a git merge.
+
+        Refreshes the reachability index, so events of merged commits show up
+        on the target branch, and pins the source branch's remaining commits
+        (squash merges) to it. No event is copied.
+        """
         if target_branch is None:
             target_branch = self.get_current_branch()
+        # Counted before the refresh, so the report covers what this merge added
+        visible_before = self.db.count_branch_events(target_branch)
+        self.db.refresh_branch_index(force=True)
         if source_branch is None:
             # Try to detect the merged branch from git (handle both merge commits and fast-forward merges)
             try:
@@ -560,138 +659,49 @@ class RepositoryLocalSVCS:
                         potential_branches = [row[0] for row in cursor.fetchall()]
                         
                         # For each potential branch, check if it has events not in target
+                        target_condition, target_params = branch_condition(conn, target_branch)
                         for branch in potential_branches:
-                            cursor = conn.execute("""
-                                SELECT COUNT(*) FROM (
-                                    SELECT event_type, node_id, location FROM semantic_events WHERE branch = ?
-                                    EXCEPT
-                                    SELECT event_type, node_id, location FROM semantic_events WHERE branch = ?
+                            source_condition, source_params = branch_condition(conn, branch)
+                            cursor = conn.execute(f"""
+                                SELECT EXISTS (
+                                    SELECT 1 FROM semantic_events se
+                                    WHERE {source_condition} AND ({target_condition}) IS NOT 1
                                 )
-                            """, (branch, target_branch))
-                            unique_count = cursor.fetchone()[0]
-                            if unique_count > 0:
+                            """, source_params + target_params)
+                            if cursor.fetchone()[0]:
                                 source_branch = branch
                                 break
                                 
             except subprocess.CalledProcessError:
                 pass
+        if source_branch:
+            self.db.merge_branch_events(source_branch, target_branch)
+        merged = self.db.count_branch_events(target_branch) - visible_before
         if not source_branch:
+            if merged > 0:
+                return f"✅ SVCS: {merged} merged semantic events now visible on {target_branch}"
             return "ℹ️ SVCS: No source branch detected for merge processing"
-        with self.db.get_connection() as conn:
-            # Find all unique (event_type, node_id, location) in source branch not present in target branch
-            cursor = conn.execute("""
-                SELECT se1.event_type, se1.node_id, se1.location
-                FROM semantic_events se1
-                WHERE se1.branch = ?
-                EXCEPT
-                SELECT se2.event_type, se2.node_id, se2.location
-                FROM semantic_events se2
-                WHERE se2.branch = ?
-            """, (source_branch, target_branch))
-            unique_keys = cursor.fetchall()
-            if not unique_keys:
-                return f"ℹ️ SVCS: No new semantic events to merge from {source_branch} to {target_branch}"
-            merged_count = 0
-            for event_type, node_id, location in unique_keys:
-                # Get the most recent event for this key from the source branch
-                event_cursor = conn.execute("""
-                    SELECT commit_hash, event_type, node_id, location, details, layer, layer_description, confidence, reasoning, impact, created_at
-                    FROM semantic_events
-                    WHERE branch = ? AND event_type = ? AND node_id = ? AND location = ?
-                    ORDER BY created_at DESC LIMIT 1
-                """, (source_branch, event_type, node_id, location))
-                event = event_cursor.fetchone()
-                if event:
-                    new_event_id = str(uuid.uuid4())
-                    conn.execute("""
-                        INSERT INTO semantic_events 
-                        (event_id, commit_hash, branch, event_type, node_id, location,
-                        details, layer, layer_description, confidence, reasoning, impact, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        new_event_id,
-                        event[0],  # commit_hash
-                        target_branch,
-                        event[1],  # event_type
-                        event[2],  # node_id
-                        event[3],  # location
-                        event[4],  # details
-                        event[5],  # layer
-                        event[6],  # layer_description
-                        event[7],  # confidence
-                        event[8],  # reasoning
-                        event[9],  # impact
-                        event[10]  # created_at
-                    ))
-                    merged_count += 1
-            conn.commit()
-            return f"✅ SVCS: Merged {merged_count} semantic events from {source_branch} to {target_branch}"
+        if merged <= 0:
+            return f"ℹ️ SVCS: No new semantic events to merge from {source_branch} to {target_branch}"
+        return f"✅ SVCS: Merged {merged} semantic events from {source_branch} to {target_branch}"
 
     def import_semantic_events_from_notes(self, commit_hashes: List[str] = None) -> int:
-        """Import semantic events from git notes for specified commits or recent commits."""
+        """Import semantic events from git notes for commits without local events.
+
+        Without commit_hashes only the notes changed since the last import are
+        read (see svcs_repo_notes.sync_notes). Returns the number of events imported.
+        """
         if commit_hashes is None:
-            # Get recent commits that might have notes but no local semantic events
-            try:
-                result = subprocess.run([
-                    "git", "log", "--format=%H", "-10"
-                ], cwd=self.repo_path, capture_output=True, text=True, check=True)
-                commit_hashes = result.stdout.strip().split('\n')
-            except subprocess.CalledProcessError:
-                return 0
-        
-        imported_count = 0
-        current_branch = self.get_current_branch()
-        
-        for commit_hash in commit_hashes:
-            if not commit_hash.strip():
-                continue
-                
-            # Check if we already have semantic events for this commit
-            with self.db.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT COUNT(*) FROM semantic_events WHERE commit_hash = ?", 
-                    (commit_hash,)
-                )
-                if cursor.fetchone()[0] > 0:
-                    continue  # Already have events for this commit
-                
-                # Try to get semantic data from git notes
-                note_data = self.git_notes.get_semantic_data_from_note(commit_hash)
-                if note_data and 'semantic_events' in note_data:
-                    # Store commit metadata
-                    self.store_commit_metadata(commit_hash)
-                    
-                    # Import semantic events
-                    for event_data in note_data['semantic_events']:
-                        event_data['commit_hash'] = commit_hash
-                        event_id = str(uuid.uuid4())
-                        created_at = event_data.get('created_at', int(datetime.now().timestamp()))
-                        
-                        conn.execute("""
-                            INSERT INTO semantic_events (
-                                event_id, commit_hash, branch, event_type, node_id, location,
-                                details, layer, layer_description, confidence, reasoning, impact, created_at
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            event_id,
-                            commit_hash,
-                            current_branch,
-                            event_data.get("event_type"),
-                            event_data.get("node_id"),
-                            event_data.get("location"),
-                            event_data.get("details"),
-                            event_data.get("layer", "core"),
-                            event_data.get("layer_description"),
-                            event_data.get("confidence", 1.0),
-                            event_data.get("reasoning"),
-                            event_data.get("impact"),
-                            created_at
-                        ))
-                        imported_count += 1
-                    
-                    conn.commit()
-        
-        return imported_count
+            return sync_notes(self.db, remote=None)["events"]
+        return hydrate_notes(self.db, commits=commit_hashes)["events"]
+
+    def sync_notes_from_remote(self, remote: str = "origin", min_interval: float = 0) -> Dict[str, Any]:
+        """Fetch semantic notes if the remote ref moved and import the changed ones.
+
+        min_interval (seconds) lets frequent hooks reuse a recent remote check.
+        Returns the svcs_repo_notes.sync_notes summary.
+        """
+        return sync_notes(self.db, remote=remote, min_interval=min_interval)
 
     def auto_resolve_merge(self) -> str:
         """Automatically resolve common post-merge scenarios and semantic event issues."""
@@ -761,7 +771,6 @@ class RepositoryLocalSVCS:
             
             conn.execute("UPDATE repository_info SET config = ? WHERE repo_path = ?", 
                         (json.dumps(config), str(self.repo_path)))
-            conn.commit()
     
     def get_all_config(self) -> Dict[str, Any]:
         """Get all configuration values."""
@@ -782,45 +791,38 @@ class RepositoryLocalSVCS:
             
             # Use the PROVEN working modular analyzer system
             from svcs.semantic_analyzer import SVCSModularAnalyzer
+            from svcs.git_objects import get_object_reader
+            from svcs.parse_cache import get_parse_cache, get_spill_dir
             analyzer = SVCSModularAnalyzer(str(self.repo_path))
+            reader = get_object_reader(str(self.repo_path))
+            # Blobs parsed by earlier hook runs are reused from .svcs/parse_cache
+            get_parse_cache().set_spill_dir(get_spill_dir(str(self.repo_path)))
             
-            # Get changed files in this commit
-            try:
-                cmd = ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", commit_hash]
-                result = subprocess.run(cmd, cwd=self.repo_path, capture_output=True, text=True, check=True)
-                changed_files = [f.strip() for f in result.stdout.strip().split('\n') if f.strip()]
-            except subprocess.CalledProcessError:
-                # Try initial commit approach
-                cmd = ["git", "ls-tree", "--name-only", "-r", commit_hash]
-                result = subprocess.run(cmd, cwd=self.repo_path, capture_output=True, text=True, check=True)
-                changed_files = [f.strip() for f in result.stdout.strip().split('\n') if f.strip()]
+            # Get changed files in this commit (--root covers the initial commit)
+            changes = reader.changed_files(commit_hash)
             
-            if not changed_files:
+            if not changes:
                 print("🔍 SVCS: No files changed in this commit")
                 return False
             
             # Analyze each changed file
             all_events = []
-            for filepath in changed_files:
+            for change in changes:
+                filepath = change.path
                 # Only analyze supported file types
                 if not filepath.endswith(('.py', '.js', '.ts', '.php', '.phtml')):
                     continue
                     
                 try:
-                    # Get file content before and after
-                    try:
-                        before_result = subprocess.run(['git', 'show', f'{commit_hash}~1:{filepath}'], 
-                                                     cwd=self.repo_path, capture_output=True, text=True, check=True)
-                        before_content = before_result.stdout
-                    except subprocess.CalledProcessError:
-                        before_content = ""  # New file or initial commit
-                    
-                    after_result = subprocess.run(['git', 'show', f'{commit_hash}:{filepath}'], 
-                                                cwd=self.repo_path, capture_output=True, text=True, check=True)
-                    after_content = after_result.stdout
+                    # File content before and after, read from the shared cat-file process
+                    before_content = reader.read_text(change.old_blob)
+                    after_content = reader.read_text(change.new_blob)
                     
                     # Use the working analyzer
-                    file_events = analyzer.analyze_changes(filepath, before_content, after_content)
+                    file_events = analyzer.analyze_file_changes(
+                        filepath, before_content, after_content,
+                        before_blob=change.old_blob, after_blob=change.new_blob
+                    )
                     
                     # Add commit context to each event
                     for event in file_events:
@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Bulk Semantic Notes Import for Repository-Local SVCS
+
+Hydrates .svcs/semantic.db from the semantic git notes shared by a team
+(refs/notes/svcs-semantic), e.g. right after a clone:
+
+1. One `git notes list` lists every annotated commit and its note blob
+2. Commits that already have events in the database are skipped
+3. The remaining note blobs and their commit objects stream through the
+   shared `git cat-file --batch` process (svcs/git_objects.py)
+4. Events are bulk inserted, one transaction per chunk of commits
+
+Hooks sync incrementally instead (sync_notes): the notes_sync table keeps
+the last remote head seen and the last notes commit imported, so the fetch
+is skipped while the remote ref is unchanged and only the notes that
+`git diff-tree` reports between the imported and the current notes commit
+are read.
+
+Notes are written as one canonical document per commit that replaces any
+older note: write_note stores it with `git hash-object --stdin` and
+`git notes add -f -C`, and write_notes builds a single notes commit for
+many commits in one `git fast-import` pass (history backfills). Notes are
+written as format 1 (indented JSON) until teammates run a reader for
+format 2 (dictionary-encoded compact JSON behind a magic line, opted in
+with SVCS_NOTES_FORMAT=2). decode_note reads both, and convert_notes
+(`svcs notes convert`) rewrites notes in place.
+
+Usage:
+    svcs notes hydrate
+    summary = hydrate_notes(RepositoryLocalDatabase(repo_path))
+    summary = sync_notes(RepositoryLocalDatabase(repo_path), remote="origin")
+    write_notes(repo_path, [(commit_hash, events), ...])
+    svcs notes convert
+"""
+
+import itertools
+import json
+import logging
+import os
+import subprocess
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NOTES_REF = "refs/notes/svcs-semantic"
+
+# Note content format written by this version (see note_document)
+NOTE_FORMAT = int(os.environ.get("SVCS_NOTES_FORMAT", "1"))
+NOTE_V2_MAGIC = b"SVCS-NOTE/2\n"
+
+# Commits written per transaction while hydrating
+HYDRATE_CHUNK_COMMITS = 200
+
+# Seconds a branch checkout trusts the last remote check before asking again
+NOTES_CHECK_INTERVAL = 60
+
+
+def _git(repo_path: str, *args) -> Optional[str]:
+    try:
+        result = subprocess.run(["git", *args], cwd=repo_path, capture_output=True, text=True, check=True)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    return result.stdout
+
+
+def resolve_notes_ref(repo_path: str, notes_ref: str = NOTES_REF) -> Optional[str]:
+    """Current commit of the local notes ref, or None if it does not exist."""
+    output = _git(repo_path, "rev-parse", "-q", "--verify", f"{notes_ref}^{{commit}}")
+    return output.strip() or None if output else None
+
+
+def list_notes(repo_path: str, notes_ref: str = NOTES_REF) -> Dict[str, str]:
+    """Annotated commit -> note blob ID for every note on the ref ({} if it does not exist)."""
+    result = subprocess.run(["git", "notes", "--ref", notes_ref, "list"], cwd=repo_path,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return {}
+    notes = {}
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            notes[parts[1]] = parts[0]
+    return notes
+
+
+def changed_notes(repo_path: str, old_head: str, new_head: str) -> Optional[Dict[str, str]]:
+    """Commit -> note blob ID for notes added or changed between two notes commits.
+
+    Paths in the notes tree are commit IDs, possibly fanned out into
+    `ab/cdef...` directories. Removed notes are left out. Returns None when
+    the diff cannot be computed (e.g. old_head was pruned after a rewrite).
+    """
+    output = _git(repo_path, "diff-tree", "-r", "--no-renames", old_head, new_head)
+    if output is None:
+        return None
+    notes = {}
+    for line in output.splitlines():
+        meta, _, path = line.partition("\t")
+        fields = meta.split()
+        if len(fields) == 5 and fields[4] in ("A", "M", "T"):
+            notes[path.replace("/", "")] = fields[3]
+    return notes
+
+
+def get_sync_state(conn, notes_ref: str = NOTES_REF) -> Dict[str, Any]:
+    """The notes_sync row of a notes ref ({} before the first sync)."""
+    row = conn.execute(
+        "SELECT remote_head, checked_at, imported_head, imported_at FROM notes_sync WHERE notes_ref = ?",
+        (notes_ref,)).fetchone()
+    if row is None:
+        return {}
+    return dict(zip(("remote_head", "checked_at", "imported_head", "imported_at"), row))
+
+
+def _record_sync(conn, notes_ref: str, **columns):
+    conn.execute("INSERT OR IGNORE INTO notes_sync (notes_ref) VALUES (?)", (notes_ref,))
+    conn.execute(f"UPDATE notes_sync SET {', '.join(f'{name} = ?' for name in columns)} WHERE notes_ref = ?",
+                 (*columns.values(), notes_ref))
+
+
+def fetch_notes_ref(repo_path: str, remote: str = "origin", notes_ref: str = NOTES_REF) -> Optional[str]:
+    """Fetch the notes ref from remote only when it has moved.
+
+    One `git ls-remote` compares the remote head with the local ref; the
+    fetch runs only when they differ. Returns "fetched" or "unchanged", or
+    None when the remote is unreachable, has no semantic notes or the
+    update was rejected (local notes not pushed yet).
+    """
+    output = _git(repo_path, "ls-remote", remote, notes_ref)
+    remote_head = output.split()[0] if output and output.strip() else None
+    if remote_head is None:
+        logger.info(f"No semantic git notes found on remote '{remote}'")
+        return None
+    if remote_head == resolve_notes_ref(repo_path, notes_ref):
+        return "unchanged"
+    if _git(repo_path, "fetch", "-q", remote, f"{notes_ref}:{notes_ref}") is None:
+        logger.warning(f"Failed to fetch git notes from '{remote}'")
+        return None
+    return "fetched"
+
+
+def fetch_notes(db, remote: str = "origin", notes_ref: str = NOTES_REF,
+                min_interval: float = 0) -> Optional[str]:
+    """fetch_notes_ref, remembering the check in notes_sync.
+
+    With min_interval, a check made less than that many seconds ago is
+    trusted without contacting the remote and "skipped" is returned.
+    """
+    with db.get_connection() as conn:
+        state = get_sync_state(conn, notes_ref)
+    now = int(time.time())
+    if min_interval and state.get("checked_at") and now - state["checked_at"] < min_interval:
+        return "skipped"
+    status = fetch_notes_ref(str(db.repo_path), remote, notes_ref)
+    if status is not None:
+        with db.get_connection() as conn:
+            _record_sync(conn, notes_ref, remote_head=resolve_notes_ref(str(db.repo_path), notes_ref),
+                         checked_at=now)
+    return status
+
+
+def parse_note(content: str, commit_hash: str = None) -> Optional[Dict[str, Any]]:
+    """Parse the content of a semantic note.
+
+    Notes appended to by older versions hold several JSON documents separated
+    by `---`; the one written for commit_hash is returned (the first one when
+    commit_hash is None).
+    """
+    content = content.strip()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        pass
+    for block in content.split('\n---\n'):
+        try:
+            data = json.loads(block.strip())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict) and (commit_hash is None or data.get("commit_hash") == commit_hash):
+            return data
+    return None
+
+
+def _encode_events(semantic_events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Dictionary-encode events: shared field list, rows of values, interned strings.
+
+    String values (event types, layers, layer descriptions, locations...)
+    are stored once in "strings" and referenced by index; "dict_fields" lists
+    the fields encoded that way. Missing values are null.
+    """
+    fields = sorted({key for event in semantic_events for key in event})
+    dict_fields = [index for index, field in enumerate(fields)
+                   if all(isinstance(event.get(field), (str, type(None))) for event in semantic_events)]
+    strings: Dict[str, int] = {}
+    rows = []
+    for event in semantic_events:
+        row = [event.get(field) for field in fields]
+        for index in dict_fields:
+            if row[index] is not None:
+                row[index] = strings.setdefault(row[index], len(strings))
+        rows.append(row)
+    return {"fields": fields, "dict_fields": dict_fields, "strings": list(strings), "events": rows}
+
+
+def _decode_events(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    fields, strings = payload["fields"], payload["strings"]
+    dict_fields = set(payload["dict_fields"])
+    events = []
+    for row in payload["events"]:
+        events.append({field: strings[value] if index in dict_fields else value
+                       for index, (field, value) in enumerate(zip(fields, row)) if value is not None})
+    return events
+
+
+def note_document(commit_hash: str, semantic_events: List[Dict[str, Any]], timestamp: str = None,
+                  note_format: int = None) -> bytes:
+    """The canonical note content for a commit's semantic events.
+
+    note_format 1 (default, readable by every SVCS version) is the original
+    indented JSON; note_format 2 (SVCS_NOTES_FORMAT=2) is NOTE_V2_MAGIC
+    followed by compact JSON with dictionary-encoded events. Format 2 stays
+    uncompressed text so git can still delta notes against each other when
+    packing the notes ref.
+    """
+    if note_format is None:
+        note_format = NOTE_FORMAT
+    timestamp = timestamp or datetime.now().isoformat()
+    if note_format == 1:
+        note_data = {
+            "version": "1.0",
+            "timestamp": timestamp,
+            "semantic_events": semantic_events,
+            "analyzer": "svcs",
+            "commit_hash": commit_hash
+        }
+        return json.dumps(note_data, indent=2, default=str).encode("utf-8")
+    payload = {"format": 2, "analyzer": "svcs", "commit_hash": commit_hash, "timestamp": timestamp,
+               **_encode_events(semantic_events)}
+    compact = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)
+    return NOTE_V2_MAGIC + compact.encode("utf-8")
+
+
+def decode_note(data: bytes, commit_hash: str = None) -> Optional[Dict[str, Any]]:
+    """Decode a semantic note of any format into the version 1.0 document shape.
+
+    The result also carries "format" (1 or 2). Format 2 notes written
+    zlib-compressed by earlier versions are still read. Returns None for
+    notes that are not semantic data or cannot be decoded.
+    """
+    if data.startswith(NOTE_V2_MAGIC):
+        try:
+            body = data[len(NOTE_V2_MAGIC):]
+            if not body.lstrip().startswith(b"{"):
+                body = zlib.decompress(body)
+            payload = json.loads(body.decode("utf-8"))
+            return {
+                "version": "2",
+                "format": payload["format"],
+                "timestamp": payload.get("timestamp"),
+                "semantic_events": _decode_events(payload),
+                "analyzer": payload.get("analyzer"),
+                "commit_hash": payload.get("commit_hash")
+            }
+        except (zlib.error, ValueError, KeyError, IndexError, TypeError):
+            return None
+    note = parse_note(data.decode("utf-8", "replace"), commit_hash)
+    if isinstance(note, dict):
+        note.setdefault("format", 1)
+    return note
+
+
+def write_note(repo_path: str, commit_hash: str, semantic_events: List[Dict[str, Any]],
+               notes_ref: str = NOTES_REF) -> bool:
+    """Replace the note of one commit.
+
+    The content is stored as a blob first (`git notes add` would rewrite
+    binary content) and attached with `-C`.
+    """
+    stored = subprocess.run(["git", "hash-object", "-w", "--stdin"], cwd=repo_path,
+                            input=note_document(commit_hash, semantic_events), capture_output=True)
+    result = stored
+    if stored.returncode == 0:
+        blob = stored.stdout.decode("ascii").strip()
+        result = subprocess.run(["git", "notes", "--ref", notes_ref, "add", "-f", "-C", blob, commit_hash],
+                                cwd=repo_path, capture_output=True)
+    if result.returncode != 0:
+        logger.error(f"Failed to store git note: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return result.returncode == 0
+
+
+def write_notes(repo_path: str, notes: Iterable[Tuple[str, List[Dict[str, Any]]]],
+                notes_ref: str = NOTES_REF, message: str = "Notes added by SVCS backfill") -> int:
+    """Replace the notes of many commits with one notes commit built by `git fast-import`.
+
+    notes yields (commit_hash, semantic_events). See write_note_contents.
+    """
+    return write_note_contents(repo_path, ((commit_hash, note_document(commit_hash, semantic_events))
+                                           for commit_hash, semantic_events in notes),
+                               notes_ref, message)
+
+
+def write_note_contents(repo_path: str, contents: Iterable[Tuple[str, bytes]],
+                        notes_ref: str = NOTES_REF, message: str = "Notes added by SVCS") -> int:
+    """Replace the notes of many commits with raw contents in one `git fast-import` pass.
+
+    contents yields (commit_hash, note bytes), streamed to a single process.
+    fast-import refuses the update if the notes ref moved meanwhile, so
+    concurrent note writes are never lost. Returns the number of notes
+    written (0 on failure).
+    """
+    contents = iter(contents)
+    first = next(contents, None)
+    if first is None:
+        return 0
+    parent = resolve_notes_ref(repo_path, notes_ref)
+    ident = (_git(repo_path, "var", "GIT_COMMITTER_IDENT") or "").strip()
+    if not ident:
+        ident = f"SVCS <svcs@localhost> {int(time.time())} +0000"
+    message_bytes = message.encode("utf-8") + b"\n"
+
+    process = subprocess.Popen(["git", "fast-import", "--quiet", "--date-format=raw"], cwd=repo_path,
+                               stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    written = 0
+    try:
+        stream = process.stdin
+        stream.write(f"commit {notes_ref}\ncommitter {ident}\n".encode("utf-8"))
+        stream.write(b"data %d\n%s" % (len(message_bytes), message_bytes))
+        if parent:
+            stream.write(f"from {parent}\n".encode("utf-8"))
+        for commit_hash, content in itertools.chain([first], contents):
+            stream.write(b"N inline %s\ndata %d\n%s\n" % (commit_hash.encode("utf-8"), len(content), content))
+            written += 1
+        stream.write(b"done\n")
+        stream.close()
+    except BrokenPipeError:
+        pass
+    stderr = process.stderr.read()
+    if process.wait() != 0:
+        logger.error(f"git fast-import failed writing notes: {stderr.decode('utf-8', 'replace').strip()}")
+        return 0
+    return written
+
+
+def convert_notes(repo_path: str, note_format: int = None, notes_ref: str = NOTES_REF) -> Dict[str, int]:
+    """Rewrite every note that is not in note_format (default: the current format).
+
+    All notes are read through one `cat-file --batch` process and the
+    converted ones are written in one fast-import commit; timestamps are
+    kept. Returns counts: notes, converted, invalid (left unchanged).
+    """
+    if note_format is None:
+        note_format = NOTE_FORMAT
+    notes = list_notes(repo_path, notes_ref)
+    summary = {"notes": len(notes), "converted": 0, "invalid": 0}
+    if not notes:
+        return summary
+
+    from svcs.git_objects import get_object_reader
+    reader = get_object_reader(repo_path)
+    blob_commits: Dict[str, List[str]] = {}
+    for commit, blob in notes.items():
+        blob_commits.setdefault(blob, []).append(commit)
+
+    converted = []
+    for blob, result in reader.read_objects(blob_commits):
+        for commit in blob_commits[blob]:
+            data = decode_note(result[1], commit) if result else None
+            if not isinstance(data, dict) or not isinstance(data.get("semantic_events"), list):
+                summary["invalid"] += 1
+            elif data["format"] != note_format:
+                converted.append((commit, note_document(commit, data["semantic_events"],
+                                                        data.get("timestamp"), note_format)))
+    summary["converted"] = write_note_contents(repo_path, converted, notes_ref,
+                                               f"Convert SVCS notes to format {note_format}")
+    return summary
+
+
+def parse_commit_metadata(data: bytes) -> Optional[Dict[str, Any]]:
+    """Author, timestamp and subject from a raw commit object (as get_commit_metadata returns them)."""
+    header, _, message = data.partition(b"\n\n")
+    for line in header.split(b"\n"):
+        if not line.startswith(b"author "):
+            continue
+        ident = line[len(b"author "):].decode("utf-8", "replace")
+        name, _, rest = ident.rpartition(" <")
+        try:
+            timestamp = int(rest.rsplit("> ", 1)[1].split()[0])
+        except (IndexError, ValueError):
+            return None
+        subject = message.decode("utf-8", "replace").strip().split("\n\n", 1)[0]
+        return {"author": name, "timestamp": timestamp, "message": " ".join(subject.split("\n"))}
+    return None
+
+
+def import_notes(db, notes: Dict[str, str], branch: str = None,
+                 chunk_commits: int = HYDRATE_CHUNK_COMMITS) -> Dict[str, int]:
+    """Import the given notes (commit -> note blob ID) of commits without events.
+
+    Events are stored on branch (default: the current branch) together with
+    the commit's metadata when the commit object is available locally.
+
+    Returns counts: notes (given), pending (without local events), commits
+    and events imported, and invalid (unreadable notes).
+    """
+    repo_path = str(db.repo_path)
+    summary = {"notes": len(notes), "pending": 0, "commits": 0, "events": 0, "invalid": 0}
+    if not notes:
+        return summary
+
+    with db.get_connection() as conn:
+        if len(notes) <= chunk_commits:
+            # Incremental syncs look up their few commits instead of scanning the index
+            known = {row[0] for row in conn.execute(
+                f"SELECT DISTINCT commit_hash FROM semantic_events WHERE commit_hash IN "
+                f"({', '.join('?' * len(notes))})", list(notes))}
+        else:
+            known = {row[0] for row in conn.execute("SELECT DISTINCT commit_hash FROM semantic_events")}
+    pending = [commit for commit in notes if commit not in known]
+    summary["pending"] = len(pending)
+    if not pending:
+        return summary
+    if branch is None:
+        branch = db.get_current_branch()
+
+    from svcs.git_objects import get_object_reader
+    reader = get_object_reader(repo_path)
+    for start in range(0, len(pending), chunk_commits):
+        chunk = pending[start:start + chunk_commits]
+        blobs = dict(reader.read_objects(notes[commit] for commit in chunk))
+        commit_objects = dict(reader.read_objects(chunk))
+
+        imports: List[tuple] = []
+        for commit in chunk:
+            blob = blobs.get(notes[commit])
+            data = decode_note(blob[1], commit) if blob else None
+            if not isinstance(data, dict) or not isinstance(data.get("semantic_events"), list):
+                summary["invalid"] += 1
+                continue
+            events = [event for event in data["semantic_events"] if isinstance(event, dict)]
+            for event in events:
+                event.setdefault("layer", "core")
+            commit_object = commit_objects.get(commit)
+            metadata = (parse_commit_metadata(commit_object[1])
+                        if commit_object and commit_object[0] == "commit" else None)
+            if events:
+                imports.append((commit, events, metadata))
+
+        with db.get_connection() as conn:
+            for commit, events, metadata in imports:
+                db.store_semantic_events(events, commit_hash=commit, branch=branch,
+                                         commit_metadata=metadata, conn=conn)
+        summary["commits"] += len(imports)
+        summary["events"] += sum(len(events) for _, events, _ in imports)
+
+    logger.info(f"Imported {summary['events']} events from {summary['commits']} semantic notes")
+    return summary
+
+
+def hydrate_notes(db, commits: Iterable[str] = None, branch: str = None, notes_ref: str = NOTES_REF,
+                  chunk_commits: int = HYDRATE_CHUNK_COMMITS) -> Dict[str, int]:
+    """Import the semantic notes of commits that have no events in the database yet.
+
+    db is a RepositoryLocalDatabase; commits limits the import to those
+    commits (default: every note on the ref, after which later syncs start
+    from the current notes commit). See import_notes for branch and the
+    returned counts.
+    """
+    repo_path = str(db.repo_path)
+    head = resolve_notes_ref(repo_path, notes_ref)
+    notes = list_notes(repo_path, notes_ref) if head else {}
+    if commits is not None:
+        wanted = set(commits)
+        notes = {commit: blob for commit, blob in notes.items() if commit in wanted}
+    summary = import_notes(db, notes, branch=branch, chunk_commits=chunk_commits)
+    if commits is None and head:
+        with db.get_connection() as conn:
+            _record_sync(conn, notes_ref, imported_head=head, imported_at=int(time.time()))
+    return summary
+
+
+def sync_notes(db, remote: Optional[str] = "origin", branch: str = None, notes_ref: str = NOTES_REF,
+               min_interval: float = 0) -> Dict[str, Any]:
+    """Fetch the notes ref if it moved and import the notes changed since the last sync.
+
+    remote=None skips the fetch and imports local changes only; min_interval
+    is passed to fetch_notes. Without a recorded (or still existing) imported
+    notes commit this falls back to a full hydrate_notes.
+
+    Returns the import counts plus fetch (fetch_notes status) and
+    incremental (whether a diff was used).
+    """
+    repo_path = str(db.repo_path)
+    fetch = fetch_notes(db, remote, notes_ref, min_interval) if remote else None
+    head = resolve_notes_ref(repo_path, notes_ref)
+    with db.get_connection() as conn:
+        imported_head = get_sync_state(conn, notes_ref).get("imported_head")
+
+    summary = {"notes": 0, "pending": 0, "commits": 0, "events": 0, "invalid": 0}
+    if head is None or head == imported_head:
+        summary.update(fetch=fetch, incremental=True)
+        return summary
+
+    notes = changed_notes(repo_path, imported_head, head) if imported_head else None
+    if notes is None:
+        summary = hydrate_notes(db, branch=branch, notes_ref=notes_ref)
+        summary.update(fetch=fetch, incremental=False)
+        return summary
+    summary = import_notes(db, notes, branch=branch)
+    with db.get_connection() as conn:
+        _record_sync(conn, notes_ref, imported_head=head, imported_at=int(time.time()))
+    summary.update(fetch=fetch, incremental=True)
+    return summary
@@ -29,7 +29,7 @@ from datetime import datetime, timedelta
 # Import from centralized API
 sys.path.insert(0, '.')
 try:
-    from svcs.api import get_full_log, get_node_evolution
+    from svcs.api import get_full_log, get_node_evolution, resolves_revision
 except ImportError:
     print("❌ Error: Could not import from svcs.api")
     print("   Make sure you're running this from a repository with SVCS initialized")
@@ -82,11 +82,12 @@ class RepositoryQualityAnalyzer:
     
     def _get_filtered_events(self):
         """Get events filtered by branch, author, and date."""
-        events = get_full_log()
-        
-        # Filter by branch if specified
-        if self.branch:
-            events = self._filter_by_branch(events, self.branch)
+        # The branch filter runs in SQL against the commits the branch reaches
+        if self.branch and not resolves_revision(self.branch):
+            print(f"⚠️  Warning: Could not get commits for branch '{self.branch}', showing all events")
+            events = get_full_log()
+        else:
+            events = get_full_log(branch=self.branch)
         
         # Filter by author if specified
         if self.author:
@@ -103,29 +104,6 @@ class RepositoryQualityAnalyzer:
         
         return events
     
-    def _filter_by_branch(self, events, branch):
-        """Filter events by git branch."""
-        try:
-            # Get commits on the specified branch
-            branch_commits = subprocess.run(
-                ['git', 'rev-list', branch],
-                capture_output=True, text=True, check=True
-            ).stdout.strip().split('\n')
-            branch_commits = set(commit for commit in branch_commits if commit)
-            
-            # Filter events to only those on this branch
-            filtered_events = []
-            for event in events:
-                commit_hash = event.get('commit_hash', '')
-                if commit_hash and any(commit_hash.startswith(bc) for bc in branch_commits):
-                    filtered_events.append(event)
-            
-            return filtered_events
-            
-        except subprocess.CalledProcessError:
-            print(f"⚠️  Warning: Could not get commits for branch '{branch}', showing all events")
-            return events
-    
     def get_git_info(self):
         """Get git repository information."""
         try:
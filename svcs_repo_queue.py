@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Background Analysis Queue for SVCS
+
+Keeps `git commit` fast by moving semantic analysis out of the post-commit hook:
+1. The hook only records the commit hash in the analysis_queue table of
+   .svcs/semantic.db and makes sure a worker is running
+2. Workers (`svcs worker`) claim jobs, analyze them and store the events
+3. Jobs are durable: a crashed worker's job is picked up again, and a commit
+   is only ever queued once
+4. Failed jobs are retried up to max_attempts, then kept for `svcs queue retry`
+
+Set `svcs config set async-analysis false` to analyze synchronously again.
+
+Usage:
+    svcs worker --concurrency 2
+    svcs queue status
+    svcs queue retry [COMMIT]
+"""
+
+import contextlib
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from svcs_repo_local import RepositoryLocalDatabase, RepositoryLocalSVCS
+
+try:
+    import fcntl
+except ImportError:  # Windows: no worker lock, hooks always start a worker
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+QUEUE_STATUSES = ("pending", "running", "done", "failed")
+DEFAULT_MAX_ATTEMPTS = 3
+# A running job older than this is considered abandoned (must exceed the
+# slowest analysis, including Layer 5b AI timeouts and retries)
+DEFAULT_LEASE_SECONDS = 15 * 60
+
+_JOB_COLUMNS = ("commit_hash", "branch", "status", "attempts", "last_error", "worker_id",
+                "event_count", "enqueued_at", "started_at", "finished_at")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class RepositoryAnalysisQueue:
+    """Durable, deduplicated queue of commits awaiting analysis."""
+
+    def __init__(self, repo_path: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 lease_seconds: int = DEFAULT_LEASE_SECONDS, db: RepositoryLocalDatabase = None):
+        self.repo_path = Path(repo_path).resolve()
+        self.db = db or RepositoryLocalDatabase(str(self.repo_path))
+        self.max_attempts = max(1, max_attempts)
+        self.lease_seconds = lease_seconds
+
+    def enqueue(self, commit_hash: str, branch: str = None) -> bool:
+        """Queue a commit; returns False if it was already queued or analyzed."""
+        with self.db.get_connection() as conn:
+            cursor = conn.execute("""
+                INSERT OR IGNORE INTO analysis_queue (commit_hash, branch, status, enqueued_at)
+                VALUES (?, ?, 'pending', ?)
+            """, (commit_hash, branch, int(time.time())))
+            return cursor.rowcount > 0
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest pending job, or None if the queue is empty."""
+        with self.db.get_connection() as conn:
+            if not conn.in_transaction:
+                # Take the write lock before reading, so two workers never claim the same job
+                conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("""
+                SELECT commit_hash FROM analysis_queue
+                WHERE status = 'pending'
+                ORDER BY enqueued_at, rowid
+                LIMIT 1
+            """).fetchone()
+            if not row:
+                return None
+            conn.execute("""
+                UPDATE analysis_queue
+                SET status = 'running', attempts = attempts + 1, worker_id = ?, started_at = ?
+                WHERE commit_hash = ?
+            """, (worker_id, int(time.time()), row[0]))
+            return self._get_job(conn, row[0])
+
+    def complete(self, commit_hash: str, event_count: int):
+        """Mark a job as analyzed."""
+        with self.db.get_connection() as conn:
+            conn.execute("""
+                UPDATE analysis_queue
+                SET status = 'done', event_count = ?, last_error = NULL, finished_at = ?
+                WHERE commit_hash = ?
+            """, (event_count, int(time.time()), commit_hash))
+
+    def fail(self, commit_hash: str, error: str):
+        """Record a failed attempt; the job is retried until max_attempts."""
+        with self.db.get_connection() as conn:
+            conn.execute("""
+                UPDATE analysis_queue
+                SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    last_error = ?, finished_at = ?
+                WHERE commit_hash = ?
+            """, (self.max_attempts, error, int(time.time()), commit_hash))
+
+    def recover_abandoned(self) -> int:
+        """Requeue running jobs whose worker died or whose lease expired."""
+        hostname = socket.gethostname()
+        now = int(time.time())
+        abandoned = []
+        with self.db.get_connection() as conn:
+            for commit_hash, worker_id, started_at in conn.execute(
+                    "SELECT commit_hash, worker_id, started_at FROM analysis_queue WHERE status = 'running'"):
+                host, _, rest = (worker_id or "").partition(":")
+                pid = rest.split(":")[0]
+                dead = host == hostname and pid.isdigit() and not _pid_alive(int(pid))
+                if dead or (started_at or 0) < now - self.lease_seconds:
+                    abandoned.append(commit_hash)
+
+        # Counts as a failed attempt, so a commit that crashes workers ends up 'failed'
+        for commit_hash in abandoned:
+            self.fail(commit_hash, "Worker exited before finishing the analysis")
+        return len(abandoned)
+
+    def retry(self, commit_hash: str = None) -> int:
+        """Move failed jobs (all, or those matching a hash prefix) back to pending."""
+        with self.db.get_connection() as conn:
+            if commit_hash:
+                cursor = conn.execute("""
+                    UPDATE analysis_queue SET status = 'pending', attempts = 0
+                    WHERE status = 'failed' AND commit_hash LIKE ?
+                """, (f"{commit_hash}%",))
+            else:
+                cursor = conn.execute(
+                    "UPDATE analysis_queue SET status = 'pending', attempts = 0 WHERE status = 'failed'")
+            return cursor.rowcount
+
+    def get_status(self) -> Dict[str, Any]:
+        """Job counts by status and the age of the oldest pending job."""
+        counts = dict.fromkeys(QUEUE_STATUSES, 0)
+        with self.db.get_connection() as conn:
+            for status, count in conn.execute("SELECT status, COUNT(*) FROM analysis_queue GROUP BY status"):
+                counts[status] = count
+            oldest = conn.execute(
+                "SELECT MIN(enqueued_at) FROM analysis_queue WHERE status = 'pending'").fetchone()[0]
+        return {
+            "counts": counts,
+            "oldest_pending_age": int(time.time()) - oldest if oldest else None
+        }
+
+    def list_jobs(self, status: str = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recently queued jobs, optionally filtered by status."""
+        query = f"SELECT {', '.join(_JOB_COLUMNS)} FROM analysis_queue"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY enqueued_at DESC, rowid DESC LIMIT ?"
+        params.append(limit)
+        with self.db.get_connection() as conn:
+            return [dict(zip(_JOB_COLUMNS, row)) for row in conn.execute(query, params)]
+
+    def pending_count(self) -> int:
+        with self.db.get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM analysis_queue WHERE status = 'pending'").fetchone()[0]
+
+    def _get_job(self, conn, commit_hash: str) -> Dict[str, Any]:
+        row = conn.execute(f"SELECT {', '.join(_JOB_COLUMNS)} FROM analysis_queue WHERE commit_hash = ?",
+                           (commit_hash,)).fetchone()
+        return dict(zip(_JOB_COLUMNS, row))
+
+
+def _worker_lock_path(repo_path: Path) -> Path:
+    return repo_path / ".svcs" / "worker.lock"
+
+
+@contextlib.contextmanager
+def _hold_worker_lock(repo_path: Path):
+    """Shared lock held by every live worker, so hooks can tell one is running."""
+    if fcntl is None:
+        yield
+        return
+    with open(_worker_lock_path(repo_path), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def worker_running(repo_path: str) -> bool:
+    """True if a worker currently holds the repository's worker lock."""
+    if fcntl is None:
+        return False
+    lock_path = _worker_lock_path(Path(repo_path).resolve())
+    if not lock_path.exists():
+        return False
+    with open(lock_path, "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return True
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return False
+
+
+class QueueWorker:
+    """Drains the analysis queue with a configurable number of threads."""
+
+    def __init__(self, repo_path: str, concurrency: int = 1, poll_interval: float = 2.0,
+                 queue: RepositoryAnalysisQueue = None):
+        self.repo_path = Path(repo_path).resolve()
+        self.queue = queue or RepositoryAnalysisQueue(str(self.repo_path))
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, drain: bool = False, progress: Callable[[str], None] = print) -> Dict[str, int]:
+        """Process jobs until stopped, or with drain=True until the queue is empty."""
+        stats = {"processed": 0, "failed": 0, "events": 0, "recovered": 0}
+        while True:
+            with _hold_worker_lock(self.repo_path):
+                stats["recovered"] += self.queue.recover_abandoned()
+                threads = [
+                    threading.Thread(target=self._work_loop, args=(index, drain, stats, progress), daemon=True)
+                    for index in range(self.concurrency)
+                ]
+                for thread in threads:
+                    thread.start()
+                try:
+                    for thread in threads:
+                        while thread.is_alive():
+                            thread.join(timeout=0.5)
+                except KeyboardInterrupt:
+                    self.stop()
+                    for thread in threads:
+                        thread.join()
+
+            # A hook may have queued a commit after our last claim but while we
+            # still held the lock (so it did not start a worker): pick it up
+            if not drain or self._stop.is_set() or not self.queue.pending_count():
+                return stats
+
+    def _work_loop(self, index: int, drain: bool, stats: Dict[str, int], progress):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+        from svcs.analyzers.comprehensive_analyzer import ANALYSIS_JOBS
+        from svcs.semantic_analyzer import SVCSModularAnalyzer
+        # Workers already run concurrently; only fan out files when SVCS_ANALYSIS_JOBS asks for it
+        analyzer = SVCSModularAnalyzer(str(self.repo_path), jobs=ANALYSIS_JOBS or 1)
+        svcs = RepositoryLocalSVCS(str(self.repo_path))
+
+        while not self._stop.is_set():
+            job = self.queue.claim(worker_id)
+            if job is None:
+                if drain:
+                    return
+                self._stop.wait(self.poll_interval)
+                continue
+
+            commit_hash = job["commit_hash"]
+            try:
+                events = analyzer.analyze_commit_changes(commit_hash)
+                stored_count = 0
+                if events:
+                    stored_count, _ = svcs.analyze_and_store_commit(commit_hash, events, branch=job["branch"])
+                self.queue.complete(commit_hash, stored_count)
+                with self._stats_lock:
+                    stats["processed"] += 1
+                    stats["events"] += stored_count
+                if progress:
+                    progress(f"✅ SVCS: {commit_hash[:8]} analyzed ({stored_count} events)")
+            except Exception as e:
+                self.queue.fail(commit_hash, str(e))
+                with self._stats_lock:
+                    stats["failed"] += 1
+                logger.warning(f"Analysis of {commit_hash[:8]} failed: {e}")
+                if progress:
+                    progress(f"❌ SVCS: {commit_hash[:8]} failed (attempt {job['attempts']}): {e}")
+
+
+def spawn_worker(repo_path: str):
+    """Start a detached `svcs worker --drain` for the repository."""
+    repo_path = Path(repo_path).resolve()
+    cli_script = Path(__file__).resolve().parent / "svcs" / "cli.py"
+    # Hook-specific variables (GIT_INDEX_FILE etc.) must not leak into the worker
+    env = {key: value for key, value in os.environ.items() if not key.startswith("GIT_")}
+    with open(repo_path / ".svcs" / "worker.log", "a") as log:
+        subprocess.Popen(
+            [sys.executable, str(cli_script), "--path", str(repo_path), "worker", "--drain"],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+            cwd=str(repo_path), env=env, start_new_session=True
+        )
+
+
+def enqueue_post_commit(repo_path: str, commit_hash: str = None, start_worker: bool = True) -> Optional[str]:
+    """Queue a commit from the post-commit hook.
+
+    Returns the queued commit hash, or None when asynchronous analysis is
+    disabled and the caller should analyze synchronously.
+    """
+    svcs = RepositoryLocalSVCS(repo_path)
+    if not svcs.get_config("async_analysis", True):
+        return None
+
+    if not commit_hash:
+        commit_hash = subprocess.run(["git", "rev-parse", "HEAD"], cwd=svcs.repo_path,
+                                     capture_output=True, text=True, check=True).stdout.strip()
+    queue = RepositoryAnalysisQueue(str(svcs.repo_path), db=svcs.db)
+    queue.enqueue(commit_hash, branch=svcs.db.get_current_branch())
+
+    if start_worker and not worker_running(str(svcs.repo_path)):
+        spawn_worker(str(svcs.repo_path))
+    return commit_hash
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Commit-to-Branch Reachability Index for Repository-Local SVCS
+
+Events are stored once, on the branch they were analyzed on. Which branches
+an event belongs to is answered by git instead of by copying it around:
+
+1. branch_commits holds (branch, commit_hash) for every commit reachable from
+   each local branch head, refreshed from `git rev-list` when heads move
+2. Fast-forwarded heads only add `git rev-list new ^old`; rebased, reset or
+   new branches are re-listed; deleted or renamed branches are dropped
+3. Pinned rows (pinned = 1) make commits visible on a branch whose history
+   does not contain them (squash merges, notes imports, pre-index copies);
+   refreshes keep them
+4. Branch filters on an indexed branch match the events whose commit is in
+   branch_commits (an EXISTS probe of its primary key, so keyset pages stay
+   on the created_at index); the stamp is ignored, so events of rebased-away
+   or reset commits drop out. Branches git does not list use the stamp plus
+   their pinned commits
+
+Usage:
+    refresh_branch_index(conn, repo_path)
+    condition, params = branch_condition(conn, "main")
+    conn.execute(f"SELECT COUNT(*) FROM semantic_events se WHERE {condition}", params)
+"""
+
+import logging
+import sqlite3
+import subprocess
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def _git(repo_path: str, *args) -> Optional[str]:
+    try:
+        result = subprocess.run(["git", *args], cwd=repo_path, capture_output=True, text=True, check=True)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    return result.stdout
+
+
+def list_branch_heads(repo_path: str) -> Optional[Dict[str, str]]:
+    """Local branch name -> head commit, or None outside a git repository."""
+    output = _git(repo_path, "for-each-ref", "--format=%(refname:short) %(objectname)", "refs/heads")
+    if output is None:
+        return None
+    heads = {}
+    for line in output.splitlines():
+        name, _, head = line.rpartition(" ")
+        if name and head:
+            heads[name] = head
+    return heads
+
+
+def _rev_list(repo_path: str, head: str, exclude: str = None) -> Optional[List[str]]:
+    output = _git(repo_path, "rev-list", head, *([f"^{exclude}"] if exclude else []))
+    return None if output is None else output.split()
+
+
+def revision_exists(repo_path: str, revision: str) -> bool:
+    """Whether git resolves the revision to a commit."""
+    return _git(repo_path, "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}") is not None
+
+
+def _is_ancestor(repo_path: str, ancestor: str, head: str) -> bool:
+    try:
+        return subprocess.run(["git", "merge-base", "--is-ancestor", ancestor, head], cwd=repo_path,
+                              capture_output=True).returncode == 0
+    except OSError:
+        return False
+
+
+def has_branch_index(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name IN ('branch_commits', 'branch_heads')").fetchone()[0] == 2
+
+
+def refresh_branch_index(conn: sqlite3.Connection, repo_path: str) -> Dict[str, int]:
+    """Bring branch_commits up to date with the local branch heads.
+
+    git runs before the write transaction; a branch whose stored head changed
+    in the meantime is left for the next refresh. Runs in the caller's
+    transaction if there is one. Returns {branch: commits listed} for the
+    branches that moved.
+    """
+    heads = list_branch_heads(repo_path)
+    if heads is None or not has_branch_index(conn):
+        return {}
+    stored = dict(conn.execute("SELECT branch, head FROM branch_heads"))
+
+    plans = []
+    for branch, head in heads.items():
+        old = stored.get(branch)
+        if old == head:
+            continue
+        if old and _is_ancestor(repo_path, old, head):
+            commits, replace = _rev_list(repo_path, head, exclude=old), False
+        else:
+            commits, replace = _rev_list(repo_path, head), True
+        if commits is not None:
+            plans.append((branch, old, head, commits, replace))
+    removed = [branch for branch in stored if branch not in heads]
+    if not plans and not removed:
+        return {}
+
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = dict(conn.execute("SELECT branch, head FROM branch_heads"))
+        for branch in removed:
+            conn.execute("DELETE FROM branch_commits WHERE branch = ?", (branch,))
+            conn.execute("DELETE FROM branch_heads WHERE branch = ?", (branch,))
+        refreshed = {}
+        now = int(time.time())
+        for branch, old, head, commits, replace in plans:
+            if current.get(branch) != old:
+                continue
+            if replace:
+                conn.execute("DELETE FROM branch_commits WHERE branch = ? AND pinned = 0", (branch,))
+            conn.executemany("INSERT OR IGNORE INTO branch_commits (branch, commit_hash) VALUES (?, ?)",
+                             [(branch, commit) for commit in commits])
+            conn.execute("""
+                INSERT INTO branch_heads (branch, head, refreshed_at) VALUES (?, ?, ?)
+                ON CONFLICT (branch) DO UPDATE SET head = excluded.head, refreshed_at = excluded.refreshed_at
+            """, (branch, head, now))
+            refreshed[branch] = len(commits)
+        if own_transaction:
+            conn.commit()
+    except Exception:
+        if own_transaction:
+            conn.rollback()
+        raise
+    if refreshed or removed:
+        logger.debug(f"Branch index refreshed: {refreshed}, removed: {removed}")
+    return refreshed
+
+
+def is_indexed_branch(conn: sqlite3.Connection, branch: str) -> bool:
+    """Whether branch_commits lists the branch's commits from git (it has a branch_heads row)."""
+    try:
+        return conn.execute("SELECT 1 FROM branch_heads WHERE branch = ?", (branch,)).fetchone() is not None
+    except sqlite3.OperationalError:
+        return False
+
+
+def has_pinned_commits(conn: sqlite3.Connection, branch: str) -> bool:
+    """Whether a branch git does not list has branch_commits rows (pins) anyway."""
+    try:
+        return conn.execute("SELECT 1 FROM branch_commits WHERE branch = ? LIMIT 1", (branch,)).fetchone() is not None
+    except sqlite3.OperationalError:
+        return False
+
+
+def commit_branches(conn: sqlite3.Connection, commits: List[str], prefer: str = None) -> Dict[str, str]:
+    """A branch that reaches (or has pinned) each commit: `prefer` when it does,
+    otherwise the first by name. Commits no indexed branch reaches are left out."""
+    branches = {}
+    for start in range(0, len(commits), 500):
+        chunk = commits[start:start + 500]
+        rows = conn.execute(f"""
+            SELECT commit_hash, branch FROM branch_commits
+            WHERE commit_hash IN ({", ".join("?" * len(chunk))}) ORDER BY commit_hash, branch
+        """, chunk)
+        for commit_hash, branch in rows:
+            if commit_hash not in branches or branch == prefer:
+                branches[commit_hash] = branch
+    return branches
+
+
+def branch_condition(conn: sqlite3.Connection, branch: str, alias: str = "se",
+                     by_commit: bool = False) -> Tuple[str, List[str]]:
+    """SQL condition (and parameters) selecting the events of a branch.
+
+    For indexed branches, every event of a commit the branch reaches or has
+    pinned; otherwise the events stamped with the branch, plus those of its
+    pinned commits. The default form keeps ORDER BY created_at pages on the
+    keyset index; by_commit lets the planner start from the branch's commits
+    instead, which suits counts.
+    """
+    if not is_indexed_branch(conn, branch):
+        if not has_pinned_commits(conn, branch):
+            return f"{alias}.branch = ?", [branch]
+        # A branch git does not list (deleted, or never checked out here) that received pins
+        return (f"({alias}.branch = ? OR {alias}.commit_hash IN "
+                f"(SELECT commit_hash FROM branch_commits WHERE branch = ?))"), [branch, branch]
+    if by_commit:
+        return f"{alias}.commit_hash IN (SELECT commit_hash FROM branch_commits WHERE branch = ?)", [branch]
+    return (f"EXISTS (SELECT 1 FROM branch_commits bc WHERE bc.branch = ? "
+            f"AND bc.commit_hash = {alias}.commit_hash)"), [branch]
+
+
+def revision_condition(conn: sqlite3.Connection, repo_path: str, revision: str,
+                       alias: str = "se") -> Tuple[str, List[str]]:
+    """Like branch_condition, for any git revision (branch, tag, remote ref, commit).
+
+    Local branches use the reachability index (refreshed first). Other
+    revisions list their commits once into a temporary table on this
+    connection; revisions git does not know match the branch stamp only.
+    """
+    refresh_branch_index(conn, repo_path)
+    if is_indexed_branch(conn, revision):
+        return branch_condition(conn, revision, alias)
+    commits = _rev_list(repo_path, revision)
+    if not commits:
+        return branch_condition(conn, revision, alias)
+    own_transaction = not conn.in_transaction
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS revision_commits (
+            revision TEXT NOT NULL,
+            commit_hash TEXT NOT NULL,
+            PRIMARY KEY (revision, commit_hash)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("DELETE FROM temp.revision_commits WHERE revision = ?", (revision,))
+    conn.executemany("INSERT OR IGNORE INTO temp.revision_commits (revision, commit_hash) VALUES (?, ?)",
+                     [(revision, commit) for commit in commits])
+    if own_transaction:
+        conn.commit()
+    return (f"{alias}.commit_hash IN (SELECT commit_hash FROM temp.revision_commits WHERE revision = ?)",
+            [revision])
+
+
+def pin_branch_commits(conn: sqlite3.Connection, source_branch: str, target_branch: str) -> int:
+    """Make the source branch's events visible on the target branch.
+
+    Pins the commits of source events the target branch does not show yet
+    (a squash or cherry-picked merge), without copying any event. Returns
+    the number of commits pinned.
+    """
+    source, source_params = branch_condition(conn, source_branch)
+    target, target_params = branch_condition(conn, target_branch)
+    cursor = conn.execute(f"""
+        INSERT OR IGNORE INTO branch_commits (branch, commit_hash, pinned)
+        SELECT DISTINCT ?, se.commit_hash, 1 FROM semantic_events se
+        WHERE {source} AND ({target}) IS NOT 1 AND se.commit_hash IS NOT NULL
+    """, [target_branch] + source_params + target_params)
+    return cursor.rowcount
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Semantic Event Search for Repository-Local SVCS
+
+Compiles dashboard and API search filters into one parameterized SQL query
+against the repository-local semantic.db, instead of loading a fixed number
+of events and filtering them in Python:
+
+1. Every filter becomes a WHERE condition with bound parameters
+2. Sorting, LIMIT and OFFSET run in SQLite, on the branch/created_at indexes
+3. A matching COUNT(*) query reports the real number of matches
+4. Opaque keyset cursors on (timestamp, event_id) page through results, so
+   page N costs the same index range scan as page 1
+5. Text terms use the FTS5 index (ranked by bm25) when the database has one,
+   and fall back to LIKE otherwise
+6. Branch filters match the commits reachable from the branch (see
+   svcs_repo_reachability), so merged events show up without copies
+
+Usage:
+    query = EventQuery(branch="main").event_types(["node_added"]).author("alice").limit(20)
+    page = query.fetch_page(conn)       # {"events": [...], "next_cursor": "..."}
+    total = query.count(conn)
+    next_page = EventQuery(branch="main").after(page["next_cursor"]).limit(20).fetch_page(conn)
+"""
+
+import base64
+import json
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from migrations.migrate_database import EVENT_FTS_TABLE, fts5_supported
+from svcs_repo_reachability import branch_condition
+
+# Columns returned for each event (same shape as get_branch_events)
+EVENT_COLUMNS = """
+    se.event_id, se.commit_hash, se.branch, se.event_type, se.node_id, se.location,
+    se.details, se.layer, se.confidence, se.reasoning, se.impact, se.created_at,
+    c.author, c.timestamp as commit_timestamp, c.message as commit_message
+"""
+
+# Public sort names mapped to SQL expressions; anything else is rejected
+SORT_FIELDS = {
+    "timestamp": "se.created_at",
+    "created_at": "se.created_at",
+    "commit_timestamp": "c.timestamp",
+    "confidence": "se.confidence",
+    "event_type": "se.event_type",
+    "layer": "se.layer",
+    "location": "se.location",
+    "node_id": "se.node_id",
+    "author": "c.author",
+}
+
+# Search terms for AI-detected pattern categories (matched in details and reasoning)
+PATTERN_TERMS = {
+    "performance": ["performance", "optimization", "speed", "efficiency"],
+    "architecture": ["architecture", "design", "pattern", "structure"],
+    "error_handling": ["error", "exception", "handling", "try", "catch"],
+    "refactoring": ["refactor", "cleanup", "reorganize", "restructure"],
+    "security": ["security", "authentication", "authorization", "validation"],
+    "testing": ["test", "testing", "unit", "integration", "mock"],
+    "documentation": ["documentation", "comment", "docstring", "readme"]
+}
+
+
+def parse_date(value: Union[str, int, float, datetime, None]) -> Optional[int]:
+    """Parse YYYY-MM-DD, 'N days/weeks/months/years ago', 'today' or 'yesterday'.
+
+    Returns a Unix timestamp, or None if the value cannot be parsed.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    text = str(value).strip().lower()
+    try:
+        return int(datetime.strptime(text, "%Y-%m-%d").timestamp())
+    except ValueError:
+        pass
+
+    now = datetime.now()
+    if text == "today":
+        return int(now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+    if text == "yesterday":
+        return int((now - timedelta(days=1)).timestamp())
+
+    match = re.match(r"(\d+)\s*(day|week|month|year)s?\s+ago$", text)
+    if match:
+        amount = int(match.group(1))
+        days = {"day": 1, "week": 7, "month": 30, "year": 365}[match.group(2)]
+        return int((now - timedelta(days=amount * days)).timestamp())
+    return None
+
+
+def encode_cursor(timestamp: Optional[int], event_id: str) -> str:
+    """Opaque cursor pointing just past the event with this (timestamp, event_id)."""
+    payload = json.dumps([timestamp, event_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, event_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if isinstance(timestamp, bool) or not isinstance(timestamp, int) or not isinstance(event_id, str):
+            raise TypeError("unexpected cursor fields")
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    return timestamp, event_id
+
+
+def fts_match_expression(terms: Iterable[str], columns: Iterable[str] = None) -> Optional[str]:
+    """FTS5 MATCH expression for any of the terms, each a word-prefix phrase.
+
+    Terms are split into words the way the unicode61 tokenizer splits them, so
+    "error_handling" matches that identifier and "perf" matches "performance".
+    Returns None if no term contains a word character.
+    """
+    phrases = []
+    for term in terms:
+        words = re.findall(r"[^\W_]+", str(term))
+        if words:
+            phrases.append('"' + " ".join(words) + '"*')
+    if not phrases:
+        return None
+    expression = " OR ".join(phrases)
+    if columns:
+        expression = "{" + " ".join(columns) + "} : (" + expression + ")"
+    return expression
+
+
+def has_event_fts(conn: sqlite3.Connection) -> bool:
+    """Whether semantic_events has a usable, trigger-maintained FTS5 index."""
+    if not fts5_supported(conn):
+        return False
+    names = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE name = ? OR tbl_name = 'semantic_events'", (EVENT_FTS_TABLE,))}
+    return EVENT_FTS_TABLE in names and "semantic_events_fts_insert" in names
+
+
+def text_search_sql(terms: Iterable[str], columns: Iterable[str] = ("details", "reasoning"),
+                    alias: str = "se", use_fts: bool = True) -> Dict[str, Any]:
+    """SQL fragments matching events whose columns contain any of the terms.
+
+    Returns {"join", "join_params", "where", "where_params", "rank"}. With
+    use_fts the match is a JOIN against the FTS5 index and "rank" is its bm25
+    score (lower is better); otherwise it is a LIKE condition and rank is None.
+    """
+    terms = [str(t) for t in terms]
+    columns = tuple(columns)
+    expression = fts_match_expression(terms, columns) if use_fts else None
+    if expression is not None:
+        return {
+            "join": (f" JOIN (SELECT rowid AS fts_rowid, bm25({EVENT_FTS_TABLE}) AS fts_rank"
+                     f" FROM {EVENT_FTS_TABLE} WHERE {EVENT_FTS_TABLE} MATCH ?) fts"
+                     f" ON fts.fts_rowid = {alias}.rowid"),
+            "join_params": [expression],
+            "where": "",
+            "where_params": [],
+            "rank": "fts.fts_rank",
+        }
+
+    clauses = []
+    params = []
+    for term in terms:
+        for column in columns:
+            clauses.append(f"{alias}.{column} LIKE ? ESCAPE '\\'")
+            params.append(_like_pattern(term))
+    return {
+        "join": "",
+        "join_params": [],
+        "where": "(" + " OR ".join(clauses) + ")" if clauses else "",
+        "where_params": params,
+        "rank": None,
+    }
+
+
+def _like_pattern(text: str) -> str:
+    """Substring LIKE pattern with %, _ and the escape character escaped."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _as_list(value) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [v for v in value if v not in (None, "")]
+    return [value] if value != "" else []
+
+
+class EventQuery:
+    """Builder for a filtered, sorted and paginated semantic event query."""
+
+    def __init__(self, branch: Optional[str] = None):
+        self._conditions: List[str] = []
+        self._params: List[Any] = []
+        self._needs_commits = False
+        self._order: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._cursor: Optional[Tuple[int, str]] = None
+        self._text: Optional[Tuple[List[str], Tuple[str, ...]]] = None
+        self._branch: Optional[str] = None
+        self._branch_filter: Optional[Tuple[str, List[Any]]] = None
+        if branch is not None:
+            self.branch(branch)
+
+    def _where(self, condition: str, *params, commits: bool = False) -> "EventQuery":
+        self._conditions.append(condition)
+        self._params.extend(params)
+        self._needs_commits = self._needs_commits or commits
+        return self
+
+    # --- Filters ---
+
+    def branch(self, branch: str) -> "EventQuery":
+        """Events on a branch.
+
+        fetch/count resolve it against the connection's reachability index
+        (see svcs_repo_reachability); a SQL statement built without one
+        filters on the branch stamped on each event.
+        """
+        self._branch = branch
+        self._branch_filter = None
+        return self
+
+    def commit(self, commit_hash: str) -> "EventQuery":
+        return self._where("se.commit_hash = ?", commit_hash)
+
+    def author(self, author: Optional[str]) -> "EventQuery":
+        """Case-insensitive substring match on the commit author."""
+        if not author:
+            return self
+        return self._where("c.author LIKE ? ESCAPE '\\'", _like_pattern(author), commits=True)
+
+    def event_types(self, event_types: Union[str, Iterable[str], None]) -> "EventQuery":
+        values = _as_list(event_types)
+        if not values:
+            return self
+        return self._where(f"se.event_type IN ({', '.join('?' for _ in values)})", *values)
+
+    def layers(self, layers: Union[str, Iterable[str], None]) -> "EventQuery":
+        values = [str(v) for v in _as_list(layers)]
+        if not values:
+            return self
+        return self._where(f"se.layer IN ({', '.join('?' for _ in values)})", *values)
+
+    def location(self, pattern: Optional[str]) -> "EventQuery":
+        """Case-insensitive substring match on the event location."""
+        if not pattern:
+            return self
+        return self._where("se.location LIKE ? ESCAPE '\\'", _like_pattern(pattern))
+
+    def node(self, node_id: Optional[str]) -> "EventQuery":
+        if not node_id:
+            return self
+        return self._where("se.node_id = ?", node_id)
+
+    def confidence(self, minimum: Optional[float] = None, maximum: Optional[float] = None) -> "EventQuery":
+        if minimum is not None:
+            self._where("se.confidence >= ?", float(minimum))
+        if maximum is not None:
+            self._where("se.confidence <= ?", float(maximum))
+        return self
+
+    def since(self, value) -> "EventQuery":
+        """Events created at or after a date (see parse_date); unparsable values are ignored."""
+        cutoff = parse_date(value)
+        if cutoff is None:
+            return self
+        return self._where("se.created_at >= ?", cutoff)
+
+    def until(self, value) -> "EventQuery":
+        """Events created before a date (see parse_date); unparsable values are ignored."""
+        cutoff = parse_date(value)
+        if cutoff is None:
+            return self
+        return self._where("se.created_at < ?", cutoff)
+
+    def text(self, terms: Union[str, Iterable[str], None],
+             columns: Tuple[str, ...] = ("details", "reasoning")) -> "EventQuery":
+        """Events whose text columns contain any of the terms.
+
+        Uses the FTS5 index (prefix match on whole words) when the database has
+        one, otherwise a LIKE substring match.
+        """
+        values = [str(v) for v in _as_list(terms)]
+        if values:
+            self._text = (values, tuple(columns))
+        return self
+
+    def pattern(self, pattern_type: str) -> "EventQuery":
+        """Filter on an AI pattern category from PATTERN_TERMS (or a free-text term)."""
+        return self.text(PATTERN_TERMS.get(pattern_type, [pattern_type]))
+
+    # --- Ordering and paging ---
+
+    def order_by(self, field: str = "timestamp", descending: bool = True) -> "EventQuery":
+        """Add a sort key; unknown fields raise ValueError.
+
+        "relevance" ranks text matches by bm25 (best first when descending),
+        falling back to confidence without a full-text index.
+        """
+        if field == "relevance":
+            self._order.append((field, bool(descending)))
+            return self
+        if field not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {field} "
+                             f"(use one of {', '.join(sorted(SORT_FIELDS) + ['relevance'])})")
+        if SORT_FIELDS[field].startswith("c."):
+            self._needs_commits = True
+        self._order.append((SORT_FIELDS[field], bool(descending)))
+        return self
+
+    def limit(self, limit: Optional[int], offset: int = 0) -> "EventQuery":
+        self._limit = None if limit is None else max(0, int(limit))
+        self._offset = max(0, int(offset or 0))
+        return self
+
+    def after(self, cursor: Optional[str]) -> "EventQuery":
+        """Continue after the page that returned this cursor (timestamp order only)."""
+        self._cursor = decode_cursor(cursor) if cursor else None
+        return self
+
+    # --- SQL ---
+
+    def _keyset_descending(self) -> bool:
+        order = self._order or [(SORT_FIELDS["timestamp"], True)]
+        if len(order) != 1 or order[0][0] != "se.created_at":
+            raise ValueError("Cursors require ordering by timestamp only")
+        if self._offset:
+            raise ValueError("Use either a cursor or an offset, not both")
+        return order[0][1]
+
+    def _from_where(self, fts: bool) -> Tuple[str, List[Any], Optional[str]]:
+        """FROM ... WHERE fragment, its parameters and the bm25 rank expression."""
+        conditions = list(self._conditions)
+        params: List[Any] = []
+        where_params = list(self._params)
+        if self._branch is not None:
+            condition, branch_params = self._branch_filter or ("se.branch = ?", [self._branch])
+            conditions.insert(0, condition)
+            where_params[:0] = branch_params
+        joins = ""
+        rank = None
+        if self._text:
+            terms, columns = self._text
+            match = text_search_sql(terms, columns, alias="se", use_fts=fts)
+            joins += match["join"]
+            params.extend(match["join_params"])
+            if match["where"]:
+                conditions.append(match["where"])
+                where_params.extend(match["where_params"])
+            rank = match["rank"]
+        if self._cursor is not None:
+            # Row-value comparison is a single range on the (created_at, event_id) index
+            conditions.append(f"(se.created_at, se.event_id) {'<' if self._keyset_descending() else '>'} (?, ?)")
+            where_params.extend(self._cursor)
+        where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+        return joins + where, params + where_params, rank
+
+    def build(self, fts: bool = False) -> Tuple[str, List[Any]]:
+        """SELECT statement and parameters; fts selects the FTS5 text match."""
+        from_where, params, rank = self._from_where(fts)
+        order = self._order or [(SORT_FIELDS["timestamp"], True)]
+        keys = []
+        for expr, desc in order:
+            if expr == "relevance":
+                # bm25 scores are lower for better matches
+                keys.append(f"{rank} {'ASC' if desc else 'DESC'}" if rank
+                            else f"se.confidence {'DESC' if desc else 'ASC'}")
+            else:
+                keys.append(f"{expr} {'DESC' if desc else 'ASC'}")
+        if "se.created_at" not in [expr for expr, _ in order]:
+            keys.append(f"se.created_at {'DESC' if order[0][1] else 'ASC'}")
+        # event_id makes the order total, so pages never overlap or skip rows
+        keys.append(f"se.event_id {'DESC' if order[0][1] else 'ASC'}")
+
+        sql = (f"SELECT {EVENT_COLUMNS} FROM semantic_events se "
+               f"LEFT JOIN commits c ON se.commit_hash = c.commit_hash"
+               f"{from_where} ORDER BY {', '.join(keys)}")
+        if self._limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([self._limit, self._offset])
+        return sql, params
+
+    def build_count(self, fts: bool = False) -> Tuple[str, List[Any]]:
+        """COUNT(*) statement and parameters for the current filters (ignores paging)."""
+        cursor, self._cursor = self._cursor, None
+        try:
+            from_where, params, _ = self._from_where(fts)
+        finally:
+            self._cursor = cursor
+        join = " LEFT JOIN commits c ON se.commit_hash = c.commit_hash" if self._needs_commits else ""
+        return f"SELECT COUNT(*) FROM semantic_events se{join}{from_where}", params
+
+    def _use_fts(self, conn: sqlite3.Connection) -> bool:
+        return bool(self._text) and fts_match_expression(self._text[0]) is not None and has_event_fts(conn)
+
+    def _resolve_branch(self, conn: sqlite3.Connection, by_commit: bool = False) -> None:
+        if self._branch is not None:
+            self._branch_filter = branch_condition(conn, self._branch, by_commit=by_commit)
+
+    def fetch(self, conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+        self._resolve_branch(conn)
+        sql, params = self.build(fts=self._use_fts(conn))
+        cursor = conn.execute(sql, params)
+        columns = [desc[0] for desc in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def fetch_page(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        """One page of events plus the cursor for the next one.
+
+        The cursor is None on the last page and for orders other than timestamp,
+        which page with offsets. Reads one row past the limit to tell whether
+        another page exists.
+        """
+        if self._limit is None:
+            return {"events": self.fetch(conn), "next_cursor": None}
+        try:
+            self._keyset_descending()
+        except ValueError:
+            # Other sort orders page with offsets
+            return {"events": self.fetch(conn), "next_cursor": None}
+
+        limit = self._limit
+        self._limit = limit + 1
+        try:
+            events = self.fetch(conn)
+        finally:
+            self._limit = limit
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = encode_cursor(events[-1]["created_at"], events[-1]["event_id"]) if events else None
+        return {"events": events, "next_cursor": next_cursor}
+
+    def count(self, conn: sqlite3.Connection) -> int:
+        # Counts have no order to keep, so start from the branch's commits
+        self._resolve_branch(conn, by_commit=True)
+        sql, params = self.build_count(fts=self._use_fts(conn))
+        return conn.execute(sql, params).fetchone()[0]
+
+
+def build_event_query(branch: Optional[str] = None, author: str = None, event_types=None,
+                      location_pattern: str = None, layers=None, min_confidence: float = None,
+                      max_confidence: float = None, since_date=None, until_date=None,
+                      pattern_type: str = None, node_id: str = None,
+                      order_by: str = "timestamp", order_desc: bool = True,
+                      limit: Optional[int] = 20, offset: int = 0, cursor: str = None) -> EventQuery:
+    """EventQuery from the keyword filters used by the web and MCP search APIs."""
+    query = (EventQuery(branch)
+             .author(author)
+             .event_types(event_types)
+             .location(location_pattern)
+             .layers(layers)
+             .node(node_id)
+             .confidence(min_confidence, max_confidence)
+             .since(since_date)
+             .until(until_date))
+    if pattern_type:
+        query.pattern(pattern_type)
+    return query.order_by(order_by or "timestamp", order_desc).limit(limit, offset).after(cursor)
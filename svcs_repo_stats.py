@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Event Statistics for Repository-Local SVCS
+
+Dashboards, `svcs status` and the analytics endpoints used to run COUNT and
+GROUP BY over the whole semantic_events table on every call. They now read
+the event_stats rollup instead (see migration 7 in migrations/migrate_database.py):
+
+1. One row per (branch, event_type, layer, author, day) with the event count
+   and confidence sum, kept current by triggers in the writer's transaction
+2. Every statistic is a SUM over the matching rollup rows, so its cost grows
+   with the number of groups rather than the number of events
+3. `svcs cleanup --rebuild-stats` recomputes the rollups from scratch
+
+The rollup groups events by the branch they were stored on; per-branch
+event counts that follow git reachability come from count_branch_events,
+which sums the per-commit commit_event_counts rollup (migration 10) over the
+branch's commits.
+
+Usage:
+    with get_connection(db_path) as conn:
+        stats = get_event_stats(conn, branch="main", since="30 days ago")
+        stats["total_events"], stats["event_types"], stats["authors"], stats["days"]
+"""
+
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from migrations.migrate_database import (COMMIT_EVENT_COUNTS_TABLE, EVENT_STATS_SELECT, EVENT_STATS_TABLE,
+                                         rebuild_commit_event_counts, rebuild_event_stats)
+from svcs_repo_reachability import branch_condition, has_pinned_commits, is_indexed_branch
+from svcs_repo_search import parse_date
+
+# Statistic name -> rollup column it groups by
+GROUPINGS = {
+    "event_types": "event_type",
+    "layers": "layer",
+    "authors": "author",
+    "days": "day",
+    "branches": "branch",
+}
+
+
+def has_event_stats(conn: sqlite3.Connection) -> bool:
+    """Whether the database has the trigger-maintained event_stats rollup."""
+    names = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE name IN (?, 'event_stats_event_insert')", (EVENT_STATS_TABLE,))}
+    return len(names) == 2
+
+
+def has_commit_event_counts(conn: sqlite3.Connection) -> bool:
+    """Whether the database has the trigger-maintained commit_event_counts rollup."""
+    names = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE name IN (?, 'commit_event_counts_insert')",
+        (COMMIT_EVENT_COUNTS_TABLE,))}
+    return len(names) == 2
+
+
+def _stats_source(conn: sqlite3.Connection) -> str:
+    # Databases without the rollup get the same rows computed on the fly
+    return EVENT_STATS_TABLE if has_event_stats(conn) else f"({EVENT_STATS_SELECT})"
+
+
+def get_event_stats(conn: sqlite3.Connection, branch: Optional[str] = None, since=None, until=None,
+                    groupings: List[str] = None) -> Dict[str, Any]:
+    """Event totals and per-group counts from the event_stats rollup.
+
+    since/until accept anything parse_date does and filter on the commit day
+    (UTC, whole days). Returns total_events, avg_confidence and one
+    {value: count} dict per grouping (event_types, layers, authors, days,
+    branches), largest first; days are in date order. Missing branch, layer
+    and author values are reported as None.
+    """
+    conditions = []
+    params: List[Any] = []
+    if branch is not None:
+        conditions.append("branch = ?")
+        params.append(branch)
+    since_ts, until_ts = parse_date(since), parse_date(until)
+    if since_ts is not None:
+        conditions.append("day >= date(?, 'unixepoch')")
+        params.append(since_ts)
+    if until_ts is not None:
+        conditions.append("day < date(?, 'unixepoch')")
+        params.append(until_ts)
+    where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+    source = _stats_source(conn)
+
+    total, confidence_sum, confidence_count = conn.execute(
+        f"SELECT TOTAL(event_count), TOTAL(confidence_sum), TOTAL(confidence_count) FROM {source} s{where}",
+        params).fetchone()
+    stats: Dict[str, Any] = {
+        "total_events": int(total),
+        "avg_confidence": confidence_sum / confidence_count if confidence_count else 0.0,
+    }
+    for name in groupings or GROUPINGS:
+        column = GROUPINGS[name]
+        order = "value" if column == "day" else "count DESC, value"
+        rows = conn.execute(f"""
+            SELECT {column} AS value, SUM(event_count) AS count FROM {source} s{where}
+            GROUP BY {column} ORDER BY {order}
+        """, params).fetchall()
+        stats[name] = {(value if value != "" else None): count for value, count in rows}
+    return stats
+
+
+def count_branch_events(conn: sqlite3.Connection, branch: str) -> int:
+    """Number of events on one branch.
+
+    Indexed branches sum commit_event_counts over their reachable and pinned
+    commits (see svcs_repo_reachability); other branches read a primary-key
+    range of the event_stats rollup, or count through the branch and commit
+    indexes when they have pinned commits. None scans semantic_events.
+    """
+    if is_indexed_branch(conn, branch):
+        if has_commit_event_counts(conn):
+            total = conn.execute(f"""
+                SELECT TOTAL(cc.event_count) FROM branch_commits bc
+                JOIN {COMMIT_EVENT_COUNTS_TABLE} cc ON cc.commit_hash = bc.commit_hash
+                WHERE bc.branch = ?
+            """, (branch,)).fetchone()[0]
+            return int(total)
+        # Without the rollup, count per commit through the commit_hash index
+        return conn.execute("""
+            SELECT COUNT(*) FROM semantic_events
+            WHERE commit_hash IN (SELECT commit_hash FROM branch_commits WHERE branch = ?)
+        """, (branch,)).fetchone()[0]
+    if has_pinned_commits(conn, branch):
+        condition, params = branch_condition(conn, branch, by_commit=True)
+        return conn.execute(f"SELECT COUNT(*) FROM semantic_events se WHERE {condition}", params).fetchone()[0]
+    total = conn.execute(f"SELECT TOTAL(event_count) FROM {_stats_source(conn)} s WHERE branch = ?",
+                         (branch,)).fetchone()[0]
+    return int(total)
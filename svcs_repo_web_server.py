@@ -252,22 +252,29 @@ def search_events():
         since_days = data.get('since_days')
         order_by = data.get('order_by', 'timestamp')
         order_desc = data.get('order_desc', True)
+        cursor = data.get('cursor')  # next_cursor from the previous page
         
-        events = web_repository_manager.search_events(
-            repo_path, 
-            limit=limit, 
-            event_type=event_type, 
-            since_days=since_days,
-            order_by=order_by,
-            order_desc=order_desc
-        )
+        try:
+            page = web_repository_manager.search_events_page(
+                repo_path, 
+                limit=limit, 
+                event_type=event_type, 
+                since_days=since_days,
+                order_by=order_by,
+                order_desc=order_desc,
+                cursor=cursor
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        events = page['events']
         
         return jsonify({
             'success': True,
             'data': {
                 'repository_path': repo_path,
                 'events': events,
-                'total': len(events)
+                'total': len(events),
+                'next_cursor': page['next_cursor']
             }
         })
     except Exception as e:
@@ -288,9 +295,6 @@ def search_events_advanced():
         if not svcs:
             return jsonify({'success': False, 'error': 'Repository not found or not initialized'}), 404
         
-        # Get all events from the SELECTED REPOSITORY
-        events = svcs.get_branch_events(limit=5000)  # Get more events for filtering
-        
         # Extract advanced search parameters
         author = data.get('author')
         event_types = data.get('event_types')  # List of event types
@@ -301,92 +305,43 @@ def search_events_advanced():
         since_date = data.get('since_date')  # YYYY-MM-DD or relative like "7 days ago"
         until_date = data.get('until_date')
         limit = data.get('limit', 20)
+        offset = data.get('offset', 0)
+        cursor = data.get('cursor')  # next_cursor from the previous page (timestamp order)
         order_by = data.get('order_by', 'timestamp')
         order_desc = data.get('order_desc', True)
         
-        # Apply advanced filtering to repository events
-        filtered_events = events
-        
-        # Filter by author
-        if author:
-            filtered_events = [e for e in filtered_events if author.lower() in str(e.get('author', '')).lower()]
-        
-        # Filter by event types
-        if event_types:
-            event_types_list = event_types if isinstance(event_types, list) else [event_types]
-            filtered_events = [e for e in filtered_events if e.get('event_type') in event_types_list]
-        
-        # Filter by location pattern
-        if location_pattern:
-            filtered_events = [e for e in filtered_events if location_pattern.lower() in str(e.get('location', '')).lower()]
-        
-        # Filter by layers
-        if layers:
-            layers_list = layers if isinstance(layers, list) else [layers]
-            filtered_events = [e for e in filtered_events if e.get('layer') in layers_list]
-        
-        # Filter by confidence
-        if min_confidence is not None:
-            filtered_events = [e for e in filtered_events if e.get('confidence', 0) >= min_confidence]
-        if max_confidence is not None:
-            filtered_events = [e for e in filtered_events if e.get('confidence', 1) <= max_confidence]
-        
-        # Filter by date range
-        if since_date:
-            # Handle relative dates like "7 days ago"
-            if 'days ago' in since_date:
-                import re
-                days_match = re.search(r'(\d+)\s*days?\s*ago', since_date)
-                if days_match:
-                    days = int(days_match.group(1))
-                    from datetime import datetime, timedelta
-                    cutoff = int((datetime.now() - timedelta(days=days)).timestamp())
-                    filtered_events = [e for e in filtered_events if e.get('created_at', 0) > cutoff]
-            else:
-                # Handle absolute dates
-                try:
-                    from datetime import datetime
-                    cutoff = int(datetime.strptime(since_date, '%Y-%m-%d').timestamp())
-                    filtered_events = [e for e in filtered_events if e.get('created_at', 0) > cutoff]
-                except:
-                    pass  # Invalid date format, skip filter
-        
-        if until_date:
-            try:
-                from datetime import datetime
-                cutoff = int(datetime.strptime(until_date, '%Y-%m-%d').timestamp())
-                filtered_events = [e for e in filtered_events if e.get('created_at', 0) < cutoff]
-            except:
-                pass  # Invalid date format, skip filter
-        
-        # Apply ordering
-        sort_field = order_by
-        if sort_field == 'timestamp':
-            sort_field = 'created_at'  # Map to actual field name
-        
-        def get_sort_key(event):
-            value = event.get(sort_field, 0)
-            if sort_field == 'created_at' and value:
-                return value
-            elif sort_field == 'confidence':
-                return event.get('confidence', 0)
-            elif sort_field == 'event_type':
-                return event.get('event_type', '')
-            else:
-                return value or 0
-        
-        filtered_events.sort(key=get_sort_key, reverse=order_desc)
-        
-        # Apply limit
-        final_events = filtered_events[:limit]
+        # Filtering, ordering and paging run in SQL against the SELECTED REPOSITORY
+        try:
+            result = svcs.search_events(
+                branch=data.get('branch'),
+                author=author,
+                event_types=event_types,
+                location_pattern=location_pattern,
+                layers=layers,
+                min_confidence=min_confidence,
+                max_confidence=max_confidence,
+                since_date=since_date,
+                until_date=until_date,
+                order_by=order_by,
+                order_desc=order_desc,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                with_total=data.get('include_total')
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        final_events = result['events']
         
         return jsonify({
             'success': True,
             'data': {
                 'repository_path': repo_path,
                 'results': final_events,  # Use 'results' field for advanced search frontend
-                'total': len(filtered_events),
+                'total': result['total'],
                 'showing': len(final_events),
+                'offset': offset,
+                'next_cursor': result['next_cursor'],
                 'filters_applied': {
                     'author': author,
                     'event_types': event_types,
@@ -422,33 +377,32 @@ def search_semantic_patterns():
         if not pattern_type:
             return jsonify({'success': False, 'error': 'Pattern type is required'}), 400
         
-        try:
-            # Import from main SVCS API instead of repository-specific API
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            svcs_api_path = os.path.join(current_dir, '.svcs')
-            sys.path.insert(0, svcs_api_path)
-            from api import search_semantic_patterns
-            
-            # Call pattern search function
-            results = search_semantic_patterns(
-                pattern_type=pattern_type,
-                min_confidence=min_confidence,
-                since_date=since_date,
-                limit=limit
-            )
-            
-            return jsonify({
-                'success': True,
-                'data': {
-                    'patterns': results,
-                    'count': len(results),
-                    'pattern_type': pattern_type,
-                    'confidence_threshold': min_confidence
-                }
-            })
-            
-        except ImportError as e:
-            return jsonify({'success': False, 'error': f'Pattern search not available: {e}'}), 500
+        svcs = web_repository_manager.get_repository(repository_path)
+        if not svcs:
+            return jsonify({'success': False, 'error': 'Repository not found or not initialized'}), 404
+        
+        # Pattern terms are matched in details/reasoning (FTS5, best bm25 rank first)
+        result = svcs.search_events(
+            branch=data.get('branch'),
+            pattern_type=pattern_type,
+            min_confidence=min_confidence,
+            since_date=since_date,
+            order_by='relevance',
+            order_desc=True,
+            limit=limit
+        )
+        results = result['events']
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'patterns': results,
+                'count': len(results),
+                'total': result['total'],
+                'pattern_type': pattern_type,
+                'confidence_threshold': min_confidence
+            }
+        })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -802,23 +756,21 @@ def generate_analytics():
         if not svcs:
             return jsonify({'success': False, 'error': 'Repository not found or not initialized'}), 404
         
-        # Get all events for analysis
-        events = svcs.get_branch_events(limit=1000)
+        # Branch totals from the event_stats rollup
+        stats = svcs.db.get_event_stats(branch=svcs.get_current_branch())
         
         # Generate analytics
         analytics = {
-            'total_events': len(events),
-            'event_types': {},
-            'activity_by_day': {},
+            'total_events': stats['total_events'],
+            'event_types': stats['event_types'],
+            'activity_by_day': stats['days'],
             'top_files': {},
             'patterns': []
         }
         
-        # Count event types
+        # File activity of the most recent events
+        events = svcs.get_branch_events(limit=1000)
         for event in events:
-            event_type = event.get('event_type', 'unknown')
-            analytics['event_types'][event_type] = analytics['event_types'].get(event_type, 0) + 1
-            
             # Count file activity
             location = event.get('location', 'unknown')
             if '/' in location:
@@ -1315,7 +1267,6 @@ def cleanup_orphaned_data():
                     for hash_val in orphaned_hashes:
                         conn.execute("DELETE FROM semantic_events WHERE commit_hash = ?", (hash_val,))
                     
-                    conn.commit()
                     cleanup_result = f"Cleaned {len(orphaned_hashes)} orphaned commits with their semantic events"
                 else:
                     cleanup_result = "No orphaned data found - repository is clean"
@@ -1377,7 +1328,6 @@ def cleanup_unreachable_commits():
                     for hash_val in unreachable_hashes:
                         conn.execute("DELETE FROM semantic_events WHERE commit_hash = ?", (hash_val,))
                     
-                    conn.commit()
                     cleanup_result = f"Cleaned {len(unreachable_hashes)} unreachable commits with their semantic events"
                 else:
                     cleanup_result = "No unreachable commits found - all commits are reachable"
@@ -1414,33 +1364,8 @@ def get_database_stats():
             return jsonify({'success': False, 'error': 'Repository not found or not initialized'}), 404
         
         try:
-            # Get basic database statistics manually
-            with svcs.db.get_connection() as conn:
-                # Count total events
-                cursor = conn.execute("SELECT COUNT(*) FROM semantic_events")
-                total_events = cursor.fetchone()[0]
-                
-                # Count commits
-                cursor = conn.execute("SELECT COUNT(*) FROM commits")
-                commits_tracked = cursor.fetchone()[0]
-                
-                # Get database file size
-                db_path = Path(repo_path) / '.svcs' / 'semantic.db'
-                db_size = db_path.stat().st_size if db_path.exists() else 0
-                db_size_mb = round(db_size / (1024 * 1024), 2)
-                
-                # Count branches
-                cursor = conn.execute("SELECT COUNT(DISTINCT branch) FROM semantic_events")
-                branches_count = cursor.fetchone()[0]
-                
-                stats = {
-                    'total_events': total_events,
-                    'commits_tracked': commits_tracked,
-                    'database_size': f"{db_size_mb} MB",
-                    'database_size_bytes': db_size,
-                    'branches_tracked': branches_count,
-                    'database_path': str(db_path)
-                }
+            # Totals come from the event_stats rollup, not a scan of all events
+            stats = svcs.get_database_stats()
             
             return jsonify({
                 'success': True,
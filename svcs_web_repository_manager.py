@@ -7,7 +7,6 @@ Uses repository-local semantic.db files with optional central registry at ~/.svc
 """
 
 import os
-import sqlite3
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -16,6 +15,8 @@ from datetime import datetime, timedelta
 # Add paths for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+from svcs_repo_connections import get_connection
+
 try:
     from svcs_repo_local import RepositoryLocalSVCS
     REPO_LOCAL_AVAILABLE = True
@@ -35,7 +36,7 @@ class SVCSWebRepositoryManager:
         """Initialize central repository registry."""
         try:
             self.registry_db.parent.mkdir(exist_ok=True)
-            with sqlite3.connect(self.registry_db) as conn:
+            with get_connection(self.registry_db) as conn:
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS repositories (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -46,7 +47,6 @@ class SVCSWebRepositoryManager:
                         last_accessed INTEGER
                     )
                 """)
-                conn.commit()
         except Exception:
             pass
     
@@ -143,7 +143,7 @@ class SVCSWebRepositoryManager:
         repositories = []
         
         try:
-            with sqlite3.connect(self.registry_db) as conn:
+            with get_connection(self.registry_db) as conn:
                 cursor = conn.execute("""
                     SELECT name, path, db_path, created_at, last_accessed 
                     FROM repositories ORDER BY last_accessed DESC
@@ -261,14 +261,13 @@ class SVCSWebRepositoryManager:
             
             db_path = str(Path(repo_path) / '.svcs' / 'semantic.db')
             
-            with sqlite3.connect(self.registry_db) as conn:
+            with get_connection(self.registry_db) as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO repositories 
                     (name, path, db_path, created_at, last_accessed)
                     VALUES (?, ?, ?, ?, ?)
                 """, (name, repo_path, db_path, int(datetime.now().timestamp()), 
                       int(datetime.now().timestamp())))
-                conn.commit()
             
             return {'success': True, 'message': f'Repository "{name}" registered successfully'}
         except Exception as e:
@@ -321,10 +320,9 @@ class SVCSWebRepositoryManager:
         try:
             repo_path = str(Path(repo_path).resolve())
             
-            with sqlite3.connect(self.registry_db) as conn:
+            with get_connection(self.registry_db) as conn:
                 cursor = conn.execute("DELETE FROM repositories WHERE path = ?", (repo_path,))
                 if cursor.rowcount > 0:
-                    conn.commit()
                     # Clear from cache
                     if repo_path in self.repositories:
                         del self.repositories[repo_path]
@@ -364,54 +362,48 @@ class SVCSWebRepositoryManager:
             return {'error': str(e)}
     
     def search_events(self, repo_path: str, limit: int = 20, event_type: str = None, 
-                     since_days: int = None, order_by: str = 'timestamp', order_desc: bool = True) -> List[Dict[str, Any]]:
+                     since_days: int = None, order_by: str = 'timestamp', order_desc: bool = True,
+                     cursor: str = None) -> List[Dict[str, Any]]:
         """Search semantic events in repository."""
+        return self.search_events_page(repo_path, limit, event_type, since_days,
+                                       order_by, order_desc, cursor)['events']
+    
+    def search_events_page(self, repo_path: str, limit: int = 20, event_type: str = None,
+                           since_days: int = None, order_by: str = 'timestamp', order_desc: bool = True,
+                           cursor: str = None) -> Dict[str, Any]:
+        """Search semantic events; also returns the cursor for the next page."""
         svcs = self.get_repository(repo_path)
         if not svcs:
-            return []
+            return {'events': [], 'next_cursor': None}
         
         try:
-            events = svcs.get_branch_events(limit=1000)
-            
-            # Apply filters
-            if event_type:
-                events = [e for e in events if e.get('event_type') == event_type]
-            
+            since_date = None
             if since_days:
-                cutoff = int((datetime.now() - timedelta(days=since_days)).timestamp())
-                events = [e for e in events if e.get('created_at', 0) > cutoff]
-            
-            # Apply ordering
-            sort_field = order_by
-            if sort_field == 'timestamp':
-                sort_field = 'created_at'  # Map to actual field name in basic search
-            
-            def get_sort_key(event):
-                value = event.get(sort_field, 0)
-                if sort_field == 'created_at' and value:
-                    return value
-                elif sort_field == 'confidence':
-                    return event.get('confidence', 0)
-                elif sort_field == 'event_type':
-                    return event.get('event_type', '')
-                else:
-                    return value or 0
-            
-            events.sort(key=get_sort_key, reverse=order_desc)
-            
-            return events[:limit]
+                since_date = datetime.now() - timedelta(days=since_days)
+            
+            return svcs.search_events(
+                event_types=event_type,
+                since_date=since_date,
+                order_by=order_by,
+                order_desc=order_desc,
+                limit=limit,
+                cursor=cursor,
+                with_total=False
+            )
+        except ValueError:
+            # Malformed cursor or unsupported sort: let the caller report it
+            raise
         except Exception:
-            return []
+            return {'events': [], 'next_cursor': None}
     
     def update_registry_access(self, repo_path: str):
         """Update last accessed timestamp for repository."""
         try:
             repo_path = str(Path(repo_path).resolve())
-            with sqlite3.connect(self.registry_db) as conn:
+            with get_connection(self.registry_db) as conn:
                 conn.execute("""
                     UPDATE repositories SET last_accessed = ? WHERE path = ?
                 """, (int(datetime.now().timestamp()), repo_path))
-                conn.commit()
         except Exception:
             pass
 
@@ -421,7 +413,7 @@ class SVCSWebRepositoryManager:
             repo_path = str(Path(repo_path).resolve())
             
             # Check if already registered
-            with sqlite3.connect(self.registry_db) as conn:
+            with get_connection(self.registry_db) as conn:
                 cursor = conn.execute("SELECT name FROM repositories WHERE path = ?", (repo_path,))
                 if cursor.fetchone():
                     return {'success': True, 'message': 'Repository already registered', 'already_registered': True}
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: the --branch filter of the analytics and quality reports.
+
+Compares the old filter (full log loaded, then every event's commit tested
+with str.startswith against the tuple of `git rev-list <branch>`) with
+get_full_log(branch=...), which resolves the branch in SQL through the
+reachability index. The old filter is timed on a sample of events and
+extrapolated, since it is O(events x commits).
+
+Usage:
+    python tests/benchmark_branch_filter.py [events] [commits]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_local import RepositoryLocalDatabase
+
+LEGACY_SAMPLE = 500
+
+
+def make_repo(path, commits):
+    """Linear history of empty commits on main, written with git fast-import."""
+    subprocess.run(["git", "init", "-q", "-b", "main", "."], cwd=path, check=True)
+    stream = []
+    for i in range(commits):
+        message = f"commit {i}".encode()
+        stream.append(b"commit refs/heads/main\n"
+                      b"committer bench <bench@example.com> %d +0000\n"
+                      b"data %d\n%s\n" % (1_700_000_000 + i, len(message), message))
+        if i == 0:
+            stream.append(b"deleteall\n")
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input=b"".join(stream), check=True)
+    return subprocess.run(["git", "rev-list", "main"], cwd=path, check=True,
+                          capture_output=True, text=True).stdout.split()
+
+
+def legacy_filter(events, branch):
+    branch_commits = subprocess.run(['git', 'rev-list', branch], capture_output=True, text=True,
+                                    check=True).stdout.strip().split('\n')
+    branch_commits = set(commit for commit in branch_commits if commit)
+    return [event for event in events
+            if event.get('commit_hash', '').startswith(tuple(branch_commits)) if branch_commits]
+
+
+def main():
+    event_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    commit_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+
+    with tempfile.TemporaryDirectory(prefix="svcs_bench_") as tmp:
+        commits = make_repo(tmp, commit_count)
+        db = RepositoryLocalDatabase(tmp)
+        with db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO commits (commit_hash, branch, author, timestamp) VALUES (?, 'main', 'bench', ?)",
+                [(commit, 1_700_000_000 + i) for i, commit in enumerate(commits)])
+        db.store_semantic_events(
+            [{"commit_hash": commits[i % commit_count], "event_type": "node_modified",
+              "node_id": f"func:f{i}", "location": f"pkg/module_{i % 50}.py", "details": "Function changed",
+              "layer": "core", "confidence": 1.0, "created_at": 1_700_000_000 + i}
+             for i in range(event_count)], branch="main")
+
+        os.chdir(tmp)
+        from svcs.api import get_full_log
+        print(f"📊 --branch main over {event_count} events and {commit_count} commits")
+
+        start = time.perf_counter()
+        events = get_full_log()
+        load = time.perf_counter() - start
+        start = time.perf_counter()
+        sample = legacy_filter(events[:LEGACY_SAMPLE], "main")
+        per_event = (time.perf_counter() - start) / LEGACY_SAMPLE
+        before = load + per_event * len(events)
+        print(f"{'startswith filter (old, est.)':<32} {before * 1000:10.1f} ms  "
+              f"({len(sample)}/{LEGACY_SAMPLE} sampled events kept)")
+
+        start = time.perf_counter()
+        filtered = get_full_log(branch="main")
+        after = time.perf_counter() - start
+        print(f"{'SQL reachability filter':<32} {after * 1000:10.1f} ms  ({len(filtered)} events)")
+        print(f"⚡ Speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
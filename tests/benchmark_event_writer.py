@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-commit cost of writing semantic events.
+
+Compares the old one-event-per-call path (one connection, one branch lookup
+and one commit per event) with the batched RepositoryLocalDatabase writer.
+
+Usage:
+    python tests/benchmark_event_writer.py [events_per_commit] [commits]
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_local import RepositoryLocalDatabase
+
+
+def make_repo(path):
+    for cmd in (["git", "init", "-q", "."],
+                ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com",
+                 "commit", "-q", "--allow-empty", "-m", "bench"]):
+        subprocess.run(cmd, cwd=path, check=True, capture_output=True)
+    return subprocess.run(["git", "rev-parse", "HEAD"], cwd=path, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def make_events(count):
+    return [{"event_type": "node_added", "node_id": f"func:f{i}", "location": "app.py",
+             "details": "Function added", "layer": "1"} for i in range(count)]
+
+
+def bench(label, write, commits):
+    start = time.perf_counter()
+    for _ in range(commits):
+        write()
+    per_commit = (time.perf_counter() - start) / commits
+    print(f"{label:<28} {per_commit * 1000:10.1f} ms/commit")
+    return per_commit
+
+
+def main():
+    events_per_commit = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    commits = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory(prefix="svcs_bench_") as tmp:
+        commit_hash = make_repo(tmp)
+        db = RepositoryLocalDatabase(tmp)
+        metadata = db.get_commit_metadata(commit_hash)
+        events = make_events(events_per_commit)
+        for event in events:
+            event["commit_hash"] = commit_hash
+
+        print(f"📊 Writing {events_per_commit} events per commit, {commits} commits")
+        before = bench("per-event store_semantic_event",
+                       lambda: [db.store_semantic_event(e) for e in events], commits)
+        after = bench("batched store_semantic_events",
+                      lambda: db.store_semantic_events(events, commit_hash=commit_hash,
+                                                       commit_metadata=metadata), commits)
+        print(f"⚡ Speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
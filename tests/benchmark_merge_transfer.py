@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: merging a feature branch's events in process_merge.
+
+Compares the old per-key copy loop (EXCEPT over the keys, then one SELECT ...
+LIMIT 1 and one INSERT with a fresh UUID per key) with pinning the feature
+commits to the target branch (RepositoryLocalDatabase.merge_branch_events),
+which writes one branch_commits row per commit and copies no events.
+
+Usage:
+    python tests/benchmark_merge_transfer.py [feature_events]
+"""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_local import RepositoryLocalDatabase
+
+
+def make_repo(path):
+    for cmd in (["git", "init", "-q", "-b", "main", "."],
+                ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com",
+                 "commit", "-q", "--allow-empty", "-m", "bench"]):
+        subprocess.run(cmd, cwd=path, check=True, capture_output=True)
+    return subprocess.run(["git", "rev-parse", "HEAD"], cwd=path, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def make_events(count, offset=0):
+    # Two events per key on average, so the copy loop has to pick the latest
+    return [{"event_type": "node_modified", "node_id": f"func:f{(i + offset) // 2}",
+             "location": f"pkg/module_{((i + offset) // 2) % 50}.py", "details": "Function changed",
+             "layer": "core", "confidence": 1.0, "created_at": 1_700_000_000 + i}
+            for i in range(count)]
+
+
+def feature_commit(i):
+    # Squashed feature history: commits the main branch never reaches
+    return f"{i % 200:040x}"
+
+
+def legacy_transfer(db, source_branch, target_branch):
+    """process_merge before branch views followed reachability."""
+    with db.get_connection() as conn:
+        unique_keys = conn.execute("""
+            SELECT se1.event_type, se1.node_id, se1.location
+            FROM semantic_events se1
+            WHERE se1.branch = ?
+            EXCEPT
+            SELECT se2.event_type, se2.node_id, se2.location
+            FROM semantic_events se2
+            WHERE se2.branch = ?
+        """, (source_branch, target_branch)).fetchall()
+        columns = ["commit_hash", "event_type", "node_id", "location", "details", "layer",
+                   "layer_description", "confidence", "reasoning", "impact", "created_at"]
+        events_to_merge = []
+        for event_type, node_id, location in unique_keys:
+            event = conn.execute("""
+                SELECT commit_hash, event_type, node_id, location, details, layer, layer_description, confidence, reasoning, impact, created_at
+                FROM semantic_events
+                WHERE branch = ? AND event_type = ? AND node_id = ? AND location = ?
+                ORDER BY created_at DESC LIMIT 1
+            """, (source_branch, event_type, node_id, location)).fetchone()
+            if event:
+                events_to_merge.append(dict(zip(columns, event)))
+        db.store_semantic_events(events_to_merge, branch=target_branch, conn=conn)
+    return f"{len(events_to_merge)} events copied"
+
+
+def bench(label, merge):
+    start = time.perf_counter()
+    result = merge()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed * 1000:10.1f} ms  ({result})")
+    return elapsed
+
+
+def main():
+    feature_events = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    with tempfile.TemporaryDirectory(prefix="svcs_bench_") as tmp:
+        legacy_repo = Path(tmp) / "legacy"
+        legacy_repo.mkdir()
+        commit_hash = make_repo(legacy_repo)
+        db = RepositoryLocalDatabase(str(legacy_repo))
+        # main already has a tenth of the keys
+        db.store_semantic_events(make_events(feature_events // 10), commit_hash=commit_hash, branch="main")
+        events = make_events(feature_events)
+        for i, event in enumerate(events):
+            event["commit_hash"] = feature_commit(i)
+        db.store_semantic_events(events, branch="feature")
+        pinned_repo = Path(tmp) / "pinned"
+        shutil.copytree(legacy_repo, pinned_repo)
+
+        print(f"📊 Merging a {feature_events}-event feature branch into main")
+        before = bench("per-key copy loop (old)",
+                       lambda: legacy_transfer(db, "feature", "main"))
+        pinned = RepositoryLocalDatabase(str(pinned_repo))
+        after = bench("pin feature commits",
+                      lambda: f"{pinned.merge_branch_events('feature', 'main')} commits pinned")
+        print(f"⚡ Speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: semantic notes ref size and fetch time, JSON vs compact notes.
+
+Writes the same notes (one per commit) in format 1 (indented JSON) and
+format 2 (dictionary-encoded compact JSON) into two repositories and
+reports the note blob bytes, the pack a fresh repository fetches for
+refs/notes/svcs-semantic and how long that fetch takes.
+
+Note that git already deltas similar JSON blobs against each other when
+packing, so the packed ref shrinks much less than the blobs themselves
+(compressing the notes would stop git from deltifying them and grow the
+pack). convert_notes adds a commit on top of the
+existing notes, so the old blobs stay in the ref's history.
+
+Usage:
+    python tests/benchmark_notes_format.py [commits] [events_per_commit]
+"""
+
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_notes import NOTES_REF, note_document, write_note_contents
+
+LAYERS = [("core", "Core structural analysis"), ("5a", "AI pattern analysis"),
+          ("5b", "True AI semantic analysis")]
+EVENT_TYPES = ["node_added", "signature_changed", "dependency_added", "node_logic_changed"]
+
+
+def git(path, *args):
+    return subprocess.run(["git", *args], cwd=path, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def make_repo(path, commits):
+    git(path, "init", "-q", ".")
+    stream = "".join(f"commit refs/heads/main\ncommitter bench <bench@example.com> {1700000000 + i} +0000\n"
+                     f"data {len(str(i))}\n{i}\n" for i in range(commits))
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input=stream.encode(), check=True)
+    return git(path, "rev-list", "--reverse", "refs/heads/main").split()
+
+
+def make_events(rng, words, commit_index, count):
+    events = []
+    for i in range(count):
+        layer, description = LAYERS[i % len(LAYERS)]
+        name = rng.choice(words)
+        events.append({"event_type": EVENT_TYPES[i % len(EVENT_TYPES)], "node_id": f"func:{name}",
+                       "location": f"src/module_{i % 7}.py", "layer": layer, "layer_description": description,
+                       "details": f"Function {name} changed: " + " ".join(rng.choices(words, k=8)),
+                       "reasoning": " ".join(rng.choices(words, k=15)) if layer != "core" else None,
+                       "confidence": round(rng.uniform(0.5, 1.0), 2), "created_at": 1700000000 + commit_index})
+    return events
+
+
+def measure(remote, workdir):
+    """Pack bytes and seconds for fetching only the notes ref into a fresh repository."""
+    with tempfile.TemporaryDirectory(dir=workdir) as target:
+        git(target, "init", "-q", ".")
+        start = time.perf_counter()
+        git(target, "fetch", "-q", "--no-tags", f"file://{remote}", f"{NOTES_REF}:{NOTES_REF}")
+        elapsed = time.perf_counter() - start
+        sizes = dict(line.split(": ") for line in git(target, "count-objects", "-v").splitlines())
+        return int(sizes["size-pack"]) * 1024, elapsed
+
+
+def bench(label, note_format, commits, events_per_commit, workdir):
+    rng = random.Random(42)
+    words = [f"{rng.choice(['parse', 'load', 'build', 'render', 'sync'])}_{rng.randrange(10 ** 6)}"
+             for _ in range(5000)]
+    repo = Path(workdir) / f"format{note_format}"
+    repo.mkdir()
+    hashes = make_repo(repo, commits)
+    contents = [(commit_hash, note_document(commit_hash, make_events(rng, words, i, events_per_commit),
+                                            note_format=note_format))
+                for i, commit_hash in enumerate(hashes)]
+    write_note_contents(str(repo), contents)
+    git(repo, "gc", "-q", "--prune=now")
+    blob_bytes = sum(len(content) for _, content in contents)
+    pack_bytes, seconds = measure(repo, workdir)
+    print(f"{label:<20} blobs {blob_bytes / 1024:8.0f} KiB  pack {pack_bytes / 1024:8.0f} KiB  "
+          f"fetch {seconds * 1000:6.0f} ms")
+    return blob_bytes, pack_bytes, seconds
+
+
+def main():
+    commits = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    events_per_commit = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+    with tempfile.TemporaryDirectory(prefix="svcs_bench_") as tmp:
+        print(f"📊 {commits} notes with {events_per_commit} events each")
+        before = bench("format 1 (JSON)", 1, commits, events_per_commit, tmp)
+        after = bench("format 2 (compact)", 2, commits, events_per_commit, tmp)
+        print(f"⚡ Note blobs {before[0] / after[0]:.1f}x smaller, packed ref {before[1] / after[1]:.2f}x, "
+              f"fetch {before[2] / after[2]:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
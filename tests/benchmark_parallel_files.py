@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: analysis of one commit touching many files, by worker count.
+
+Builds a commit that edits N Python modules (a codemod-style change) and
+times ComprehensiveAnalyzer.analyze_commit with 1..N worker processes,
+checking that every run returns the same events in the same order.
+
+Usage:
+    python tests/benchmark_parallel_files.py [files] [max_jobs]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs.analyzers.comprehensive_analyzer import ComprehensiveAnalyzer
+from svcs.parse_cache import ParseCache
+
+
+def module_source(index, renamed):
+    call = "fetch_data" if renamed else "get_data"
+    functions = []
+    for i in range(12):
+        functions.append(
+            f"def handler_{index}_{i}(items, limit=10):\n"
+            f"    result = [item * {i} for item in items if item > limit]\n"
+            f"    if not result:\n"
+            f"        return {call}(limit)\n"
+            f"    return sorted(result, key=lambda value: -value)\n")
+    return "import os\nfrom api import " + call + "\n\n\n" + "\n\n".join(functions)
+
+
+def make_repo(path, files):
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+                       cwd=path, check=True, capture_output=True)
+    git("init", "-q", ".")
+    package = Path(path, "pkg")
+    package.mkdir()
+    for renamed in (False, True):
+        for index in range(files):
+            (package / f"module_{index}.py").write_text(module_source(index, renamed))
+        git("add", "-A")
+        git("commit", "-q", "-m", "rename get_data" if renamed else "initial")
+    return subprocess.run(["git", "rev-parse", "HEAD"], cwd=path, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    max_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory(prefix="svcs_bench_") as tmp:
+        commit_hash = make_repo(tmp, files)
+        print(f"📊 One commit changing {files} files, {os.cpu_count()} CPUs")
+
+        baseline, reference = None, None
+        jobs = 1
+        while jobs <= max_jobs:
+            # A fresh cache per run, so every run parses every blob
+            analyzer = ComprehensiveAnalyzer(parse_cache=ParseCache(), jobs=jobs, parallel_threshold=0)
+            start = time.perf_counter()
+            events = analyzer.analyze_commit(commit_hash, tmp)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            reference = reference or events
+            assert events == reference, "event output differs from the single-process run"
+            print(f"{jobs:>3} worker(s) {elapsed:8.2f}s {files / elapsed:8.1f} files/s "
+                  f"speedup {baseline / elapsed:4.1f}x ({len(events)} events)")
+            jobs *= 2
+
+
+if __name__ == "__main__":
+    main()
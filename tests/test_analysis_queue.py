@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the durable background analysis queue and its worker.
+"""
+
+import sqlite3
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_local import RepositoryLocalSVCS
+from svcs_repo_queue import QueueWorker, RepositoryAnalysisQueue, enqueue_post_commit
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def make_repo(path, commits=3):
+    run(["git", "init", "-q", "-b", "main", "."], path)
+    run(["git", "config", "user.name", "Dev"], path)
+    run(["git", "config", "user.email", "dev@example.com"], path)
+    hashes = []
+    body = ""
+    for i in range(commits):
+        body += f"\ndef func_{i}(value):\n    return value + {i}\n"
+        (path / "module.py").write_text(body)
+        run(["git", "add", "module.py"], path)
+        run(["git", "commit", "-q", "-m", f"commit {i}"], path)
+        hashes.append(run(["git", "rev-parse", "HEAD"], path))
+    svcs = RepositoryLocalSVCS(str(path))
+    svcs.initialize_repository()
+    return svcs, hashes
+
+
+def test_enqueue_deduplicates_and_claims_in_order(tmp_path):
+    queue = RepositoryAnalysisQueue(str(tmp_path), max_attempts=2)
+    assert queue.enqueue("a" * 40, branch="main")
+    assert queue.enqueue("b" * 40, branch="main")
+    assert not queue.enqueue("a" * 40, branch="other")
+
+    job = queue.claim("host:1:0")
+    assert job["commit_hash"] == "a" * 40 and job["status"] == "running" and job["attempts"] == 1
+    queue.complete(job["commit_hash"], 4)
+    # Analyzed commits are not queued again
+    assert not queue.enqueue("a" * 40)
+
+    job = queue.claim("host:1:0")
+    queue.fail(job["commit_hash"], "boom")
+    assert queue.get_status()["counts"]["pending"] == 1
+    job = queue.claim("host:1:0")
+    queue.fail(job["commit_hash"], "boom again")
+    assert queue.claim("host:1:0") is None
+
+    status = queue.get_status()
+    assert status["counts"] == {"pending": 0, "running": 0, "done": 1, "failed": 1}
+    assert queue.list_jobs(status="failed")[0]["last_error"] == "boom again"
+
+    assert queue.retry("bbbb") == 1
+    assert queue.claim("host:1:0")["attempts"] == 1
+
+
+def test_concurrent_claims_never_share_a_job(tmp_path):
+    queue = RepositoryAnalysisQueue(str(tmp_path))
+    for i in range(30):
+        queue.enqueue(f"{i:040x}")
+
+    claimed = []
+
+    def claim_all(index):
+        while True:
+            job = queue.claim(f"host:1:{index}")
+            if job is None:
+                return
+            claimed.append(job["commit_hash"])
+
+    threads = [threading.Thread(target=claim_all, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == [f"{i:040x}" for i in range(30)]
+
+
+def test_jobs_of_dead_workers_are_recovered(tmp_path):
+    queue = RepositoryAnalysisQueue(str(tmp_path))
+    queue.enqueue("c" * 40)
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+
+    import socket
+    queue.claim(f"{socket.gethostname()}:{finished.pid}:0")
+    assert queue.recover_abandoned() == 1
+    job = queue.claim("host:2:0")
+    assert job["commit_hash"] == "c" * 40 and job["attempts"] == 2
+
+
+def test_worker_drains_queue_with_queued_branch(tmp_path):
+    svcs, hashes = make_repo(tmp_path)
+    queue = RepositoryAnalysisQueue(str(tmp_path))
+    for commit_hash in hashes:
+        queue.enqueue(commit_hash, branch="feature")
+
+    stats = QueueWorker(str(tmp_path), concurrency=2, queue=queue).run(drain=True, progress=None)
+    assert stats["processed"] == len(hashes)
+    assert stats["failed"] == 0
+    assert queue.get_status()["counts"]["done"] == len(hashes)
+
+    with sqlite3.connect(svcs.db.db_path) as conn:
+        branches = {row[0] for row in conn.execute(
+            "SELECT DISTINCT branch FROM semantic_events")}
+        analyzed = {row[0] for row in conn.execute("SELECT DISTINCT commit_hash FROM semantic_events")}
+    assert branches == {"feature"}
+    assert analyzed == set(hashes)
+
+
+def test_worker_keeps_file_analysis_in_process(tmp_path, monkeypatch):
+    svcs, hashes = make_repo(tmp_path)
+    queue = RepositoryAnalysisQueue(str(tmp_path))
+    queue.enqueue(hashes[-1], branch="main")
+    from svcs import semantic_analyzer
+    jobs = []
+
+    class RecordingAnalyzer(semantic_analyzer.SVCSModularAnalyzer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            jobs.append(self.comprehensive_analyzer.jobs)
+
+    monkeypatch.setattr(semantic_analyzer, "SVCSModularAnalyzer", RecordingAnalyzer)
+    assert QueueWorker(str(tmp_path), concurrency=2, queue=queue).run(drain=True, progress=None)["processed"] == 1
+    assert jobs == [1, 1]
+
+
+def test_post_commit_enqueue_respects_config(tmp_path):
+    svcs, hashes = make_repo(tmp_path, commits=1)
+
+    assert enqueue_post_commit(str(tmp_path), start_worker=False) == hashes[-1]
+    assert enqueue_post_commit(str(tmp_path), start_worker=False) == hashes[-1]
+    jobs = RepositoryAnalysisQueue(str(tmp_path)).list_jobs()
+    assert [(job["commit_hash"], job["branch"]) for job in jobs] == [(hashes[-1], "main")]
+
+    svcs.set_config("async_analysis", False)
+    assert enqueue_post_commit(str(tmp_path), start_worker=False) is None
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched, single-transaction event writer in RepositoryLocalDatabase.
+"""
+
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_local import RepositoryLocalSVCS
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def make_repo(path):
+    run(["git", "init", "-q", "-b", "main", "."], path)
+    run(["git", "config", "user.name", "Test User"], path)
+    run(["git", "config", "user.email", "test@example.com"], path)
+    (path / "app.py").write_text("def main():\n    return 1\n")
+    run(["git", "add", "app.py"], path)
+    run(["git", "commit", "-q", "-m", "initial"], path)
+    return run(["git", "rev-parse", "HEAD"], path)
+
+
+def sample_events(count):
+    return [
+        {
+            "event_type": "node_added",
+            "node_id": f"func:f{i}",
+            "location": "app.py",
+            "details": f"Function f{i} added",
+            "layer": "1",
+        }
+        for i in range(count)
+    ]
+
+
+def test_store_semantic_events_writes_commit_and_events(tmp_path):
+    commit_hash = make_repo(tmp_path)
+    svcs = RepositoryLocalSVCS(str(tmp_path))
+
+    metadata = svcs.db.get_commit_metadata(commit_hash)
+    assert metadata["author"] == "Test User"
+    assert metadata["message"] == "initial"
+
+    event_ids = svcs.db.store_semantic_events(
+        sample_events(50), commit_hash=commit_hash, commit_metadata=metadata
+    )
+    assert len(event_ids) == len(set(event_ids)) == 50
+
+    with sqlite3.connect(svcs.db.db_path) as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT branch, commit_hash FROM semantic_events"
+        ).fetchall()
+        assert rows == [("main", commit_hash)]
+        author = conn.execute(
+            "SELECT author FROM commits WHERE commit_hash = ?", (commit_hash,)
+        ).fetchone()[0]
+        assert author == "Test User"
+
+
+def test_analyze_and_store_commit_uses_single_branch_lookup(tmp_path, monkeypatch):
+    commit_hash = make_repo(tmp_path)
+    svcs = RepositoryLocalSVCS(str(tmp_path))
+    svcs.initialize_repository()
+    monkeypatch.setattr(svcs.git_notes, "store_semantic_data_as_note", lambda *a: True)
+
+    calls = []
+    original = svcs.db.get_current_branch
+
+    def counting_branch():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(svcs.db, "get_current_branch", counting_branch)
+
+    stored_count, notes_success = svcs.analyze_and_store_commit(commit_hash, sample_events(300))
+    assert stored_count == 300
+    assert notes_success
+    assert len(calls) == 1
+
+    status = svcs.get_repository_status()
+    assert status["commits_analyzed"] == 1
+
+
+def test_store_semantic_events_keeps_created_at_and_joins_transaction(tmp_path):
+    commit_hash = make_repo(tmp_path)
+    svcs = RepositoryLocalSVCS(str(tmp_path))
+
+    events = sample_events(3)
+    for event in events:
+        event["commit_hash"] = commit_hash
+        event["created_at"] = 1000
+
+    with svcs.db.get_connection() as conn:
+        svcs.db.store_semantic_events(events, branch="feature", conn=conn)
+        conn.rollback()
+
+    with svcs.db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM semantic_events").fetchone()[0] == 0
+        svcs.db.store_semantic_events(events, branch="feature", conn=conn)
+        conn.commit()
+        rows = conn.execute("SELECT DISTINCT branch, created_at FROM semantic_events").fetchall()
+        assert rows == [("feature", 1000)]
+
+
+def test_hook_path_stores_each_event_once(tmp_path):
+    make_repo(tmp_path)
+    (tmp_path / "app.py").write_text("def main(value):\n    return value\n\ndef helper():\n    pass\n")
+    run(["git", "commit", "-q", "-am", "second"], tmp_path)
+    commit_hash = run(["git", "rev-parse", "HEAD"], tmp_path)
+
+    from svcs.semantic_analyzer import SVCSModularAnalyzer
+    svcs = RepositoryLocalSVCS(str(tmp_path))
+    svcs.initialize_repository()
+    events = SVCSModularAnalyzer(str(tmp_path)).analyze_commit_changes(commit_hash)
+    assert events
+    svcs.analyze_and_store_commit(commit_hash, events)
+
+    with sqlite3.connect(svcs.db.db_path) as conn:
+        rows = conn.execute(
+            "SELECT event_id, branch FROM semantic_events WHERE commit_hash = ?", (commit_hash,)
+        ).fetchall()
+    assert len(rows) == len(events)
+    assert all(event_id and branch == "main" for event_id, branch in rows)
+
+
+def test_every_analysis_entry_point_writes_the_note(tmp_path):
+    import asyncio
+    from svcs.semantic_analyzer import SVCSModularAnalyzer
+    from svcs_mcp.svcs_repo_local_core import RepositoryLocalMCPServer
+    from svcs_repo_notes import list_notes
+
+    make_repo(tmp_path)
+    svcs = RepositoryLocalSVCS(str(tmp_path))
+    analyzer = SVCSModularAnalyzer(str(tmp_path))
+
+    def commit(body, message):
+        (tmp_path / "app.py").write_text(body)
+        run(["git", "commit", "-q", "-am", message], tmp_path)
+        return run(["git", "rev-parse", "HEAD"], tmp_path)
+
+    # Storing analysis of the CLI analyzer
+    first = commit("def main(value):\n    return value\n", "second")
+    assert analyzer.analyze_commit(first)
+
+    # The MCP analyze_current_commit tool
+    second = commit("def main(value):\n    return value\n\ndef helper():\n    pass\n", "third")
+    server = RepositoryLocalMCPServer()
+    server.repo_manager.repositories[str(tmp_path.resolve())] = svcs
+    server.repo_manager.analyzers[str(tmp_path.resolve())] = analyzer
+    result = asyncio.run(server.analyze_current_commit(str(tmp_path)))
+    assert result["success"] and result["notes_written"] and result["commit_hash"] == second
+
+    assert {first, second} <= set(list_notes(str(tmp_path)))
+    with sqlite3.connect(svcs.db.db_path) as conn:
+        counts = dict(conn.execute("SELECT commit_hash, COUNT(*) FROM semantic_events GROUP BY commit_hash"))
+    assert counts[second] == result["events_stored"] == result["events_detected"]
+    assert counts[first] > 0
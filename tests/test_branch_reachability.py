@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for reachability-based branch views and merge processing.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from migrations.migrate_database import EVENT_STATS_SELECT
+from svcs_repo_local import RepositoryLocalSVCS
+from svcs_repo_reachability import refresh_branch_index
+from svcs_repo_search import EventQuery
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def make_repo(path):
+    run(["git", "init", "-q", "-b", "main", "."], path)
+    run(["git", "config", "user.name", "Dev"], path)
+    run(["git", "config", "user.email", "dev@example.com"], path)
+    svcs = RepositoryLocalSVCS(str(path))
+    svcs.initialize_repository()
+    return svcs, commit(path, "initial")
+
+
+def commit(path, message):
+    run(["git", "commit", "-q", "--allow-empty", "-m", message], path)
+    return run(["git", "rev-parse", "HEAD"], path)
+
+
+def store(svcs, commit_hash, branch, *node_ids):
+    svcs.db.store_semantic_events(
+        [{"event_type": "node_added", "node_id": node_id, "location": "app.py", "details": "change",
+          "layer": "core", "confidence": 0.9, "created_at": 100 + i} for i, node_id in enumerate(node_ids)],
+        commit_hash=commit_hash, branch=branch, commit_metadata=svcs.db.get_commit_metadata(commit_hash))
+
+
+def node_ids(events):
+    return sorted(event["node_id"] for event in events)
+
+
+def total_rows(svcs):
+    with svcs.db.get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM semantic_events").fetchone()[0]
+
+
+def test_merge_commit_makes_events_visible_without_copies(tmp_path):
+    svcs, initial = make_repo(tmp_path)
+    store(svcs, initial, "main", "func:base")
+    run(["git", "checkout", "-q", "-b", "feature"], tmp_path)
+    store(svcs, commit(tmp_path, "feature 1"), "feature", "func:a", "func:b")
+    store(svcs, commit(tmp_path, "feature 2"), "feature", "func:c")
+    run(["git", "checkout", "-q", "main"], tmp_path)
+
+    # The feature branch reaches main's history; main does not reach feature
+    assert node_ids(svcs.get_branch_events("feature")) == ["func:a", "func:b", "func:base", "func:c"]
+    assert node_ids(svcs.get_branch_events("main")) == ["func:base"]
+    comparison = svcs.compare_branches("feature", "main")
+    assert (comparison["only_in_branch1"], comparison["only_in_branch2"]) == (3, 0)
+
+    run(["git", "merge", "-q", "--no-ff", "feature", "-m", "Merge branch 'feature'"], tmp_path)
+    assert svcs.process_merge("feature", "main") == "✅ SVCS: Merged 3 semantic events from feature to main"
+
+    assert total_rows(svcs) == 4
+    assert node_ids(svcs.get_branch_events("main")) == ["func:a", "func:b", "func:base", "func:c"]
+    assert svcs.search_events("main", event_types=["node_added"])["total"] == 4
+    assert svcs.get_repository_status()["semantic_events_count"] == 4
+    assert "No new semantic events" in svcs.process_merge("feature", "main")
+    with svcs.db.get_connection() as conn:
+        assert sorted(conn.execute("SELECT * FROM event_stats")) == sorted(conn.execute(EVENT_STATS_SELECT))
+
+
+def test_squash_merge_pins_source_commits(tmp_path):
+    svcs, initial = make_repo(tmp_path)
+    run(["git", "checkout", "-q", "-b", "feature"], tmp_path)
+    (tmp_path / "app.py").write_text("def a():\n    return 1\n")
+    run(["git", "add", "app.py"], tmp_path)
+    feature = commit(tmp_path, "feature")
+    store(svcs, feature, "feature", "func:a")
+    run(["git", "checkout", "-q", "main"], tmp_path)
+    run(["git", "merge", "-q", "--squash", "feature"], tmp_path)
+    commit(tmp_path, "Squashed feature")
+
+    assert svcs.process_merge("feature", "main") == "✅ SVCS: Merged 1 semantic events from feature to main"
+    assert node_ids(svcs.get_branch_events("main")) == ["func:a"]
+    assert total_rows(svcs) == 1
+
+    # Pins survive a reset that rewrites the branch's reachable commits
+    run(["git", "reset", "-q", "--hard", initial], tmp_path)
+    svcs.db.refresh_branch_index(force=True)
+    assert node_ids(svcs.get_branch_events("main")) == ["func:a"]
+    with svcs.db.get_connection() as conn:
+        assert conn.execute("SELECT commit_hash FROM branch_commits WHERE branch = 'main' AND pinned = 1"
+                            ).fetchall() == [(feature,)]
+
+
+def test_refresh_follows_branch_heads(tmp_path):
+    svcs, initial = make_repo(tmp_path)
+    with svcs.db.get_connection() as conn:
+        assert refresh_branch_index(conn, str(tmp_path)) == {"main": 1}
+        assert refresh_branch_index(conn, str(tmp_path)) == {}
+
+        second = commit(tmp_path, "second")
+        # Fast-forward: only the new commit is listed
+        assert refresh_branch_index(conn, str(tmp_path)) == {"main": 1}
+        assert sorted(row[0] for row in conn.execute(
+            "SELECT commit_hash FROM branch_commits WHERE branch = 'main'")) == sorted([initial, second])
+
+        run(["git", "branch", "topic"], tmp_path)
+        run(["git", "reset", "-q", "--hard", initial], tmp_path)
+        # Rewound branch is listed again; the new branch gets its whole history
+        assert refresh_branch_index(conn, str(tmp_path)) == {"main": 1, "topic": 2}
+        assert conn.execute("SELECT commit_hash FROM branch_commits WHERE branch = 'main'").fetchall() == [(initial,)]
+
+        run(["git", "branch", "-q", "-D", "topic"], tmp_path)
+        refresh_branch_index(conn, str(tmp_path))
+        assert conn.execute("SELECT COUNT(*) FROM branch_commits WHERE branch = 'topic'").fetchone()[0] == 0
+        assert conn.execute("SELECT branch FROM branch_heads").fetchall() == [("main",)]
+
+
+def test_reset_commits_leave_the_branch_and_counts_follow(tmp_path):
+    svcs, initial = make_repo(tmp_path)
+    store(svcs, initial, "main", "func:base")
+    store(svcs, commit(tmp_path, "dropped"), "main", "func:a", "func:b")
+    assert node_ids(svcs.get_branch_events("main")) == ["func:a", "func:b", "func:base"]
+    assert svcs.db.count_branch_events("main") == 3
+
+    # Events stamped with main stay in the database but are no longer on it
+    run(["git", "reset", "-q", "--hard", initial], tmp_path)
+    svcs.db.refresh_branch_index(force=True)
+    assert node_ids(svcs.get_branch_events("main")) == ["func:base"]
+    assert svcs.db.count_branch_events("main") == 1
+    assert svcs.search_events("main")["total"] == 1
+    assert total_rows(svcs) == 3
+
+    with svcs.db.get_connection() as conn:
+        conn.execute("DELETE FROM semantic_events WHERE node_id = 'func:base'")
+        counts = sorted(conn.execute("SELECT commit_hash, event_count FROM commit_event_counts"))
+        assert counts == sorted(conn.execute(
+            "SELECT commit_hash, COUNT(*) FROM semantic_events GROUP BY commit_hash"))
+    assert svcs.db.count_branch_events("main") == 0
+
+
+def test_branch_view_query_uses_indexes(tmp_path):
+    svcs, _ = make_repo(tmp_path)
+    svcs.db.refresh_branch_index(force=True)
+    with svcs.db.get_connection() as conn:
+        query = EventQuery("main").limit(20)
+        query.fetch(conn)
+        sql, params = query.build()
+        plan = " | ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+    assert "branch_commits" in sql and "se.branch =" not in sql
+    # Pages walk the keyset index newest first, probing branch_commits by its primary key
+    assert "idx_semantic_events_keyset" in plan
+    assert "bc USING PRIMARY KEY" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_report_branch_filters_run_in_sql(tmp_path, monkeypatch, capsys):
+    svcs, initial = make_repo(tmp_path)
+    store(svcs, initial, "main", "func:base")
+    run(["git", "checkout", "-q", "-b", "feature"], tmp_path)
+    feature = commit(tmp_path, "feature")
+    store(svcs, feature, "feature", "func:a", "func:b")
+    run(["git", "tag", "v1", initial], tmp_path)
+    run(["git", "checkout", "-q", "main"], tmp_path)
+    monkeypatch.chdir(tmp_path)
+    from svcs.api import get_branch_event_counts, get_branch_events, get_full_log
+    from svcs_repo_quality import RepositoryQualityAnalyzer
+
+    assert node_ids(get_full_log(branch="feature")) == ["func:a", "func:b", "func:base"]
+    assert node_ids(get_full_log(branch="main")) == ["func:base"]
+    # Tags and commit ids are listed into a temporary table
+    assert node_ids(get_full_log(branch="v1")) == ["func:base"]
+    assert node_ids(get_full_log(branch=feature)) == ["func:a", "func:b", "func:base"]
+    assert len(get_full_log()) == 3
+    assert get_branch_event_counts(["main", "feature"]) == {"main": 1, "feature": 3}
+    assert len(get_branch_events("feature", limit=2)) == 2
+    assert node_ids(RepositoryQualityAnalyzer(branch="main").events) == ["func:base"]
+    # Revisions git cannot resolve keep the warning and report on every event
+    capsys.readouterr()
+    assert len(RepositoryQualityAnalyzer(branch="no-such-branch").events) == 3
+    assert "Could not get commits for branch 'no-such-branch'" in capsys.readouterr().out
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared WAL connection pool.
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import svcs_repo_connections as connections
+from svcs_repo_connections import ConnectionPool, connect, get_connection
+from svcs_repo_local import RepositoryLocalDatabase
+
+
+def make_table(db_path):
+    with get_connection(db_path) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, value TEXT)")
+
+
+def test_connections_use_wal_and_tuned_pragmas(tmp_path, monkeypatch):
+    monkeypatch.setenv("SVCS_DB_BUSY_TIMEOUT", "1234")
+    conn = ConnectionPool().get(tmp_path / "pragmas.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16000
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+
+def test_connections_are_reused_per_thread(tmp_path):
+    db_path = tmp_path / "reuse.db"
+    pool = ConnectionPool()
+    first = pool.get(db_path)
+    assert pool.get(str(db_path)) is first
+    first.close()
+    assert pool.get(db_path) is first
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.get(db_path)))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+
+    # Recreating the database file opens a fresh connection
+    pool.close_all()
+    old = pool.get(db_path)
+    db_path.unlink()
+    Path(str(db_path) + "-wal").unlink(missing_ok=True)
+    Path(str(db_path) + "-shm").unlink(missing_ok=True)
+    assert pool.get(db_path) is not old
+
+
+def test_nested_blocks_share_one_transaction(tmp_path):
+    db_path = tmp_path / "nested.db"
+    make_table(db_path)
+
+    def count():
+        reader = connect(db_path)
+        try:
+            return reader.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        finally:
+            reader.close()
+
+    with get_connection(db_path) as outer:
+        outer.execute("INSERT INTO items (value) VALUES ('a')")
+        with get_connection(db_path) as inner:
+            assert inner is outer
+            inner.execute("INSERT INTO items (value) VALUES ('b')")
+        # The inner block does not commit the outer block's work
+        assert count() == 0
+    assert count() == 2
+
+    try:
+        with get_connection(db_path) as conn:
+            conn.execute("INSERT INTO items (value) VALUES ('c')")
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert count() == 2
+
+    # close() discards uncommitted work and resets the row factory
+    conn = get_connection(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("INSERT INTO items (value) VALUES ('d')")
+    conn.close()
+    assert count() == 2
+    assert type(get_connection(db_path).execute("SELECT 1").fetchone()) is tuple
+
+
+def test_repository_database_uses_pool(tmp_path):
+    db = RepositoryLocalDatabase(str(tmp_path))
+    assert db.get_connection() is get_connection(tmp_path / ".svcs" / "semantic.db")
+    assert db.get_connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_readers_do_not_block_during_writes(tmp_path, monkeypatch):
+    # Readers must not wait on the writer at all, so no lock timeout is allowed
+    monkeypatch.setenv("SVCS_DB_BUSY_TIMEOUT", "0")
+    db_path = tmp_path / "stress.db"
+    make_table(db_path)
+    connections.close_connections()
+
+    errors = []
+    read_counts = []
+    stop = threading.Event()
+    writer_in_transaction = threading.Event()
+
+    def writer():
+        try:
+            for batch in range(40):
+                with get_connection(db_path) as conn:
+                    conn.executemany("INSERT INTO items (value) VALUES (?)",
+                                     [(f"{batch}-{i}" * 20,) for i in range(250)])
+                    writer_in_transaction.set()
+                    # Hold the write lock while readers run
+                    time.sleep(0.005)
+        except sqlite3.Error as e:
+            errors.append(e)
+        finally:
+            stop.set()
+
+    def reader():
+        counts = []
+        try:
+            writer_in_transaction.wait(5)
+            while not stop.is_set():
+                conn = get_connection(db_path)
+                try:
+                    counts.append(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+                finally:
+                    conn.close()
+        except sqlite3.Error as e:
+            errors.append(e)
+        read_counts.append(counts)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert not errors
+    assert len(read_counts) == 4 and all(read_counts)
+    # Each reader sees a consistent, growing snapshot of committed batches only
+    for counts in read_counts:
+        assert counts == sorted(counts)
+        assert all(count % 250 == 0 for count in counts)
+    with get_connection(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 40 * 250
+
+
+def test_rollback_journal_readers_would_block(tmp_path):
+    # Baseline for the test above: without WAL a pending writer locks readers out
+    db_path = tmp_path / "journal.db"
+    writer = sqlite3.connect(db_path, timeout=0)
+    writer.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)")
+    writer.commit()
+    writer.execute("PRAGMA cache_size = 1")
+    writer.execute("BEGIN IMMEDIATE")
+    # Overflow the page cache so the writer escalates to an exclusive lock
+    writer.executemany("INSERT INTO items (value) VALUES (?)", [("x" * 500,) for _ in range(2000)])
+
+    reader = sqlite3.connect(db_path, timeout=0)
+    try:
+        reader.execute("SELECT COUNT(*) FROM items").fetchone()
+        blocked = False
+    except sqlite3.OperationalError as e:
+        blocked = "locked" in str(e)
+    finally:
+        reader.close()
+        writer.rollback()
+        writer.close()
+    assert blocked
+
+    # The same open write transaction under WAL leaves readers alone
+    wal_path = tmp_path / "wal.db"
+    make_table(wal_path)
+    writer = connect(wal_path, timeout=0)
+    writer.execute("PRAGMA cache_size = 1")
+    writer.execute("BEGIN IMMEDIATE")
+    writer.executemany("INSERT INTO items (value) VALUES (?)", [("x" * 500,) for _ in range(2000)])
+    try:
+        assert get_connection(wal_path).execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+    finally:
+        writer.rollback()
+        writer.close()
+
+
+def test_writers_join_the_callers_transaction(tmp_path):
+    from svcs_repo_queue import RepositoryAnalysisQueue
+
+    db = RepositoryLocalDatabase(str(tmp_path))
+    queue = RepositoryAnalysisQueue(str(tmp_path), db=db)
+    event = {"event_type": "node_added", "node_id": "func:f", "location": "app.py", "commit_hash": "a" * 40}
+
+    try:
+        with db.get_connection():
+            db.store_semantic_events([event], branch="main")
+            queue.enqueue("b" * 40)
+            assert queue.claim("worker")["commit_hash"] == "b" * 40
+            queue.complete("b" * 40, 1)
+            raise RuntimeError("abort the unit of work")
+    except RuntimeError:
+        pass
+
+    reader = connect(db.db_path)
+    try:
+        assert reader.execute("SELECT COUNT(*) FROM semantic_events").fetchone()[0] == 0
+        assert reader.execute("SELECT COUNT(*) FROM analysis_queue").fetchone()[0] == 0
+    finally:
+        reader.close()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQL query builder behind the web server's event searches.
+"""
+
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_local import RepositoryLocalSVCS
+from svcs_repo_search import EventQuery, build_event_query, encode_cursor, has_event_fts, parse_date
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def make_repo(path, event_count=6000):
+    run(["git", "init", "-q", "-b", "main", "."], path)
+    run(["git", "config", "user.name", "Alice Example"], path)
+    run(["git", "config", "user.email", "alice@example.com"], path)
+    (path / "app.py").write_text("def main():\n    return 1\n")
+    run(["git", "add", "app.py"], path)
+    run(["git", "commit", "-q", "-m", "initial"], path)
+    commit_hash = run(["git", "rev-parse", "HEAD"], path)
+
+    svcs = RepositoryLocalSVCS(str(path))
+    svcs.initialize_repository()
+    base = int(datetime(2024, 1, 1).timestamp())
+    events = [
+        {
+            "event_type": "node_added" if i % 3 else "node_removed",
+            "node_id": f"func:f{i}",
+            "location": "src/core_app.py" if i % 2 else "tests/test_app.py",
+            "details": "Improves performance of the loop" if i % 10 == 0 else "Plain change",
+            "layer": "5b" if i % 10 == 0 else "core",
+            "confidence": 0.9 if i % 10 == 0 else 1.0,
+            "created_at": base + i,
+        }
+        for i in range(event_count)
+    ]
+    metadata = svcs.db.get_commit_metadata(commit_hash)
+    svcs.db.store_semantic_events(events, commit_hash=commit_hash, commit_metadata=metadata)
+    return svcs, base
+
+
+def test_filters_run_in_sql_with_real_total(tmp_path):
+    svcs, base = make_repo(tmp_path)
+
+    # More matches than the old 5000-row preload, counted exactly
+    result = svcs.search_events(event_types=["node_added"], limit=20)
+    assert result["total"] == 4000
+    assert len(result["events"]) == 20
+    assert [e["created_at"] for e in result["events"]] == sorted(
+        (e["created_at"] for e in result["events"]), reverse=True)
+    assert result["events"][0]["author"] == "Alice Example"
+
+    result = svcs.search_events(author="alice", location_pattern="CORE_", layers="core",
+                                since_date=datetime.fromtimestamp(base + 100),
+                                until_date=base + 200, order_by="timestamp", order_desc=False)
+    created = [e["created_at"] for e in result["events"]]
+    assert result["total"] == 50
+    assert created == sorted(created) and created[0] == base + 101
+    assert all(e["location"] == "src/core_app.py" and e["layer"] == "core" for e in result["events"])
+
+    # The LIKE wildcard in the user's text is matched literally
+    assert svcs.search_events(location_pattern="core%app")["total"] == 0
+
+    patterns = svcs.search_events(pattern_type="performance", min_confidence=0.7, limit=5)
+    assert patterns["total"] == 600
+    assert all("performance" in e["details"] for e in patterns["events"])
+
+
+def test_pages_do_not_overlap(tmp_path):
+    svcs, _ = make_repo(tmp_path, event_count=50)
+    first = svcs.search_events(order_by="confidence", limit=20)["events"]
+    second = svcs.search_events(order_by="confidence", limit=20, offset=20)["events"]
+    third = svcs.search_events(order_by="confidence", limit=20, offset=40)["events"]
+    ids = [e["event_id"] for e in first + second + third]
+    assert len(ids) == len(set(ids)) == 50
+
+
+def test_unknown_sort_field_is_rejected():
+    with pytest.raises(ValueError):
+        EventQuery(branch="main").order_by("details; DROP TABLE semantic_events")
+
+
+def test_query_uses_branch_index(tmp_path):
+    svcs, _ = make_repo(tmp_path, event_count=10)
+    sql, params = build_event_query(branch="main", layers=["core"], limit=20).build()
+    with svcs.db.get_connection() as conn:
+        plan = " | ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+    assert "idx_semantic_events_branch_keyset" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_parse_date_formats():
+    assert parse_date("2024-01-02") == int(datetime(2024, 1, 2).timestamp())
+    week_ago = parse_date("1 week ago")
+    assert abs(week_ago - int((datetime.now() - timedelta(days=7)).timestamp())) <= 2
+    assert parse_date("3 days ago") > week_ago
+    assert parse_date("not a date") is None
+
+
+def test_web_manager_search_uses_query_builder(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    (tmp_path / "home").mkdir()
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    make_repo(repo, event_count=30)
+
+    from svcs_web_repository_manager import SVCSWebRepositoryManager
+    manager = SVCSWebRepositoryManager()
+    events = manager.search_events(str(repo), limit=5, event_type="node_removed", order_desc=False)
+    assert len(events) == 5
+    assert all(e["event_type"] == "node_removed" for e in events)
+    assert events[0]["node_id"] == "func:f0"
+
+
+def test_cursor_pages_cover_ties_exactly_once(tmp_path):
+    svcs, base = make_repo(tmp_path, event_count=55)
+    with svcs.db.get_connection() as conn:
+        # Many events share a timestamp; event_id keeps the order total
+        conn.execute("UPDATE semantic_events SET created_at = ? WHERE created_at < ?", (base, base + 30))
+        conn.commit()
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = svcs.search_events(limit=20, cursor=cursor)
+        assert (page["total"] is None) == (cursor is not None)
+        seen.extend(page["events"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 3
+    assert len({e["event_id"] for e in seen}) == len(seen) == 55
+    keys = [(e["created_at"], e["event_id"]) for e in seen]
+    assert keys == sorted(keys, reverse=True)
+
+    # get_branch_events accepts the same cursor
+    first = svcs.search_events(limit=10)
+    assert svcs.get_branch_events(limit=10, cursor=first["next_cursor"]) == \
+        svcs.search_events(limit=10, cursor=first["next_cursor"])["events"]
+
+
+def test_cursor_query_is_a_range_scan(tmp_path):
+    svcs, base = make_repo(tmp_path, event_count=10)
+    cursor = encode_cursor(base + 5, "zzz")
+    sql, params = build_event_query(branch="main", limit=20, cursor=cursor).build()
+    with svcs.db.get_connection() as conn:
+        plan = " | ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+    assert "idx_semantic_events_branch_keyset (branch=? AND (created_at,event_id)<(?,?))" in plan
+    assert "TEMP B-TREE" not in plan
+
+    with pytest.raises(ValueError):
+        build_event_query(branch="main", cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        build_event_query(branch="main", order_by="confidence", cursor=cursor).build()
+
+
+def test_api_full_log_pages(tmp_path, monkeypatch):
+    make_repo(tmp_path, event_count=45)
+    monkeypatch.chdir(tmp_path)
+    from svcs.api import get_full_log, get_next_cursor, search_events_advanced
+
+    everything = get_full_log()
+    seen, cursor = [], None
+    while True:
+        page = get_full_log(limit=20, cursor=cursor)
+        seen.extend(page)
+        cursor = get_next_cursor(page, 20)
+        if cursor is None:
+            break
+    assert [e["event_id"] for e in seen] == [e["event_id"] for e in everything]
+    assert len(seen) == 45
+
+    first = search_events_advanced(event_types=["node_added"], limit=10)
+    second = search_events_advanced(event_types=["node_added"], limit=10,
+                                    cursor=get_next_cursor(first, 10))
+    assert len(second) == 10
+    assert not {e["event_id"] for e in first} & {e["event_id"] for e in second}
+
+
+def test_api_cursor_is_index_range(tmp_path):
+    svcs, _ = make_repo(tmp_path, event_count=5)
+    from svcs.api import _keyset_condition
+    condition, params = _keyset_condition(encode_cursor(100, "x"))
+    with svcs.db.get_connection() as conn:
+        plan = " | ".join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT e.event_id FROM semantic_events e "
+            "JOIN commits c ON e.commit_hash = c.commit_hash "
+            f"WHERE {condition} ORDER BY c.timestamp DESC, e.event_id DESC LIMIT 20", params))
+    assert "idx_commits_timestamp (timestamp<?)" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+
+
+def fts_count(conn, expression):
+    return conn.execute("SELECT COUNT(*) FROM semantic_events_fts WHERE semantic_events_fts MATCH ?",
+                        (expression,)).fetchone()[0]
+
+
+def test_fts_index_follows_event_writes(tmp_path):
+    svcs, _ = make_repo(tmp_path, event_count=20)
+    with svcs.db.get_connection() as conn:
+        assert has_event_fts(conn)
+        assert fts_count(conn, "performance") == 2
+        conn.execute("UPDATE semantic_events SET details = 'Caching layer' WHERE node_id = 'func:f0'")
+        conn.execute("DELETE FROM semantic_events WHERE node_id = 'func:f10'")
+        conn.commit()
+        assert fts_count(conn, "performance") == 0
+        assert fts_count(conn, "cach*") == 1
+        # The external-content index stays consistent with the table
+        conn.execute("INSERT INTO semantic_events_fts (semantic_events_fts) VALUES ('integrity-check')")
+
+
+def test_pattern_search_ranks_by_bm25(tmp_path):
+    svcs, base = make_repo(tmp_path, event_count=3)
+    commit_hash = svcs.get_branch_events(limit=1)[0]["commit_hash"]
+    svcs.db.store_semantic_events([
+        {"event_type": "abstract_performance_optimization", "node_id": "func:hot", "location": "app.py",
+         "details": "Performance optimization: speed and efficiency of the hot loop",
+         "layer": "5b", "confidence": 0.8, "created_at": base - 10},
+    ], commit_hash=commit_hash)
+
+    page = svcs.search_events(pattern_type="performance", order_by="relevance", limit=5)
+    assert page["total"] == 2
+    assert page["events"][0]["node_id"] == "func:hot"
+
+    sql, _ = build_event_query(branch="main", pattern_type="performance", order_by="relevance").build(fts=True)
+    assert "MATCH" in sql and "LIKE" not in sql
+
+
+def test_search_falls_back_to_like_without_fts5(tmp_path, monkeypatch):
+    import migrations.migrate_database as migrate_database
+
+    svcs, _ = make_repo(tmp_path, event_count=20)
+    monkeypatch.setattr(migrate_database, "_fts5_supported", False)
+
+    # Reopening with a build that lacks FTS5 detaches the triggers, so writes keep working
+    svcs = RepositoryLocalSVCS(str(tmp_path))
+    with svcs.db.get_connection() as conn:
+        assert not has_event_fts(conn)
+    commit_hash = svcs.get_branch_events(limit=1)[0]["commit_hash"]
+    svcs.db.store_semantic_events([{"event_type": "node_added", "node_id": "func:late", "location": "app.py",
+                                    "details": "Performance fix", "layer": "core"}], commit_hash=commit_hash)
+    assert svcs.search_events(pattern_type="performance")["total"] == 3
+
+    # With FTS5 back, the index is rebuilt and includes the rows written meanwhile
+    monkeypatch.setattr(migrate_database, "_fts5_supported", True)
+    svcs = RepositoryLocalSVCS(str(tmp_path))
+    with svcs.db.get_connection() as conn:
+        assert has_event_fts(conn)
+        assert fts_count(conn, "performance") == 3
+    assert svcs.search_events(pattern_type="performance")["total"] == 3
+
+
+def test_api_text_searches_use_fts(tmp_path, monkeypatch):
+    make_repo(tmp_path, event_count=30)
+    monkeypatch.chdir(tmp_path)
+    from svcs import api
+
+    ranked = api.search_semantic_patterns("performance", min_confidence=0.5, limit=10)
+    assert len(ranked) == 3
+    assert api._text_search(["performance"], ("details",))["rank"] == "fts.fts_rank"
+    assert len(api.find_dependency_changes("loop")) == 3
+    assert len(api.search_events(location="src/core")) == 15
+    # Locations are plain substring matches, not whole-word index matches
+    assert len(api.search_events(location="core_app", event_type="node_removed")) == 5
+    assert len(api.search_events(location="ore_app.py")) == 15
+    assert len(api.search_events_advanced(location_pattern="re_ap")) == 15
+    assert api.search_events(location="core%app") == []
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for the trigger-maintained event_stats rollup.
+"""
+
+import argparse
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from migrations.migrate_database import EVENT_STATS_SELECT
+from svcs.commands.status import cmd_cleanup
+from svcs_repo_local import RepositoryLocalSVCS
+from svcs_repo_stats import get_event_stats, has_event_stats
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def make_repo(path):
+    run(["git", "init", "-q", "-b", "main", "."], path)
+    run(["git", "config", "user.name", "Alice Example"], path)
+    run(["git", "config", "user.email", "alice@example.com"], path)
+    (path / "app.py").write_text("def main():\n    return 1\n")
+    run(["git", "add", "app.py"], path)
+    run(["git", "commit", "-q", "-m", "initial"], path)
+    svcs = RepositoryLocalSVCS(str(path))
+    svcs.initialize_repository()
+    return svcs, run(["git", "rev-parse", "HEAD"], path)
+
+
+def make_events(count, created_at):
+    return [
+        {
+            "event_type": "node_added" if i % 3 else "node_removed",
+            "node_id": f"func:f{i}",
+            "location": "app.py",
+            "details": "change",
+            "layer": "core" if i % 2 else None,
+            "confidence": 0.5 if i % 2 else None,
+            "created_at": created_at + i,
+        }
+        for i in range(count)
+    ]
+
+
+def rollup(conn):
+    return sorted(conn.execute("SELECT * FROM event_stats").fetchall())
+
+
+def recomputed(conn):
+    return sorted(conn.execute(EVENT_STATS_SELECT).fetchall())
+
+
+def test_rollup_follows_inserts_updates_and_deletes(tmp_path):
+    svcs, head = make_repo(tmp_path)
+    db = svcs.db
+    created = int(datetime(2024, 3, 1, 12, tzinfo=timezone.utc).timestamp())
+
+    metadata = db.get_commit_metadata(head)
+    db.store_semantic_events(make_events(30, created), commit_hash=head, commit_metadata=metadata)
+    # Events stored before their commit row are counted without an author
+    db.store_semantic_events(make_events(6, created), commit_hash="f" * 40, branch="feature")
+
+    with db.get_connection() as conn:
+        assert has_event_stats(conn)
+        assert rollup(conn) == recomputed(conn)
+        authors = get_event_stats(conn, branch="feature")["authors"]
+        assert authors == {None: 6}
+
+        conn.execute("INSERT INTO commits (commit_hash, branch, author, timestamp) VALUES (?, ?, ?, ?)",
+                     ("f" * 40, "feature", "Bob", created - 86400 * 10))
+        assert rollup(conn) == recomputed(conn)
+        assert get_event_stats(conn, branch="feature")["authors"] == {"Bob": 6}
+
+        conn.execute("UPDATE commits SET author = 'Carol' WHERE commit_hash = ?", ("f" * 40,))
+        conn.execute("UPDATE semantic_events SET layer = 'ai', confidence = 0.75 WHERE node_id = 'func:f1'")
+        conn.execute("UPDATE semantic_events SET branch = 'feature' WHERE node_id = 'func:f2' AND branch = 'main'")
+        assert rollup(conn) == recomputed(conn)
+
+        conn.execute("DELETE FROM semantic_events WHERE event_type = 'node_removed'")
+        conn.execute("DELETE FROM commits WHERE commit_hash = ?", ("f" * 40,))
+        assert rollup(conn) == recomputed(conn)
+        # Groups whose last event went away are removed
+        assert conn.execute("SELECT COUNT(*) FROM event_stats WHERE event_count <= 0").fetchone()[0] == 0
+
+        conn.execute("DELETE FROM semantic_events")
+        assert rollup(conn) == []
+
+
+def test_statistics_read_only_the_rollup(tmp_path):
+    svcs, head = make_repo(tmp_path)
+    day = int(datetime(2024, 3, 1, 12, tzinfo=timezone.utc).timestamp())
+    metadata = dict(svcs.db.get_commit_metadata(head), timestamp=day)
+    svcs.db.store_semantic_events(make_events(90, day), commit_hash=head, commit_metadata=metadata)
+
+    stats = svcs.db.get_event_stats(branch="main")
+    assert stats["total_events"] == 90
+    assert stats["event_types"] == {"node_added": 60, "node_removed": 30}
+    assert stats["layers"] == {"core": 45, None: 45}
+    assert stats["authors"] == {"Alice Example": 90}
+    assert stats["days"] == {"2024-03-01": 90}
+    assert abs(stats["avg_confidence"] - 0.5) < 1e-9
+    assert svcs.db.get_event_stats(since="2024-03-02")["total_events"] == 0
+    assert svcs.db.get_event_stats(until="2024-03-02")["total_events"] == 90
+
+    status = svcs.get_repository_status()
+    assert status["semantic_events_count"] == 90
+    database = svcs.get_database_stats()
+    assert (database["total_events"], database["commits_tracked"], database["branches_tracked"]) == (90, 1, 1)
+
+    with svcs.db.get_connection() as conn:
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT SUM(event_count) FROM event_stats WHERE branch = ?", ("main",)))
+        assert "semantic_events" not in plan
+
+        # Without the rollup the same numbers are computed from the events
+        conn.execute("DROP TABLE event_stats")
+        assert get_event_stats(conn, branch="main") == stats
+
+
+def test_cleanup_rebuilds_stats(tmp_path, capsys):
+    svcs, head = make_repo(tmp_path)
+    svcs.db.store_semantic_events(make_events(12, 1_700_000_000), commit_hash=head,
+                                  commit_metadata=svcs.db.get_commit_metadata(head))
+    with svcs.db.get_connection() as conn:
+        conn.execute("DELETE FROM event_stats")
+
+    cmd_cleanup(argparse.Namespace(path=str(tmp_path), git_unreachable=False,
+                                   show_stats=False, rebuild_stats=True))
+    assert "Event statistics rebuilt" in capsys.readouterr().out
+    assert svcs.db.get_event_stats()["total_events"] == 12
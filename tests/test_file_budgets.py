@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for per-file size and time budgets in the comprehensive analyzer.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from svcs.analyzers.comprehensive_analyzer import ComprehensiveAnalyzer
+from svcs.parse_cache import ParseCache
+from svcs.parsers import ParseTimeout, PythonParser
+
+BEFORE = "import os\n\ndef keep(x):\n    return x\n"
+AFTER = "import json\n\ndef keep(x, y):\n    return [v for v in x]\n\ndef added():\n    pass\n"
+
+
+def analyzer(**budgets):
+    return ComprehensiveAnalyzer(parse_cache=ParseCache(), jobs=1, **budgets)
+
+
+def event_types(events):
+    return sorted(event["event_type"] for event in events)
+
+
+def test_within_budget_runs_all_layers():
+    events = analyzer(max_file_bytes=10_000, max_file_seconds=60).analyze_file_changes("app.py", BEFORE, AFTER)
+    assert "analysis_degraded" not in event_types(events)
+    assert {event["layer"] for event in events} > {"1"}
+
+
+def test_oversized_file_is_not_parsed():
+    class ExplodingParser:
+        def __getattr__(self, name):
+            raise AssertionError("parser used for an oversized file")
+
+    budgeted = analyzer(max_file_bytes=40)
+    budgeted.parsers["python"] = ExplodingParser()
+    events = budgeted.analyze_file_changes("bundle.py", "", AFTER)
+    assert event_types(events) == ["analysis_degraded", "file_added"]
+    assert events[-1]["details"] == f"Structural analysis only: {len(AFTER)} bytes exceeds the 40 byte budget"
+    assert events[-1]["node_id"] == "file:bundle.py"
+
+    # Multi-byte characters count by their UTF-8 size
+    events = analyzer(max_file_bytes=40).analyze_file_changes("text.py", "", "s = '" + "ä" * 20 + "'\n")
+    assert "analysis_degraded" in event_types(events)
+
+
+def test_slow_layer_falls_back_to_structural_events():
+    budgeted = analyzer(max_file_seconds=0.05)
+    full = analyzer(max_file_seconds=0).analyze_file_changes("app.py", BEFORE, AFTER)
+
+    original = budgeted.layer3.analyze
+    def slow_layer3(*args):
+        time.sleep(0.1)
+        return original(*args)
+    budgeted.layer3.analyze = slow_layer3
+
+    events = budgeted.analyze_file_changes("app.py", BEFORE, AFTER)
+    structural = [event for event in full if event["layer"] == "1"]
+    assert events[:-1] == structural
+    assert events[-1]["event_type"] == "analysis_degraded"
+    assert events[-1]["details"] == "Structural analysis only: layer 3 ran past the 0.05s time budget"
+
+
+class SleepyParser(PythonParser):
+    """Takes two seconds per file, checking its deadline every 10 ms like a visitor would."""
+
+    def parse_code(self, source_code):
+        for _ in range(200):
+            time.sleep(0.01)
+            self.check_deadline()
+        return super().parse_code(source_code)
+
+
+def test_slow_parser_is_stopped_at_the_deadline():
+    budgeted = analyzer(max_file_seconds=0.05)
+    budgeted.parsers["python"] = SleepyParser()
+
+    start = time.monotonic()
+    events = budgeted.analyze_file_changes("app.py", BEFORE, AFTER, before_blob="a" * 40, after_blob="b" * 40)
+    assert time.monotonic() - start < 1
+    assert events[-1]["details"] == "Structural analysis only: parsing ran past the 0.05s time budget"
+    assert {event["layer"] for event in events} == {"1"}
+    # Nothing half-parsed is cached, and the parser is left without a deadline
+    assert budgeted.parse_cache.get_stats()["entries"] == 0
+    assert budgeted.parsers["python"].deadline is None
+
+
+def test_python_visitor_checks_the_deadline():
+    source = "".join(f"def f{i}(a, b):\n    return [a + b * {i} for _ in range(3)]\n" for i in range(200))
+    parser = PythonParser()
+    parser.deadline = time.monotonic() - 1
+    with pytest.raises(ParseTimeout):
+        parser.parse_code(source)
+    with pytest.raises(ParseTimeout):
+        parser.parse_changes(source, source + "x = 1\n")
+    parser.deadline = None
+    assert len(parser.parse_code(source)[0]) == 200
+
+
+def test_ai_layer_gets_the_time_left():
+    budgeted = analyzer(max_file_seconds=30)
+    timeouts = []
+    def slow_layer5b(*args, timeout=None):
+        timeouts.append(timeout)
+        time.sleep(0.1)
+        return []
+    budgeted.layer5b.analyze = slow_layer5b
+    budgeted.analyze_file_changes("app.py", BEFORE, AFTER)
+    assert 0 < timeouts[0] <= 30
+
+    budgeted.max_file_seconds = 0.05
+    events = budgeted.analyze_file_changes("app.py", BEFORE, AFTER)
+    assert events[-1]["details"] == "Structural analysis only: layer 5b ran past the 0.05s time budget"
+
+    # No request is started once the time is up
+    assert budgeted.layer5b._query_llm("prompt", timeout=0) == "[]"
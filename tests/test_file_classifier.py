@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for generated, minified and vendored file detection.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs.analyzers.comprehensive_analyzer import ComprehensiveAnalyzer
+from svcs.file_classifier import FileClassifier, PathPattern, parse_attributes
+from svcs.git_objects import GitObjectReader
+from svcs.parse_cache import ParseCache
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def commit_all(path, message):
+    run(["git", "add", "-A"], path)
+    run(["git", "-c", "user.name=Test", "-c", "user.email=test@example.com",
+         "commit", "-q", "-m", message], path)
+    return run(["git", "rev-parse", "HEAD"], path)
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_patterns_follow_gitattributes_semantics():
+    assert PathPattern("*_pb2.py").matches("api/proto/user_pb2.py")
+    assert not PathPattern("*.py").matches("src/app.pyc")
+    assert PathPattern("/gen/*.py").matches("gen/a.py")
+    assert not PathPattern("/gen/*.py").matches("src/gen/a.py")
+    assert not PathPattern("gen/*.py").matches("gen/sub/a.py")
+    assert PathPattern("**/vendor/**").matches("vendor/lib.js")
+    assert PathPattern("**/vendor/**").matches("web/vendor/lib/x.js")
+    assert PathPattern("a/**/b.py").matches("a/b.py") and PathPattern("a/**/b.py").matches("a/x/y/b.py")
+    assert PathPattern("*.py", base="pkg").matches("pkg/sub/m.py")
+    assert not PathPattern("*.py", base="pkg").matches("other/m.py")
+
+    rules = parse_attributes("# comment\n*.js linguist-generated\nkeep.js -linguist-generated text\n"
+                             "lib/** linguist-vendored=true\nother.py diff=python\n")
+    assert [(rule.pattern, states) for rule, states in rules] == [
+        ("*.js", {"linguist-generated": True}),
+        ("keep.js", {"linguist-generated": False}),
+        ("lib/**", {"linguist-vendored": True}),
+    ]
+
+
+def test_paths_and_content_are_classified():
+    classifier = FileClassifier(patterns={"vendored": ["libs/ext/"]})
+    classes = classifier.classify_paths(["api/user_pb2.py", "static/app.min.js", "third_party/x/y.py",
+                                         "libs/ext/z.js", "src/app.py"])
+    assert {path: c.category for path, c in classes.items()} == {
+        "api/user_pb2.py": "generated", "static/app.min.js": "minified",
+        "third_party/x/y.py": "vendored", "libs/ext/z.js": "vendored"}
+
+    assert classifier.classify_content("a.py", "# @generated by tool\nx = 1\n").category == "generated"
+    assert classifier.classify_content("a.go", "// Code generated by protoc-gen-go. DO NOT EDIT.\n")
+    assert classifier.classify_content("a.js", "var a=1;" * 300).category == "minified"
+    assert classifier.classify_content("a.py", "def f():\n    return 1\n" * 100) is None
+    # Markers below the header are ordinary text
+    assert classifier.classify_content("a.py", "x = 1\n" * 10 + "# @generated\n") is None
+
+
+def test_config_sets_globs_and_actions(tmp_path):
+    write(tmp_path / ".svcs" / "config.json", json.dumps({"file_classification": {
+        "generated": ["src/client/**"], "actions": {"generated": "skip", "vendored": "bogus"}}}))
+    classifier = FileClassifier.from_repo(str(tmp_path))
+    file_class = classifier.classify_path("src/client/api.py")
+    assert file_class.category == "generated" and classifier.action(file_class) == "skip"
+    assert classifier.actions["vendored"] == "skip"
+    assert FileClassifier.from_repo(str(tmp_path / "missing")).actions["generated"] == "structural"
+
+
+def test_gitattributes_are_read_from_the_commit(tmp_path):
+    run(["git", "init", "-q", "."], tmp_path)
+    write(tmp_path / ".gitattributes", "gen/** linguist-generated\n")
+    write(tmp_path / "pkg" / ".gitattributes", "*.py linguist-vendored\nown.py -linguist-vendored\n")
+    for path in ("gen/a.py", "pkg/dep.py", "pkg/own.py", "src/app.py"):
+        write(tmp_path / path, "x = 1\n")
+    commit = commit_all(tmp_path, "initial")
+    (tmp_path / ".gitattributes").unlink()
+
+    reader = GitObjectReader(str(tmp_path))
+    try:
+        classes = FileClassifier().classify_paths(["gen/a.py", "pkg/dep.py", "pkg/own.py", "src/app.py"],
+                                                  reader, commit)
+    finally:
+        reader.close()
+    assert {path: c.category for path, c in classes.items()} == {"gen/a.py": "generated",
+                                                                "pkg/dep.py": "vendored"}
+    assert classes["gen/a.py"].reason == "linguist-generated in .gitattributes"
+
+
+def test_unset_attribute_overrides_built_in_globs(tmp_path):
+    run(["git", "init", "-q", "."], tmp_path)
+    write(tmp_path / ".gitattributes", "vendor/** -linguist-vendored\n*_pb2.py -linguist-vendored\n")
+    paths = ["vendor/mylib/a.py", "web/vendor/b.js", "api/user_pb2.py", "libs/ext/c.py"]
+    for path in paths:
+        write(tmp_path / path, "x = 1\n")
+    commit = commit_all(tmp_path, "initial")
+
+    reader = GitObjectReader(str(tmp_path))
+    try:
+        classes = FileClassifier(patterns={"vendored": ["libs/ext/"]}).classify_paths(paths, reader, commit)
+    finally:
+        reader.close()
+    # The repository's own vendor/ directory is analyzed; other categories and configured globs still apply
+    assert {path: c.category for path, c in classes.items()} == {
+        "web/vendor/b.js": "vendored", "api/user_pb2.py": "generated", "libs/ext/c.py": "vendored"}
+
+
+def test_config_can_drop_the_built_in_globs(tmp_path):
+    write(tmp_path / ".svcs" / "config.json", json.dumps({"file_classification": {
+        "use_defaults": False, "vendored": ["deps/**"]}}))
+    classifier = FileClassifier.from_repo(str(tmp_path))
+    assert classifier.classify_path("vendor/mylib/a.py") is None
+    assert classifier.classify_path("deps/x.py").category == "vendored"
+
+
+def test_analyze_commit_skips_and_downgrades(tmp_path):
+    run(["git", "init", "-q", "."], tmp_path)
+    write(tmp_path / "app.py", "def f():\n    return 1\n")
+    commit_all(tmp_path, "initial")
+    write(tmp_path / "app.py", "def f(x):\n    return x\n")
+    write(tmp_path / "proto" / "user_pb2.py", "def g():\n    pass\n")
+    write(tmp_path / "third_party" / "lib.py", "def h():\n    pass\n")
+    write(tmp_path / "web" / "bundle.js", "function a(){return 1};" * 100)
+    commit = commit_all(tmp_path, "change")
+
+    analyzer = ComprehensiveAnalyzer(parse_cache=ParseCache(), jobs=1)
+    events = analyzer.analyze_commit(commit, str(tmp_path))
+
+    locations = {event["location"] for event in events}
+    assert "third_party/lib.py" not in locations
+    degraded = {event["location"]: event["details"] for event in events
+                if event["event_type"] == "analysis_degraded"}
+    assert degraded == {
+        "proto/user_pb2.py": "Structural analysis only: generated file, path matches *_pb2.py",
+        "web/bundle.js": "Structural analysis only: minified file, average line length 2300",
+    }
+    assert all(event["layer"] == "1" for event in events if event["location"] in degraded)
+    assert any(event["layer"] != "1" for event in events if event["location"] == "app.py")
+    assert analyzer.stats == {"files_analyzed": 1, "files_degraded": 2, "files_skipped": 1,
+                              "generated_files": 1, "minified_files": 1, "vendored_files": 1}
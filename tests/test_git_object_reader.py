@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent `git cat-file --batch` object reader.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs.git_objects import GitObjectReader, get_object_reader, parse_raw_diff
+from svcs.analyzers.comprehensive_analyzer import ComprehensiveAnalyzer
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def commit_all(path, message):
+    run(["git", "add", "-A"], path)
+    run(["git", "-c", "user.name=Test", "-c", "user.email=test@example.com",
+         "commit", "-q", "-m", message], path)
+    return run(["git", "rev-parse", "HEAD"], path)
+
+
+def make_repo(path, file_count=3):
+    run(["git", "init", "-q", "."], path)
+    for i in range(file_count):
+        (path / f"mod{i}.py").write_text(f"def f{i}():\n    return {i}\n")
+    (path / "gone.py").write_text("def gone():\n    pass\n")
+    first = commit_all(path, "initial")
+    for i in range(file_count):
+        (path / f"mod{i}.py").write_text(f"def f{i}(x):\n    return x + {i}\n")
+    (path / "gone.py").unlink()
+    (path / "new.py").write_text("def new():\r\n    return 1\r\n")
+    (path / "image.png").write_bytes(b"\x89PNG\x00\xff")
+    second = commit_all(path, "change")
+    return first, second
+
+
+def test_changed_files_reports_blob_ids(tmp_path):
+    first, second = make_repo(tmp_path)
+    reader = GitObjectReader(str(tmp_path))
+    try:
+        changes = {c.path: c for c in reader.changed_files(second)}
+        assert changes["gone.py"].status == "D" and changes["gone.py"].new_blob is None
+        assert changes["new.py"].status == "A" and changes["new.py"].old_blob is None
+        assert changes["mod0.py"].status == "M"
+
+        before = reader.read_text(changes["mod0.py"].old_blob)
+        after = reader.read_text(changes["mod0.py"].new_blob)
+        assert before == run(["git", "show", f"{first}:mod0.py"], tmp_path) + "\n"
+        assert "x + 0" in after
+
+        # Text mode matches `git show` with universal newlines
+        assert reader.read_text(changes["new.py"].new_blob) == "def new():\n    return 1\n"
+        assert reader.read_blob(changes["image.png"].new_blob) == b"\x89PNG\x00\xff"
+
+        # Initial commit is diffed against the empty tree
+        assert {c.path for c in reader.changed_files(first)} == {"mod0.py", "mod1.py", "mod2.py", "gone.py"}
+    finally:
+        reader.close()
+
+
+def test_missing_objects_return_empty(tmp_path):
+    make_repo(tmp_path)
+    reader = GitObjectReader(str(tmp_path))
+    try:
+        assert reader.read_blob("f" * 40) is None
+        assert reader.read_text(None) == ""
+        assert reader.read_text("HEAD:does-not-exist.py") == ""
+        # The process survives a miss
+        assert reader.read_text("HEAD:mod1.py").startswith("def f1")
+    finally:
+        reader.close()
+
+
+def test_parse_raw_diff_handles_renames():
+    output = (":100644 100644 " + "a" * 40 + " " + "b" * 40 + " R087\0old.py\0new.py\0"
+              ":160000 160000 " + "c" * 40 + " " + "d" * 40 + " M\0vendor/sub\0")
+    changes = parse_raw_diff(output)
+    assert changes[0].path == "new.py" and changes[0].status == "R"
+    assert changes[1].old_blob is None and changes[1].new_blob is None
+
+
+def test_analyze_commit_spawns_constant_processes(tmp_path, monkeypatch):
+    _, second = make_repo(tmp_path, file_count=20)
+    analyzer = ComprehensiveAnalyzer()
+    get_object_reader(str(tmp_path)).close()
+
+    spawned = []
+    real_popen = subprocess.Popen
+
+    class CountingPopen(real_popen):
+        def __init__(self, args, *a, **kw):
+            spawned.append(args)
+            super().__init__(args, *a, **kw)
+
+    monkeypatch.setattr(subprocess, "Popen", CountingPopen)
+    events = analyzer.analyze_commit(second, str(tmp_path))
+
+    assert events
+    git_calls = [args for args in spawned if args and args[0] == "git"]
+    # One diff-tree plus one long-lived cat-file, independent of file count
+    assert len(git_calls) == 2
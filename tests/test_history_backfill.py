@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel, resumable history backfill (svcs analyze).
+"""
+
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_backfill import RepositoryHistoryBackfill
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def make_history(path, commits=6):
+    run(["git", "init", "-q", "-b", "main", "."], path)
+    body = ""
+    for i in range(commits):
+        body += f"\ndef func_{i}(value):\n    return value * {i}\n"
+        (path / "module.py").write_text(body)
+        run(["git", "add", "module.py"], path)
+        run(["git", "-c", "user.name=Dev", "-c", "user.email=dev@example.com",
+             "commit", "-q", "-m", f"commit {i}"], path)
+    return run(["git", "rev-list", "--reverse", "HEAD"], path).split()
+
+
+def progress_rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return dict(conn.execute("SELECT commit_hash, event_count FROM analysis_progress"))
+
+
+def test_backfill_all_commits_in_parallel(tmp_path):
+    hashes = make_history(tmp_path)
+    backfill = RepositoryHistoryBackfill(str(tmp_path), jobs=2, batch_size=2)
+
+    stats = backfill.run(all_refs=True, progress=None)
+    assert stats["total_commits"] == len(hashes)
+    assert stats["analyzed_commits"] == len(hashes)
+    assert stats["failed_commits"] == 0
+    assert stats["stored_events"] > 0
+    assert stats["commits_per_second"] > 0
+
+    rows = progress_rows(backfill.db.db_path)
+    assert set(rows) == set(hashes)
+    with sqlite3.connect(backfill.db.db_path) as conn:
+        stored = conn.execute("SELECT COUNT(*) FROM semantic_events").fetchone()[0]
+        authors = {row[0] for row in conn.execute("SELECT author FROM commits")}
+    assert stored == stats["stored_events"] == sum(rows.values())
+    assert authors == {"Dev"}
+
+
+def test_backfill_resumes_after_partial_run(tmp_path):
+    hashes = make_history(tmp_path)
+    backfill = RepositoryHistoryBackfill(str(tmp_path), jobs=1)
+
+    # A first run that only got through the first half
+    first = backfill.run(rev_range=hashes[2], progress=None)
+    assert first["analyzed_commits"] == 3
+
+    second = backfill.run(all_refs=True, progress=None)
+    assert second["skipped_commits"] == 3
+    assert second["analyzed_commits"] == len(hashes) - 3
+
+    third = backfill.run(all_refs=True, progress=None)
+    assert third["analyzed_commits"] == 0
+    assert third["skipped_commits"] == len(hashes)
+
+
+def test_range_uses_git_revision_syntax(tmp_path):
+    hashes = make_history(tmp_path)
+    backfill = RepositoryHistoryBackfill(str(tmp_path), jobs=1)
+    commits = backfill.list_commits(rev_range="HEAD~2..HEAD")
+    assert [commit_hash for commit_hash, _ in commits] == hashes[-2:]
+    assert commits[-1][1]["message"] == f"commit {len(hashes) - 1}"
+
+
+def test_commits_are_stamped_with_a_branch_that_reaches_them(tmp_path):
+    hashes = make_history(tmp_path, commits=2)
+    run(["git", "checkout", "-q", "-b", "feature"], tmp_path)
+    (tmp_path / "feature.py").write_text("def feature():\n    return 1\n")
+    run(["git", "add", "feature.py"], tmp_path)
+    run(["git", "-c", "user.name=Dev", "-c", "user.email=dev@example.com", "commit", "-q", "-m", "feature"],
+        tmp_path)
+    feature = run(["git", "rev-parse", "HEAD"], tmp_path)
+    run(["git", "checkout", "-q", "main"], tmp_path)
+
+    backfill = RepositoryHistoryBackfill(str(tmp_path), jobs=1)
+    backfill.run(all_refs=True, progress=None)
+    with sqlite3.connect(backfill.db.db_path) as conn:
+        stamps = dict(conn.execute("SELECT DISTINCT commit_hash, branch FROM semantic_events"))
+    assert stamps == {hashes[0]: "main", hashes[1]: "main", feature: "feature"}
+
+
+def test_failed_commits_are_not_checkpointed(tmp_path, monkeypatch):
+    hashes = make_history(tmp_path, commits=3)
+    backfill = RepositoryHistoryBackfill(str(tmp_path), jobs=1)
+
+    from svcs.git_objects import GitObjectReader
+    real_changed_files = GitObjectReader.changed_files
+
+    def failing_changed_files(self, commit_hash):
+        if commit_hash == hashes[1]:
+            raise subprocess.CalledProcessError(128, ["git", "diff-tree"])
+        return real_changed_files(self, commit_hash)
+
+    monkeypatch.setattr(GitObjectReader, "changed_files", failing_changed_files)
+    stats = backfill.run(all_refs=True, progress=None)
+    assert stats["failed_commits"] == 1
+    assert set(progress_rows(backfill.db.db_path)) == {hashes[0], hashes[2]}
+
+    monkeypatch.setattr(GitObjectReader, "changed_files", real_changed_files)
+    retry = backfill.run(all_refs=True, progress=None)
+    assert retry["analyzed_commits"] == 1 and retry["failed_commits"] == 0
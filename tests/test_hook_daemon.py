@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the resident hook daemon and its thin hook client.
+"""
+
+import sqlite3
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import svcs_repo_daemon as daemon
+from svcs.commands import events as event_commands
+from svcs_repo_hooks import RepositoryLocalHookManager
+from svcs_repo_local import RepositoryLocalSVCS
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def commit(path, body, message):
+    (path / "module.py").write_text(body)
+    run(["git", "add", "module.py"], path)
+    run(["git", "-c", "user.name=Dev", "-c", "user.email=dev@example.com",
+         "commit", "-q", "-m", message], path)
+    return run(["git", "rev-parse", "HEAD"], path)
+
+
+def start_daemon(socket_path):
+    server = daemon.HookDaemon(socket_path=socket_path, idle_timeout=10)
+    server.bind()
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    return server, thread
+
+
+def test_hook_runs_in_daemon_with_warm_analyzer(tmp_path, monkeypatch, capsys):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    run(["git", "init", "-q", "-b", "main", "."], repo)
+    commit(repo, "def alpha():\n    return 1\n", "first")
+    svcs = RepositoryLocalSVCS(str(repo))
+    svcs.initialize_repository()
+    # Synchronous analysis, so post-commit reaches the daemon instead of the queue
+    svcs.set_config("async_analysis", False)
+    head = commit(repo, "def alpha(x):\n    return x\n\ndef beta():\n    pass\n", "second")
+
+    socket_path = tmp_path / "run" / "daemon.sock"
+    monkeypatch.setenv("SVCS_DAEMON_SOCKET", str(socket_path))
+    monkeypatch.setattr(event_commands, "_warm_instances", None)
+    server, thread = start_daemon(socket_path)
+    try:
+        status = daemon.ping()
+        assert status["pid"] and status["requests"] == 0
+
+        capsys.readouterr()
+        assert daemon.run_hook_client("post-commit", [], repo_path=str(repo), daemon_only=True) == 0
+        assert "Stored" in capsys.readouterr().out
+
+        with sqlite3.connect(repo / ".svcs" / "semantic.db") as conn:
+            stored = conn.execute("SELECT COUNT(*) FROM semantic_events WHERE commit_hash = ?",
+                                  (head,)).fetchone()[0]
+        assert stored > 0
+
+        # The analyzer built for the first hook is reused by the next one
+        key = ("analyzer", str(repo.resolve()))
+        analyzer = event_commands._warm_instances[key]
+        daemon.run_hook_client("post-commit", [], repo_path=str(repo), daemon_only=True)
+        assert event_commands._warm_instances[key] is analyzer
+        assert daemon.ping()["repositories"] == [str(repo.resolve())]
+    finally:
+        assert daemon.stop_daemon()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert not socket_path.exists()
+
+
+def test_client_reports_unavailable_daemon(tmp_path, monkeypatch):
+    socket_path = tmp_path / "daemon.sock"
+    monkeypatch.setenv("SVCS_DAEMON_SOCKET", str(socket_path))
+    assert daemon.ping() is None
+    assert daemon.run_hook_client("post-commit", [], repo_path=str(tmp_path),
+                                  daemon_only=True) == daemon.EXIT_DAEMON_UNAVAILABLE
+
+    # A stale socket file left by a crashed daemon is not mistaken for a live one
+    socket_path.write_text("")
+    assert daemon.ping() is None
+
+
+def test_generated_hooks_try_daemon_first(tmp_path):
+    content = RepositoryLocalHookManager(str(tmp_path))._generate_hook_content("post-commit")
+    handoff = content.index("--daemon-only post-commit")
+    assert handoff < content.index("analyze_commit_changes")
+    assert "svcs_repo_daemon.py" in content
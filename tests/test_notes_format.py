@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact (format 2) semantic note encoding and conversion.
+"""
+
+import json
+import subprocess
+import sys
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_local import RepositoryLocalSVCS
+from svcs_repo_notes import (NOTE_V2_MAGIC, NOTES_REF, convert_notes, decode_note, hydrate_notes,
+                             note_document, write_note_contents)
+
+
+def run(cmd, cwd, stdin=None):
+    return subprocess.run(cmd, cwd=cwd, input=stdin, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def make_events(count):
+    return [{"event_type": "node_added", "node_id": f"func:f{i}", "location": "src/app.py",
+             "details": f"Function f{i} added", "layer": "core", "confidence": 0.9, "created_at": 100 + i,
+             "layer_description": "Core structural analysis", "reasoning": None}
+            for i in range(count)]
+
+
+def test_round_trip_drops_only_null_values():
+    events = make_events(20) + [{"event_type": "dependency_added", "node_id": "module:os", "impact": {"x": 1}}]
+    content = note_document("c" * 40, events, timestamp="2026-01-01T00:00:00", note_format=2)
+    assert content.startswith(NOTE_V2_MAGIC + b"{")
+    note = decode_note(content)
+    assert (note["format"], note["commit_hash"], note["timestamp"]) == (2, "c" * 40, "2026-01-01T00:00:00")
+    assert note["semantic_events"] == [{key: value for key, value in event.items() if value is not None}
+                                       for event in events]
+    assert len(content) * 2 < len(note_document("c" * 40, events, note_format=1))
+
+
+def test_json_stays_the_default_and_compressed_notes_still_decode():
+    assert note_document("c" * 40, make_events(1)).startswith(b"{")
+    compact = note_document("c" * 40, make_events(3), note_format=2)[len(NOTE_V2_MAGIC):]
+    note = decode_note(NOTE_V2_MAGIC + zlib.compress(compact, 9))
+    assert (note["format"], len(note["semantic_events"])) == (2, 3)
+
+
+def test_reader_accepts_json_notes():
+    v1 = note_document("a" * 40, make_events(2), note_format=1)
+    assert json.loads(v1)["version"] == "1.0"
+    note = decode_note(v1)
+    assert (note["format"], len(note["semantic_events"])) == (1, 2)
+    assert decode_note(NOTE_V2_MAGIC + b"not zlib") is None
+
+
+def test_convert_rewrites_json_notes_in_one_commit(tmp_path):
+    run(["git", "init", "-q", "-b", "main", "."], tmp_path)
+    run(["git", "config", "user.name", "Dev"], tmp_path)
+    run(["git", "config", "user.email", "dev@example.com"], tmp_path)
+    commits = []
+    for i in range(5):
+        run(["git", "commit", "-q", "--allow-empty", "-m", f"change {i}"], tmp_path)
+        commits.append(run(["git", "rev-parse", "HEAD"], tmp_path))
+    old = json.loads(note_document(commits[0], make_events(3), timestamp="2020-01-01T00:00:00", note_format=1))
+    for commit_hash in commits[:4]:
+        old["commit_hash"] = commit_hash
+        run(["git", "notes", "--ref", NOTES_REF, "add", "-F", "-", commit_hash], tmp_path, json.dumps(old, indent=2))
+    write_note_contents(str(tmp_path), [(commits[4], note_document(commits[4], make_events(1), note_format=2))])
+    head = run(["git", "rev-parse", NOTES_REF], tmp_path)
+
+    assert convert_notes(str(tmp_path), note_format=2) == {"notes": 5, "converted": 4, "invalid": 0}
+    assert run(["git", "rev-list", "--count", f"{head}..{NOTES_REF}"], tmp_path) == "1"
+    svcs = RepositoryLocalSVCS(str(tmp_path))
+    note = svcs.git_notes.get_semantic_data_from_note(commits[0])
+    assert (note["format"], note["timestamp"], len(note["semantic_events"])) == (2, "2020-01-01T00:00:00", 3)
+    assert convert_notes(str(tmp_path), note_format=2)["converted"] == 0
+    assert hydrate_notes(svcs.db)["events"] == 13
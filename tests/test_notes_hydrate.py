@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk semantic notes import (svcs notes hydrate).
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs.git_objects import get_object_reader
+from svcs_repo_local import RepositoryLocalSVCS
+from svcs_repo_notes import NOTES_REF, hydrate_notes, list_notes, parse_note
+
+
+def run(cmd, cwd, stdin=None):
+    return subprocess.run(cmd, cwd=cwd, input=stdin, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def make_repo(path, commit_count):
+    run(["git", "init", "-q", "-b", "main", "."], path)
+    run(["git", "config", "user.name", "Dev"], path)
+    run(["git", "config", "user.email", "dev@example.com"], path)
+    svcs = RepositoryLocalSVCS(str(path))
+    svcs.initialize_repository()
+    commits = []
+    for i in range(commit_count):
+        run(["git", "commit", "-q", "--allow-empty", "-m", f"change {i}\n\nbody"], path)
+        commits.append(run(["git", "rev-parse", "HEAD"], path))
+    return svcs, commits
+
+
+def add_note(path, commit_hash, *node_ids):
+    note = {"commit_hash": commit_hash, "semantic_events": [
+        {"event_type": "node_added", "node_id": node_id, "location": "app.py", "details": "shared"}
+        for node_id in node_ids]}
+    run(["git", "notes", "--ref", NOTES_REF, "add", "-f", "-F", "-", commit_hash], path, json.dumps(note))
+
+
+def event_rows(svcs):
+    with svcs.db.get_connection() as conn:
+        return conn.execute(
+            "SELECT e.commit_hash, e.node_id, e.layer, c.author, e.branch FROM semantic_events e "
+            "LEFT JOIN commits c ON c.commit_hash = e.commit_hash ORDER BY e.node_id").fetchall()
+
+
+def test_hydrate_imports_every_note_beyond_recent_history(tmp_path):
+    svcs, commits = make_repo(tmp_path, 15)
+    for i, commit_hash in enumerate(commits):
+        add_note(tmp_path, commit_hash, f"func:f{i:02d}")
+    run(["git", "notes", "--ref", NOTES_REF, "add", "-f", "-m", "not json", commits[3]], tmp_path)
+
+    assert set(list_notes(str(tmp_path))) == set(commits)
+    summary = hydrate_notes(svcs.db, chunk_commits=4)
+    assert summary == {"notes": 15, "pending": 15, "commits": 14, "events": 14, "invalid": 1}
+
+    rows = event_rows(svcs)
+    assert len(rows) == 14
+    assert rows[0] == (commits[0], "func:f00", "core", "Dev", "main")
+    with svcs.db.get_connection() as conn:
+        assert conn.execute("SELECT message FROM commits WHERE commit_hash = ?",
+                            (commits[0],)).fetchone()[0] == "change 0"
+
+    # Commits with local events are skipped on the next run
+    assert hydrate_notes(svcs.db)["events"] == 0
+    assert svcs.import_semantic_events_from_notes() == 0
+    assert len(event_rows(svcs)) == 14
+
+
+def test_hydrate_limited_to_commits(tmp_path):
+    svcs, commits = make_repo(tmp_path, 3)
+    for i, commit_hash in enumerate(commits):
+        add_note(tmp_path, commit_hash, f"func:a{i}", f"func:b{i}")
+    assert svcs.import_semantic_events_from_notes([commits[1]]) == 2
+    assert {row[0] for row in event_rows(svcs)} == {commits[1]}
+    assert svcs.import_semantic_events_from_notes() == 4
+
+
+def test_hydrate_without_notes_ref(tmp_path):
+    svcs, _ = make_repo(tmp_path, 1)
+    assert hydrate_notes(svcs.db) == {"notes": 0, "pending": 0, "commits": 0, "events": 0, "invalid": 0}
+
+
+def test_parse_note_with_appended_blocks():
+    first = json.dumps({"commit_hash": "a" * 40, "semantic_events": []})
+    second = json.dumps({"commit_hash": "b" * 40, "semantic_events": [{"node_id": "x"}]})
+    content = f"{first}\n---\n{second}\n"
+    assert parse_note(content, "b" * 40)["semantic_events"] == [{"node_id": "x"}]
+    assert parse_note(content)["commit_hash"] == "a" * 40
+    assert parse_note("garbage") is None
+
+
+def test_read_objects_batches_in_order(tmp_path):
+    _, commits = make_repo(tmp_path, 3)
+    reader = get_object_reader(str(tmp_path))
+    results = list(reader.read_objects(commits + ["0" * 40], chunk_size=2))
+    assert [spec for spec, _ in results] == commits + ["0" * 40]
+    assert all(result[0] == "commit" for _, result in results[:3])
+    assert results[3][1] is None
+    assert reader.read_object(commits[0])[0] == "commit"
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental semantic notes sync between clones.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_local import RepositoryLocalSVCS
+from svcs_repo_notes import NOTES_REF, changed_notes, get_sync_state, resolve_notes_ref, sync_notes
+
+
+def run(cmd, cwd, stdin=None):
+    return subprocess.run(cmd, cwd=cwd, input=stdin, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def configure(path):
+    run(["git", "config", "user.name", "Dev"], path)
+    run(["git", "config", "user.email", "dev@example.com"], path)
+
+
+def commit_with_note(path, message, *node_ids):
+    run(["git", "commit", "-q", "--allow-empty", "-m", message], path)
+    commit_hash = run(["git", "rev-parse", "HEAD"], path)
+    note = {"commit_hash": commit_hash, "semantic_events": [
+        {"event_type": "node_added", "node_id": node_id, "location": "app.py", "details": "shared"}
+        for node_id in node_ids]}
+    run(["git", "notes", "--ref", NOTES_REF, "add", "-F", "-", commit_hash], path, json.dumps(note))
+    return commit_hash
+
+
+def publish(path):
+    run(["git", "push", "-q", "origin", "main", NOTES_REF], path)
+
+
+def make_clones(tmp_path):
+    origin, upstream, clone = tmp_path / "origin.git", tmp_path / "upstream", tmp_path / "clone"
+    run(["git", "init", "-q", "--bare", "-b", "main", str(origin)], tmp_path)
+    run(["git", "clone", "-q", str(origin), str(upstream)], tmp_path)
+    configure(upstream)
+    run(["git", "checkout", "-q", "-b", "main"], upstream)
+    for i in range(3):
+        commit_with_note(upstream, f"change {i}", f"func:f{i}")
+    publish(upstream)
+    run(["git", "clone", "-q", str(origin), str(clone)], tmp_path)
+    configure(clone)
+    svcs = RepositoryLocalSVCS(str(clone))
+    svcs.initialize_repository()
+    return upstream, clone, svcs
+
+
+def event_count(svcs):
+    with svcs.db.get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM semantic_events").fetchone()[0]
+
+
+def test_sync_fetches_only_when_remote_moved(tmp_path):
+    upstream, clone, svcs = make_clones(tmp_path)
+
+    first = sync_notes(svcs.db)
+    assert (first["fetch"], first["incremental"], first["events"]) == ("fetched", False, 3)
+    assert resolve_notes_ref(str(clone)) == resolve_notes_ref(str(upstream))
+
+    again = sync_notes(svcs.db)
+    assert (again["fetch"], again["notes"], again["events"]) == ("unchanged", 0, 0)
+    assert sync_notes(svcs.db, min_interval=3600)["fetch"] == "skipped"
+
+    added = commit_with_note(upstream, "change 3", "func:f3", "func:g3")
+    publish(upstream)
+    run(["git", "pull", "-q", "origin", "main"], clone)
+    update = sync_notes(svcs.db)
+    assert (update["fetch"], update["incremental"], update["notes"], update["events"]) == ("fetched", True, 1, 2)
+    assert event_count(svcs) == 5
+    with svcs.db.get_connection() as conn:
+        state = get_sync_state(conn)
+    assert state["imported_head"] == state["remote_head"] == resolve_notes_ref(str(clone))
+    with svcs.db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM semantic_events WHERE commit_hash = ?",
+                            (added,)).fetchone()[0] == 2
+
+
+def test_local_import_follows_notes_ref(tmp_path):
+    upstream, clone, svcs = make_clones(tmp_path)
+    assert svcs.git_notes.fetch_notes_from_remote()
+    assert svcs.import_semantic_events_from_notes() == 3
+    assert svcs.import_semantic_events_from_notes() == 0
+
+    old_head = resolve_notes_ref(str(clone))
+    local = commit_with_note(clone, "local change", "func:local")
+    assert changed_notes(str(clone), old_head, resolve_notes_ref(str(clone))).keys() == {local}
+    assert svcs.import_semantic_events_from_notes() == 1
+    assert event_count(svcs) == 4
+
+
+def test_sync_without_remote_notes(tmp_path):
+    origin, clone = tmp_path / "origin.git", tmp_path / "clone"
+    run(["git", "init", "-q", "--bare", str(origin)], tmp_path)
+    run(["git", "clone", "-q", str(origin), str(clone)], tmp_path)
+    svcs = RepositoryLocalSVCS(str(clone))
+    summary = svcs.sync_notes_from_remote()
+    assert (summary["fetch"], summary["events"]) == (None, 0)
+    assert not svcs.git_notes.fetch_notes_from_remote()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the stdin and fast-import semantic notes writers.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs_repo_backfill import RepositoryHistoryBackfill
+from svcs_repo_local import GitNotesManager, RepositoryLocalSVCS
+from svcs_repo_notes import NOTES_REF, changed_notes, decode_note, list_notes, resolve_notes_ref, write_notes
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def make_commits(path, count):
+    run(["git", "init", "-q", "-b", "main", "."], path)
+    run(["git", "config", "user.name", "Dev"], path)
+    run(["git", "config", "user.email", "dev@example.com"], path)
+    for i in range(count):
+        run(["git", "commit", "-q", "--allow-empty", "-m", f"change {i}"], path)
+    return run(["git", "rev-list", "--reverse", "HEAD"], path).split()
+
+
+def events(*node_ids):
+    return [{"event_type": "node_added", "node_id": node_id, "location": "app.py", "details": "x" * 5000}
+            for node_id in node_ids]
+
+
+def show_note(path, commit_hash):
+    data = subprocess.run(["git", "notes", "--ref", NOTES_REF, "show", commit_hash], cwd=path,
+                          capture_output=True, check=True).stdout
+    return decode_note(data, commit_hash)
+
+
+def test_note_is_replaced_not_appended(tmp_path):
+    commit_hash = make_commits(tmp_path, 1)[0]
+    notes = GitNotesManager(str(tmp_path))
+    assert notes.store_semantic_data_as_note(commit_hash, events("func:old"))
+    # Large enough to exceed a single argv entry
+    assert notes.store_semantic_data_as_note(commit_hash, events(*(f"func:new{i}" for i in range(40))))
+
+    note = show_note(tmp_path, commit_hash)
+    assert note["commit_hash"] == commit_hash
+    assert len(note["semantic_events"]) == 40
+    assert notes.get_semantic_data_from_note(commit_hash)["semantic_events"][0]["node_id"] == "func:new0"
+
+
+def test_fast_import_writes_all_notes_in_one_commit(tmp_path):
+    commits = make_commits(tmp_path, 300)
+    first = GitNotesManager(str(tmp_path))
+    assert first.store_semantic_data_as_note(commits[0], events("func:stale"))
+    before = resolve_notes_ref(str(tmp_path))
+
+    assert write_notes(str(tmp_path), ((commit_hash, events(f"func:f{i}")) for i, commit_hash in enumerate(commits))) == 300
+    after = resolve_notes_ref(str(tmp_path))
+    assert run(["git", "rev-list", "--count", f"{before}..{after}"], tmp_path) == "1"
+    assert set(list_notes(str(tmp_path))) == set(commits)
+    assert show_note(tmp_path, commits[0])["semantic_events"][0]["node_id"] == "func:f0"
+    # Fanned-out note paths map back to commit IDs
+    assert changed_notes(str(tmp_path), before, after).keys() == set(commits)
+
+    assert write_notes(str(tmp_path), []) == 0
+    assert resolve_notes_ref(str(tmp_path)) == after
+
+
+def test_backfill_publishes_notes(tmp_path):
+    run(["git", "init", "-q", "-b", "main", "."], tmp_path)
+    for i in range(3):
+        (tmp_path / "module.py").write_text("".join(f"def func_{j}():\n    return {j}\n" for j in range(i + 1)))
+        run(["git", "add", "module.py"], tmp_path)
+        run(["git", "-c", "user.name=Dev", "-c", "user.email=dev@example.com",
+             "commit", "-q", "-m", f"commit {i}"], tmp_path)
+    svcs = RepositoryLocalSVCS(str(tmp_path))
+    stats = RepositoryHistoryBackfill(str(tmp_path), jobs=1, notes=True).run(all_refs=True, progress=None)
+    assert stats["notes_written"] == stats["analyzed_commits"] == 3
+    for commit_hash in list_notes(str(tmp_path)):
+        assert svcs.git_notes.get_semantic_data_from_note(commit_hash)["semantic_events"]
+
+
+def test_backfill_writes_notes_with_each_checkpoint(tmp_path):
+    run(["git", "init", "-q", "-b", "main", "."], tmp_path)
+    for i in range(3):
+        (tmp_path / "module.py").write_text("".join(f"def func_{j}():\n    return {j}\n" for j in range(i + 1)))
+        run(["git", "add", "module.py"], tmp_path)
+        run(["git", "-c", "user.name=Dev", "-c", "user.email=dev@example.com",
+             "commit", "-q", "-m", f"commit {i}"], tmp_path)
+    svcs = RepositoryLocalSVCS(str(tmp_path))
+    seen = []
+
+    def progress(message):
+        with svcs.db.get_connection() as conn:
+            checkpointed = {row[0] for row in conn.execute("SELECT commit_hash FROM analysis_progress")}
+        seen.append((checkpointed, set(list_notes(str(tmp_path)))))
+
+    backfill = RepositoryHistoryBackfill(str(tmp_path), jobs=1, batch_size=1, notes=True)
+    assert backfill.run(all_refs=True, progress=progress, report_every=0)["notes_written"] == 3
+    # Every checkpointed batch already has its notes
+    assert [len(checkpointed) for checkpointed, _ in seen] == [1, 2, 3]
+    assert all(checkpointed == noted for checkpointed, noted in seen)
+    assert run(["git", "rev-list", "--count", NOTES_REF], tmp_path) == "3"
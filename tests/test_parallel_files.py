@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for process-pool analysis of files within one commit.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs.analyzers.comprehensive_analyzer import ComprehensiveAnalyzer
+from svcs.git_objects import get_object_reader
+from svcs.parse_cache import ParseCache
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def commit_all(path, message):
+    run(["git", "add", "-A"], path)
+    run(["git", "-c", "user.name=Dev", "-c", "user.email=dev@example.com", "commit", "-q", "-m", message], path)
+    return run(["git", "rev-parse", "HEAD"], path)
+
+
+def make_codemod_commit(path, files):
+    run(["git", "init", "-q", "."], path)
+    for version in range(2):
+        for i in range(files):
+            body = f"def handler_{i}(value):\n    return value + {i}\n"
+            if version:
+                body = f"import json\n\n\ndef handler_{i}(value, extra=None):\n    return [v for v in value]\n"
+            (path / f"module_{i:02d}.py").write_text(body)
+        (path / "notes.txt").write_text(f"version {version}\n")
+        head = commit_all(path, f"version {version}")
+    return head
+
+
+def test_pool_output_matches_sequential_order(tmp_path):
+    commit_hash = make_codemod_commit(tmp_path, 9)
+
+    sequential = ComprehensiveAnalyzer(parse_cache=ParseCache(), jobs=1).analyze_commit(commit_hash, str(tmp_path))
+    pooled = ComprehensiveAnalyzer(parse_cache=ParseCache(), jobs=3, parallel_threshold=4).analyze_commit(
+        commit_hash, str(tmp_path))
+
+    assert pooled == sequential
+    locations = [event["location"] for event in sequential]
+    assert locations == sorted(locations)
+    assert {event["location"] for event in sequential} == {f"module_{i:02d}.py" for i in range(9)}
+
+
+def test_pool_workers_are_spawned_not_forked(tmp_path, monkeypatch):
+    commit_hash = make_codemod_commit(tmp_path, 4)
+    import multiprocessing
+    methods = []
+    get_context = multiprocessing.get_context
+    monkeypatch.setattr(multiprocessing, "get_context",
+                        lambda method=None: methods.append(method) or get_context(method))
+    events = ComprehensiveAnalyzer(parse_cache=ParseCache(), jobs=2, parallel_threshold=2).analyze_commit(
+        commit_hash, str(tmp_path))
+    assert methods == ["spawn"]
+    assert {event["location"] for event in events} == {f"module_{i:02d}.py" for i in range(4)}
+
+
+def test_small_commits_stay_in_process(tmp_path, monkeypatch):
+    commit_hash = make_codemod_commit(tmp_path, 2)
+    import multiprocessing
+    monkeypatch.setattr(multiprocessing, "get_context", None)
+    events = ComprehensiveAnalyzer(parse_cache=ParseCache(), jobs=4, parallel_threshold=3).analyze_commit(
+        commit_hash, str(tmp_path))
+    assert {event["location"] for event in events} == {"module_00.py", "module_01.py"}
+
+
+def test_read_texts_batches_blobs(tmp_path):
+    commit_hash = make_codemod_commit(tmp_path, 2)
+    reader = get_object_reader(str(tmp_path))
+    changes = reader.changed_files(commit_hash)
+    texts = reader.read_texts([change.new_blob for change in changes] + [None, "0" * 40], chunk_size=2)
+    assert set(texts) == {change.new_blob for change in changes}
+    assert all(texts[change.new_blob] == reader.read_text(change.new_blob) for change in changes)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the blob-keyed parse cache.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs.parse_cache import ParseCache, get_spill_dir
+from svcs.parsers import PythonParser
+from svcs.analyzers.comprehensive_analyzer import ComprehensiveAnalyzer
+
+
+class CountingParser(PythonParser):
+    # Full parses only, so every analyzed blob goes through the cache
+    scoped_parsing = False
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def parse_code(self, source_code):
+        self.calls += 1
+        return super().parse_code(source_code)
+
+
+def run(cmd, cwd):
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_same_blob_is_parsed_once():
+    cache = ParseCache(max_entries=2)
+    parser = CountingParser()
+
+    first = cache.get_or_parse(parser, "a" * 40, "def f():\n    pass\n")
+    second = cache.get_or_parse(parser, "a" * 40, "def f():\n    pass\n")
+    assert parser.calls == 1
+    assert first is second
+    assert "func:f" in first[0]
+
+    # Content without a blob ID is never cached
+    cache.get_or_parse(parser, None, "def g():\n    pass\n")
+    cache.get_or_parse(parser, None, "def g():\n    pass\n")
+    assert parser.calls == 3
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ParseCache(max_entries=2)
+    parser = CountingParser()
+    for blob in ("1" * 40, "2" * 40):
+        cache.get_or_parse(parser, blob, "x = 1\n")
+    cache.get_or_parse(parser, "1" * 40, "x = 1\n")   # refresh 1
+    cache.get_or_parse(parser, "3" * 40, "x = 1\n")   # evicts 2
+    assert parser.calls == 3
+
+    cache.get_or_parse(parser, "1" * 40, "x = 1\n")
+    assert parser.calls == 3
+    cache.get_or_parse(parser, "2" * 40, "x = 1\n")
+    assert parser.calls == 4
+    assert cache.get_stats()["entries"] == 2
+
+
+def test_disk_spill_survives_new_cache_and_respects_version(tmp_path):
+    parser = CountingParser()
+    ParseCache(spill_dir=str(tmp_path)).get_or_parse(parser, "b" * 40, "def h(x):\n    return x\n")
+
+    reloaded = ParseCache(spill_dir=str(tmp_path))
+    nodes, deps = reloaded.get_or_parse(parser, "b" * 40, "def h(x):\n    return x\n")
+    assert parser.calls == 1
+    assert reloaded.get_stats()["disk_hits"] == 1
+    assert nodes["func:h"]["signature"] == "(x)"
+
+    # A parser version bump invalidates old entries
+    parser.parser_version += "-next"
+    reloaded.get_or_parse(parser, "b" * 40, "def h(x):\n    return x\n")
+    assert parser.calls == 2
+
+
+def test_sequential_commits_reuse_after_blob(tmp_path):
+    run(["git", "init", "-q", "."], tmp_path)
+    (tmp_path / ".svcs").mkdir()
+    hashes = []
+    body = ""
+    for i in range(4):
+        body += f"\ndef func_{i}(value):\n    return value * {i}\n"
+        (tmp_path / "module.py").write_text(body)
+        run(["git", "add", "module.py"], tmp_path)
+        run(["git", "-c", "user.name=Dev", "-c", "user.email=dev@example.com",
+             "commit", "-q", "-m", f"commit {i}"], tmp_path)
+        hashes.append(run(["git", "rev-parse", "HEAD"], tmp_path))
+
+    cache = ParseCache()
+    analyzer = ComprehensiveAnalyzer(parse_cache=cache)
+    counting = CountingParser()
+    analyzer.parsers["python"] = counting
+
+    for commit_hash in hashes:
+        analyzer.analyze_commit(commit_hash, str(tmp_path))
+    # One parse per distinct blob, plus the initial commit's empty (blob-less) side
+    assert counting.calls == len(hashes) + 1
+    assert cache.get_stats()["hits"] == len(hashes) - 1
+    assert cache.spill_dir == Path(get_spill_dir(str(tmp_path)))
+
+    # Re-analysis in a fresh process-like cache is served from .svcs/parse_cache
+    fresh = ComprehensiveAnalyzer(parse_cache=ParseCache())
+    fresh.parsers["python"] = counting
+    fresh.analyze_commit(hashes[-1], str(tmp_path))
+    assert counting.calls == len(hashes) + 1
+
+
+class ScopedCountingParser(PythonParser):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.scoped_calls = 0
+
+    def parse_code(self, source_code):
+        self.calls += 1
+        return super().parse_code(source_code)
+
+    def parse_changes(self, before_code, after_code):
+        self.scoped_calls += 1
+        return super().parse_changes(before_code, after_code)
+
+
+def test_scoped_parser_caches_committed_after_blobs():
+    analyzer = ComprehensiveAnalyzer(parse_cache=ParseCache())
+    parser = ScopedCountingParser()
+    analyzer.parsers["python"] = parser
+    first = "def f(value):\n    return value\n"
+    second = first + "\ndef g():\n    return 1\n"
+    third = second.replace("return 1", "return 2")
+
+    analyzer.analyze_file_changes("m.py", first, second, before_blob="a" * 40, after_blob="b" * 40)
+    # The next commit's before blob is this commit's after blob
+    events = analyzer.analyze_file_changes("m.py", second, third, before_blob="b" * 40, after_blob="c" * 40)
+    assert analyzer.parse_cache.get_stats()["hits"] == 1
+    assert parser.calls == 3 and parser.scoped_calls == 0
+    assert any(event["node_id"] == "func:g" for event in events)
+
+    # Working-tree content has no blob to cache: only the touched nodes are detailed
+    analyzer.analyze_file_changes("m.py", first, third)
+    assert parser.scoped_calls == 1 and analyzer.parse_cache.get_stats()["entries"] == 3
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for single-pass Python node extraction and source hashes.
+"""
+
+import ast
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs.parsers import PythonParser
+from svcs.parsers.python_parser import FunctionDetailVisitor
+
+SOURCE = '''
+import os
+from collections import OrderedDict
+
+def outer(items, *args, flag=True, **kwargs):
+    total = 0
+    def inner(value):
+        class Local(Base):
+            limit = 10
+        return [v for v in value if v > 2] or (lambda: None)
+    async def fetch(url):
+        import json
+        return await get(url, {"x": 1.5})
+    for item in items:
+        if item is None:
+            continue
+        total += inner(item)
+    try:
+        os.remove("tmp")
+    except OSError:
+        pass
+    return total
+
+@register
+class Shape(Base):
+    sides = 0
+    def area(self):
+        return self.sides ** 2
+
+def inner(value):
+    return value
+'''
+
+
+def visitor_details(node):
+    visitor = FunctionDetailVisitor()
+    visitor.async_features["async_def"] = isinstance(node, ast.AsyncFunctionDef)
+    visitor.visit(node)
+    return visitor
+
+
+def test_function_details_match_a_visitor_per_function():
+    nodes, deps = PythonParser().parse_code(SOURCE)
+    assert deps == {"os", "collections", "json"}
+    assert set(nodes) == {"func:outer", "func:inner", "func:fetch", "class:Local",
+                          "class:Shape", "func:area"}
+
+    for node in ast.walk(ast.parse(SOURCE)):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name != "inner":
+            expected = visitor_details(node)
+            details = nodes[f"func:{node.name}"]
+            assert details["control_flow"] == expected.control_flow_statements
+            for name in ("calls", "comprehensions", "lambda_functions", "class_definitions",
+                         "async_features", "string_literals", "numeric_literals",
+                         "boolean_literals", "none_literals", "attribute_access",
+                         "augmented_assignments", "exception_handlers", "return_statements"):
+                assert details[name] == getattr(expected, name), (node.name, name)
+
+    # Nested functions count towards the enclosing one, async_def does not
+    assert nodes["func:outer"]["async_features"] == {"async_def": False, "await_calls": 1}
+    assert nodes["func:fetch"]["async_features"] == {"async_def": True, "await_calls": 1}
+    assert nodes["func:outer"]["class_definitions"] == 1
+    assert nodes["func:outer"]["signature"] == "(items, *args, flag, **kwargs)"
+    assert nodes["class:Shape"]["decorators"] == {"register"}
+    assert nodes["class:Shape"]["attributes"] == {"sides"}
+
+
+def test_last_definition_in_walk_order_wins():
+    nodes, _ = PythonParser().parse_code(SOURCE)
+    # ast.walk reaches the module-level inner first, so the nested one overrides it
+    assert nodes["func:inner"]["lambda_functions"] == 1
+    assert list(nodes)[:3] == ["func:outer", "class:Shape", "func:inner"]
+
+
+def test_source_hash_ignores_formatting_only():
+    parser = PythonParser()
+    base = parser.parse_code("def f(a, b):\n    return a + b\n")[0]["func:f"]
+    reformatted = parser.parse_code("\n\ndef f(a,b):  # add\n    return (a + b)\n")[0]["func:f"]
+    changed = parser.parse_code("def f(a, b):\n    return a - b\n")[0]["func:f"]
+    assert "source" not in base
+    assert base["source_hash"] == reformatted["source_hash"]
+    assert base["source_hash"] != changed["source_hash"]
+
+    node = ast.parse("def f(a, b):\n    return a + b\n").body[0]
+    assert parser.get_node_details(node) == base
+
+
+def test_source_hash_distinguishes_block_layout():
+    parser = PythonParser()
+    in_body = parser.parse_code("def f(x):\n    if x:\n        a()\n        b()\n")[0]["func:f"]
+    in_else = parser.parse_code("def f(x):\n    if x:\n        a()\n    else:\n        b()\n")[0]["func:f"]
+    assert in_body["source_hash"] != in_else["source_hash"]
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Tests for the versioned schema migration runner and the query indexes it adds.
+
+The EXPLAIN QUERY PLAN assertions pin the hot queries to their indexes so a
+schema or query change that falls back to a full table scan is caught.
+"""
+
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from migrations.migrate_database import MIGRATIONS, apply_migrations, get_schema_version
+from svcs_repo_local import RepositoryLocalDatabase
+from svcs_repo_reachability import refresh_branch_index
+from svcs_repo_search import EventQuery
+
+
+def make_db(tmp_path):
+    subprocess.run(["git", "init", "-q", "."], cwd=tmp_path, check=True)
+    return RepositoryLocalDatabase(str(tmp_path))
+
+
+def query_plan(conn, query, params=()):
+    return " | ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params))
+
+
+def test_migrations_recorded_and_idempotent(tmp_path):
+    db = make_db(tmp_path)
+    latest = max(version for version, _, _ in MIGRATIONS)
+
+    with db.get_connection() as conn:
+        assert get_schema_version(conn) == latest
+        assert apply_migrations(conn) == []
+        count = conn.execute("SELECT COUNT(*) FROM schema_migrations").fetchone()[0]
+        assert count == len(MIGRATIONS)
+
+    # Re-opening the database must not re-run anything
+    RepositoryLocalDatabase(str(tmp_path))
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM schema_migrations").fetchone()[0] == len(MIGRATIONS)
+
+
+def test_failed_migration_is_rolled_back(tmp_path):
+    db = make_db(tmp_path)
+
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER)")
+        raise RuntimeError("boom")
+
+    with db.get_connection() as conn:
+        before = get_schema_version(conn)
+        try:
+            apply_migrations(conn, MIGRATIONS + [(before + 1, "broken", broken)])
+        except RuntimeError:
+            pass
+        assert get_schema_version(conn) == before
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert "half_done" not in tables
+
+
+def test_branch_events_query_uses_index(tmp_path):
+    db = make_db(tmp_path)
+    subprocess.run(["git", "-c", "user.name=Dev", "-c", "user.email=dev@example.com",
+                    "commit", "-q", "--allow-empty", "-m", "initial"], cwd=tmp_path, check=True)
+    branch = subprocess.run(["git", "branch", "--show-current"], cwd=tmp_path, capture_output=True,
+                            text=True, check=True).stdout.strip()
+    with db.get_connection() as conn:
+        refresh_branch_index(conn, str(tmp_path))
+        query = EventQuery(branch).limit(10)
+        query.fetch(conn)
+        plan = query_plan(conn, *query.build())
+        query.count(conn)
+        count_plan = query_plan(conn, *query.build_count())
+    assert "idx_semantic_events_keyset" in plan
+    assert "USE TEMP B-TREE" not in plan
+    assert "idx_semantic_events_commit_created" in count_plan
+
+
+def test_merge_queries_use_covering_index(tmp_path):
+    db = make_db(tmp_path)
+    with db.get_connection() as conn:
+        except_plan = query_plan(conn, """
+            SELECT event_type, node_id, location FROM semantic_events WHERE branch = ?
+            EXCEPT
+            SELECT event_type, node_id, location FROM semantic_events WHERE branch = ?
+        """, ("feature", "main"))
+        lookup_plan = query_plan(conn, """
+            SELECT * FROM semantic_events
+            WHERE branch = ? AND event_type = ? AND node_id = ? AND location = ?
+            ORDER BY created_at DESC LIMIT 1
+        """, ("feature", "node_added", "func:a", "a.py"))
+    assert "COVERING INDEX idx_semantic_events_branch_key" in except_plan
+    assert "SCAN semantic_events" not in except_plan
+    assert "idx_semantic_events_branch_key" in lookup_plan
+
+
+def test_commit_and_node_lookups_use_index(tmp_path):
+    db = make_db(tmp_path)
+    with db.get_connection() as conn:
+        commit_plan = query_plan(conn, "SELECT COUNT(*) FROM semantic_events WHERE commit_hash = ?", ("abc",))
+        node_plan = query_plan(conn, """
+            SELECT e.event_id FROM semantic_events e
+            JOIN commits c ON e.commit_hash = c.commit_hash
+            WHERE e.node_id = ? ORDER BY c.timestamp DESC
+        """, ("func:a",))
+    assert "idx_semantic_events_commit" in commit_plan
+    assert "idx_semantic_events_node" in node_plan
+
+
+def test_indexes_skip_missing_columns(tmp_path):
+    # Databases created by the legacy storage schema have no branch column
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE commits (commit_hash TEXT PRIMARY KEY, author TEXT, timestamp INTEGER)")
+        conn.execute("""
+            CREATE TABLE semantic_events (
+                event_id INTEGER PRIMARY KEY AUTOINCREMENT, commit_hash TEXT, event_type TEXT,
+                node_id TEXT, location TEXT, created_at INTEGER
+            )
+        """)
+        apply_migrations(conn, MIGRATIONS[:1])
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_semantic_events_commit" in indexes
+    assert "idx_semantic_events_branch_created" not in indexes
+
+
+def test_legacy_storage_schema_is_rebuilt(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE commits (commit_hash TEXT PRIMARY KEY, author TEXT, timestamp INTEGER)
+        """)
+        conn.execute("""
+            CREATE TABLE semantic_events (
+                event_id INTEGER PRIMARY KEY AUTOINCREMENT, commit_hash TEXT, event_type TEXT,
+                node_id TEXT, location TEXT, details TEXT, layer TEXT, layer_description TEXT,
+                confidence REAL, reasoning TEXT, impact TEXT, created_at INTEGER
+            )
+        """)
+        conn.execute("INSERT INTO commits VALUES ('c1', 'Dev', 100)")
+        conn.executemany(
+            "INSERT INTO semantic_events (commit_hash, event_type, node_id, location, details, layer, created_at) "
+            "VALUES ('c1', ?, ?, 'a.py', '', 'core', 100)",
+            [("node_added", "func:a"), ("node_added", "func:b")]
+        )
+        apply_migrations(conn)
+
+        columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(semantic_events)")}
+        rows = conn.execute("SELECT event_id, node_id FROM semantic_events ORDER BY node_id").fetchall()
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+    assert columns["event_id"] == "TEXT" and "branch" in columns
+    assert [node for _, node in rows] == ["func:a", "func:b"]
+    assert all(len(event_id) == 36 for event_id, _ in rows)
+    assert "idx_semantic_events_branch_keyset" in indexes
+    assert "idx_commits_branch_timestamp" in indexes
+
+
+def test_double_written_events_are_removed(tmp_path):
+    db = make_db(tmp_path)
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM schema_migrations WHERE version >= 4")
+        conn.execute("INSERT INTO commits (commit_hash, branch, author, timestamp) VALUES ('c1', 'main', 'Dev', 100)")
+        event = ("c1", "node_added", "func:a", "a.py", "", "core", 100)
+        # Old hook path: branch-less, ID-less copy plus the branch-aware copy
+        conn.execute("INSERT INTO semantic_events (event_id, commit_hash, event_type, node_id, location, "
+                     "details, layer, created_at, branch) VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, NULL)", event)
+        conn.execute("INSERT INTO semantic_events (event_id, commit_hash, event_type, node_id, location, "
+                     "details, layer, created_at, branch) VALUES ('e1', ?, ?, ?, ?, ?, ?, ?, 'main')", event)
+        # An event only ever written by the old path survives with the commit's branch
+        conn.execute("INSERT INTO semantic_events (event_id, commit_hash, event_type, node_id, location, "
+                     "details, layer, created_at, branch) VALUES (NULL, 'c1', 'node_removed', 'func:b', "
+                     "'a.py', '', 'core', 100, NULL)")
+        conn.commit()
+
+        assert 4 in apply_migrations(conn)
+        rows = conn.execute("SELECT event_id, event_type, branch FROM semantic_events "
+                            "ORDER BY event_type").fetchall()
+
+    assert len(rows) == 2
+    assert rows[0] == ("e1", "node_added", "main")
+    assert rows[1][1:] == ("node_removed", "main") and rows[1][0]
+
+
+def test_merged_event_copies_collapse_into_pins(tmp_path):
+    db = make_db(tmp_path)
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM schema_migrations WHERE version >= 8")
+        event = ("c1", "node_added", "func:a", "a.py", "", "core", 100)
+        # Old process_merge: the feature event copied to main and release
+        for event_id, branch in (("e1", "feature"), ("e2", "main"), ("e3", "release")):
+            conn.execute("INSERT INTO semantic_events (event_id, commit_hash, event_type, node_id, location, "
+                         "details, layer, created_at, branch) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (event_id, *event, branch))
+        # Same node changed again in another commit is a different event
+        conn.execute("INSERT INTO semantic_events (event_id, commit_hash, event_type, node_id, location, "
+                     "details, layer, created_at, branch) VALUES ('e4', 'c2', 'node_added', 'func:a', "
+                     "'a.py', '', 'core', 200, 'main')")
+        conn.commit()
+
+        assert 8 in apply_migrations(conn)
+        rows = conn.execute("SELECT event_id FROM semantic_events ORDER BY event_id").fetchall()
+        pins = conn.execute("SELECT branch, commit_hash, pinned FROM branch_commits ORDER BY branch").fetchall()
+        stats_branches = dict(conn.execute("SELECT branch, SUM(event_count) FROM event_stats GROUP BY branch"))
+
+    assert rows == [("e1",), ("e4",)]
+    assert pins == [("main", "c1", 1), ("release", "c1", 1)]
+    assert stats_branches == {"feature": 1, "main": 1}
+    # The collapsed event is still listed on every branch it was copied to
+    assert [e["event_id"] for e in db.get_branch_events("release")] == ["e1"]
+    assert [e["event_id"] for e in db.get_branch_events("main")] == ["e4", "e1"]
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for hunk-scoped Python parsing: only changed nodes get full details.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from svcs.analyzers.comprehensive_analyzer import ComprehensiveAnalyzer
+from svcs.parsers import PythonParser
+
+CASES = sorted((Path(__file__).parent.parent / "test_cases" / "python").iterdir())
+
+
+class FullParser(PythonParser):
+    scoped_parsing = False
+
+
+def analyze(before, after, scoped):
+    analyzer = ComprehensiveAnalyzer()
+    if not scoped:
+        analyzer.parsers["python"] = FullParser()
+    events = analyzer.analyze_file_changes("module.py", before, after)
+    return sorted(json.dumps(event, sort_keys=True, default=str) for event in events)
+
+
+def read_case(case, name):
+    path = case / name
+    return path.read_text() if path.exists() else ""
+
+
+@pytest.mark.parametrize("case", [c for c in CASES if c.is_dir()], ids=lambda c: c.name)
+def test_events_match_full_parse_on_corpus(case):
+    before, after = read_case(case, "before.py"), read_case(case, "after.py")
+    assert analyze(before, after, scoped=True) == analyze(before, after, scoped=False)
+
+
+def module(*bodies):
+    return "import os\n\n" + "\n\n".join(bodies) + "\n"
+
+
+HELPER = "def helper(items):\n    return [x for x in items if x]\n"
+WORKER = "@cached\ndef worker(path):\n    return os.path.join(path, 'x')\n"
+SHAPE = "class Shape:\n    def area(self):\n        return 0\n"
+
+
+def test_only_touched_nodes_get_full_details():
+    before = module(HELPER, WORKER, SHAPE)
+    after = module("# header\n" + HELPER, WORKER.replace("'x'", "'y'"), SHAPE)
+    (nodes_before, _), (nodes_after, deps) = PythonParser().parse_changes(before, after)
+
+    assert deps == {"os"}
+    # helper shifted down a line but is otherwise untouched
+    assert nodes_before["func:helper"] == nodes_after["func:helper"]
+    assert nodes_after["func:helper"]["comprehensions"]["list"] == 1
+    assert "signature" not in nodes_after["func:helper"]
+    assert "signature" in nodes_after["func:worker"]
+    assert nodes_before["func:worker"] != nodes_after["func:worker"]
+    assert nodes_before["class:Shape"] == nodes_after["class:Shape"]
+    assert "func:area" in nodes_after and "signature" not in nodes_after["func:area"]
+
+
+def test_decorator_and_duplicate_name_changes_use_full_details():
+    before = module(HELPER, WORKER, SHAPE, "def helper():\n    pass\n")
+    after = module(HELPER, WORKER.replace("@cached\n", ""), SHAPE, "def helper():\n    pass\n")
+    (nodes_before, _), (nodes_after, _) = PythonParser().parse_changes(before, after)
+
+    assert nodes_before["func:worker"]["decorators"] == {"cached"}
+    assert nodes_after["func:worker"]["decorators"] == set()
+    # Redefined names keep the full details of the last definition
+    assert nodes_after["func:helper"]["signature"] == "()"
+
+
+def test_syntax_error_side_falls_back_to_full_parse():
+    (nodes_before, _), (nodes_after, _) = PythonParser().parse_changes(module(HELPER), "def broken(:\n")
+    assert "signature" in nodes_before["func:helper"]
+    assert nodes_after == {}